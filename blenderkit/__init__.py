@@ -1728,6 +1728,34 @@ class BlenderKitAddonPreferences(AddonPreferences):
 
     thumb_size: IntProperty(name="Assetbar thumbnail Size", default=96, min=-1, max=256)
 
+    search_cache_ttl: IntProperty(name="Search Cache Validity",
+                                  description="Minutes during which cached search results are shown without asking "
+                                              "the server, older ones are checked with the server first",
+                                  default=10,
+                                  min=0,
+                                  max=10080)
+
+    thumbnail_cache_size: IntProperty(name="Thumbnail Cache Size (MB)",
+                                      description="Disk space used to keep thumbnails, "
+                                                  "the least recently used ones are removed first",
+                                      default=500,
+                                      min=0,
+                                      max=100000)
+
+    max_simultaneous_downloads: IntProperty(name="Simultaneous Downloads",
+                                            description="How many assets can be downloaded at the same time, "
+                                                        "others wait for their turn",
+                                            default=2,
+                                            min=1,
+                                            max=16)
+
+    download_connections: IntProperty(name="Connections per Download",
+                                      description="Large files are downloaded in this many parts at once, "
+                                                  "which can be faster on slow or distant connections",
+                                      default=4,
+                                      min=1,
+                                      max=16)
+
     asset_counter: IntProperty(name="Usage Counter",
                                description="Counts usages so it asks for registration only after reaching a limit",
                                default=0,
@@ -1805,6 +1833,10 @@ class BlenderKitAddonPreferences(AddonPreferences):
         # layout.prop(self, "panel_behaviour")
         layout.prop(self, "thumb_size")
         layout.prop(self, "max_assetbar_rows")
+        layout.prop(self, "search_cache_ttl")
+        layout.prop(self, "thumbnail_cache_size")
+        layout.prop(self, "max_simultaneous_downloads")
+        layout.prop(self, "download_connections")
         layout.prop(self, "tips_on_start")
         layout.prop(self, "search_in_header")
         layout.prop(self, "thumbnail_use_gpu")
@@ -1814,6 +1846,17 @@ class BlenderKitAddonPreferences(AddonPreferences):
             layout.prop(self, "experimental_features")
             layout.prop(self, "categories_fix")
 
+            # task queue counters, to find what makes the add-on stall
+            stats = tasks_queue.get_stats()
+            box = layout.box()
+            box.label(text='Task queue')
+            box.label(text=f"Queued: {stats['depth']} ({stats['ready']} due), max {stats['max_depth']}")
+            box.label(text=f"Tasks: {stats['executed']} run, {stats['failed']} failed, "
+                           f"{stats['coalesced']} coalesced, {stats['late']} late")
+            box.label(text=f"Latency: mean {stats['mean_latency'] * 1000:.0f} ms, max {stats['max_latency'] * 1000:.0f} ms")
+            if stats['slowest_task']:
+                box.label(text=f"Slowest task: {stats['slowest_task']} {stats['slowest_task_time'] * 1000:.0f} ms")
+
 
 # # @bpy.app.handlers.persistent
 # def blenderkit_timer():
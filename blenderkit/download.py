@@ -17,7 +17,8 @@
 # ##### END GPL LICENSE BLOCK #####
 
 
-from blenderkit import paths, append_link, utils, ui, colors, tasks_queue, rerequests, resolutions, ui_panels, search
+from blenderkit import paths, append_link, utils, ui, colors, tasks_queue, rerequests, resolutions, ui_panels, search, \
+    ranged_download
 
 import threading
 import time
@@ -711,41 +712,25 @@ def download_asset_file(asset_data, resolution='blend', api_key = ''):
         bk_logger.debug('not downloading, already in db')
         return file_name
 
-    download_canceled = False
+    res_file_info, resolution = paths.get_res_file(asset_data, resolution)
+    last_percent = [0]
 
-    with open(file_name, "wb") as f:
-        print("Downloading %s" % file_name)
-        headers = utils.get_headers(api_key)
-        res_file_info, resolution = paths.get_res_file(asset_data, resolution)
-        response = requests.get(res_file_info['url'], stream=True)
-        total_length = response.headers.get('Content-Length')
+    def print_progress(downloaded, total):
+        if not total:
+            return
+        percent = int(downloaded * 100 / total)
+        if percent > last_percent[0]:
+            last_percent[0] = percent
+            print(f'Downloading {asset_data["name"]} {utils.files_size_to_text(total)} {percent}% ')
 
-        if total_length is None or int(total_length) < 1000:  # no content length header
-            download_canceled = True
-            print(response.content)
-        else:
-            total_length = int(total_length)
-            dl = 0
-            last_percent = 0
-            percent = 0
-            for data in response.iter_content(chunk_size=4096 * 10):
-                dl += len(data)
-
-                # the exact output you're looking for:
-                fs_str = utils.files_size_to_text(total_length)
-
-                percent = int(dl * 100 / total_length)
-                if percent > last_percent:
-                    last_percent = percent
-                    # sys.stdout.write('\r')
-                    # sys.stdout.write(f'Downloading {asset_data['name']} {fs_str} {percent}% ')  # + int(dl * 50 / total_length) * 'x')
-                    print(
-                        f'Downloading {asset_data["name"]} {fs_str} {percent}% ')  # + int(dl * 50 / total_length) * 'x')
-                    # sys.stdout.flush()
-
-                # print(int(dl*50/total_length)*'x'+'\r')
-                f.write(data)
-    if download_canceled:
+    print("Downloading %s" % file_name)
+    try:
+        ranged_download.RangedDownload(res_file_info['url'], file_name, progress=print_progress).run()
+    except (ranged_download.DownloadError, requests.RequestException, OSError) as e:
+        print(e)
+        return None
+    if not ranged_download.verify_blend_header(file_name):
+        print('downloaded file is not a .blend file')
         delete_unfinished_file(file_name)
         return None
 
@@ -753,13 +738,14 @@ def download_asset_file(asset_data, resolution='blend', api_key = ''):
 
 
 class Downloader(threading.Thread):
-    def __init__(self, asset_data, tcom, scene_id, api_key, resolution='blend'):
+    def __init__(self, asset_data, tcom, scene_id, api_key, resolution='blend', connections=1):
         super(Downloader, self).__init__()
         self.asset_data = asset_data
         self.tcom = tcom
         self.scene_id = scene_id
         self.api_key = api_key
         self.resolution = resolution
+        self.connections = connections
         self._stop_event = threading.Event()
 
     def stop(self):
@@ -801,50 +787,20 @@ class Downloader(threading.Thread):
         if self.stopped():
             bk_logger.debug('stopping download: ' + asset_data['name'])
             return
+        if tcom.passargs.get('delete'):
+            # the previous download was broken, don't continue from its parts.
+            ranged_download.delete_partial(file_name)
 
-        download_canceled = False
-        with open(file_name, "wb") as f:
-            bk_logger.debug("Downloading %s" % file_name)
-            headers = utils.get_headers(api_key)
-            res_file_info, self.resolution = paths.get_res_file(asset_data, self.resolution)
-            response = requests.get(res_file_info['url'], stream=True)
-            total_length = response.headers.get('Content-Length')
-            if total_length is None:  # no content length header
-                print('no content length')
-                print(response.content)
-                tcom.report = response.content
-                download_canceled = True
-            else:
-                # bk_logger.debug(total_length)
-                if int(total_length) < 1000:  # means probably no file returned.
-                    tasks_queue.add_task((ui.add_report, (response.content, 20, colors.RED)))
-
-                    tcom.report = response.content
-
-                tcom.file_size = int(total_length)
-                fsmb = tcom.file_size // (1024 * 1024)
-                fskb = tcom.file_size % 1024
-                if fsmb == 0:
-                    t = '%iKB' % fskb
-                else:
-                    t = ' %iMB' % fsmb
-
-                tcom.report = f'Downloading {t} {self.resolution}'
-
-                dl = 0
-                totdata = []
-                for data in response.iter_content(chunk_size=4096 * 32):  # crashed here... why? investigate:
-                    dl += len(data)
-                    tcom.downloaded = dl
-                    tcom.progress = int(100 * tcom.downloaded / tcom.file_size)
-                    f.write(data)
-                    if self.stopped():
-                        bk_logger.debug('stopping download: ' + asset_data['name'])
-                        download_canceled = True
-                        break
-
-        if download_canceled:
-            delete_unfinished_file(file_name)
+        tcom.report = 'Waiting for other downloads'
+        if not ranged_download.download_slots.acquire(self.stopped):
+            bk_logger.debug('stopping download: ' + asset_data['name'])
+            return
+        try:
+            finished = self.download_file(file_name)
+        finally:
+            ranged_download.download_slots.release()
+        if not finished:
+            # the partial file is kept, a new download of the asset continues it.
             return
         # unpack the file immediately after download
 
@@ -853,6 +809,45 @@ class Downloader(threading.Thread):
         resolutions.send_to_bg(self.asset_data, file_name, command='unpack')
         # utils.p('end downloader thread')
 
+    def download_file(self, file_name):
+        '''download and check the asset file, returns False if stopped or failed.'''
+        asset_data = self.asset_data
+        tcom = self.tcom
+        bk_logger.debug("Downloading %s" % file_name)
+        res_file_info, self.resolution = paths.get_res_file(asset_data, self.resolution)
+
+        def set_progress(downloaded, total):
+            tcom.downloaded = downloaded
+            if total:
+                if total != tcom.file_size:
+                    tcom.file_size = total
+                    tcom.report = f'Downloading {utils.files_size_to_text(total)} {self.resolution}'
+                tcom.progress = int(100 * downloaded / total)
+
+        tcom.report = f'Downloading {self.resolution}'
+        try:
+            finished = ranged_download.RangedDownload(res_file_info['url'], file_name, connections=self.connections,
+                                                      stopped=self.stopped, progress=set_progress).run()
+        except (ranged_download.DownloadError, requests.RequestException, OSError) as e:
+            bk_logger.debug('download failed: %s %s' % (asset_data['name'], e))
+            tcom.report = f'Download failed: {e}'
+            tcom.error = True
+            tasks_queue.add_task(
+                (ui.add_report, ('Failed to download %s, try again to continue.' % asset_data['name'], 5, colors.RED)))
+            return False
+        if not finished:
+            bk_logger.debug('stopping download: ' + asset_data['name'])
+            return False
+
+        # an error page instead of the file would make the unpacking fail.
+        if not ranged_download.verify_blend_header(file_name):
+            tcom.report = 'Downloaded file is not a .blend file'
+            tcom.error = True
+            tasks_queue.add_task((ui.add_report, (tcom.report, 5, colors.RED)))
+            delete_unfinished_file(file_name)
+            return False
+        return True
+
 
 
 class ThreadCom:  # object passed to threads to read background process stdout info
@@ -890,7 +885,9 @@ def download(asset_data, **kwargs):
         asset_data = copy.deepcopy(asset_data)
     else:
         asset_data = asset_data.to_dict()
-    readthread = Downloader(asset_data, tcom, scene_id, api_key, resolution=kwargs['resolution'])
+    ranged_download.download_slots.set_limit(user_preferences.max_simultaneous_downloads)
+    readthread = Downloader(asset_data, tcom, scene_id, api_key, resolution=kwargs['resolution'],
+                            connections=user_preferences.download_connections)
     readthread.start()
 
     global download_threads
@@ -1,6 +1,31 @@
 import bpy
 import os
 import time
+import concurrent.futures
+
+# pixel checks of big images are split in chunks of this many pixels, checked in parallel.
+# numpy releases the GIL while working on the chunks, so threads are enough.
+PIXEL_CHUNK_SIZE = 1024 * 1024
+
+_pixel_executor = None
+
+
+def get_pixel_executor():
+    global _pixel_executor
+    if _pixel_executor is None:
+        _pixel_executor = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+    return _pixel_executor
+
+
+def check_all_pixels(na, check, channels=4):
+    '''
+    Returns True if check returns True for every chunk of the flat pixel array, each chunk having whole pixels.
+    '''
+    step = PIXEL_CHUNK_SIZE * channels
+    if na.size <= step:
+        return bool(check(na))
+    chunks = [na[i:i + step] for i in range(0, na.size, step)]
+    return all(get_pixel_executor().map(check, chunks))
 
 
 def get_orig_render_settings():
@@ -145,12 +170,11 @@ def find_image_depth(image):
 
 
 def can_erase_alpha(na):
-    alpha = na[3::4]
-    alpha_sum = alpha.sum()
-    if alpha_sum == alpha.size:
+    import numpy
+    can_erase = check_all_pixels(na, lambda chunk: numpy.all(chunk[3::4] == 1))
+    if can_erase:
         print('image can have alpha erased')
-    # print(alpha_sum, alpha.size)
-    return alpha_sum == alpha.size
+    return can_erase
 
 
 def is_image_black(na):
@@ -167,13 +191,15 @@ def is_image_black(na):
 
 
 def is_image_bw(na):
-    r = na[::4]
-    g = na[1::4]
-    b = na[2::4]
+    import numpy
+
+    def check(chunk):
+        r = chunk[::4]
+        g = chunk[1::4]
+        b = chunk[2::4]
+        return numpy.array_equal(r, g) and numpy.array_equal(g, b)
 
-    rg_equal = r == g
-    gb_equal = g == b
-    rgbequal = rg_equal.all() and gb_equal.all()
+    rgbequal = check_all_pixels(na, check)
     if rgbequal:
         print('image is black and white, can have channels reduced')
 
@@ -305,6 +331,27 @@ def check_nmap_mean_ok(i):
     return nmap_ok
 
 
+def integrate_heights(slopes, mask=None):
+    '''
+    Heights of a (width, height) array of slopes, each pixel being the average of its left and bottom neighbours
+    plus its own slope, pixels outside of the image or the mask being 0.
+    Computed one diagonal at a time, as every pixel of a diagonal depends only on the previous one.
+    '''
+    import numpy
+    width, height = slopes.shape
+    # padded with a row and column of zeros for the neighbours outside of the image
+    heights = numpy.zeros((width + 1, height + 1), numpy.float32)
+    x_all = numpy.arange(width)
+    for d in range(width + height - 1):
+        x = x_all[max(0, d - height + 1):min(d, width - 1) + 1]
+        y = d - x
+        h = (heights[x, y + 1] + heights[x + 1, y] + slopes[x, y]) / 2
+        if mask is not None:
+            h = numpy.where(mask[x, y], h, 0)
+        heights[x + 1, y + 1] = h
+    return heights[1:, 1:]
+
+
 def check_nmap_ogl_vs_dx(i, mask=None, generated_test_images=False):
     '''
     checks if normal map is directX or OpenGL.
@@ -319,53 +366,24 @@ def check_nmap_ogl_vs_dx(i, mask=None, generated_test_images=False):
     na = imagetonumpy(i)
 
     if mask:
-        mask = imagetonumpy(mask)
-
-    red_x_comparison = numpy.zeros((width, height), numpy.float32)
-    green_y_comparison = numpy.zeros((width, height), numpy.float32)
+        mask = imagetonumpy(mask)[:, :, 3] > 0
+    else:
+        mask = None
 
-    if generated_test_images:
-        red_x_comparison_img = numpy.empty((width, height, 4), numpy.float32)  # images for debugging purposes
-        green_y_comparison_img = numpy.empty((width, height, 4), numpy.float32)  # images for debugging purposes
+    # slope of the normal in x and y
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        diff_x = (na[:, :, 0] - rmean) / (na[:, :, 2] - 0.5)
+        diff_y = (na[:, :, 1] - gmean) / (na[:, :, 2] - 0.5)
 
-    ogl = numpy.zeros((width, height), numpy.float32)
-    dx = numpy.zeros((width, height), numpy.float32)
+    # heights obtained by integrating the slopes, green up for OpenGL and down for DirectX
+    ogl = integrate_heights(-diff_x - diff_y, mask)
+    dx = integrate_heights(-diff_x + diff_y, mask)
 
     if generated_test_images:
-        ogl_img = numpy.empty((width, height, 4), numpy.float32)  # images for debugging purposes
-        dx_img = numpy.empty((width, height, 4), numpy.float32)  # images for debugging purposes
-
-    for y in range(0, height):
-        for x in range(0, width):
-            # try to mask with UV mask image
-            if mask is None or mask[x, y, 3] > 0:
-
-                last_height_x = ogl[max(x - 1, 0), min(y, height - 1)]
-                last_height_y = ogl[max(x, 0), min(y - 1, height - 1)]
-
-                diff_x = ((na[x, y, 0] - rmean) / ((na[x, y, 2] - 0.5)))
-                diff_y = ((na[x, y, 1] - gmean) / ((na[x, y, 2] - 0.5)))
-                calc_height = (last_height_x + last_height_y) \
-                              - diff_x - diff_y
-                calc_height = calc_height / 2
-                ogl[x, y] = calc_height
-                if generated_test_images:
-                    rgb = calc_height * .1 + .5
-                    ogl_img[x, y] = [rgb, rgb, rgb, 1]
-
-                # green channel
-                last_height_x = dx[max(x - 1, 0), min(y, height - 1)]
-                last_height_y = dx[max(x, 0), min(y - 1, height - 1)]
-
-                diff_x = ((na[x, y, 0] - rmean) / ((na[x, y, 2] - 0.5)))
-                diff_y = ((na[x, y, 1] - gmean) / ((na[x, y, 2] - 0.5)))
-                calc_height = (last_height_x + last_height_y) \
-                              - diff_x + diff_y
-                calc_height = calc_height / 2
-                dx[x, y] = calc_height
-                if generated_test_images:
-                    rgb = calc_height * .1 + .5
-                    dx_img[x, y] = [rgb, rgb, rgb, 1]
+        ogl_img = numpy.ones((width, height, 4), numpy.float32)  # images for debugging purposes
+        dx_img = numpy.ones((width, height, 4), numpy.float32)  # images for debugging purposes
+        ogl_img[:, :, :3] = (ogl * .1 + .5)[:, :, None]
+        dx_img[:, :, :3] = (dx * .1 + .5)[:, :, None]
 
     ogl_std = ogl.std()
     dx_std = dx.std()
@@ -141,6 +141,17 @@ def get_temp_dir(subdir=None):
     return tempdir
 
 
+def get_cache_dir():
+    '''persistent cache of search results and thumbnails, in the global directory'''
+    user_preferences = bpy.context.preferences.addons['blenderkit'].preferences
+    cache_dir = user_preferences.global_dir
+    if cache_dir.startswith('//'):
+        cache_dir = bpy.path.abspath(cache_dir)
+    cache_dir = os.path.join(cache_dir, 'cache')
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    return cache_dir
+
 
 def get_download_dirs(asset_type):
     ''' get directories where assets will be downloaded'''
@@ -0,0 +1,402 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+'''
+Resumable downloads of asset files.
+
+A file is downloaded to <file>.part, with the state of the transfer (ETag, size, downloaded ranges) kept
+in <file>.part.json. A failed or cancelled download continues from where it stopped, using HTTP Range
+requests with If-Range, so that a file changed on the server is downloaded again from the start.
+Large files can be downloaded over several connections, each one fetching its own segment.
+
+The finished file is checked before it replaces the target file: its size, and its checksum when the server
+sends one for the whole file (Content-MD5 or x-amz-checksum-sha256 headers). ETags are not used as checksums,
+since they are not the MD5 of the content for encrypted or multipart S3 objects.
+
+This module doesn't use bpy, it's used from the download threads.
+'''
+
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import requests
+
+bk_logger = logging.getLogger('blenderkit')
+
+CHUNK_SIZE = 128 * 1024
+# progress of the segments is saved at most this often (seconds).
+STATE_SAVE_INTERVAL = 1.0
+# files smaller than this are downloaded over one connection.
+SEGMENTED_MIN_SIZE = 64 * 1024 * 1024
+RETRIES = 5
+RETRY_DELAY = 2.0
+TIMEOUT = 30
+
+PART_SUFFIX = '.part'
+STATE_SUFFIX = '.part.json'
+
+# checksum headers of the whole file, with their hashlib algorithm. The values are base64 encoded.
+CHECKSUM_HEADERS = (
+    ('Content-MD5', 'md5'),
+    ('x-amz-checksum-sha256', 'sha256'),
+)
+CONTENT_RANGE = re.compile(r'bytes (\d+)-(\d+)/(\d+|\*)')
+
+
+class DownloadError(Exception):
+    pass
+
+
+class _Restart(Exception):
+    '''The file changed on the server, the download has to start again.'''
+    pass
+
+
+class DownloadSlots():
+    '''
+    Limits the number of simultaneous downloads, the limit can be changed while downloads wait.
+    '''
+
+    def __init__(self, limit=2):
+        self.limit = limit
+        self.active = 0
+        self._condition = threading.Condition()
+
+    def set_limit(self, limit):
+        with self._condition:
+            self.limit = max(1, limit)
+            self._condition.notify_all()
+
+    def acquire(self, stopped=None):
+        '''Wait for a free slot, returns False if stopped meanwhile.'''
+        with self._condition:
+            while self.active >= self.limit:
+                if stopped is not None and stopped():
+                    return False
+                self._condition.wait(0.5)
+            self.active += 1
+            return True
+
+    def release(self):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+
+download_slots = DownloadSlots()
+
+
+def part_paths(filepath):
+    return filepath + PART_SUFFIX, filepath + STATE_SUFFIX
+
+
+def delete_partial(filepath):
+    '''Remove the partial download of filepath, if any.'''
+    for path in part_paths(filepath):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def verify_blend_header(filepath):
+    '''Check the file looks like a .blend file (plain or compressed), not an error page.'''
+    with open(filepath, 'rb') as f:
+        header = f.read(7)
+    return header == b'BLENDER' or header[:2] == b'\x1f\x8b' or header[:4] == b'\x28\xb5\x2f\xfd'
+
+
+def file_digest(filepath, algorithm):
+    h = hashlib.new(algorithm)
+    with open(filepath, 'rb') as f:
+        for data in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(data)
+    return h.hexdigest()
+
+
+def response_checksum(response):
+    '''(algorithm, hex digest) of the whole file from the headers of a full response, or None.'''
+    if 'Content-Encoding' in response.headers:
+        # the checksum would be the one of the encoded data.
+        return None
+    for header, algorithm in CHECKSUM_HEADERS:
+        value = response.headers.get(header)
+        if value is None:
+            continue
+        try:
+            digest = base64.b64decode(value, validate=True)
+        except (binascii.Error, ValueError):
+            # e.g. composite checksums of multipart uploads ('<base64>-<parts>'), not the one of the file.
+            continue
+        if len(digest) == hashlib.new(algorithm).digest_size:
+            return [algorithm, digest.hex()]
+    return None
+
+
+class RangedDownload():
+    def __init__(self, url, filepath, connections=1, stopped=None, progress=None, session=None):
+        '''
+        Parameters
+        ----------
+        url - file url
+        filepath - where the finished file is written
+        connections - maximum connections used for large files
+        stopped - function returning True when the download should stop
+        progress - function called with (downloaded, total), total is None if unknown
+        session - requests session, to reuse connections
+        '''
+        self.url = url
+        self.filepath = filepath
+        self.part_path, self.state_path = part_paths(filepath)
+        self.connections = max(1, connections)
+        self.stopped = stopped or (lambda: False)
+        self.progress = progress
+        self.session = session or requests.Session()
+
+        self.etag = None
+        self.last_modified = None
+        self.size = None
+        # [algorithm, hex digest] of the whole file, when the server gave it.
+        self.checksum = None
+        # [start, end, position], end excluded, None when the size isn't known.
+        self.segments = []
+        self._lock = threading.Lock()
+        self._state_saved = 0
+        self._errors = []
+
+    # State
+    # ---------------------------
+
+    def _load_state(self):
+        if not os.path.isfile(self.part_path):
+            return False
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.etag = state['etag']
+            self.last_modified = state['last_modified']
+            self.size = state['size']
+            self.checksum = state.get('checksum')
+            self.segments = state['segments']
+        except (OSError, ValueError, KeyError):
+            return False
+        # without a validator, we couldn't know the parts belong to the same file.
+        return bool(self.segments) and (self.etag is not None or self.last_modified is not None)
+
+    def _save_state(self, force=False):
+        now = time.time()
+        if not force and now - self._state_saved < STATE_SAVE_INTERVAL:
+            return
+        self._state_saved = now
+        state = {
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'size': self.size,
+            'checksum': self.checksum,
+            'segments': self.segments,
+        }
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _reset(self):
+        delete_partial(self.filepath)
+        self.etag = self.last_modified = self.size = self.checksum = None
+        self.segments = []
+
+    def downloaded(self):
+        return sum(position - start for start, end, position in self.segments)
+
+    def _report_progress(self):
+        if self.progress is not None:
+            self.progress(self.downloaded(), self.size)
+
+    # Transfer
+    # ---------------------------
+
+    def _request(self, segment):
+        '''Open the response continuing the segment.'''
+        start, end, position = segment
+        headers = {}
+        if position > 0 or end is not None:
+            headers['Range'] = 'bytes=%d-%s' % (position, '' if end is None else end - 1)
+            validator = self.etag or self.last_modified
+            if validator is not None:
+                headers['If-Range'] = validator
+        response = self.session.get(self.url, headers=headers, stream=True, timeout=TIMEOUT)
+        if response.status_code >= 400:
+            response.close()
+            raise DownloadError('Server responded %d' % response.status_code)
+        if 'Range' in headers:
+            match = CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+            if response.status_code != 206 or match is None or int(match.group(1)) != position:
+                # the file changed, or ranges aren't supported.
+                response.close()
+                raise _Restart()
+        return response
+
+    def _read(self, response, segment, f):
+        '''Write the response to the segment, until its end or until stopped.'''
+        f.seek(segment[2])
+        try:
+            for data in response.iter_content(chunk_size=CHUNK_SIZE):
+                if segment[1] is not None:
+                    data = data[:segment[1] - segment[2]]
+                f.write(data)
+                f.flush()
+                with self._lock:
+                    segment[2] += len(data)
+                    self._save_state()
+                self._report_progress()
+                if self.stopped() or self._errors or (segment[1] is not None and segment[2] >= segment[1]):
+                    break
+        finally:
+            response.close()
+
+    def _download_segment(self, segment, response=None):
+        '''Download the segment, retrying on connection errors.'''
+        tries = 0
+        with open(self.part_path, 'r+b') as f:
+            while not self.stopped() and not self._errors:
+                try:
+                    if response is None:
+                        response = self._request(segment)
+                    self._read(response, segment, f)
+                    response = None
+                    if segment[1] is None or segment[2] >= segment[1]:
+                        return
+                    if self.stopped() or self._errors:
+                        return
+                    # the connection ended before the segment.
+                    raise DownloadError('Connection closed early')
+                except (requests.RequestException, DownloadError, OSError) as e:
+                    response = None
+                    tries += 1
+                    if tries > RETRIES or segment[1] is None:
+                        # without size, nothing tells where the next request would continue.
+                        raise
+                    bk_logger.debug('download error, retrying: %s' % e)
+                    time.sleep(RETRY_DELAY * tries)
+
+    def _segment_thread(self, segment):
+        try:
+            self._download_segment(segment)
+        except Exception as e:
+            self._errors.append(e)
+
+    def _start(self):
+        '''First request of a new download, which also tells the size and if ranges are accepted.'''
+        response = self.session.get(self.url, stream=True, timeout=TIMEOUT)
+        if response.status_code >= 400:
+            response.close()
+            raise DownloadError('Server responded %d' % response.status_code)
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+        length = response.headers.get('Content-Length')
+        self.size = int(length) if length is not None and 'Content-Encoding' not in response.headers else None
+        self.checksum = response_checksum(response)
+
+        with open(self.part_path, 'wb') as f:
+            if self.size is not None:
+                f.truncate(self.size)
+        ranges = response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        if self.size is not None and ranges and self.connections > 1 and self.size >= SEGMENTED_MIN_SIZE:
+            bounds = [self.size * i // self.connections for i in range(self.connections + 1)]
+            self.segments = [[start, end, start] for start, end in zip(bounds[:-1], bounds[1:])]
+        else:
+            self.segments = [[0, self.size, 0]]
+        self._save_state(force=True)
+        return response
+
+    def _run_segments(self, first_response=None):
+        segments = [s for s in self.segments if s[1] is None or s[2] < s[1]]
+        threads = []
+        for segment in segments[1:]:
+            thread = threading.Thread(target=self._segment_thread, args=(segment,), daemon=True)
+            thread.start()
+            threads.append(thread)
+        # the first segment in this thread, it can continue the first response.
+        if first_response is not None and (not segments or segments[0] is not self.segments[0]):
+            first_response.close()
+            first_response = None
+        try:
+            if segments:
+                self._download_segment(segments[0], first_response)
+        except Exception as e:
+            self._errors.append(e)
+        for thread in threads:
+            thread.join()
+        with self._lock:
+            self._save_state(force=True)
+
+        if self._errors:
+            if any(isinstance(e, _Restart) for e in self._errors):
+                raise _Restart()
+            raise self._errors[0]
+
+    def _verify(self):
+        # the part file has its final size from the start, the downloaded ranges tell if it's complete.
+        downloaded = self.downloaded()
+        if self.size is not None and downloaded != self.size:
+            raise DownloadError('Downloaded %d bytes instead of %d' % (downloaded, self.size))
+        if self.checksum is not None:
+            algorithm, digest = self.checksum
+            if file_digest(self.part_path, algorithm) != digest:
+                raise DownloadError('Downloaded file is corrupted, checksum mismatch')
+
+    def run(self):
+        '''
+        Download the file, continuing a previous partial download if possible.
+        Returns True when the file is complete, False if the download was stopped, in which case
+        it can be resumed later. Raises DownloadError when it fails.
+        '''
+        for attempt in range(2):
+            try:
+                if self._load_state():
+                    bk_logger.debug('resuming download at %d bytes: %s' % (self.downloaded(), self.filepath))
+                    self._report_progress()
+                    self._run_segments()
+                else:
+                    self._reset()
+                    self._run_segments(self._start())
+                break
+            except _Restart:
+                bk_logger.debug('file changed on the server, restarting download: %s' % self.filepath)
+                self._errors = []
+                self._reset()
+        else:
+            raise DownloadError('File keeps changing on the server')
+
+        if self.stopped():
+            return False
+        try:
+            self._verify()
+        except DownloadError:
+            self._reset()
+            raise
+        os.replace(self.part_path, self.filepath)
+        delete_partial(self.filepath)
+        return True
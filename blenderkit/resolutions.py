@@ -26,6 +26,8 @@ import bpy
 import requests
 import math
 import threading
+import queue
+import traceback
 
 resolutions = {
     'resolution_0_5K': 512,
@@ -36,6 +38,11 @@ resolutions = {
 }
 rkeys = list(resolutions.keys())
 
+# marks the lines where a worker reports a finished job, its other output is just printed.
+WORKER_RESULT_PREFIX = 'BLENDERKIT_RESOLUTION_JOB '
+# workers are restarted after this many jobs, so that anything leaked by Blender doesn't pile up.
+WORKER_MAX_JOBS = 20
+
 resolution_props_to_server = {
 
     '512': 'resolution_0_5K',
@@ -327,6 +334,7 @@ def generate_lower_resolutions_hdr(asset_data, fpath):
 
     preferences = bpy.context.preferences.addons['blenderkit'].preferences
     patch_asset_empty(asset_data['id'], preferences.api_key)
+    return files
 
 
 def generate_lower_resolutions(data):
@@ -417,7 +425,8 @@ def generate_lower_resolutions(data):
             upload_resolutions(files, data['asset_data'])
             preferences = bpy.context.preferences.addons['blenderkit'].preferences
             patch_asset_empty(data['asset_data']['id'], preferences.api_key)
-        return
+            return files
+    return []
 
 
 def regenerate_thumbnail_material(data):
@@ -545,19 +554,22 @@ def check_needs_resolutions(a):
     return False
 
 
-def download_asset(asset_data, resolution='blend', unpack=False, api_key=''):
+def download_asset(asset_data, resolution='blend', unpack=False, api_key='', scene_id=None):
     '''
     Download an asset non-threaded way.
     Parameters
     ----------
     asset_data - search result from elastic or assets endpoints from API
+    scene_id - id of the scene, has to be given when called from a thread, since getting it can write to the scene
 
     Returns
     -------
     path to the resulting asset file or None if asset isn't accessible
     '''
 
-    has_url = download.get_download_url(asset_data, download.get_scene_id(), api_key, tcom=None,
+    if scene_id is None:
+        scene_id = download.get_scene_id()
+    has_url = download.get_download_url(asset_data, scene_id, api_key, tcom=None,
                                         resolution='blend')
     if has_url:
         fpath = download.download_asset_file(asset_data, api_key = api_key)
@@ -568,22 +580,30 @@ def download_asset(asset_data, resolution='blend', unpack=False, api_key=''):
     return None
 
 
-def generate_resolution_thread(asset_data, api_key):
+def generate_resolution_thread(asset_data, api_key, scene_id, worker=None):
     '''
     A thread that downloads file and only then starts an instance of Blender that generates the resolution
     Parameters
     ----------
     asset_data
+    scene_id - id of the scene, got in the main thread
+    worker - ResolutionWorker running the unpacking and generation, if None, new Blender instances are started.
 
     Returns
     -------
 
     '''
 
-    fpath = download_asset(asset_data, unpack=True, api_key=api_key)
+    fpath = download_asset(asset_data, unpack=worker is None, api_key=api_key, scene_id=scene_id)
 
     if fpath:
-        if asset_data['assetType'] != 'hdr':
+        if worker is not None:
+            if asset_data['assetType'] != 'hdr':
+                if worker.run(asset_data, fpath, command='unpack')['success']:
+                    worker.run(asset_data, fpath, command='generate_resolutions')
+            else:
+                worker.run(asset_data, fpath, command='generate_resolutions_hdr')
+        elif asset_data['assetType'] != 'hdr':
             print('send to bg ', fpath)
             proc = send_to_bg(asset_data, fpath, command='generate_resolutions', wait=True);
         else:
@@ -596,7 +616,9 @@ def iterate_for_resolutions(filepath, process_count=12, api_key='', do_checks =
     ''' iterate through all assigned assets, check for those which need generation and send them to res gen'''
     assets = load_assets_list(filepath)
     print(len(assets))
-    threads = []
+    # the workers run in threads, which must not write to the scene.
+    scene_id = download.get_scene_id()
+    pool = ResolutionWorkerPool(process_count)
     for asset_data in assets:
         asset_data = search.parse_result(asset_data)
         if asset_data is not None:
@@ -604,21 +626,155 @@ def iterate_for_resolutions(filepath, process_count=12, api_key='', do_checks =
             if not do_checks or check_needs_resolutions(asset_data):
                 print('downloading and generating resolution for  %s' % asset_data['name'])
                 # this is just a quick hack for not using original dirs in blendrkit...
-                generate_resolution_thread(asset_data, api_key)
-                # thread = threading.Thread(target=generate_resolution_thread, args=(asset_data, api_key))
-                # thread.start()
-                #
-                # threads.append(thread)
-                # print('processes ', len(threads))
-                # while len(threads) > process_count - 1:
-                #     for t in threads:
-                #         if not t.is_alive():
-                #             threads.remove(t)
-                #         break;
-                # else:
-                #     print(f'Failed to generate resolution:{asset_data["name"]}')
+                pool.submit(generate_resolution_thread, asset_data, api_key, scene_id)
             else:
                 print('not generated resolutions:', asset_data['name'])
+    pool.close()
+
+
+def format_job_stats(stats):
+    text = f"{stats['command']} {stats['asset']}: {stats['time']:.1f}s"
+    if stats.get('wait_time'):
+        text += f" (waited {stats['wait_time']:.1f}s)"
+    if stats.get('pixels'):
+        text += f", {stats['images']} images {stats['pixels'] / 1e6:.1f} Mpx, " \
+                f"{stats['pixels'] / 1e6 / max(stats['time'], 1e-6):.1f} Mpx/s"
+    text += f", {stats.get('input_size', 0) / 1e6:.1f}MB in, {stats.get('output_size', 0) / 1e6:.1f}MB out"
+    if not stats['success']:
+        text += ' - FAILED: ' + stats.get('error', '')
+    return text
+
+
+class ResolutionWorker():
+    '''
+    A background Blender instance running resolution jobs one after another,
+    which saves starting Blender for each asset.
+    Jobs are sent as json lines to its stdin, results are read from its stdout.
+    '''
+
+    def __init__(self, binary_path, debug_value=0):
+        self.binary_path = binary_path
+        self.debug_value = debug_value
+        self.proc = None
+        self.jobs_done = 0
+        self.stats = []
+        # time the next job waited in the queue of the pool
+        self.wait_time = 0
+
+    def start(self):
+        script_path = os.path.dirname(os.path.realpath(__file__))
+        self.proc = subprocess.Popen([
+            self.binary_path,
+            "--background",
+            "-noaudio",
+            "--python", os.path.join(script_path, "resolutions_bg.py"),
+            "--", "--worker"
+        ], bufsize=1, stdout=subprocess.PIPE, stdin=subprocess.PIPE, universal_newlines=True, encoding='utf-8',
+            creationflags=utils.get_process_flags())
+        self.jobs_done = 0
+
+    def stop(self):
+        if self.proc is None:
+            return
+        try:
+            # closing stdin ends the job loop of the worker
+            self.proc.stdin.close()
+            for line in self.proc.stdout:
+                print(line, end='')
+            self.proc.wait(timeout=60)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+        self.proc = None
+
+    def run(self, asset_data, fpath, command='generate_resolutions'):
+        '''Run a job and wait for it to finish, returns the stats of the job.'''
+        if self.proc is None or self.proc.poll() is not None:
+            self.start()
+        data = {
+            'fpath': fpath,
+            'debug_value': self.debug_value,
+            'asset_data': asset_data,
+            'command': command,
+        }
+        stats = None
+        try:
+            self.proc.stdin.write(json.dumps(data, ensure_ascii=False) + '\n')
+            self.proc.stdin.flush()
+            for line in self.proc.stdout:
+                if line.startswith(WORKER_RESULT_PREFIX):
+                    stats = json.loads(line[len(WORKER_RESULT_PREFIX):])
+                    break
+                print(line, end='')
+        except OSError as e:
+            print(e)
+        if stats is None:
+            # the worker crashed, a new one is started for the next job
+            try:
+                returncode = self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                returncode = None
+                self.proc.kill()
+            stats = {'command': command, 'asset': asset_data['name'], 'success': False, 'time': 0,
+                     'error': 'worker exited with %s' % returncode}
+            self.proc = None
+        stats['wait_time'] = self.wait_time
+        self.wait_time = 0
+        self.stats.append(stats)
+        print(format_job_stats(stats))
+
+        self.jobs_done += 1
+        if self.jobs_done >= WORKER_MAX_JOBS:
+            self.stop()
+        return stats
+
+
+class ResolutionWorkerPool():
+    '''
+    Runs the submitted tasks in worker_count threads, each one having its own ResolutionWorker.
+    A task is called with the worker as worker keyword argument.
+    '''
+
+    def __init__(self, worker_count=4):
+        self.tasks = queue.Queue()
+        self.workers = [ResolutionWorker(bpy.app.binary_path, bpy.app.debug_value) for i in range(worker_count)]
+        self.start_time = time.time()
+        self.threads = []
+        for worker in self.workers:
+            thread = threading.Thread(target=self._work, args=(worker,), daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, task, *args):
+        self.tasks.put((task, args, time.time()))
+
+    def _work(self, worker):
+        while True:
+            item = self.tasks.get()
+            if item is None:
+                worker.stop()
+                return
+            task, args, submit_time = item
+            # reported with the first job of the task
+            worker.wait_time = time.time() - submit_time
+            try:
+                task(*args, worker=worker)
+            except Exception as e:
+                traceback.print_exc()
+
+    def close(self):
+        '''Wait for all the tasks to finish, stop the workers and print the stats.'''
+        for thread in self.threads:
+            self.tasks.put(None)
+        for thread in self.threads:
+            thread.join()
+
+        stats = [s for worker in self.workers for s in worker.stats]
+        total_time = time.time() - self.start_time
+        failed = sum(1 for s in stats if not s['success'])
+        pixels = sum(s.get('pixels', 0) for s in stats)
+        print(f'{len(stats)} resolution jobs ({failed} failed) in {total_time:.1f}s, '
+              f'{len(stats) / max(total_time, 1e-6) * 3600:.0f} jobs/hour, {pixels / 1e6:.1f} Mpx processed')
+        return stats
 
 
 def send_to_bg(asset_data, fpath, command='generate_resolutions', wait=True):
@@ -679,19 +835,70 @@ def write_data_back(asset_data):
     pass;
 
 
-def run_bg(datafile):
-    print('background file operation')
-    with open(datafile, 'r',encoding='utf-8') as f:
-        data = json.load(f)
+def run_bg_command(data):
+    '''runs the command on the current file, returns the list of generated files if any.'''
     bpy.app.debug_value = data['debug_value']
     write_data_back(data['asset_data'])
     if data['command'] == 'generate_resolutions':
-        generate_lower_resolutions(data)
+        return generate_lower_resolutions(data)
+    elif data['command'] == 'generate_resolutions_hdr':
+        return generate_lower_resolutions_hdr(data['asset_data'], data['fpath'])
     elif data['command'] == 'unpack':
         unpack_asset(data)
     elif data['command'] == 'regen_thumbnail':
         regenerate_thumbnail_material(data)
 
+
+def run_bg(datafile):
+    print('background file operation')
+    with open(datafile, 'r',encoding='utf-8') as f:
+        data = json.load(f)
+    run_bg_command(data)
+
+
+def run_bg_worker():
+    '''
+    Job loop of a ResolutionWorker: runs the jobs read from stdin until it's closed,
+    and reports the stats of each job to stdout.
+    '''
+    print('background resolution worker started')
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        data = json.loads(line)
+        fpath = data['fpath']
+        t = time.time()
+        stats = {
+            'command': data['command'],
+            'asset': data['asset_data']['name'],
+            'success': False,
+            'input_size': os.path.getsize(fpath) if os.path.exists(fpath) else 0,
+        }
+        try:
+            if os.path.splitext(fpath)[1] == '.blend':
+                bpy.ops.wm.open_mainfile(filepath=fpath, load_ui=False)
+            else:
+                # hdr images are loaded by the command itself
+                for image in bpy.data.images[:]:
+                    if image.name != 'Render Result':
+                        bpy.data.images.remove(image)
+            stats['open_time'] = time.time() - t
+            images = [i for i in bpy.data.images if i.name != 'Render Result']
+            stats['images'] = len(images)
+            stats['pixels'] = sum(i.size[0] * i.size[1] for i in images)
+
+            files = run_bg_command(data) or []
+            stats['output_size'] = sum(os.path.getsize(f['file_path']) for f in files
+                                       if os.path.exists(f['file_path']))
+            stats['success'] = True
+        except Exception as e:
+            traceback.print_exc()
+            stats['error'] = str(e)
+        stats['time'] = time.time() - t
+        # on its own line, even if Blender didn't finish its last one
+        sys.stdout.write('\n' + WORKER_RESULT_PREFIX + json.dumps(stats) + '\n')
+        sys.stdout.flush()
+
 # load_assets_list()
 # generate_lower_resolutions()
 # class TestOperator(bpy.types.Operator):
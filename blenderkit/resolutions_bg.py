@@ -5,4 +5,7 @@ from blenderkit import resolutions
 BLENDERKIT_EXPORT_DATA = sys.argv[-1]
 
 if __name__ == "__main__":
-    resolutions.run_bg(sys.argv[-1])
+    if BLENDERKIT_EXPORT_DATA == '--worker':
+        resolutions.run_bg_worker()
+    else:
+        resolutions.run_bg(sys.argv[-1])
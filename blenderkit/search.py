@@ -17,7 +17,7 @@
 # ##### END GPL LICENSE BLOCK #####
 
 from blenderkit import paths, utils, categories, ui, colors, bkit_oauth, version_checker, tasks_queue, rerequests, \
-    resolutions, image_utils, ratings_utils
+    resolutions, image_utils, ratings_utils, search_cache
 
 import blenderkit
 from bpy.app.handlers import persistent
@@ -51,6 +51,7 @@ import unicodedata
 import urllib
 import queue
 import logging
+import itertools
 
 bk_logger = logging.getLogger('blenderkit')
 
@@ -76,10 +77,6 @@ def check_errors(rdata):
 
 
 search_threads = []
-thumb_workers_sml = []
-thumb_workers_full = []
-thumb_sml_download_threads = queue.Queue()
-thumb_full_download_threads = queue.Queue()
 reports_queue = queue.Queue()
 all_thumbs_loaded = True
 
@@ -664,43 +661,90 @@ def generate_author_textblock(adata):
     return t
 
 
-def download_image(session, url, filepath):
-    r = None
-    try:
-        r = session.get(url, stream=False)
-    except Exception as e:
-        bk_logger.error('Thumbnail download failed')
-        bk_logger.error(str(e))
-    if r and r.status_code == 200:
-        with open(filepath, 'wb') as f:
-            f.write(r.content)
-
-
-def thumb_download_worker(queue_sml, queue_full):
-    # print('thumb downloader', self.url)
-    # utils.p('start thumbdownloader thread')
-    while 1:
-        session = None
-        # start a session only for single search usually, if users starts scrolling, the session might last longer if
-        # queue gets filled.
-        if not queue_sml.empty() or not queue_full.empty():
-            if session is None:
-                session = requests.Session()
-            while not queue_sml.empty():
-                # first empty the small thumbs queue
-                url, filepath = queue_sml.get()
-                download_image(session, url, filepath)
-            exit_full = False
-            # download full resolution image, but only if no small thumbs are waiting. If there are small
-            while not queue_full.empty() and queue_sml.empty():
-                url, filepath = queue_full.get()
-                download_image(session, url, filepath)
-
-        if queue_sml.empty() and queue_full.empty():
-            if session is not None:
-                session.close()
-                session = None
-            time.sleep(.5)
+THUMBNAIL_WORKERS = 8
+THUMBNAIL_TIMEOUT = 20
+# thumbnail download priorities, lower ones are downloaded first.
+THUMBNAIL_VISIBLE = 0
+THUMBNAIL_SMALL = 1
+THUMBNAIL_FULL = 2
+
+
+class ThumbnailDownloader():
+    '''
+    Pool of threads downloading thumbnails, sharing a keep-alive session.
+    Thumbnails visible in the asset bar are downloaded first, and thumbnails of previous searches are dropped,
+    even while downloading, as soon as a new search starts.
+    '''
+
+    def __init__(self, workers=THUMBNAIL_WORKERS):
+        self.workers = workers
+        self.queue = queue.PriorityQueue()
+        # incremented by each new search, downloads queued by previous ones are stale.
+        self.generation = 0
+        self.threads = []
+        self.session = None
+        # keeps the queue order for same priorities, and avoids comparing the other fields.
+        self._counter = itertools.count()
+
+    def start(self):
+        if self.threads:
+            return
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        for a in range(self.workers):
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def new_search(self):
+        '''The results of previous searches get replaced, returns the generation of the new search.'''
+        self.generation += 1
+        return self.generation
+
+    def add(self, url, filepath, priority, generation, cache=None):
+        self.queue.put((priority, next(self._counter), generation, url, filepath, cache))
+
+    def _worker(self):
+        while True:
+            # blocks until there is something to download.
+            priority, count, generation, url, filepath, cache = self.queue.get()
+            try:
+                if generation == self.generation and not os.path.exists(filepath):
+                    self._download(url, filepath, generation, cache)
+            except Exception as e:
+                bk_logger.error('Thumbnail download failed')
+                bk_logger.error(str(e))
+            finally:
+                self.queue.task_done()
+
+    def _download(self, url, filepath, generation, cache):
+        chunks = []
+        with self.session.get(url, stream=True, timeout=THUMBNAIL_TIMEOUT) as r:
+            if r.status_code != 200:
+                return
+            for chunk in r.iter_content(chunk_size=65536):
+                if generation != self.generation:
+                    # a new search started.
+                    return
+                chunks.append(chunk)
+        content = b''.join(chunks)
+
+        if cache is not None:
+            try:
+                cache.put_thumbnail(url, content, filepath)
+                return
+            except Exception as e:
+                bk_logger.error('Thumbnail caching failed: ' + str(e))
+        # previews are loaded as soon as the file exists, so it must be complete.
+        tmp_path = filepath + '.tmp%d' % threading.get_ident()
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, filepath)
+
+
+thumb_downloader = ThumbnailDownloader()
 
 
 def write_gravatar(a_id, gravatar_path):
@@ -729,7 +773,7 @@ def fetch_gravatar(adata):
     if adata.get('avatar128') is not None:
         avatar_path = paths.get_temp_dir(subdir='bkit_g/') + adata['id'] + '.jpg'
         if os.path.exists(avatar_path):
-            tasks_queue.add_task((write_gravatar, (adata['id'], avatar_path)))
+            tasks_queue.add_task((write_gravatar, (adata['id'], avatar_path)), priority=tasks_queue.PRIORITY_LOW)
             return;
 
         url = paths.get_bkit_url() + adata['avatar128']
@@ -740,7 +784,7 @@ def fetch_gravatar(adata):
             # print(r.headers['content-disposition'])
             with open(avatar_path, 'wb') as f:
                 f.write(r.content)
-            tasks_queue.add_task((write_gravatar, (adata['id'], avatar_path)))
+            tasks_queue.add_task((write_gravatar, (adata['id'], avatar_path)), priority=tasks_queue.PRIORITY_LOW)
         elif r.status_code == '404':
             adata['avatar128'] = None
             utils.p('avatar for author not available.')
@@ -751,7 +795,7 @@ def fetch_gravatar(adata):
         gravatar_path = paths.get_temp_dir(subdir='bkit_g/') + adata['gravatarHash'] + '.jpg'
 
         if os.path.exists(gravatar_path):
-            tasks_queue.add_task((write_gravatar, (adata['id'], gravatar_path)))
+            tasks_queue.add_task((write_gravatar, (adata['id'], gravatar_path)), priority=tasks_queue.PRIORITY_LOW)
             return;
 
         url = "https://www.gravatar.com/avatar/" + adata['gravatarHash'] + '?d=404'
@@ -759,7 +803,7 @@ def fetch_gravatar(adata):
         if r.status_code == 200:
             with open(gravatar_path, 'wb') as f:
                 f.write(r.content)
-            tasks_queue.add_task((write_gravatar, (adata['id'], gravatar_path)))
+            tasks_queue.add_task((write_gravatar, (adata['id'], gravatar_path)), priority=tasks_queue.PRIORITY_LOW)
         elif r.status_code == '404':
             adata['gravatarHash'] = None
             utils.p('gravatar for author not available.')
@@ -899,7 +943,7 @@ def parse_html_formated_error(text):
 class Searcher(threading.Thread):
     query = None
 
-    def __init__(self, query, params, tempdir='', headers=None, urlquery=''):
+    def __init__(self, query, params, tempdir='', headers=None, urlquery='', cache=None):
         super(Searcher, self).__init__()
         self.query = query
         self.params = params
@@ -908,6 +952,8 @@ class Searcher(threading.Thread):
         self.tempdir = tempdir
         self.headers = headers
         self.urlquery = urlquery
+        # search_cache.SearchCache, or None to always ask the server.
+        self.cache = cache
 
     def stop(self):
         self._stop_event.set()
@@ -916,7 +962,7 @@ class Searcher(threading.Thread):
         return self._stop_event.is_set()
 
     def run(self):
-        global reports_queue, thumb_sml_download_threads, thumb_full_download_threads
+        global reports_queue
 
         maxthreads = 50
         query = self.query
@@ -932,28 +978,52 @@ class Searcher(threading.Thread):
         rdata = {}
         rdata['results'] = []
 
-        try:
-            utils.p(self.urlquery)
-            r = rerequests.get(self.urlquery, headers=self.headers)  # , params = rparameters)
-        except requests.exceptions.RequestException as e:
-            bk_logger.error(e)
-            reports_queue.put(str(e))
-            # utils.p('end search thread')
+        cache = self.cache
+        cached = None
+        if cache is not None:
+            cache_key = cache.results_key(self.urlquery, self.headers)
+            cached = cache.get_results(cache_key)
 
-            return
-
-        mt('search response is back ')
-        try:
-            rdata = r.json()
-        except Exception as e:
-            if hasattr(r, 'text'):
-                error_description = parse_html_formated_error(r.text)
-                reports_queue.put(error_description)
-                tasks_queue.add_task((ui.add_report, (error_description, 10, colors.RED)))
-
-            bk_logger.error(e)
-            return
-        mt('data parsed ')
+        if cached is not None and cached[2]:
+            # recent enough to not even ask the server.
+            rdata = cached[0]
+            mt('search results from cache ')
+        else:
+            headers = dict(self.headers or {})
+            if cached is not None and cached[1]:
+                headers['If-None-Match'] = cached[1]
+            try:
+                utils.p(self.urlquery)
+                r = rerequests.get(self.urlquery, headers=headers)  # , params = rparameters)
+            except requests.exceptions.RequestException as e:
+                if cached is None:
+                    bk_logger.error(e)
+                    reports_queue.put(str(e))
+                    # utils.p('end search thread')
+
+                    return
+                r = rerequests.FakeResponse()
+
+            mt('search response is back ')
+            if cached is not None and (r.status_code == 304 or isinstance(r, rerequests.FakeResponse)):
+                # not modified, or offline: use the cached results.
+                if r.status_code == 304:
+                    cache.validate_results(cache_key)
+                rdata = cached[0]
+            else:
+                try:
+                    rdata = r.json()
+                except Exception as e:
+                    if hasattr(r, 'text'):
+                        error_description = parse_html_formated_error(r.text)
+                        reports_queue.put(error_description)
+                        tasks_queue.add_task((ui.add_report, (error_description, 10, colors.RED)))
+
+                    bk_logger.error(e)
+                    return
+                if cache is not None and r.status_code == 200 and rdata.get('results'):
+                    cache.put_results(cache_key, rdata, r.headers.get('ETag'))
+            mt('data parsed ')
         if not rdata.get('results'):
             utils.pprint(rdata)
             # if the result was converted to json and didn't return results,
@@ -1027,10 +1097,14 @@ class Searcher(threading.Thread):
             # utils.p('end search thread')
             return
 
-        # this loop handles downloading of small thumbnails
-        for imgpath, url in sml_thbs:
-            if not os.path.exists(imgpath):
-                thumb_sml_download_threads.put((url, imgpath))
+        # this loop handles downloading of small thumbnails, the ones visible in the asset bar first.
+        # pages of a next search are loaded when the user scrolls to them.
+        generation = params['thumbnail_generation']
+        visible_count = len(rdata['results']) if params.get('get_next') else params['visible_count']
+        for i, (imgpath, url) in enumerate(sml_thbs):
+            if not os.path.exists(imgpath) and (cache is None or not cache.get_thumbnail(url, imgpath)):
+                priority = THUMBNAIL_VISIBLE if i < visible_count else THUMBNAIL_SMALL
+                thumb_downloader.add(url, imgpath, priority, generation, cache)
 
         if self.stopped():
             utils.p('stopping search : ' + str(query))
@@ -1044,11 +1118,9 @@ class Searcher(threading.Thread):
             return
 
         # start downloading full thumbs in the end
-        tsession = requests.Session()
-
         for imgpath, url in full_thbs:
-            if not os.path.exists(imgpath):
-                thumb_full_download_threads.put((url, imgpath))
+            if not os.path.exists(imgpath) and (cache is None or not cache.get_thumbnail(url, imgpath)):
+                thumb_downloader.add(url, imgpath, THUMBNAIL_FULL, generation, cache)
         # utils.p('end search thread')
         mt('thumbnails finished')
 
@@ -1228,7 +1300,7 @@ def mt(text):
 
 
 def add_search_process(query, params):
-    global search_threads, thumb_workers_sml, thumb_workers_full, all_thumbs_loaded
+    global search_threads, all_thumbs_loaded
 
     while (len(search_threads) > 0):
         old_thread = search_threads.pop(0)
@@ -1243,17 +1315,25 @@ def add_search_process(query, params):
     else:
         urlquery = query_to_url(query, params)
 
-    if thumb_workers_sml == []:
-        for a in range(0, 8):
-            thread = threading.Thread(target=thumb_download_worker,
-                                      args=(thumb_sml_download_threads, thumb_full_download_threads),
-                                      daemon=True)
-            thread.start()
-            thumb_workers_sml.append(thread)
+    thumb_downloader.start()
+    if params.get('get_next'):
+        params['thumbnail_generation'] = thumb_downloader.generation
+    else:
+        # previous results get replaced, their thumbnails aren't needed anymore.
+        params['thumbnail_generation'] = thumb_downloader.new_search()
 
     all_thumbs_loaded = False
 
-    thread = Searcher(query, params, tempdir=tempdir, headers=headers, urlquery=urlquery)
+    user_preferences = bpy.context.preferences.addons['blenderkit'].preferences
+    try:
+        cache = search_cache.get_cache(paths.get_cache_dir(), user_preferences.search_cache_ttl * 60,
+                                       user_preferences.thumbnail_cache_size * 1024 * 1024)
+    except Exception as e:
+        # searching still works, just without cache.
+        bk_logger.error('Search cache unavailable: ' + str(e))
+        cache = None
+
+    thread = Searcher(query, params, tempdir=tempdir, headers=headers, urlquery=urlquery, cache=cache)
     thread.start()
 
     search_threads.append([thread, tempdir, query['asset_type'], {}])  # 4th field is for results
@@ -1410,13 +1490,14 @@ def search(category='', get_next=False, author_id=''):
         'get_next': get_next,
         'free_first': props.free_only,
         'page_size': page_size,
+        'visible_count': ui_props.wcount * user_preferences.max_assetbar_rows,
     }
 
     orig_results = bpy.context.window_manager.get(f'bkit {ui_props.asset_type.lower()} search orig')
     if orig_results is not None and get_next:
         params['next'] = orig_results['next']
     add_search_process(query, params)
-    tasks_queue.add_task((ui.add_report, ('BlenderKit searching....', 2)))
+    tasks_queue.add_task((ui.add_report, ('BlenderKit searching....', 2)), priority=tasks_queue.PRIORITY_HIGH)
 
     props.report = 'BlenderKit searching....'
 
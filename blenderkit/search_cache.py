@@ -0,0 +1,213 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+'''
+Persistent cache of search result pages and thumbnails, so that repeated searches and scrolling
+don't need the server (and still work offline).
+
+Result pages are stored by query url in an SQLite database, reused as is during their time to live,
+then revalidated with their ETag. Thumbnails are stored by content hash, the least recently used ones
+being removed when the store gets over its size limit.
+
+This module doesn't use bpy, it's used from the search and thumbnail download threads.
+'''
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+bk_logger = logging.getLogger('blenderkit')
+
+DATABASE_NAME = 'search_cache.sqlite'
+THUMBNAILS_DIR = 'thumbnails'
+# result pages not used for this long are removed when opening the cache.
+RESULTS_MAX_AGE = 30 * 24 * 3600
+# url parameters that don't change the results.
+IGNORED_URL_PARAMETERS = {'scene_uuid'}
+
+
+class SearchCache():
+    def __init__(self, directory, ttl=600, thumbnails_max_size=500 * 1024 * 1024):
+        '''
+        Parameters
+        ----------
+        directory - where the database and thumbnails are stored
+        ttl - seconds during which result pages are used without asking the server
+        thumbnails_max_size - size of the thumbnail store in bytes
+        '''
+        self.directory = directory
+        self.ttl = ttl
+        self.thumbnails_max_size = thumbnails_max_size
+        self.thumbnails_dir = os.path.join(directory, THUMBNAILS_DIR)
+        os.makedirs(self.thumbnails_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(os.path.join(directory, DATABASE_NAME), check_same_thread=False,
+                                           timeout=10)
+        with self._lock, self._connection as c:
+            c.execute('PRAGMA journal_mode=WAL')
+            c.execute('CREATE TABLE IF NOT EXISTS results '
+                      '(key TEXT PRIMARY KEY, etag TEXT, validated REAL, used REAL, data TEXT)')
+            c.execute('CREATE TABLE IF NOT EXISTS thumbnails '
+                      '(url TEXT PRIMARY KEY, digest TEXT, size INTEGER, used REAL)')
+            c.execute('CREATE INDEX IF NOT EXISTS thumbnails_digest ON thumbnails (digest)')
+            c.execute('DELETE FROM results WHERE used < ?', (time.time() - RESULTS_MAX_AGE,))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _execute(self, sql, parameters=()):
+        with self._lock, self._connection as c:
+            return c.execute(sql, parameters).fetchall()
+
+    # Result pages
+    # ---------------------------
+
+    @staticmethod
+    def results_key(url, headers=None):
+        '''
+        Key of a result page: the query url, without the parameters not affecting the results,
+        and the user (results depend on the user rights).
+        '''
+        parsed = urllib.parse.urlsplit(url)
+        query = [(k, v) for k, v in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+                 if k not in IGNORED_URL_PARAMETERS]
+        url = urllib.parse.urlunsplit(parsed._replace(query=urllib.parse.urlencode(query)))
+        authorization = (headers or {}).get('Authorization', '')
+        return url + '#' + hashlib.sha256(authorization.encode()).hexdigest()
+
+    def get_results(self, key):
+        '''
+        Returns (rdata, etag, fresh) of a cached result page, fresh meaning it can be used without
+        revalidation. None if the page isn't cached.
+        '''
+        rows = self._execute('SELECT etag, validated, data FROM results WHERE key = ?', (key,))
+        if not rows:
+            return None
+        etag, validated, data = rows[0]
+        self._execute('UPDATE results SET used = ? WHERE key = ?', (time.time(), key))
+        return json.loads(data), etag, time.time() - validated < self.ttl
+
+    def put_results(self, key, rdata, etag=None):
+        now = time.time()
+        self._execute('INSERT OR REPLACE INTO results (key, etag, validated, used, data) VALUES (?, ?, ?, ?, ?)',
+                      (key, etag, now, now, json.dumps(rdata)))
+
+    def validate_results(self, key):
+        '''The server confirmed the cached page is still valid.'''
+        self._execute('UPDATE results SET validated = ? WHERE key = ?', (time.time(), key))
+
+    # Thumbnails
+    # ---------------------------
+
+    def _thumbnail_path(self, digest):
+        return os.path.join(self.thumbnails_dir, digest[:2], digest)
+
+    @staticmethod
+    def _place(src, filepath):
+        '''Make the stored thumbnail available at filepath.'''
+        tmp_path = filepath + '.tmp%d' % threading.get_ident()
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, filepath)
+
+    def get_thumbnail(self, url, filepath):
+        '''
+        Copy the thumbnail of the url to filepath if it's in the store, returns True on success.
+        '''
+        rows = self._execute('SELECT digest FROM thumbnails WHERE url = ?', (url,))
+        if not rows:
+            return False
+        src = self._thumbnail_path(rows[0][0])
+        try:
+            self._place(src, filepath)
+        except OSError:
+            # removed behind our back.
+            self._execute('DELETE FROM thumbnails WHERE url = ?', (url,))
+            return False
+        self._execute('UPDATE thumbnails SET used = ? WHERE url = ?', (time.time(), url))
+        return True
+
+    def put_thumbnail(self, url, content, filepath=None):
+        '''
+        Store the downloaded thumbnail of the url, and write it to filepath.
+        '''
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._thumbnail_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + '.tmp%d' % threading.get_ident()
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        self._execute('INSERT OR REPLACE INTO thumbnails (url, digest, size, used) VALUES (?, ?, ?, ?)',
+                      (url, digest, len(content), time.time()))
+        if filepath is not None:
+            self._place(path, filepath)
+        self.evict_thumbnails()
+
+    def thumbnails_size(self):
+        rows = self._execute('SELECT SUM(size) FROM (SELECT MAX(size) AS size FROM thumbnails GROUP BY digest)')
+        return rows[0][0] or 0
+
+    def evict_thumbnails(self):
+        '''Remove the least recently used thumbnails until the store fits in its size.'''
+        total_size = self.thumbnails_size()
+        if total_size <= self.thumbnails_max_size:
+            return
+        rows = self._execute('SELECT digest, MAX(size) FROM thumbnails GROUP BY digest ORDER BY MAX(used)')
+        for digest, size in rows:
+            if total_size <= self.thumbnails_max_size:
+                break
+            self._execute('DELETE FROM thumbnails WHERE digest = ?', (digest,))
+            try:
+                os.remove(self._thumbnail_path(digest))
+            except OSError:
+                pass
+            total_size -= size
+        bk_logger.debug('thumbnail cache evicted down to %d bytes' % total_size)
+
+    def clear(self):
+        self._execute('DELETE FROM results')
+        self._execute('DELETE FROM thumbnails')
+        shutil.rmtree(self.thumbnails_dir, ignore_errors=True)
+        os.makedirs(self.thumbnails_dir, exist_ok=True)
+
+
+_cache = None
+
+
+def get_cache(directory, ttl, thumbnails_max_size):
+    '''The cache of the directory, with updated settings.'''
+    global _cache
+    if _cache is None or _cache.directory != directory:
+        if _cache is not None:
+            _cache.close()
+        _cache = SearchCache(directory)
+    _cache.ttl = ttl
+    _cache.thumbnails_max_size = thumbnails_max_size
+    return _cache
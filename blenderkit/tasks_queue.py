@@ -22,10 +22,28 @@ from blenderkit import utils
 import bpy
 from bpy.app.handlers import persistent
 
-import queue
+import heapq
+import itertools
+import threading
+import time
+import collections
 import logging
 bk_logger = logging.getLogger('blenderkit')
 
+# priorities, lower ones run first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# timer intervals of the queue worker (seconds)
+BUSY_INTERVAL = 0.02
+IDLE_INTERVAL = 0.25
+# a tick stops running tasks after this time (seconds), the rest runs next tick, so that the UI stays responsive
+TICK_BUDGET = 0.05
+# task latencies kept for the stats
+LATENCY_HISTORY = 200
+
+
 @persistent
 def scene_load(context):
     user_preferences = bpy.context.preferences.addons['blenderkit'].preferences
@@ -34,26 +52,149 @@ def scene_load(context):
             bpy.app.timers.register(queue_worker)
 
 
+class TaskQueue:
+    '''
+    Tasks waiting to run in the main thread, added from any thread.
+    Delayed tasks wait in a heap ordered by the time they're due, due tasks in a heap ordered by
+    priority, deadline and order of addition. A task with a coalescing key replaces the queued task with the same key.
+    '''
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.waiting = []
+        self.ready = []
+        self.coalesced = {}
+        self.counter = itertools.count()
+        self.stats = {
+            'added': 0,
+            'executed': 0,
+            'coalesced': 0,
+            'failed': 0,
+            'late': 0,
+            'max_depth': 0,
+            'slowest_task': '',
+            'slowest_task_time': 0.0,
+        }
+        self.latencies = collections.deque(maxlen=LATENCY_HISTORY)
+
+    def __len__(self):
+        return len(self.waiting) + len(self.ready)
+
+    def put(self, task):
+        with self.lock:
+            task.order = next(self.counter)
+            if task.coalesce_key is not None:
+                previous = self.coalesced.get(task.coalesce_key)
+                if previous is not None:
+                    # removed lazily, when it gets out of the heap
+                    previous.cancelled = True
+                    self.stats['coalesced'] += 1
+                self.coalesced[task.coalesce_key] = task
+            heapq.heappush(self.waiting, (task.due, task.order, task))
+            self.stats['added'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], len(self))
+
+    def pop_due(self, now):
+        '''The next task to run, or None if no task is due.'''
+        with self.lock:
+            while self.waiting and self.waiting[0][0] <= now:
+                due, order, task = heapq.heappop(self.waiting)
+                if not task.cancelled:
+                    heapq.heappush(self.ready, (task.priority, task.deadline_time, order, task))
+            while self.ready:
+                task = heapq.heappop(self.ready)[3]
+                if task.cancelled:
+                    continue
+                if task.coalesce_key is not None and self.coalesced.get(task.coalesce_key) is task:
+                    del self.coalesced[task.coalesce_key]
+                return task
+            return None
+
+    def next_interval(self, now):
+        '''Time until the queue has something to do.'''
+        with self.lock:
+            if self.ready:
+                return BUSY_INTERVAL
+            if self.waiting:
+                return min(max(self.waiting[0][0] - now, BUSY_INTERVAL), IDLE_INTERVAL)
+            return IDLE_INTERVAL
+
+    def record(self, task, started, finished, failed):
+        with self.lock:
+            self.stats['executed'] += 1
+            if failed:
+                self.stats['failed'] += 1
+            if task.deadline_time < started:
+                self.stats['late'] += 1
+            self.latencies.append(started - task.due)
+            if finished - started > self.stats['slowest_task_time']:
+                self.stats['slowest_task_time'] = finished - started
+                self.stats['slowest_task'] = getattr(task.command, '__name__', str(task.command))
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['depth'] = len(self.waiting) + len(self.ready)
+            stats['ready'] = len(self.ready)
+            latencies = list(self.latencies)
+        stats['mean_latency'] = sum(latencies) / len(latencies) if latencies else 0.0
+        stats['max_latency'] = max(latencies) if latencies else 0.0
+        return stats
+
+
 def get_queue():
     # we pick just a random one of blender types, to try to get a persistent queue
     t = bpy.types.Scene
 
-    if not hasattr(t, 'task_queue'):
-        t.task_queue = queue.Queue()
-    return t.task_queue
+    if not hasattr(t, 'blenderkit_task_queue'):
+        t.blenderkit_task_queue = TaskQueue()
+    return t.blenderkit_task_queue
+
+
+def get_stats():
+    return get_queue().get_stats()
+
 
 class task_object:
-    def __init__(self, command = '', arguments = (), wait = 0, only_last = False, fake_context = False, fake_context_area = 'VIEW_3D'):
+    def __init__(self, command = '', arguments = (), wait = 0, only_last = False, fake_context = False, fake_context_area = 'VIEW_3D',
+                 priority = PRIORITY_NORMAL, deadline = None, coalesce_key = None):
         self.command = command
         self.arguments = arguments
         self.wait = wait
         self.only_last = only_last
         self.fake_context = fake_context
         self.fake_context_area = fake_context_area
-
-def add_task(task, wait = 0, only_last = False, fake_context = False, fake_context_area = 'VIEW_3D'):
+        self.priority = priority
+        self.due = time.monotonic() + wait
+        # tasks that should have run by their deadline go first among tasks of the same priority,
+        # and count as late if they run after it.
+        self.deadline_time = self.due + deadline if deadline is not None else float('inf')
+        if coalesce_key is None and only_last:
+            # by now stashing is only used for ratings, where the first argument is url.
+            # This enables fast rating of multiple assets while allowing larger delay for uploading of ratings.
+            # this avoids a duplicate request error on the server
+            coalesce_key = str(command) + str(arguments[0])
+        self.coalesce_key = coalesce_key
+        self.cancelled = False
+        self.order = 0
+
+
+def add_task(task, wait = 0, only_last = False, fake_context = False, fake_context_area = 'VIEW_3D',
+             priority = PRIORITY_NORMAL, deadline = None, coalesce_key = None):
+    '''
+    Queue a task to run in the main thread.
+    Parameters
+    ----------
+    task - (function, arguments)
+    wait - delay in seconds before the task runs
+    only_last - only the last task added with the same function and first argument runs
+    priority - PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW
+    deadline - seconds after the task is due by which it should have run
+    coalesce_key - only the last task added with the same key runs
+    '''
     q = get_queue()
-    taskob = task_object(task[0],task[1], wait = wait, only_last = only_last, fake_context = fake_context, fake_context_area = fake_context_area)
+    taskob = task_object(task[0],task[1], wait = wait, only_last = only_last, fake_context = fake_context, fake_context_area = fake_context_area,
+                         priority = priority, deadline = deadline, coalesce_key = coalesce_key)
     q.put(taskob)
 
 
@@ -61,60 +202,31 @@ def queue_worker():
     # utils.p('start queue worker timer')
 
     #bk_logger.debug('timer queue worker')
-    time_step = 2.0
     q = get_queue()
-
-    back_to_queue = [] #delayed events
-    stashed = {}
-    # first round we get all tasks that are supposed to be stashed and run only once (only_last option)
-    # stashing finds tasks with the property only_last and same command and executes only the last one.
-    while not q.empty():
-        # print('queue while 1')
-
-        task = q.get()
-        if task.only_last:
-            #this now makes the keys not only by task, but also first argument.
-            # by now stashing is only used for ratings, where the first argument is url.
-            # This enables fast rating of multiple assets while allowing larger delay for uploading of ratings.
-            # this avoids a duplicate request error on the server
-            stashed[str(task.command)+str(task.arguments[0])] = task
-        else:
-            back_to_queue.append(task)
-    if len(stashed.keys())>1:
-        bk_logger.debug('task queue stashed task:' +str(stashed))
-    #return tasks to que except for stashed
-    for task in back_to_queue:
-        q.put(task)
-    #return stashed tasks to queue
-    for k in stashed.keys():
-        q.put(stashed[k])
-    #second round, execute or put back waiting tasks.
-    back_to_queue = []
-    while not q.empty():
-        # print('window manager', bpy.context.window_manager)
-        task = q.get()
-
-        if task.wait>0:
-            task.wait-=time_step
-            back_to_queue.append(task)
-        else:
-            bk_logger.debug('task queue task:'+ str( task.command) +str( task.arguments))
-            try:
-                if task.fake_context:
-                    fc = utils.get_fake_context(bpy.context, area_type = task.fake_context_area)
-                    task.command(fc,*task.arguments)
-                else:
-                    task.command(*task.arguments)
-            except Exception as e:
-                bk_logger.error('task queue failed task:'+ str(task.command)+str(task.arguments)+ str(e))
-                # bk_logger.exception('Got exception on main handler')
-                # raise
-        # print('queue while 2')
-    for task in back_to_queue:
-        q.put(task)
+    tick_start = time.monotonic()
+    while time.monotonic() - tick_start < TICK_BUDGET:
+        task = q.pop_due(time.monotonic())
+        if task is None:
+            break
+        bk_logger.debug('task queue task:'+ str( task.command) +str( task.arguments))
+        started = time.monotonic()
+        failed = False
+        try:
+            if task.fake_context:
+                fc = utils.get_fake_context(bpy.context, area_type = task.fake_context_area)
+                task.command(fc,*task.arguments)
+            else:
+                task.command(*task.arguments)
+        except Exception as e:
+            failed = True
+            bk_logger.error('task queue failed task:'+ str(task.command)+str(task.arguments)+ str(e))
+            # bk_logger.exception('Got exception on main handler')
+            # raise
+        q.record(task, started, time.monotonic(), failed)
     # utils.p('end queue worker timer')
 
-    return 2.0
+    # fast while there are tasks, slow when there's nothing to do
+    return q.next_interval(time.monotonic())
 
 
 def register():
@@ -50,7 +50,9 @@ class upload_in_chunks(object):
                     break
                 self.readsofar += len(data)
                 percent = self.readsofar * 1e2 / self.totalsize
-                tasks_queue.add_task((ui.add_report, (f"Uploading {self.report_name} {percent}%",)))
+                # only the latest progress of the file is worth reporting
+                tasks_queue.add_task((ui.add_report, (f"Uploading {self.report_name} {percent}%",)),
+                                     coalesce_key=('upload progress', self.report_name))
 
                 # bg_blender.progress('uploading %s' % self.report_name, percent)
                 # sys.stderr.write("\r{percent:3.0f}%".format(percent=percent))
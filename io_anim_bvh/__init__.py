@@ -33,6 +33,8 @@ bl_info = {
 
 if "bpy" in locals():
     import importlib
+    if "bvh_rotation" in locals():
+        importlib.reload(bvh_rotation)
     if "import_bvh" in locals():
         importlib.reload(import_bvh)
     if "export_bvh" in locals():
@@ -0,0 +1,177 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+Rotation conversions of whole animations at once, as NumPy arrays of
+eulers (N, 3), matrices (N, 3, 3) and quaternions (N, 4).
+
+Same conventions as mathutils: an euler with order 'XYZ' rotates around X,
+then Y, then Z. Matrix to euler/quaternion conversions follow Blender's
+math library, which works on transposed (column major) matrices.
+"""
+
+import numpy as np
+
+
+# (i, j, k) axes and parity of each euler order, see Blender's RotOrderInfo.
+_euler_orders = {
+    'XYZ': ((0, 1, 2), False),
+    'XZY': ((0, 2, 1), True),
+    'YXZ': ((1, 0, 2), True),
+    'YZX': ((1, 2, 0), False),
+    'ZXY': ((2, 0, 1), False),
+    'ZYX': ((2, 1, 0), True),
+}
+
+
+def _axis_rotation(axis, angles):
+    cos = np.cos(angles)
+    sin = np.sin(angles)
+    i = (axis + 1) % 3
+    j = (axis + 2) % 3
+    mats = np.zeros((len(angles), 3, 3))
+    mats[:, axis, axis] = 1.0
+    mats[:, i, i] = cos
+    mats[:, i, j] = -sin
+    mats[:, j, i] = sin
+    mats[:, j, j] = cos
+    return mats
+
+
+def euler_to_matrix(eulers, order):
+    """
+    Rotation matrices of eulers (angles in radians, always in x, y, z order)
+    applied in the given order.
+    """
+    mats = None
+    for axis_name in order:
+        axis = "XYZ".index(axis_name)
+        rot = _axis_rotation(axis, eulers[:, axis])
+        mats = rot if mats is None else rot @ mats
+    return mats
+
+
+def _matrix_to_euler2(mats, order):
+    """
+    The two euler solutions of each normalized rotation matrix.
+    """
+    (i, j, k), parity = _euler_orders[order]
+    mat = mats.transpose(0, 2, 1)
+    cy = np.hypot(mat[:, i, i], mat[:, i, j])
+    gimbal = cy <= 16.0 * np.finfo(np.float32).eps
+
+    eul1 = np.empty((len(mats), 3))
+    eul2 = np.empty((len(mats), 3))
+    eul1[:, i] = np.where(gimbal,
+                          np.arctan2(-mat[:, k, j], mat[:, j, j]),
+                          np.arctan2(mat[:, j, k], mat[:, k, k]))
+    eul1[:, j] = np.arctan2(-mat[:, i, k], cy)
+    eul1[:, k] = np.where(gimbal, 0.0, np.arctan2(mat[:, i, j], mat[:, i, i]))
+    eul2[:, i] = np.where(gimbal, eul1[:, i], np.arctan2(-mat[:, j, k], -mat[:, k, k]))
+    eul2[:, j] = np.where(gimbal, eul1[:, j], np.arctan2(-mat[:, i, k], -cy))
+    eul2[:, k] = np.where(gimbal, eul1[:, k], np.arctan2(-mat[:, i, j], -mat[:, i, i]))
+
+    if parity:
+        eul1 = -eul1
+        eul2 = -eul2
+    return eul1, eul2
+
+
+def _wrap_angle(angles):
+    return (angles + np.pi) % (2.0 * np.pi) - np.pi
+
+
+def matrix_to_compatible_euler(mats, order, prev_euler=(0.0, 0.0, 0.0)):
+    """
+    Eulers of the rotation matrices (scale is ignored), each one compatible
+    with the previous one (no jump on interpolation), the first one with
+    prev_euler. Same as calling Matrix.to_euler(order, prev) frame by frame,
+    but for the way it picks the closest solution.
+    """
+    mats = mats / np.linalg.norm(mats, axis=1, keepdims=True)
+    eul1, eul2 = _matrix_to_euler2(mats, order)
+    if not len(mats):
+        return eul1
+
+    def distance(eul_a, eul_b):
+        return np.sum(np.abs(_wrap_angle(eul_a - eul_b)), axis=1)
+
+    # Both solutions are as far from the same solution of the previous
+    # frame, so following the closest one from frame to frame is only a
+    # matter of switching solutions or not.
+    prev_euler = np.array(prev_euler, dtype=np.float64).reshape(1, 3)
+    switch = np.empty(len(mats), dtype=bool)
+    switch[0] = distance(eul2[:1], prev_euler)[0] < distance(eul1[:1], prev_euler)[0]
+    switch[1:] = distance(eul2[1:], eul1[:-1]) < distance(eul1[1:], eul1[:-1])
+    use_eul2 = (np.cumsum(switch) % 2).astype(bool)
+    eulers = np.where(use_eul2[:, None], eul2, eul1)
+
+    # Remove the 360 degrees jumps.
+    return np.unwrap(np.concatenate((prev_euler, eulers)), axis=0)[1:]
+
+
+def matrix_to_quaternion(mats):
+    """
+    Quaternions (w, x, y, z) of the rotation matrices (scale is ignored).
+    """
+    mats = mats / np.linalg.norm(mats, axis=1, keepdims=True)
+    mat = mats.transpose(0, 2, 1)
+    m00 = mat[:, 0, 0]
+    m11 = mat[:, 1, 1]
+    m22 = mat[:, 2, 2]
+    quats = np.empty((len(mats), 4))
+
+    tr = 0.25 * (1.0 + m00 + m11 + m22)
+    use_w = tr > np.finfo(np.float32).eps
+    use_x = ~use_w & (m00 > m11) & (m00 > m22)
+    use_y = ~use_w & ~use_x & (m11 > m22)
+    use_z = ~use_w & ~use_x & ~use_y
+
+    # Each case avoids dividing by a small component.
+    m = mat[use_w]
+    s = np.sqrt(tr[use_w])
+    quats[use_w, 0] = s
+    s = 1.0 / (4.0 * s)
+    quats[use_w, 1] = (m[:, 1, 2] - m[:, 2, 1]) * s
+    quats[use_w, 2] = (m[:, 2, 0] - m[:, 0, 2]) * s
+    quats[use_w, 3] = (m[:, 0, 1] - m[:, 1, 0]) * s
+
+    m = mat[use_x]
+    s = 2.0 * np.sqrt(1.0 + m[:, 0, 0] - m[:, 1, 1] - m[:, 2, 2])
+    quats[use_x, 1] = 0.25 * s
+    quats[use_x, 0] = (m[:, 1, 2] - m[:, 2, 1]) / s
+    quats[use_x, 2] = (m[:, 1, 0] + m[:, 0, 1]) / s
+    quats[use_x, 3] = (m[:, 2, 0] + m[:, 0, 2]) / s
+
+    m = mat[use_y]
+    s = 2.0 * np.sqrt(1.0 + m[:, 1, 1] - m[:, 0, 0] - m[:, 2, 2])
+    quats[use_y, 2] = 0.25 * s
+    quats[use_y, 0] = (m[:, 2, 0] - m[:, 0, 2]) / s
+    quats[use_y, 1] = (m[:, 1, 0] + m[:, 0, 1]) / s
+    quats[use_y, 3] = (m[:, 2, 1] + m[:, 1, 2]) / s
+
+    m = mat[use_z]
+    s = 2.0 * np.sqrt(1.0 + m[:, 2, 2] - m[:, 0, 0] - m[:, 1, 1])
+    quats[use_z, 3] = 0.25 * s
+    quats[use_z, 0] = (m[:, 0, 1] - m[:, 1, 0]) / s
+    quats[use_z, 1] = (m[:, 2, 0] + m[:, 0, 2]) / s
+    quats[use_z, 2] = (m[:, 2, 1] + m[:, 1, 2]) / s
+
+    return quats / np.linalg.norm(quats, axis=1, keepdims=True)
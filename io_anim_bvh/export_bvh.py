@@ -24,6 +24,10 @@
 import bpy
 
 
+# Amount of frames formatted at once.
+MOTION_BLOCK_SIZE = 4096
+
+
 def write_armature(
         context,
         filepath,
@@ -39,8 +43,8 @@ def write_armature(
             rot_order_str = "XYZ"
         return rot_order_str
 
-    from mathutils import Matrix, Euler
-    from math import degrees
+    import numpy as np
+    from .bvh_rotation import matrix_to_compatible_euler
 
     file = open(filepath, "w", encoding="utf8", newline="\n")
 
@@ -157,20 +161,18 @@ def write_armature(
             "rest_bone",
             # Blender pose bone.
             "pose_bone",
-            # Blender pose matrix.
+            # Blender pose matrices, one for each exported frame, set in a later loop.
             "pose_mat",
             # Blender rest matrix (armature space).
             "rest_arm_mat",
             # Blender rest matrix (local space).
             "rest_local_mat",
-            # Pose_mat inverted.
+            # Pose_mat inverted (only needed for parents).
             "pose_imat",
             # Rest_arm_mat inverted.
             "rest_arm_imat",
             # Rest_local_mat inverted.
             "rest_local_imat",
-            # Last used euler to preserve euler compatibility in between keyframes.
-            "prev_euler",
             # Is the bone disconnected to the parent bone?
             "skip_position",
             "rot_order",
@@ -201,25 +203,20 @@ def write_armature(
 
             self.rot_order = DecoratedBone._eul_order_lookup[self.rot_order_str]
 
-            self.pose_mat = self.pose_bone.matrix
+            self.pose_mat = None
+            self.pose_imat = None
 
             # mat = self.rest_bone.matrix  # UNUSED
             self.rest_arm_mat = self.rest_bone.matrix_local
             self.rest_local_mat = self.rest_bone.matrix
 
             # inverted mats
-            self.pose_imat = self.pose_mat.inverted()
             self.rest_arm_imat = self.rest_arm_mat.inverted()
             self.rest_local_imat = self.rest_local_mat.inverted()
 
             self.parent = None
-            self.prev_euler = Euler((0.0, 0.0, 0.0), self.rot_order_str_reverse)
             self.skip_position = ((self.rest_bone.use_connect or root_transform_only) and self.rest_bone.parent)
 
-        def update_posedata(self):
-            self.pose_mat = self.pose_bone.matrix
-            self.pose_imat = self.pose_mat.inverted()
-
         def __repr__(self):
             if self.parent:
                 return "[\"%s\" child on \"%s\"]\n" % (self.name, self.parent.name)
@@ -244,41 +241,60 @@ def write_armature(
     file.write("Frames: %d\n" % (frame_end - frame_start + 1))
     file.write("Frame Time: %.6f\n" % (1.0 / (scene.render.fps / scene.render.fps_base)))
 
-    for frame in range(frame_start, frame_end + 1):
+    # Sample the pose matrices of all bones for all frames first,
+    # then convert the whole animation of each bone at once.
+    pose_bones = obj.pose.bones
+    pose_bones_index = {pose_bone.name: i for i, pose_bone in enumerate(pose_bones)}
+    num_frames = max(frame_end - frame_start + 1, 0)
+    pose_mats = np.empty((num_frames, len(pose_bones) * 16), dtype=np.float32)
+    for frame_i, frame in enumerate(range(frame_start, frame_end + 1)):
         scene.frame_set(frame)
+        pose_bones.foreach_get("matrix", pose_mats[frame_i])
 
-        for dbone in bones_decorated:
-            dbone.update_posedata()
-
-        for dbone in bones_decorated:
-            trans = Matrix.Translation(dbone.rest_bone.head_local)
-            itrans = Matrix.Translation(-dbone.rest_bone.head_local)
+    scene.frame_set(frame_current)
 
-            if dbone.parent:
-                mat_final = dbone.parent.rest_arm_mat @ dbone.parent.pose_imat @ dbone.pose_mat @ dbone.rest_arm_imat
-                mat_final = itrans @ mat_final @ trans
-                loc = mat_final.to_translation() + (dbone.rest_bone.head_local - dbone.parent.rest_bone.head_local)
-            else:
-                mat_final = dbone.pose_mat @ dbone.rest_arm_imat
-                mat_final = itrans @ mat_final @ trans
-                loc = mat_final.to_translation() + dbone.rest_bone.head
+    # Matrices are stored column major.
+    pose_mats = pose_mats.reshape(num_frames, len(pose_bones), 4, 4).transpose(1, 0, 3, 2).astype(np.float64)
+    for dbone in bones_decorated:
+        dbone.pose_mat = pose_mats[pose_bones_index[dbone.name]]
+        if dbone.rest_bone.children:
+            dbone.pose_imat = np.linalg.inv(dbone.pose_mat)
+    del pose_mats
 
-            # keep eulers compatible, no jumping on interpolation.
-            rot = mat_final.to_euler(dbone.rot_order_str_reverse, dbone.prev_euler)
+    motion = []
+    for dbone in bones_decorated:
+        trans = np.identity(4)
+        trans[:3, 3] = dbone.rest_bone.head_local
+        itrans = np.identity(4)
+        itrans[:3, 3] = -dbone.rest_bone.head_local
+
+        if dbone.parent:
+            mat_final = (np.array(dbone.parent.rest_arm_mat) @ dbone.parent.pose_imat @ dbone.pose_mat @
+                         np.array(dbone.rest_arm_imat))
+            mat_final = itrans @ mat_final @ trans
+            loc = mat_final[:, :3, 3] + np.array(dbone.rest_bone.head_local - dbone.parent.rest_bone.head_local)
+        else:
+            mat_final = dbone.pose_mat @ np.array(dbone.rest_arm_imat)
+            mat_final = itrans @ mat_final @ trans
+            loc = mat_final[:, :3, 3] + np.array(dbone.rest_bone.head)
 
-            if not dbone.skip_position:
-                file.write("%.6f %.6f %.6f " % (loc * global_scale)[:])
+        # keep eulers compatible, no jumping on interpolation.
+        rot = matrix_to_compatible_euler(mat_final[:, :3, :3], dbone.rot_order_str_reverse)
 
-            file.write("%.6f %.6f %.6f " % (degrees(rot[dbone.rot_order[0]]), degrees(rot[dbone.rot_order[1]]), degrees(rot[dbone.rot_order[2]])))
+        if not dbone.skip_position:
+            motion.append(loc * global_scale)
 
-            dbone.prev_euler = rot
+        motion.append(np.degrees(rot[:, dbone.rot_order]))
 
-        file.write("\n")
+    # Write the frames by blocks.
+    motion = np.hstack(motion) if motion else np.empty((num_frames, 0))
+    fmt = "%.6f " * motion.shape[1] + "\n"
+    for i in range(0, num_frames, MOTION_BLOCK_SIZE):
+        block = motion[i:i + MOTION_BLOCK_SIZE]
+        file.write((fmt * len(block)) % tuple(block.ravel().tolist()))
 
     file.close()
 
-    scene.frame_set(frame_current)
-
     print("BVH Exported: %s frames:%d\n" % (filepath, frame_end - frame_start + 1))
 
 
@@ -20,10 +20,17 @@
 
 # Script copyright (C) Campbell Barton
 
-from math import radians, ceil
+from math import ceil
 
 import bpy
-from mathutils import Vector, Euler, Matrix
+from mathutils import Vector, Matrix
+import numpy as np
+
+from .bvh_rotation import (
+    euler_to_matrix,
+    matrix_to_compatible_euler,
+    matrix_to_quaternion,
+)
 
 
 class BVH_Node:
@@ -51,7 +58,7 @@ class BVH_Node:
         'rot_order',
         # Same as above but a string 'XYZ' format..
         'rot_order_str',
-        # A list one tuple's one for each frame: (locx, locy, locz, rotx, roty, rotz),
+        # An array with one row for each frame: (locx, locy, locz, rotx, roty, rotz),
         # euler rotation ALWAYS stored xyz order, even when native used.
         'anim_data',
         # Convenience function, bool, same as: (channels[0] != -1 or channels[1] != -1 or channels[2] != -1).
@@ -92,9 +99,10 @@ class BVH_Node:
 
         self.children = []
 
-        # List of 6 length tuples: (lx, ly, lz, rx, ry, rz)
+        # Rows of 6 values: (lx, ly, lz, rx, ry, rz)
         # even if the channels aren't used they will just be zero.
-        self.anim_data = [(0, 0, 0, 0, 0, 0)]
+        # The first row is the rest pose, set with the motion data in read_bvh().
+        self.anim_data = np.zeros((1, 6))
 
     def __repr__(self):
         return (
@@ -112,19 +120,52 @@ def sorted_nodes(bvh_nodes):
     return bvh_nodes_list
 
 
+def read_motion(motion_lines, channel_count):
+    """
+    Parse the frame lines of the MOTION section in a (frames, channels) array.
+    """
+    motion_lines = [line for line in motion_lines if line and not line.isspace()]
+    if not channel_count:
+        return np.zeros((len(motion_lines), 0))
+
+    # Parse all the frames at once, when each line holds the expected amount of values.
+    motion = np.fromstring(" ".join(motion_lines), sep=" ")
+    if motion.size == len(motion_lines) * channel_count:
+        return motion.reshape(len(motion_lines), channel_count)
+
+    # Lines with extra values (or invalid ones, raising an error).
+    motion = np.empty((len(motion_lines), channel_count))
+    for frame_i, line in enumerate(motion_lines):
+        motion[frame_i] = [float(value) for value in line.split()[:channel_count]]
+    return motion
+
+
 def read_bvh(context, file_path, rotate_mode='XYZ', global_scale=1.0):
     # File loading stuff
     # Open the file for importing
-    file = open(file_path, 'rU')
-
-    # Separate into a list of lists, each line a list of words.
-    file_lines = file.readlines()
-    # Non standard carrage returns?
-    if len(file_lines) == 1:
-        file_lines = file_lines[0].split('\r')
-
-    # Split by whitespace.
-    file_lines = [ll for ll in [l.split() for l in file_lines] if ll]
+    with open(file_path, 'r') as file:
+        # Also handles non standard carrage returns.
+        text_lines = file.read().splitlines()
+
+    # Separate the hierarchy into a list of lists, each line a list of words.
+    # Frame lines are only split when parsing the motion data.
+    file_lines = []
+    motion_header_count = None
+    motion_start = len(text_lines)
+    for line_i, line in enumerate(text_lines):
+        # Split by whitespace.
+        words = line.split()
+        if not words:
+            continue
+        file_lines.append(words)
+        if motion_header_count is not None:
+            # The 'Frames:' and 'Frame Time:' lines.
+            motion_header_count -= 1
+            if motion_header_count == 0:
+                motion_start = line_i + 1
+                break
+        elif len(words) == 1 and words[0].lower() == 'motion':
+            motion_header_count = 2
 
     # Create hierarchy as empties
     if file_lines[0][0].lower() == 'hierarchy':
@@ -274,31 +315,24 @@ def read_bvh(context, file_path, rotate_mode='XYZ', global_scale=1.0):
     # second life expects it, which isn't to spec.
     bvh_nodes_list = sorted_nodes(bvh_nodes)
 
-    while lineIdx < len(file_lines):
-        line = file_lines[lineIdx]
-        for bvh_node in bvh_nodes_list:
-            # for bvh_node in bvh_nodes_serial:
-            lx = ly = lz = rx = ry = rz = 0.0
-            channels = bvh_node.channels
-            anim_data = bvh_node.anim_data
-            if channels[0] != -1:
-                lx = global_scale * float(line[channels[0]])
-
-            if channels[1] != -1:
-                ly = global_scale * float(line[channels[1]])
+    motion_lines = [" ".join(words) for words in file_lines[lineIdx:]]
+    motion_lines += text_lines[motion_start:]
+    motion = read_motion(motion_lines, channelIndex + 1)
+    del text_lines, motion_lines
 
-            if channels[2] != -1:
-                lz = global_scale * float(line[channels[2]])
-
-            if channels[3] != -1 or channels[4] != -1 or channels[5] != -1:
+    for bvh_node in bvh_nodes_list:
+        channels = bvh_node.channels
+        anim_data = np.zeros((len(motion) + 1, 6))
+        for axis_i in range(3):
+            if channels[axis_i] != -1:
+                anim_data[1:, axis_i] = global_scale * motion[:, channels[axis_i]]
 
-                rx = radians(float(line[channels[3]]))
-                ry = radians(float(line[channels[4]]))
-                rz = radians(float(line[channels[5]]))
+        if bvh_node.has_rot:
+            # Unused rotation channels (-1) refer to the last value of the frame.
+            anim_data[1:, 3:] = np.radians(motion[:, channels[3:]])
 
-            # Done importing motion data #
-            anim_data.append((lx, ly, lz, rx, ry, rz))
-        lineIdx += 1
+        # Done importing motion data #
+        bvh_node.anim_data = anim_data
 
     # Assign children
     for bvh_node in bvh_nodes_list:
@@ -404,6 +438,21 @@ def bvh_node_dict2objects(context, bvh_name, bvh_nodes, rotate_mode='NATIVE', fr
     return objects
 
 
+def _fcurves_add(action, data_path, time, values):
+    """
+    Add an F-Curve for each column of values, keyed at time.
+    """
+    co = np.empty((len(time), 2), dtype=np.float32)
+    co[:, 0] = time
+    for axis_i in range(values.shape[1]):
+        curve = action.fcurves.new(data_path=data_path, index=axis_i)
+        keyframe_points = curve.keyframe_points
+        keyframe_points.add(len(time))
+
+        co[:, 1] = values[:, axis_i]
+        keyframe_points.foreach_set("co", co.ravel())
+
+
 def bvh_node_dict2armature(
         context,
         bvh_name,
@@ -529,6 +578,7 @@ def bvh_node_dict2armature(
 
     # Replace the bvh_node.temp (currently an editbone)
     # With a tuple  (pose_bone, armature_bone, bone_rest_matrix, bone_rest_matrix_inv)
+    # rest matrices being 3x3 arrays.
     num_frame = 0
     for bvh_node in bvh_nodes_list:
         bone_name = bvh_node.temp  # may not be the same name as the bvh_node, could have been shortened.
@@ -539,9 +589,7 @@ def bvh_node_dict2armature(
         bone_rest_matrix_inv = Matrix(bone_rest_matrix)
         bone_rest_matrix_inv.invert()
 
-        bone_rest_matrix_inv.resize_4x4()
-        bone_rest_matrix.resize_4x4()
-        bvh_node.temp = (pose_bone, bone, bone_rest_matrix, bone_rest_matrix_inv)
+        bvh_node.temp = (pose_bone, bone, np.array(bone_rest_matrix), np.array(bone_rest_matrix_inv))
 
         if 0 == num_frame:
             num_frame = len(bvh_node.anim_data)
@@ -550,103 +598,61 @@ def bvh_node_dict2armature(
     # used internally by this importer. Frame 1, by convention, is also often
     # the rest pose of the skeleton exported by the motion capture system.
     skip_frame = 1
-    if num_frame > skip_frame:
-        num_frame = num_frame - skip_frame
+    num_frame = max(num_frame - skip_frame, 0)
 
     # Create a shared time axis for all animation curves.
-    time = [float(frame_start)] * num_frame
     if use_fps_scale:
         dt = scene.render.fps * bvh_frame_time
-        for frame_i in range(1, num_frame):
-            time[frame_i] += float(frame_i) * dt
     else:
-        for frame_i in range(1, num_frame):
-            time[frame_i] += float(frame_i)
+        dt = 1.0
+    time = float(frame_start) + np.arange(num_frame) * dt
 
     # print("bvh_frame_time = %f, dt = %f, num_frame = %d"
     #      % (bvh_frame_time, dt, num_frame]))
 
     for i, bvh_node in enumerate(bvh_nodes_list):
         pose_bone, bone, bone_rest_matrix, bone_rest_matrix_inv = bvh_node.temp
+        anim_data = bvh_node.anim_data[skip_frame:skip_frame + num_frame]
 
         if bvh_node.has_loc:
             # Not sure if there is a way to query this or access it in the
             # PoseBone structure.
             data_path = 'pose.bones["%s"].location' % pose_bone.name
 
-            location = [(0.0, 0.0, 0.0)] * num_frame
-            for frame_i in range(num_frame):
-                bvh_loc = bvh_node.anim_data[frame_i + skip_frame][:3]
-
-                bone_translate_matrix = Matrix.Translation(
-                    Vector(bvh_loc) - bvh_node.rest_head_local)
-                location[frame_i] = (bone_rest_matrix_inv @
-                                     bone_translate_matrix).to_translation()
+            location = (anim_data[:, :3] - np.array(bvh_node.rest_head_local)) @ bone_rest_matrix_inv.T
 
-            # For each location x, y, z.
-            for axis_i in range(3):
-                curve = action.fcurves.new(data_path=data_path, index=axis_i)
-                keyframe_points = curve.keyframe_points
-                keyframe_points.add(num_frame)
-
-                for frame_i in range(num_frame):
-                    keyframe_points[frame_i].co = (
-                        time[frame_i],
-                        location[frame_i][axis_i],
-                    )
+            _fcurves_add(action, data_path, time, location)
 
         if bvh_node.has_rot:
-            data_path = None
-            rotate = None
+            # apply rotation order and convert to XYZ
+            # note that the rot_order_str is reversed.
+            bone_rotation_matrix = euler_to_matrix(anim_data[:, 3:], bvh_node.rot_order_str[::-1])
+            bone_rotation_matrix = (
+                bone_rest_matrix_inv @
+                bone_rotation_matrix @
+                bone_rest_matrix
+            )
 
             if 'QUATERNION' == rotate_mode:
-                rotate = [(1.0, 0.0, 0.0, 0.0)] * num_frame
+                rotate = matrix_to_quaternion(bone_rotation_matrix)
                 data_path = ('pose.bones["%s"].rotation_quaternion'
                              % pose_bone.name)
             else:
-                rotate = [(0.0, 0.0, 0.0)] * num_frame
+                rotate = matrix_to_compatible_euler(bone_rotation_matrix, pose_bone.rotation_mode)
                 data_path = ('pose.bones["%s"].rotation_euler' %
                              pose_bone.name)
 
-            prev_euler = Euler((0.0, 0.0, 0.0))
-            for frame_i in range(num_frame):
-                bvh_rot = bvh_node.anim_data[frame_i + skip_frame][3:]
-
-                # apply rotation order and convert to XYZ
-                # note that the rot_order_str is reversed.
-                euler = Euler(bvh_rot, bvh_node.rot_order_str[::-1])
-                bone_rotation_matrix = euler.to_matrix().to_4x4()
-                bone_rotation_matrix = (
-                    bone_rest_matrix_inv @
-                    bone_rotation_matrix @
-                    bone_rest_matrix
-                )
-
-                if len(rotate[frame_i]) == 4:
-                    rotate[frame_i] = bone_rotation_matrix.to_quaternion()
-                else:
-                    rotate[frame_i] = bone_rotation_matrix.to_euler(
-                        pose_bone.rotation_mode, prev_euler)
-                    prev_euler = rotate[frame_i]
-
             # For each euler angle x, y, z (or quaternion w, x, y, z).
-            for axis_i in range(len(rotate[0])):
-                curve = action.fcurves.new(data_path=data_path, index=axis_i)
-                keyframe_points = curve.keyframe_points
-                keyframe_points.add(num_frame)
-
-                for frame_i in range(num_frame):
-                    keyframe_points[frame_i].co = (
-                        time[frame_i],
-                        rotate[frame_i][axis_i],
-                    )
+            _fcurves_add(action, data_path, time, rotate)
 
     for cu in action.fcurves:
         if IMPORT_LOOP:
             pass  # 2.5 doenst have cyclic now?
 
+        # Enum properties can't be set with foreach_set().
         for bez in cu.keyframe_points:
             bez.interpolation = 'LINEAR'
+        cu.update()
 
     # finally apply matrix
     arm_ob.matrix_world = global_matrix
@@ -20,9 +20,11 @@
 
 import re
 import xml.dom.minidom
+from functools import lru_cache
 from math import cos, sin, tan, atan2, pi, ceil
 
 import bpy
+import numpy as np
 from mathutils import Vector, Matrix
 
 from . import svg_colors
@@ -30,7 +32,8 @@ from .svg_util import (units,
                        srgb_to_linearrgb,
                        check_points_equal,
                        parse_array_of_floats,
-                       read_float)
+                       read_float,
+                       tokenize_path_data)
 
 #### Common utilities ####
 
@@ -164,9 +167,13 @@ def SVGMatrixFromNode(node, context):
     return m
 
 
+@lru_cache(maxsize=4096)
 def SVGParseTransform(transform):
     """
     Parse transform string and return transformation matrix
+
+    Results are cached, the returned matrix is frozen as it's shared
+    between all nodes using the same transform string.
     """
 
     m = Matrix()
@@ -183,9 +190,22 @@ def SVGParseTransform(transform):
 
         m = m @ proc(params)
 
+    m.freeze()
+
     return m
 
 
+def SVGTransformCoords(matrix, coords):
+    """
+    Transform an array of SVG-file coords by a matrix, returns an array
+    of 3D coordinates
+    """
+
+    m = np.array(matrix, dtype=np.float64)
+
+    return (coords @ m[:3, :2].T + m[:3, 3]).astype(np.float32)
+
+
 def SVGGetMaterial(color, context):
     """
     Get material for specified color
@@ -400,44 +420,7 @@ class SVGPathData:
         d - the definition of the outline of a shape
         """
 
-        spaces = ' ,\t'
-        commands = {'m', 'l', 'h', 'v', 'c', 's', 'q', '', 't', 'a', 'z'}
-        current_command = ''
-        tokens = []
-
-        i = 0
-        n = len(d)
-        while i < n:
-            c = d[i]
-
-            if c in spaces:
-                pass
-            elif c.lower() in commands:
-                tokens.append(c)
-                current_command = c
-                arg_index = 1
-            elif c in ['-', '.'] or c.isdigit():
-                # Special case for 'a/A' commands.
-                # Arguments 4 and 5 are either 0 or 1 and might not
-                # be separated from the next argument with space or comma.
-                if current_command.lower() == 'a':
-                    if arg_index % 7 in [4,5]:
-                        token = d[i]
-                        last_char = i + 1
-                    else:
-                        token, last_char = read_float(d, i)
-                else:
-                    token, last_char = read_float(d, i)
-
-                arg_index += 1
-                tokens.append(token)
-
-                # in most cases len(token) and (last_char - i) are the same
-                # but with whitespace or ',' prefix they are not.
-
-                i += (last_char - i) - 1
-
-            i += 1
+        tokens = tokenize_path_data(d)
 
         self._data = tokens
         self._index = 0
@@ -1137,16 +1120,39 @@ class SVGGeometryPATH(SVGGeometry):
     def parse(self):
         """
         Parse SVG path node
+
+        Parsed splines are shared by all paths with the same definition.
         """
 
         d = self._node.getAttribute('d')
 
         self._styles = SVGParseStyles(self._node, self._context)
 
-        pathParser = SVGPathParser(d, self._styles['useFill'])
-        pathParser.parse()
+        key = (d, self._styles['useFill'])
+        splines = self._context['paths'].get(key)
+
+        if splines is None:
+            pathParser = SVGPathParser(d, self._styles['useFill'])
+            pathParser.parse()
+
+            splines = pathParser.getSplines()
+
+            for spline in splines:
+                if spline['closed'] and len(spline['points']) >= 2:
+                    first = spline['points'][0]
+                    last = spline['points'][-1]
+                    if (    first['handle_left_type'] == 'FREE' and
+                            last['handle_right_type'] == 'VECTOR'):
+                        last['handle_right_type'] = 'FREE'
+                        last['handle_right'] = (last['x'], last['y'])
+                    if (    last['handle_right_type'] == 'FREE' and
+                            first['handle_left_type'] == 'VECTOR'):
+                        first['handle_left_type'] = 'FREE'
+                        first['handle_left'] = (first['x'], first['y'])
 
-        self._splines = pathParser.getSplines()
+            self._context['paths'][key] = splines
+
+        self._splines = splines
 
     def _doCreateGeom(self, instancing):
         """
@@ -1165,44 +1171,35 @@ class SVGGeometryPATH(SVGGeometry):
         else:
             cu.dimensions = '3D'
 
-        for spline in self._splines:
-            act_spline = None
-
-            if spline['closed'] and len(spline['points']) >= 2:
-                first = spline['points'][0]
-                last = spline['points'][-1]
-                if (    first['handle_left_type'] == 'FREE' and
-                        last['handle_right_type'] == 'VECTOR'):
-                    last['handle_right_type'] = 'FREE'
-                    last['handle_right'] = (last['x'], last['y'])
-                if (    last['handle_right_type'] == 'FREE' and
-                        first['handle_left_type'] == 'VECTOR'):
-                    first['handle_left_type'] = 'FREE'
-                    first['handle_left'] = (first['x'], first['y'])
+        matrix = self._context['matrix']
 
-            for point in spline['points']:
-                co = self._transformCoord((point['x'], point['y']))
+        for spline in self._splines:
+            points = spline['points']
+            if not points:
+                continue
 
-                if act_spline is None:
-                    cu.splines.new('BEZIER')
+            co = [(point['x'], point['y']) for point in points]
+            # Undefined handles are calculated by Blender.
+            handle_left = [point['handle_left'] or xy for point, xy in zip(points, co)]
+            handle_right = [point['handle_right'] or xy for point, xy in zip(points, co)]
 
-                    act_spline = cu.splines[-1]
-                    act_spline.use_cyclic_u = spline['closed']
-                else:
-                    act_spline.bezier_points.add(1)
+            act_spline = cu.splines.new('BEZIER')
+            act_spline.use_cyclic_u = spline['closed']
 
-                bezt = act_spline.bezier_points[-1]
-                bezt.co = co
+            bezier_points = act_spline.bezier_points
+            bezier_points.add(len(points) - 1)
 
+            for bezt, point in zip(bezier_points, points):
                 bezt.handle_left_type = point['handle_left_type']
-                if point['handle_left'] is not None:
-                    handle = point['handle_left']
-                    bezt.handle_left = self._transformCoord(handle)
-
                 bezt.handle_right_type = point['handle_right_type']
-                if point['handle_right'] is not None:
-                    handle = point['handle_right']
-                    bezt.handle_right = self._transformCoord(handle)
+
+            bezier_points.foreach_set('co', SVGTransformCoords(matrix, np.array(co)).ravel())
+            bezier_points.foreach_set('handle_left', SVGTransformCoords(matrix, np.array(handle_left)).ravel())
+            bezier_points.foreach_set('handle_right', SVGTransformCoords(matrix, np.array(handle_right)).ravel())
+
+            # foreach_set() doesn't update the spline, setting a handle type
+            # again does, calculating the non-FREE handles.
+            bezier_points[0].handle_left_type = points[0]['handle_left_type']
 
         SVGFinishCurve()
 
@@ -1829,6 +1826,7 @@ class SVGLoader(SVGGeometryContainer):
         rect = (0, 0)
 
         self._context = {'defines': {},
+                         'paths': {},
                          'transform': [],
                          'rects': [rect],
                          'rect': rect,
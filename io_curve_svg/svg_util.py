@@ -93,6 +93,68 @@ def read_float(text: str, start_index: int = 0):
     return token, endptr
 
 
+path_commands = "MmLlHhVvCcSsQqTtAaZz"
+re_path_commands = re.compile(f"([{path_commands}])")
+# A number, or the start of an invalid one.
+re_path_number = re.compile(r"-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?|-?\.\d+(?:[eE][-+]?\d+)?|[-.]")
+re_path_number_start = re.compile(r"[-.\d]")
+
+
+def _tokenize_path_numbers(text, tokens):
+    for match in re_path_number.finditer(text):
+        token = match.group(0)
+        if token == '-' or token == '.':
+            start = match.start()
+            raise Exception('Invalid float value near ' + text[start:start + 10])
+        tokens.append(token)
+
+
+def _tokenize_arc_arguments(text, tokens):
+    # Arguments 4 and 5 of each arc are flags, either 0 or 1, which might not
+    # be separated from the next argument with space or comma.
+    arg_index = 1
+    search = re_path_number_start.search
+    match = re_path_number.match
+    start = 0
+    while True:
+        token_start = search(text, start)
+        if token_start is None:
+            break
+        start = token_start.start()
+        if arg_index % 7 in {4, 5}:
+            tokens.append(text[start])
+            start += 1
+        else:
+            token = match(text, start).group(0)
+            if token == '-' or token == '.':
+                raise Exception('Invalid float value near ' + text[start:start + 10])
+            tokens.append(token)
+            start += len(token)
+        arg_index += 1
+
+
+def tokenize_path_data(d):
+    """
+    Split the definition of the outline of a shape (the "d" attribute of a
+    path) into a list of tokens: command letters and numbers (as strings).
+
+    Separators and unknown characters are skipped.
+    """
+
+    tokens = []
+    parts = re_path_commands.split(d)
+    _tokenize_path_numbers(parts[0], tokens)
+    for i in range(1, len(parts), 2):
+        command = parts[i]
+        tokens.append(command)
+        if command in {'A', 'a'}:
+            _tokenize_arc_arguments(parts[i + 1], tokens)
+        else:
+            _tokenize_path_numbers(parts[i + 1], tokens)
+
+    return tokens
+
+
 def parse_coord(coord, size):
     """
     Parse coordinate component to common basis
@@ -24,9 +24,9 @@
 # XXX Not really nice, but that hack is needed to allow execution of that test
 #     from both automated CTest and by directly running the file manually.
 if __name__ == '__main__':
-    from svg_util import (parse_array_of_floats, read_float, parse_coord,)
+    from svg_util import (parse_array_of_floats, read_float, parse_coord, tokenize_path_data,)
 else:
-    from .svg_util import (parse_array_of_floats, read_float, parse_coord,)
+    from .svg_util import (parse_array_of_floats, read_float, parse_coord, tokenize_path_data,)
 import unittest
 
 class ParseArrayOfFloatsTest(unittest.TestCase):
@@ -179,5 +179,37 @@ class ParseCoordTest(unittest.TestCase):
         self.assertEqual(parse_coord("1.2%", 200), 2.4)
 
 
+class TokenizePathDataTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(tokenize_path_data(""), [])
+        self.assertEqual(tokenize_path_data("  \t "), [])
+
+    def test_commands(self):
+        self.assertEqual(tokenize_path_data("M 1 2 L 3,4 z"),
+                         ['M', '1', '2', 'L', '3', '4', 'z'])
+        self.assertEqual(tokenize_path_data("m1,2h3v4Z"),
+                         ['m', '1', '2', 'h', '3', 'v', '4', 'Z'])
+
+    def test_numbers_without_separator(self):
+        self.assertEqual(tokenize_path_data("l-1-2.5.5 1e2-3E-1"),
+                         ['l', '-1', '-2.5', '.5', '1e2', '-3E-1'])
+
+    def test_ignored_characters(self):
+        self.assertEqual(tokenize_path_data("M+1\n2"), ['M', '1', '2'])
+
+    def test_arc_flags(self):
+        self.assertEqual(tokenize_path_data("a10 20 30 0110,10a1 2 3 1 0 4 5"),
+                         ['a', '10', '20', '30', '0', '1', '10', '10',
+                          'a', '1', '2', '3', '1', '0', '4', '5'])
+        self.assertEqual(tokenize_path_data("A1 2 3 1 1 4 5 6 7 8 0 0 9 10"),
+                         ['A', '1', '2', '3', '1', '1', '4', '5',
+                          '6', '7', '8', '0', '0', '9', '10'])
+
+    def test_invalid_number(self):
+        self.assertRaises(Exception, tokenize_path_data, "M 1 -")
+        self.assertRaises(Exception, tokenize_path_data, "M 1 .e")
+        self.assertRaises(Exception, tokenize_path_data, "a 1 2 3 0 0 -")
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
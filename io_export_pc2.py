@@ -49,6 +49,7 @@ from os import remove
 import time
 import math
 import struct
+import numpy as np
 
 
 def get_sampled_frames(start, end, sampling):
@@ -101,16 +102,21 @@ def do_export(context, props, filepath):
             print('Export failed. Vertexcount of Object is not constant')
             return False
 
+        co = np.empty(vertCount * 3, dtype=np.float32)
+        me.vertices.foreach_get("co", co)
+        co = co.reshape(-1, 3)
+
+        # Both transforms at once.
+        mat = mathutils.Matrix()
         if props.world_space:
-            me.transform(ob.matrix_world)
+            mat = ob.matrix_world @ mat
         if props.rot_x90:
-            me.transform(mat_x90)
+            mat = mat_x90 @ mat
+        if props.world_space or props.rot_x90:
+            mat = np.array(mat)
+            co = co @ mat[:3, :3].T + mat[:3, 3]
 
-        for v in me.vertices:
-            thisVertex = struct.pack('<fff', float(v.co[0]),
-                                     float(v.co[1]),
-                                     float(v.co[2]))
-            file.write(thisVertex)
+        co.astype('<f4').tofile(file)
 
     if apply_modifiers:
         ob.evaluated_get(depsgraph).to_mesh_clear()
@@ -26,7 +26,7 @@ else:  # PYTHON27
 from .const import BYBLOCK, BYLAYER
 
 import io
-from .tags import dxfinfo
+from .tags import dxfinfo, is_binary_dxf
 from .color import aci_to_true_color
 
 
@@ -39,6 +39,8 @@ def read(stream, options=None):
 
 
 def readfile(filename, options=None):
+    if is_binary_dxf(filename):
+        return readfile_as_binary(filename, options)
     try:  # is it ascii code-page encoded?
         return readfile_as_asc(filename, options)
     except UnicodeDecodeError:  # try unicode and ignore errors
@@ -58,6 +60,21 @@ def readfile_as_asc(filename, options=None):
     return _read_encoded_file(filename, options, encoding=get_encoding())
 
 
+def readfile_as_binary(filename, options=None):
+    from .drawing import Drawing
+    from .tags import binary_tagger
+    from functools import partial
+
+    with io.open(filename, 'rb') as fp:
+        data = fp.read()
+    # header strings are ASCII, DXF R2007 and later are UTF-8 encoded
+    info = dxfinfo(None, binary_tagger(data, encoding='latin-1'))
+    encoding = 'utf-8' if info.version >= 'AC1021' else info.encoding
+    dwg = Drawing(data, options, tagreader=partial(binary_tagger, encoding=encoding))
+    dwg.filename = filename
+    return dwg
+
+
 def _read_encoded_file(filename, options=None, encoding='utf-8', errors='strict'):
     from .drawing import Drawing
 
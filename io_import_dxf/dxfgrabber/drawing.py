@@ -5,7 +5,7 @@
 
 __author__ = "mozman <mozman@gmx.at>"
 
-from .tags import stream_tagger
+from .tags import bulk_tagger
 from .sections import Sections
 
 DEFAULT_OPTIONS = {
@@ -16,14 +16,14 @@ DEFAULT_OPTIONS = {
 
 
 class Drawing(object):
-    def __init__(self, stream, options=None):
+    def __init__(self, stream, options=None, tagreader=bulk_tagger):
         if options is None:
             options = DEFAULT_OPTIONS
         self.grab_blocks = options.get('grab_blocks', True)
         self.assure_3d_coords = options.get('assure_3d_coords', False)
         self.resolve_text_styles = options.get('resolve_text_styles', True)
 
-        tagreader = stream_tagger(stream, self.assure_3d_coords)
+        tagreader = tagreader(stream, self.assure_3d_coords)
         self.dxfversion = 'AC1009'
         self.encoding = 'cp1252'
         self.filename = None
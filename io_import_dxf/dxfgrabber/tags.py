@@ -186,6 +186,216 @@ def string_tagger(s):
     return stream_tagger(StringIO(s))
 
 
+# Characters read at once by bulk_tagger().
+BULK_BLOCK_SIZE = 1 << 22
+
+
+def _group_tags(blocks, assure_3d_coords=False):
+    """ Generates DXFTag() from blocks of raw tags, given as (codes, values) lists. Same result as stream_tagger(),
+    but x, y and z coordinates are grouped into points by looking ahead in the block, and values are cast without
+    method calls.
+    """
+    cast_get = _TagCaster._cast.get
+    line = 0  # line of the first tag of the block
+    codes = []
+    values = []
+    for block_codes, block_values in blocks:
+        if codes:  # point continued in this block
+            codes += block_codes
+            values += block_values
+        else:
+            codes = block_codes
+            values = block_values
+        count = len(codes)
+        index = 0
+        while index < count:
+            code = codes[index]
+            if code in POINT_CODES:
+                if index + 1 < count and codes[index + 1] != code + 10:  # y coordinate is mandatory
+                    raise DXFStructureError("Missing required y coordinate near line: {}.".format(
+                        line + 2 * index + 4))
+                if index + 2 >= count:  # y and maybe z coordinates in next block
+                    break
+                try:
+                    if codes[index + 2] == code + 20:  # z coordinate just for 3d points
+                        point = (float(values[index]), float(values[index + 1]), float(values[index + 2]))
+                        index += 3
+                    else:
+                        if assure_3d_coords:
+                            point = (float(values[index]), float(values[index + 1]), 0.)
+                        else:
+                            point = (float(values[index]), float(values[index + 1]))
+                        index += 2
+                except ValueError:
+                    raise DXFStructureError('Invalid floating point values near line: {}.'.format(
+                        line + 2 * index + 6))
+                yield DXFTag(code, point)
+                continue
+            index += 1
+            if code == 999:  # skip comments
+                continue
+            value = values[index - 1]
+            typecaster = cast_get(code, tostr)
+            try:
+                value = typecaster(value)
+            except ValueError:
+                try:
+                    if typecaster is not int:
+                        raise
+                    value = int(float(value))  # convert float to int
+                except ValueError:
+                    raise DXFStructureError('Invalid tag (code={code}, value="{value}") near line: {line}.'.format(
+                        line=line + 2 * index,
+                        code=code,
+                        value=value,
+                    ))
+            yield DXFTag(code, value)
+        line += 2 * index
+        codes = codes[index:]
+        values = values[index:]
+    # like stream_tagger(), a point at the end of the data is ignored, unless its y coordinate is missing
+
+
+def _text_blocks(stream, block_size=BULK_BLOCK_SIZE):
+    """ Split a text stream into (codes, values) lists of raw tags, reading it by big blocks.
+    """
+    def split_block(lines, line, strip_cr):
+        if strip_cr:
+            lines = [l.rstrip('\r') for l in lines]
+        try:
+            return list(map(int, lines[0::2])), lines[1::2]
+        except ValueError:
+            # Yield tags up to the invalid group code, the error is only raised if the reader goes on, which it
+            # does not after the EOF tag. Same ValueError as int() in stream_tagger().
+            codes = []
+            for index, code in enumerate(lines[0::2]):
+                try:
+                    codes.append(int(code))
+                except ValueError:
+                    raise_at[0] = 'Invalid group code "{code}" near line: {line}.'.format(
+                        code=code, line=line + 2 * index + 1)
+                    break
+            return codes, lines[1:2 * len(codes):2]
+
+    raise_at = [None]
+    rest = ''
+    line = 0
+    while True:
+        data = stream.read(block_size)
+        if not data:
+            break
+        text = rest + data
+        lines = text.split('\n')
+        rest = lines.pop()  # incomplete last line
+        if len(lines) % 2:  # keep the code of an incomplete tag for next block
+            rest = lines.pop() + '\n' + rest
+        if not lines:
+            continue
+        yield split_block(lines, line, '\r' in text)
+        if raise_at[0] is not None:
+            rest = ''
+            break
+        line += len(lines)
+    if rest:  # last tag without line ending
+        lines = rest.split('\n')
+        if len(lines) == 2 and lines[1]:  # code without value or with an empty last line: EOF
+            yield split_block(lines, line, '\r' in rest)
+    if raise_at[0] is not None:
+        raise ValueError(raise_at[0])
+
+
+def bulk_tagger(stream, assure_3d_coords=False, block_size=BULK_BLOCK_SIZE):
+    """ Generates DXFTag() from a stream (untrusted external source), same as stream_tagger(), but much faster for
+    big streams, which are read by blocks of block_size characters.
+    """
+    return _group_tags(_text_blocks(stream, block_size), assure_3d_coords)
+
+
+BINARY_DXF_SENTINEL = b'AutoCAD Binary DXF\r\n\x1a\x00'
+
+
+def _binary_types():
+    """ Value type of each group code in binary DXF files, as struct format characters, 's' being a null
+    terminated string and 'B' a binary chunk (1 byte length, then data).
+    """
+    types = ['s'] * 1072
+    for fmt, codes in (
+            ('d', chain(range(10, 60), range(110, 150), range(210, 240), range(460, 470), range(1010, 1060))),
+            ('h', chain(range(60, 80), range(170, 180), range(270, 290), range(370, 390), range(400, 410),
+                        range(1060, 1071))),
+            ('i', chain(range(90, 100), range(420, 430), range(440, 460), (1071, ))),
+            ('q', range(160, 170)),
+            ('b', range(290, 300)),  # bool 1=True 0=False
+            ('B', chain(range(310, 320), (1004, ))),
+    ):
+        for code in codes:
+            types[code] = fmt
+    return types
+
+
+BINARY_TYPES = _binary_types()
+
+
+def _binary_blocks(data, encoding='cp1252', tags_per_block=65536):
+    """ Split binary DXF data into (codes, values) lists of tags, values already having their type.
+    """
+    import struct
+
+    types = BINARY_TYPES
+    unpack_from = {fmt: struct.Struct('<' + fmt).unpack_from for fmt in 'dhiqb'}
+    sizes = {fmt: struct.calcsize('<' + fmt) for fmt in 'dhiqb'}
+    find = data.find
+    length = len(data)
+    index = len(BINARY_DXF_SENTINEL)
+    # DXF R12 group codes have 1 byte (255 announcing a 2 bytes code), later versions 2 bytes. The first tag is
+    # always (0, 'SECTION').
+    short_codes = data[index + 1:index + 2] != b'\x00'
+
+    while index < length:
+        codes = []
+        values = []
+        for i in range(tags_per_block):
+            if index >= length:
+                break
+            if short_codes:
+                code = data[index]
+                index += 1
+                if code == 255:
+                    code = data[index] | (data[index + 1] << 8)
+                    index += 2
+            else:
+                code = data[index] | (data[index + 1] << 8)
+                index += 2
+            fmt = types[code] if code < len(types) else 's'
+            if fmt == 's':
+                end = find(b'\x00', index)
+                if end < 0:
+                    raise DXFStructureError("Unterminated string in binary DXF near byte: {}.".format(index))
+                value = data[index:end].decode(encoding, errors='ignore')
+                index = end + 1
+            elif fmt == 'B':  # binary chunk, as hex string like in text DXF files
+                size = data[index]
+                value = data[index + 1:index + 1 + size].hex().upper()
+                index += 1 + size
+            else:
+                value = unpack_from[fmt](data, index)[0]
+                index += sizes[fmt]
+            codes.append(code)
+            values.append(value)
+        yield codes, values
+
+
+def is_binary_dxf(filename):
+    with open(filename, 'rb') as fp:
+        return fp.read(len(BINARY_DXF_SENTINEL)) == BINARY_DXF_SENTINEL
+
+
+def binary_tagger(data, assure_3d_coords=False, encoding='cp1252'):
+    """ Generates DXFTag() from the content of a binary DXF file.
+    """
+    return _group_tags(_binary_blocks(data, encoding), assure_3d_coords)
+
+
 class Tags(list):
     """ DXFTag() chunk as flat list. """
     def find_all(self, code):
@@ -445,10 +655,11 @@ class DXFInfo(object):
         self.handseed = value
 
 
-def dxfinfo(stream):
+def dxfinfo(stream, tagreader=None):
     info = DXFInfo()
     tag = DXFTag(999999, '')
-    tagreader = stream_tagger(stream)
+    if tagreader is None:
+        tagreader = stream_tagger(stream)
     while tag != DXFTag(0, 'ENDSEC'):
         tag = next(tagreader)
         if tag.code != 9:
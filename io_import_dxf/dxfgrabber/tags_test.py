@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# Purpose: compare bulk_tagger() with stream_tagger()
+# License: MIT License
+
+from __future__ import unicode_literals
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    import os
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from dxfgrabber.tags import bulk_tagger, stream_tagger, DXFStructureError
+else:
+    from .tags import bulk_tagger, stream_tagger, DXFStructureError
+from io import StringIO
+import unittest
+
+BLOCK_SIZES = list(range(1, 33)) + [64, 1 << 22]
+
+
+def read_tags(tagger, text, **kwargs):
+    """ Tags read until the end or an error, and the error as (type, message).
+    """
+    tags = []
+    try:
+        for tag in tagger(StringIO(text), **kwargs):
+            tags.append(tag)
+    except (ValueError, DXFStructureError) as e:
+        return tags, (type(e), str(e))
+    return tags, None
+
+
+class BulkTaggerTest(unittest.TestCase):
+    def assertSameTags(self, text, assure_3d_coords=False):
+        expected_tags, expected_error = read_tags(stream_tagger, text, assure_3d_coords=assure_3d_coords)
+        for block_size in BLOCK_SIZES:
+            tags, error = read_tags(bulk_tagger, text, assure_3d_coords=assure_3d_coords, block_size=block_size)
+            self.assertEqual(tags, expected_tags, "block size {}".format(block_size))
+            if expected_error is None or expected_error[0] is not ValueError:
+                self.assertEqual(error, expected_error, "block size {}".format(block_size))
+            else:  # the message of int() is not repeated
+                self.assertIs(error[0], ValueError, "block size {}".format(block_size))
+        return expected_tags, expected_error
+
+    def test_tags(self):
+        tags, error = self.assertSameTags("0\nSECTION\n2\nENTITIES\n70\n3\n40\n1.5\n999\ncomment\n0\nEOF\n")
+        self.assertEqual(tags, [(0, 'SECTION'), (2, 'ENTITIES'), (70, 3), (40, 1.5), (0, 'EOF')])
+        self.assertIsNone(error)
+
+    def test_crlf(self):
+        self.assertSameTags("0\r\nLINE\r\n10\r\n1\r\n20\r\n2\r\n0\r\nEOF\r\n")
+
+    def test_points(self):
+        text = "0\nA\n10\n1\n20\n2\n30\n3\n11\n4\n21\n5\n0\nB\n10\n6\n20\n7\n"
+        tags, error = self.assertSameTags(text)
+        self.assertEqual(tags, [(0, 'A'), (10, (1., 2., 3.)), (11, (4., 5.)), (0, 'B')])
+        tags, error = self.assertSameTags(text, assure_3d_coords=True)
+        self.assertEqual(tags[2], (11, (4., 5., 0.)))
+
+    def test_trailing_code_without_value(self):
+        tags, error = self.assertSameTags("0\nA\n5\n")
+        self.assertEqual(tags, [(0, 'A')])
+        self.assertSameTags("0\nA\n5")
+        self.assertSameTags("0\nA\n5\r\n")
+
+    def test_empty_value(self):
+        tags, error = self.assertSameTags("0\nA\n5\n\n")
+        self.assertEqual(tags, [(0, 'A'), (5, '')])
+
+    def test_last_point_missing_y(self):
+        tags, error = self.assertSameTags("10\n1\n21\n2")
+        self.assertEqual(error, (DXFStructureError, "Missing required y coordinate near line: 4."))
+        self.assertSameTags("10\n1")
+        self.assertSameTags("10\n1\n20\n2\n")
+
+    def test_missing_y_line(self):
+        tags, error = self.assertSameTags("0\nA\n0\nB\n0\nC\n0\nD\n0\nE\n0\nF\n10\n1\n21\n2\n0\nEOF\n")
+        self.assertEqual(error, (DXFStructureError, "Missing required y coordinate near line: 16."))
+        self.assertEqual(len(tags), 6)
+
+    def test_invalid_values(self):
+        tags, error = self.assertSameTags("0\nA\n10\n1\n20\nx\n30\n3\n0\nB\n")
+        self.assertIs(error[0], DXFStructureError)
+        tags, error = self.assertSameTags("0\nA\n70\nx\n0\nB\n")
+        self.assertIs(error[0], DXFStructureError)
+
+    def test_invalid_group_code(self):
+        tags, error = self.assertSameTags("0\nA\nxx\nB\n0\nC\n")
+        self.assertEqual(tags, [(0, 'A')])
+        self.assertIs(error[0], ValueError)
+        self.assertSameTags("0\nA\n10\n1\n20\n2\nxx\n3\n")
+        self.assertSameTags("0\nA\n\nB\n")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
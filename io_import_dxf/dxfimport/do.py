@@ -21,6 +21,7 @@
 import bpy
 import os
 import re
+import numpy as np
 from mathutils import Vector, Matrix, Euler, Color, geometry
 from math import pi, radians, sqrt
 
@@ -46,6 +47,17 @@ GROUP_INSTANCES = 5
 BY_BLOCK = 6
 
 
+_wgs84 = None
+
+
+def get_wgs84():
+    """The EPSG:4326 projection, created once since it is slow."""
+    global _wgs84
+    if _wgs84 is None:
+        _wgs84 = Proj(init="EPSG:4326")
+    return _wgs84
+
+
 def transform(p1, p2, c1, c2, c3):
     if PYPROJ:
         if type(p1) is Proj and type(p2) is Proj:
@@ -54,7 +66,7 @@ def transform(p1, p2, c1, c2, c3):
             else:
                 return (c1, c2, c3)
         elif type(p2) is TransverseMercator:
-            wgs84 = Proj(init="EPSG:4326")
+            wgs84 = get_wgs84()
             if p1.srs != wgs84.srs:
                 t2, t1, t3 = proj_transform(p1, wgs84, c1, c2, c3)
             else:
@@ -69,6 +81,32 @@ def transform(p1, p2, c1, c2, c3):
             return (c1, c2, c3)
 
 
+def transform_array(p1, p2, co):
+    """
+    Same as transform(), on an array of coordinates of shape (n, 3).
+    """
+    c1, c2, c3 = co.T
+    if PYPROJ:
+        if type(p1) is Proj and type(p2) is Proj:
+            if p1.srs != p2.srs:
+                return np.column_stack(proj_transform(p1, p2, c1, c2, c3))
+            else:
+                return co
+        elif type(p2) is TransverseMercator:
+            if p1.srs != get_wgs84().srs:
+                t2, t1, t3 = proj_transform(p1, get_wgs84(), c1, c2, c3)
+            else:
+                t1, t2, t3 = c2, c1, c3  # mind c2, c1 inversion
+            tm1, tm2 = p2.fromGeographicArray(t1, t2)
+            return np.column_stack((tm1, tm2, t3))
+    else:
+        if p1.spherical:
+            t1, t2 = p2.fromGeographicArray(c2, c1)  # mind c2, c1 inversion
+            return np.column_stack((t1, t2, c3))
+        else:
+            return co
+
+
 def float_len(f):
     s = str(f)
     if 'e' in s:
@@ -95,7 +133,7 @@ class Do:
         "dwg", "combination", "known_blocks", "import_text", "import_light", "export_acis", "merge_lines",
         "do_bounding_boxes", "acis_files", "errors", "block_representation", "recenter", "did_group_instance",
         "objects_before", "pDXF", "pScene", "thickness_and_width", "but_group_by_att", "current_scene",
-        "dxf_unit_scale"
+        "dxf_unit_scale", "proj_offset"
     )
 
     def __init__(self, dxf_filename, c=BY_LAYER, import_text=True, import_light=True, export_acis=True,
@@ -121,6 +159,7 @@ class Do:
         self.but_group_by_att = but_group_by_att
         self.current_scene = None
         self.dxf_unit_scale = dxf_unit_scale
+        self.proj_offset = None
 
     def proj(self, co, elevation=0):
         """
@@ -140,19 +179,9 @@ class Do:
                 c1 *= u
                 c2 *= u
                 c3 *= u
-            # add
-            add = Vector((0, 0, 0))
-            if "latitude" in self.current_scene and "longitude" in self.current_scene:
-                if PYPROJ and type(self.pScene) not in (TransverseMercator, Indicator):
-                    wgs84 = Proj(init="EPSG:4326")
-                    cscn_lat = self.current_scene.get('latitude', 0)
-                    cscn_lon = self.current_scene.get('longitude', 0)
-                    cscn_alt = self.current_scene.get('altitude', 0)
-                    add = Vector(transform(wgs84, self.pScene, cscn_lon, cscn_lat, cscn_alt))
-
             # projection
             newco = Vector(transform(self.pDXF, self.pScene, c1, c2, c3))
-            newco = newco - add
+            newco = newco - self._proj_offset()
             if any((c == float("inf") or c == float("-inf") for c in newco)):
                 self.errors.add("Projection results in +/- infinity coordinates.")
             return newco
@@ -172,15 +201,54 @@ class Do:
             else:
                 return Vector((co[0], co[1], co[2] + elevation if len(co) == 3 else elevation))
 
+    def _proj_offset(self):
+        """
+        Projected location of the scene's geo-reference, subtracted from projected coordinates.
+        Computed once, until the scene is geo-referenced.
+        """
+        if self.proj_offset is None:
+            add = Vector((0, 0, 0))
+            if "latitude" in self.current_scene and "longitude" in self.current_scene:
+                if PYPROJ and type(self.pScene) not in (TransverseMercator, Indicator):
+                    cscn_lat = self.current_scene.get('latitude', 0)
+                    cscn_lon = self.current_scene.get('longitude', 0)
+                    cscn_alt = self.current_scene.get('altitude', 0)
+                    add = Vector(transform(get_wgs84(), self.pScene, cscn_lon, cscn_lat, cscn_alt))
+            self.proj_offset = add
+        return self.proj_offset
+
+    def proj_array(self, cos, elevation=0):
+        """
+        Same as proj(), for a list of 2D or 3D coordinates, much faster for big ones.
+        :return: array of shape (number of coordinates, 3)
+        """
+        co = np.zeros((len(cos), 3), dtype=np.float64)
+        try:
+            co_in = np.array(cos, dtype=np.float64).reshape(len(cos), -1)
+            co[:, :co_in.shape[1]] = co_in
+        except ValueError:  # 2D and 3D coordinates mixed, like bulgepoly_to_cubic() makes for open polylines
+            for c, c_in in zip(co, cos):
+                c[:len(c_in)] = c_in
+        co[:, 2] += elevation
+        if self.dxf_unit_scale != 1.0:
+            co *= self.dxf_unit_scale
+
+        if self.pScene is not None and self.pDXF is not None and len(co):
+            co = transform_array(self.pDXF, self.pScene, co) - self._proj_offset()
+            if np.any(np.isinf(co)):
+                self.errors.add("Projection results in +/- infinity coordinates.")
+        return co
+
     def georeference(self, scene, center):
+        # Projected coordinates will now be relative to this geo-reference.
+        self.proj_offset = None
         if "latitude" not in scene and "longitude" not in scene:
             if type(self.pScene) is TransverseMercator:
                 scene['latitude'] = self.pScene.lat
                 scene['longitude'] = self.pScene.lon
                 scene['altitude'] = 0
             elif type(self.pScene) is not None:
-                wgs84 = Proj(init="EPSG:4326")
-                latlon = transform(self.pScene, wgs84, center[0], center[1], center[2])
+                latlon = transform(self.pScene, get_wgs84(), center[0], center[1], center[2])
                 scene['longitude'] = latlon[0]
                 scene['latitude'] = latlon[1]
                 scene['altitude'] = latlon[2]
@@ -189,7 +257,7 @@ class Do:
     # type(self, dxf entity, blender curve data)
 
     def _cubic_bezier_closed(self, ptuple, curve):
-        count = (len(ptuple)-1)/3
+        count = (len(ptuple) - 1) // 3
         points = [ptuple[-2]]
         ptuples = ptuple[:-2]
         points += [p for p in ptuples]
@@ -198,29 +266,31 @@ class Do:
         spl.use_cyclic_u = True
         b = spl.bezier_points
         b.add(count - 1)
+        points = self.proj_array(points).tolist()
         for i, j in enumerate(range(1, len(points), 3)):
-            b[i].handle_left = self.proj(points[j - 1])
-            b[i].co = self.proj(points[j])
-            b[i].handle_right = self.proj(points[j + 1])
+            b[i].handle_left = points[j - 1]
+            b[i].co = points[j]
+            b[i].handle_right = points[j + 1]
 
     def _cubic_bezier_open(self, points, curve):
-        count = (len(points) - 1) / 3 + 1
+        count = (len(points) - 1) // 3 + 1
         spl = curve.splines.new('BEZIER')
         b = spl.bezier_points
         b.add(count - 1)
+        points = self.proj_array(points).tolist()
 
-        b[0].co = self.proj(points[0])
-        b[0].handle_left = self.proj(points[0])
-        b[0].handle_right = self.proj(points[1])
+        b[0].co = points[0]
+        b[0].handle_left = points[0]
+        b[0].handle_right = points[1]
 
-        b[-1].co = self.proj(points[-1])
-        b[-1].handle_right = self.proj(points[-1])
-        b[-1].handle_left = self.proj(points[-2])
+        b[-1].co = points[-1]
+        b[-1].handle_right = points[-1]
+        b[-1].handle_left = points[-2]
 
         for i, j in enumerate(range(3, len(points) - 2, 3), 1):
-            b[i].handle_left = self.proj(points[j - 1])
-            b[i].co = self.proj(points[j])
-            b[i].handle_right = self.proj(points[j + 1])
+            b[i].handle_left = points[j - 1]
+            b[i].co = points[j]
+            b[i].handle_right = points[j + 1]
 
     def _cubic_bezier(self, points, curve, is_closed):
         """
@@ -245,8 +315,9 @@ class Do:
         p.use_cyclic_u = is_closed
         p.points.add(len(points) - 1)
 
-        for i, pt in enumerate(points):
-            p.points[i].co = self.proj(pt, elevation).to_4d()
+        co = np.ones((len(points), 4))
+        co[:, :3] = self.proj_array(points, elevation)
+        p.points.foreach_set("co", co.ravel())
 
     def _gen_poly(self, en, curve, elevation=0):
         if any([b != 0 for b in en.bulge]):
@@ -500,9 +571,7 @@ class Do:
             else:
                 i += 1
 
-        verts = []
-        for p in points:
-            verts.append(bm.verts.new(self.proj(p)))
+        verts = [bm.verts.new(co) for co in self.proj_array(points).tolist()]
 
         # add only an edge if len points < 3
         if len(points) == 2:
@@ -1224,8 +1293,9 @@ class Do:
             verts = []
             if is_.extrusion(en):
                 t = convert.extrusion_to_matrix(en)
-            for p in en.points:
-                verts.append(bm.verts.new(self.proj((t*Vector(p)).to_3d())))
+            if en.points:
+                co = self.proj_array([(t*Vector(p)).to_3d() for p in en.points])
+                verts = [bm.verts.new(c) for c in co.tolist()]
             if len(verts) > 2:
                 bm.faces.new(verts)
             elif len(verts) == 2:
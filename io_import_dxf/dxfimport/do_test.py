@@ -0,0 +1,127 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+# Compares the batch projection of DXF coordinates with the per point one, needs Blender:
+#     blender -b --factory-startup --python io_import_dxf/dxfimport/do_test.py
+
+import os
+import tempfile
+import unittest
+
+import bpy
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    from io_import_dxf import dxfgrabber
+    from io_import_dxf.dxfimport import convert
+    from io_import_dxf.dxfimport.do import Do
+else:
+    from .. import dxfgrabber
+    from . import convert
+    from .do import Do
+
+
+# An open LWPOLYLINE with a bulge on its first segment.
+DXF_LWPOLYLINE = """0
+SECTION
+2
+ENTITIES
+0
+LWPOLYLINE
+8
+0
+90
+3
+70
+0
+38
+2.0
+10
+0.0
+20
+0.0
+42
+1.0
+10
+2.0
+20
+0.0
+10
+2.0
+20
+2.0
+0
+ENDSEC
+0
+EOF
+"""
+
+
+class ProjArrayTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.filepath = os.path.join(cls.tmpdir.name, "lwpolyline.dxf")
+        with open(cls.filepath, 'w') as f:
+            f.write(DXF_LWPOLYLINE)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def assertSameProj(self, do, points, elevation=0):
+        co = do.proj_array(points, elevation)
+        self.assertEqual(co.shape, (len(points), 3))
+        for c, point in zip(co.tolist(), points):
+            self.assertEqual(c, list(do.proj(point, elevation)))
+
+    def test_mixed_dimensions(self):
+        do = Do(self.filepath)
+        self.assertSameProj(do, [(1.0, 2.0, 3.0), (4.0, 5.0)], elevation=2.0)
+        do.dxf_unit_scale = 0.5
+        self.assertSameProj(do, [(4.0, 5.0), (1.0, 2.0, 3.0)], elevation=2.0)
+
+    def test_bulged_open_lwpolyline(self):
+        do = Do(self.filepath)
+        # 2D points, as read without assure_3d_coords
+        en = next(en for en in dxfgrabber.readfile(self.filepath).entities if en.dxftype == 'LWPOLYLINE')
+        self.assertEqual(len(en.points[-1]), 2)
+        self.assertFalse(en.is_closed)
+
+        points = convert.bulgepoly_to_cubic(do, en)
+        self.assertEqual({len(p) for p in points}, {2, 3})
+        self.assertSameProj(do, points)
+
+        curve = bpy.data.curves.new("test", 'CURVE')
+        try:
+            do.lwpolyline(en, curve)
+            bezier_points = curve.splines[0].bezier_points
+            self.assertEqual(len(bezier_points), (len(points) - 1) // 3 + 1)
+            self.assertEqual(tuple(bezier_points[-1].co), (2.0, 2.0, 0.0))
+        finally:
+            bpy.data.curves.remove(curve)
+
+
+if __name__ == '__main__':
+    import sys
+    # Blender's own arguments are not for unittest.
+    unittest.main(argv=[sys.argv[0]] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []),
+                  verbosity=2, exit=False)
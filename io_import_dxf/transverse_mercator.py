@@ -20,6 +20,8 @@
 
 from math import sin, cos, atan, atanh, radians, tan, sinh, asin, cosh, degrees
 
+import numpy as np
+
 # see conversion formulas at
 # http://en.wikipedia.org/wiki/Transverse_Mercator_projection
 # http://mathworld.wolfram.com/MercatorProjection.html
@@ -52,3 +54,24 @@ class TransverseMercator:
         lon = self.lon + degrees(lon)
         lat = degrees(lat)
         return lat, lon
+
+    # Same as above, on arrays of coordinates.
+
+    def fromGeographicArray(self, lat, lon):
+        lat_rad = np.radians(lat)
+        lon_rad = np.radians(lon)
+        B = np.cos(lat_rad) * np.sin(lon_rad - self.lon_rad)
+        x = self.radius * np.arctanh(B)
+        y = self.radius * (np.arctan(np.tan(lat_rad) / np.cos(lon_rad - self.lon_rad)) - self.lat_rad)
+        return x, y
+
+    def toGeographicArray(self, x, y):
+        x = np.asarray(x) / self.radius
+        y = np.asarray(y) / self.radius
+        D = y + self.lat_rad
+        lon = np.arctan(np.sinh(x) / np.cos(D))
+        lat = np.arcsin(np.sin(D) / np.cosh(x))
+
+        lon = self.lon + np.degrees(lon)
+        lat = np.degrees(lat)
+        return lat, lon
@@ -80,6 +80,15 @@ class ImportPLY(bpy.types.Operator, ImportHelper):
     filename_ext = ".ply"
     filter_glob: StringProperty(default="*.ply", options={'HIDDEN'})
 
+    use_verts_only: BoolProperty(
+        name="Points Only",
+        description=(
+            "Only import vertices, skipping edges, faces, UVs and colors "
+            "(much faster for large point cloud scans)"
+        ),
+        default=False,
+    )
+
     def execute(self, context):
         import os
         from . import import_ply
@@ -95,7 +104,7 @@ class ImportPLY(bpy.types.Operator, ImportHelper):
             paths.append(self.filepath)
 
         for path in paths:
-            import_ply.load(self, context, path)
+            import_ply.load(self, context, path, use_verts_only=self.use_verts_only)
 
         context.window.cursor_set('DEFAULT')
 
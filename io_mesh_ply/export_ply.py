@@ -24,62 +24,107 @@ colors, and texture coordinates per face or per vertex.
 """
 
 
-def _write_binary(fw, ply_verts, ply_faces, mesh_verts):
-    from struct import pack
+# Amount of vertices or faces formatted at once in ASCII files.
+ASCII_BLOCK_SIZE = 65536
+
+
+def _write_binary(fw, ply_verts, faces_size, faces_vidx):
+    import numpy as np
 
     # Vertex data
     # ---------------------------
 
-    for index, normal, uv_coords, color in ply_verts:
-        fw(pack("<3f", *mesh_verts[index].co))
-        if normal is not None:
-            fw(pack("<3f", *normal))
-        if uv_coords is not None:
-            fw(pack("<2f", *uv_coords))
-        if color is not None:
-            fw(pack("<4B", *color))
+    fw(ply_verts.tobytes())
 
     # Face data
     # ---------------------------
 
-    for pf in ply_faces:
-        length = len(pf)
-        fw(pack("<B%dI" % length, length, *pf))
+    # Each face is an uchar length followed by its uint indices.
+    faces_nbytes = 1 + 4 * faces_size
+    faces_offset = np.cumsum(faces_nbytes) - faces_nbytes
+    data = np.empty(np.sum(faces_nbytes), dtype=np.uint8)
+    data[faces_offset] = faces_size
+    faces_loop_start = np.cumsum(faces_size) - faces_size
+    loops_offset = (
+        np.repeat(faces_offset + 1 - 4 * faces_loop_start, faces_size) +
+        4 * np.arange(len(faces_vidx))
+    )
+    vidx_bytes = faces_vidx.astype("<u4").view(np.uint8).reshape(-1, 4)
+    data[loops_offset[:, None] + np.arange(4)] = vidx_bytes
+    fw(data.tobytes())
 
 
-def _write_ascii(fw, ply_verts, ply_faces, mesh_verts):
+def _write_ascii(fw, ply_verts, faces_size, faces_vidx):
+    from itertools import chain
+    import numpy as np
 
     # Vertex data
     # ---------------------------
 
-    for index, normal, uv_coords, color in ply_verts:
-        fw(b"%.6f %.6f %.6f" % mesh_verts[index].co[:])
-        if normal is not None:
-            fw(b" %.6f %.6f %.6f" % normal)
-        if uv_coords is not None:
-            fw(b" %.6f %.6f" % uv_coords)
-        if color is not None:
-            fw(b" %u %u %u %u" % color)
-        fw(b"\n")
+    fmt = b"%.6f %.6f %.6f"
+    if "nx" in ply_verts.dtype.names:
+        fmt += b" %.6f %.6f %.6f"
+    if "s" in ply_verts.dtype.names:
+        fmt += b" %.6f %.6f"
+    if "red" in ply_verts.dtype.names:
+        fmt += b" %u %u %u %u"
+    fmt += b"\n"
+
+    for i in range(0, len(ply_verts), ASCII_BLOCK_SIZE):
+        block = ply_verts[i:i + ASCII_BLOCK_SIZE].tolist()
+        fw((fmt * len(block)) % tuple(chain.from_iterable(block)))
 
     # Face data
     # ---------------------------
 
-    for pf in ply_faces:
-        fw(b"%d" % len(pf))
-        for index in pf:
-            fw(b" %d" % index)
-        fw(b"\n")
+    # Interleave the length of each face with its indices.
+    faces_offset = np.cumsum(faces_size + 1) - (faces_size + 1)
+    values = np.empty(len(faces_size) + len(faces_vidx), dtype=np.int64)
+    values[faces_offset] = faces_size
+    values[np.delete(np.arange(len(values)), faces_offset)] = faces_vidx
+
+    faces_fmt = {}
+    for i in range(0, len(faces_size), ASCII_BLOCK_SIZE):
+        block_sizes = faces_size[i:i + ASCII_BLOCK_SIZE].tolist()
+        fmt = []
+        for size in block_sizes:
+            face_fmt = faces_fmt.get(size)
+            if face_fmt is None:
+                face_fmt = faces_fmt[size] = b"%d" + b" %d" * size + b"\n"
+            fmt.append(face_fmt)
+        start = faces_offset[i]
+        end = start + len(block_sizes) + sum(block_sizes)
+        fw(b"".join(fmt) % tuple(values[start:end].tolist()))
+
+
+def _unique_first_seen(keys):
+    """
+    Deduplicate the rows of keys, unique rows being ordered by first
+    occurrence. Returns the index of the first occurrence of each unique row,
+    and the unique row index of each row.
+    """
+    import numpy as np
+
+    if not len(keys):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    _, first_index, inverse = np.unique(
+        keys, axis=0, return_index=True, return_inverse=True,
+    )
+    order = np.argsort(first_index)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return first_index[order], rank[inverse.ravel()]
 
 
-def save_mesh(filepath, mesh, use_ascii, use_normals, use_uv_coords, use_colors):
+def save_mesh(
+    filepath, mesh, use_ascii, use_normals, use_uv_coords, use_colors,
+):
     import bpy
+    import numpy as np
 
-    def rvec3d(v):
-        return round(v[0], 6), round(v[1], 6), round(v[2], 6)
-
-    def rvec2d(v):
-        return round(v[0], 6), round(v[1], 6)
+    def rvec_key(v):
+        # Same as rounding to 6 decimals, as integers.
+        return np.rint(v.astype(np.float64) * 1e6).astype(np.int64)
 
     if use_uv_coords and mesh.uv_layers:
         active_uv_layer = mesh.uv_layers.active.data
@@ -91,66 +136,83 @@ def save_mesh(filepath, mesh, use_ascii, use_normals, use_uv_coords, use_colors)
     else:
         use_colors = False
 
-    # in case
-    color = uvcoord = uvcoord_key = normal = normal_key = None
-
-    mesh_verts = mesh.vertices
-    # vdict = {} # (index, normal, uv) -> new index
-    vdict = [{} for i in range(len(mesh_verts))]
-    ply_verts = []
-    ply_faces = [[] for f in range(len(mesh.polygons))]
-    vert_count = 0
+    nbr_verts = len(mesh.vertices)
+    nbr_faces = len(mesh.polygons)
+    nbr_loops = len(mesh.loops)
+
+    faces_loop_start = np.empty(nbr_faces, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", faces_loop_start)
+    faces_size = np.empty(nbr_faces, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", faces_size)
+    faces_size = faces_size.astype(np.int64)
+    loops_vidx = np.empty(nbr_loops, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loops_vidx)
+
+    # Loops in faces order.
+    loops_offset = np.cumsum(faces_size) - faces_size
+    loops_order = (
+        np.arange(np.sum(faces_size)) +
+        np.repeat(faces_loop_start - loops_offset, faces_size)
+    )
+    loops_face = np.repeat(np.arange(nbr_faces), faces_size)
+    loops_vidx = loops_vidx[loops_order].astype(np.int64)
 
-    for i, f in enumerate(mesh.polygons):
+    verts_co = np.empty(nbr_verts * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", verts_co)
+    verts_co = verts_co.reshape(-1, 3)
 
-        if use_normals:
-            smooth = f.use_smooth
-            if not smooth:
-                normal = f.normal[:]
-                normal_key = rvec3d(normal)
+    # A PLY vertex is written for each unique (vertex, normal, uv, color)
+    # combination used by the loops.
+    keys = [loops_vidx[:, None]]
+    fields = [("x", "<f4"), ("y", "<f4"), ("z", "<f4")]
 
-        if use_uv_coords:
-            uv = [
-                active_uv_layer[l].uv[:]
-                for l in range(f.loop_start, f.loop_start + f.loop_total)
-            ]
-        if use_colors:
-            col = [
-                active_col_layer[l].color[:]
-                for l in range(f.loop_start, f.loop_start + f.loop_total)
-            ]
-
-        pf = ply_faces[i]
-        for j, vidx in enumerate(f.vertices):
-            v = mesh_verts[vidx]
-
-            if use_normals and smooth:
-                normal = v.normal[:]
-                normal_key = rvec3d(normal)
-
-            if use_uv_coords:
-                uvcoord = uv[j][0], uv[j][1]
-                uvcoord_key = rvec2d(uvcoord)
-
-            if use_colors:
-                color = col[j]
-                color = (
-                    int(color[0] * 255.0),
-                    int(color[1] * 255.0),
-                    int(color[2] * 255.0),
-                    int(color[3] * 255.0),
-                )
-            key = normal_key, uvcoord_key, color
-
-            vdict_local = vdict[vidx]
-            pf_vidx = vdict_local.get(key)  # Will be None initially
-
-            if pf_vidx is None:  # Same as vdict_local.has_key(key)
-                pf_vidx = vdict_local[key] = vert_count
-                ply_verts.append((vidx, normal, uvcoord, color))
-                vert_count += 1
-
-            pf.append(pf_vidx)
+    if use_normals:
+        # Smooth faces use vertex normals, others their own normal.
+        verts_normal = np.empty(nbr_verts * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("normal", verts_normal)
+        faces_normal = np.empty(nbr_faces * 3, dtype=np.float32)
+        mesh.polygons.foreach_get("normal", faces_normal)
+        faces_smooth = np.empty(nbr_faces, dtype=bool)
+        mesh.polygons.foreach_get("use_smooth", faces_smooth)
+        loops_normal = np.where(
+            faces_smooth[loops_face, None],
+            verts_normal.reshape(-1, 3)[loops_vidx],
+            faces_normal.reshape(-1, 3)[loops_face],
+        )
+        keys.append(rvec_key(loops_normal))
+        fields += [("nx", "<f4"), ("ny", "<f4"), ("nz", "<f4")]
+
+    if use_uv_coords:
+        loops_uv = np.empty(nbr_loops * 2, dtype=np.float32)
+        active_uv_layer.foreach_get("uv", loops_uv)
+        loops_uv = loops_uv.reshape(-1, 2)[loops_order]
+        keys.append(rvec_key(loops_uv))
+        fields += [("s", "<f4"), ("t", "<f4")]
+
+    if use_colors:
+        loops_color = np.empty(nbr_loops * 4, dtype=np.float32)
+        active_col_layer.foreach_get("color", loops_color)
+        loops_color = loops_color.reshape(-1, 4)[loops_order]
+        # Colors outside of [0, 1] (e.g. HDR vertex colors) would wrap around in unsigned bytes.
+        loops_color = np.clip(loops_color.astype(np.float64) * 255.0, 0.0, 255.0).astype(np.int64)
+        keys.append(loops_color)
+        fields += [
+            ("red", "u1"), ("green", "u1"), ("blue", "u1"), ("alpha", "u1"),
+        ]
+
+    ply_verts_loop, faces_vidx = _unique_first_seen(np.hstack(keys))
+
+    ply_verts = np.empty(len(ply_verts_loop), dtype=fields)
+    names = ply_verts.dtype.names
+    columns = [verts_co[loops_vidx[ply_verts_loop]]]
+    if use_normals:
+        columns.append(loops_normal[ply_verts_loop])
+    if use_uv_coords:
+        columns.append(loops_uv[ply_verts_loop])
+    if use_colors:
+        columns.append(loops_color[ply_verts_loop])
+    for name, values in zip(names, np.hstack(columns).T):
+        ply_verts[name] = values
 
     with open(filepath, "wb") as file:
         fw = file.write
@@ -188,7 +250,7 @@ def save_mesh(filepath, mesh, use_ascii, use_normals, use_uv_coords, use_colors)
                 b"property uchar alpha\n"
             )
 
-        fw(b"element face %d\n" % len(mesh.polygons))
+        fw(b"element face %d\n" % nbr_faces)
         fw(b"property list uchar uint vertex_indices\n")
         fw(b"end_header\n")
 
@@ -196,9 +258,9 @@ def save_mesh(filepath, mesh, use_ascii, use_normals, use_uv_coords, use_colors)
         # ---------------------------
 
         if use_ascii:
-            _write_ascii(fw, ply_verts, ply_faces, mesh_verts)
+            _write_ascii(fw, ply_verts, faces_size, faces_vidx)
         else:
-            _write_binary(fw, ply_verts, ply_faces, mesh_verts)
+            _write_binary(fw, ply_verts, faces_size, faces_vidx)
 
 
 def save(
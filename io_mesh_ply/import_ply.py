@@ -36,6 +36,44 @@ class ElementSpec:
             stream = stream.readline().split()
         return [x.load(format, stream) for x in self.properties]
 
+    def load_binary(self, format, stream):
+        """
+        Load all elements at once, as a NumPy structured array where property i is field 'p%d' % i.
+        Only possible when elements have a fixed size in the file (no string, all lists of a property having
+        the same length), else return None, the stream being left unchanged.
+        """
+        import numpy as np
+
+        if any(p.numeric_type == 's' or p.list_type == 's' for p in self.properties):
+            return None
+
+        start = stream.tell()
+        list_lengths = {}
+        if self.count and any(p.list_type is not None for p in self.properties):
+            first = self.load(format, stream)
+            stream.seek(start)
+            list_lengths = {i: len(first[i]) for i, p in enumerate(self.properties) if p.list_type is not None}
+
+        fields = []
+        for i, p in enumerate(self.properties):
+            if p.list_type is None:
+                fields.append(("p%d" % i, format + p.numeric_type))
+            else:
+                fields.append(("c%d" % i, format + p.list_type))
+                fields.append(("p%d" % i, format + p.numeric_type, (list_lengths.get(i, 0),)))
+        dtype = np.dtype(fields)
+
+        data = stream.read(dtype.itemsize * self.count)
+        if len(data) != dtype.itemsize * self.count:
+            stream.seek(start)
+            return None
+        elements = np.frombuffer(data, dtype=dtype)
+        for i, length in list_lengths.items():
+            if np.any(elements["c%d" % i] != length):
+                stream.seek(start)
+                return None
+        return elements
+
     def index(self, name):
         for i, p in enumerate(self.properties):
             if p.name == name:
@@ -109,16 +147,26 @@ class ObjectSpec:
         # A list of element_specs
         self.specs = []
 
-    def load(self, format, stream):
-        return {
-            i.name: [
-                i.load(format, stream) for j in range(i.count)
-            ]
-            for i in self.specs
-        }
+    def load(self, format, stream, element_names=None):
+        """
+        Binary elements of fixed size are loaded as NumPy structured arrays (see ElementSpec.load_binary),
+        others as lists of property values.
+        If element_names is given, reading stops once all of these elements are loaded.
+        """
+        obj = {}
+        for i in self.specs:
+            if element_names is not None and all(name in obj for name in element_names):
+                break
+            elements = None
+            if format != b'ascii':
+                elements = i.load_binary(format, stream)
+            if elements is None:
+                elements = [i.load(format, stream) for j in range(i.count)]
+            obj[i.name] = elements
+        return obj
 
 
-def read(filepath):
+def read(filepath, element_names=None):
     import re
 
     format = b''
@@ -244,15 +292,25 @@ def read(filepath):
             print("Invalid header ('end_header' line not found!)")
             return invalid_ply
 
-        obj = obj_spec.load(format_specs[format], plyf)
+        obj = obj_spec.load(format_specs[format], plyf, element_names)
 
     return obj_spec, obj, texture
 
 
-def load_ply_mesh(filepath, ply_name):
+def _element_property(elements, index, dtype):
+    """Values of the property at index of all elements, as a NumPy array."""
+    import numpy as np
+
+    if isinstance(elements, np.ndarray):
+        return elements["p%d" % index].astype(dtype)
+    return np.array([e[index] for e in elements], dtype=dtype)
+
+
+def load_ply_mesh(filepath, ply_name, use_verts_only=False):
     import bpy
+    import numpy as np
 
-    obj_spec, obj, texture = read(filepath)
+    obj_spec, obj, texture = read(filepath, (b'vertex',) if use_verts_only else None)
     # XXX28: use texture
     if obj is None:
         print("Invalid file")
@@ -291,42 +349,17 @@ def load_ply_mesh(filepath, ply_name):
         elif el.name == b'edge':
             eindex1, eindex2 = el.index(b'vertex1'), el.index(b'vertex2')
 
+    # Vertex indices of the faces, as arrays of faces of a same size.
     mesh_faces = []
-    mesh_uvs = []
-    mesh_colors = []
+    # Faces of various sizes, when they could not be read as an array.
+    mesh_faces_list = []
 
-    def add_face(vertices, indices, uvindices, colindices):
-        mesh_faces.append(indices)
-        if uvindices:
-            mesh_uvs.extend([(vertices[index][uvindices[0]], vertices[index][uvindices[1]]) for index in indices])
-        if colindices:
-            if len(colindices) == 3:
-                mesh_colors.extend([
-                    (
-                        vertices[index][colindices[0]] * colmultiply[0],
-                        vertices[index][colindices[1]] * colmultiply[1],
-                        vertices[index][colindices[2]] * colmultiply[2],
-                        1.0,
-                    )
-                    for index in indices
-                ])
-            elif len(colindices) == 4:
-                mesh_colors.extend([
-                    (
-                        vertices[index][colindices[0]] * colmultiply[0],
-                        vertices[index][colindices[1]] * colmultiply[1],
-                        vertices[index][colindices[2]] * colmultiply[2],
-                        vertices[index][colindices[3]] * colmultiply[3],
-                    )
-                    for index in indices
-                ])
-
-    if uvindices or colindices:
-        # If we have Cols or UVs then we need to check the face order.
-        add_face_simple = add_face
-
-        # EVIL EEKADOODLE - face order annoyance.
-        def add_face(vertices, indices, uvindices, colindices):
+    # If we have Cols or UVs then we need to check the face order.
+    fix_face_order = bool(uvindices or colindices)
+
+    # EVIL EEKADOODLE - face order annoyance.
+    def add_face(indices):
+        if fix_face_order:
             if len(indices) == 4:
                 if indices[2] == 0 or indices[3] == 0:
                     indices = indices[2], indices[3], indices[0], indices[1]
@@ -334,64 +367,91 @@ def load_ply_mesh(filepath, ply_name):
                 if indices[2] == 0:
                     indices = indices[1], indices[2], indices[0]
 
-            add_face_simple(vertices, indices, uvindices, colindices)
+        mesh_faces_list.append(indices)
+
+    def add_faces_array(faces):
+        if fix_face_order:
+            faces = faces.copy()
+            if faces.shape[1] == 4:
+                swap = (faces[:, 2] == 0) | (faces[:, 3] == 0)
+                faces[swap] = faces[swap][:, (2, 3, 0, 1)]
+            elif faces.shape[1] == 3:
+                swap = faces[:, 2] == 0
+                faces[swap] = faces[swap][:, (1, 2, 0)]
+
+        mesh_faces.append(faces)
 
     verts = obj[b'vertex']
 
-    if b'face' in obj:
-        for f in obj[b'face']:
-            ind = f[findex]
-            add_face(verts, ind, uvindices, colindices)
+    if b'face' in obj and not use_verts_only:
+        if isinstance(obj[b'face'], np.ndarray):
+            add_faces_array(obj[b'face']["p%d" % findex].astype(np.int64))
+        else:
+            for f in obj[b'face']:
+                ind = f[findex]
+                add_face(ind)
 
-    if b'tristrips' in obj:
-        for t in obj[b'tristrips']:
-            ind = t[trindex]
+    if b'tristrips' in obj and not use_verts_only:
+        if isinstance(obj[b'tristrips'], np.ndarray):
+            tristrips = obj[b'tristrips']["p%d" % trindex].tolist()
+        else:
+            tristrips = [t[trindex] for t in obj[b'tristrips']]
+        for ind in tristrips:
             len_ind = len(ind)
             for j in range(len_ind - 2):
-                add_face(verts, (ind[j], ind[j + 1], ind[j + 2]), uvindices, colindices)
+                add_face((ind[j], ind[j + 1], ind[j + 2]))
+
+    if mesh_faces_list:
+        mesh_faces.append(mesh_faces_list)
 
     mesh = bpy.data.meshes.new(name=ply_name)
 
-    mesh.vertices.add(len(obj[b'vertex']))
+    mesh.vertices.add(len(verts))
 
-    mesh.vertices.foreach_set("co", [a for v in obj[b'vertex'] for a in (v[vindices_x], v[vindices_y], v[vindices_z])])
+    verts_co = np.column_stack([_element_property(verts, i, np.float32) for i in (vindices_x, vindices_y, vindices_z)])
+    mesh.vertices.foreach_set("co", verts_co.ravel())
 
-    if b'edge' in obj:
-        mesh.edges.add(len(obj[b'edge']))
-        mesh.edges.foreach_set("vertices", [a for e in obj[b'edge'] for a in (e[eindex1], e[eindex2])])
+    if b'edge' in obj and not use_verts_only:
+        edges = obj[b'edge']
+        mesh.edges.add(len(edges))
+        edges_vidx = np.column_stack([_element_property(edges, i, np.int32) for i in (eindex1, eindex2)])
+        mesh.edges.foreach_set("vertices", edges_vidx.ravel())
 
     if mesh_faces:
         loops_vert_idx = []
-        faces_loop_start = []
         faces_loop_total = []
-        lidx = 0
-        for f in mesh_faces:
-            nbr_vidx = len(f)
-            loops_vert_idx.extend(f)
-            faces_loop_start.append(lidx)
-            faces_loop_total.append(nbr_vidx)
-            lidx += nbr_vidx
+        for faces in mesh_faces:
+            if isinstance(faces, np.ndarray):
+                loops_vert_idx.append(faces.ravel())
+                faces_loop_total.append(np.full(len(faces), faces.shape[1], dtype=np.int32))
+            else:
+                loops_vert_idx.append(np.fromiter((vidx for f in faces for vidx in f), dtype=np.int64))
+                faces_loop_total.append(np.fromiter((len(f) for f in faces), dtype=np.int32, count=len(faces)))
+        loops_vert_idx = np.concatenate(loops_vert_idx)
+        faces_loop_total = np.concatenate(faces_loop_total)
+        faces_loop_start = np.cumsum(faces_loop_total, dtype=np.int32) - faces_loop_total
 
         mesh.loops.add(len(loops_vert_idx))
-        mesh.polygons.add(len(mesh_faces))
+        mesh.polygons.add(len(faces_loop_total))
 
-        mesh.loops.foreach_set("vertex_index", loops_vert_idx)
+        mesh.loops.foreach_set("vertex_index", loops_vert_idx.astype(np.int32))
         mesh.polygons.foreach_set("loop_start", faces_loop_start)
         mesh.polygons.foreach_set("loop_total", faces_loop_total)
 
+        # Invalid vertex indices are removed by validate() below, clamp them meanwhile.
+        loops_vert_idx = np.clip(loops_vert_idx, 0, max(len(verts) - 1, 0))
+
         if uvindices:
             uv_layer = mesh.uv_layers.new()
-            for i, uv in enumerate(uv_layer.data):
-                uv.uv = mesh_uvs[i]
+            verts_uv = np.column_stack([_element_property(verts, i, np.float32) for i in uvindices])
+            uv_layer.data.foreach_set("uv", verts_uv[loops_vert_idx].ravel())
 
         if colindices:
             vcol_lay = mesh.vertex_colors.new()
-
-            for i, col in enumerate(vcol_lay.data):
-                col.color[0] = mesh_colors[i][0]
-                col.color[1] = mesh_colors[i][1]
-                col.color[2] = mesh_colors[i][2]
-                col.color[3] = mesh_colors[i][3]
+            verts_col = np.ones((len(verts), 4), dtype=np.float32)
+            for i, (colindex, multiply) in enumerate(zip(colindices, colmultiply)):
+                verts_col[:, i] = _element_property(verts, colindex, np.float64) * multiply
+            vcol_lay.data.foreach_set("color", verts_col[loops_vert_idx].ravel())
 
     mesh.update()
     mesh.validate()
@@ -428,14 +488,14 @@ def load_ply_mesh(filepath, ply_name):
     return mesh
 
 
-def load_ply(filepath):
+def load_ply(filepath, use_verts_only=False):
     import time
     import bpy
 
     t = time.time()
     ply_name = bpy.path.display_name_from_filepath(filepath)
 
-    mesh = load_ply_mesh(filepath, ply_name)
+    mesh = load_ply_mesh(filepath, ply_name, use_verts_only)
     if not mesh:
         return {'CANCELLED'}
 
@@ -452,5 +512,5 @@ def load_ply(filepath):
     return {'FINISHED'}
 
 
-def load(operator, context, filepath=""):
-    return load_ply(filepath)
+def load(operator, context, filepath="", use_verts_only=False):
+    return load_ply(filepath, use_verts_only)
@@ -0,0 +1,117 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+# Compares the meshes imported from binary and ASCII PLY files, needs Blender:
+#     blender -b --factory-startup --python io_mesh_ply/import_ply_test.py
+
+import os
+import struct
+import tempfile
+import unittest
+
+import bpy
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    from io_mesh_ply import import_ply
+else:
+    from . import import_ply
+
+
+VERTS = ((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (1.0, 1.0, 0.0), (0.0, 2.0, 0.0), (1.0, 2.0, 0.0))
+FACES = ((0, 1, 3), (0, 3, 2))
+TRISTRIPS = ((2, 3, 4, 5),)
+
+
+def ply_header(format, element_names):
+    lines = ["ply", "format %s 1.0" % format,
+             "element vertex %d" % len(VERTS), "property float x", "property float y", "property float z"]
+    if "face" in element_names:
+        lines += ["element face %d" % len(FACES), "property list uchar int vertex_indices"]
+    if "tristrips" in element_names:
+        lines += ["element tristrips %d" % len(TRISTRIPS), "property list int int vertex_indices"]
+    lines.append("end_header")
+    return ("\n".join(lines) + "\n").encode('ascii')
+
+
+def ply_ascii(element_names):
+    lines = ["%g %g %g" % co for co in VERTS]
+    if "face" in element_names:
+        lines += ["%d %s" % (len(f), " ".join(map(str, f))) for f in FACES]
+    if "tristrips" in element_names:
+        lines += ["%d %s" % (len(t), " ".join(map(str, t))) for t in TRISTRIPS]
+    return ply_header("ascii", element_names) + ("\n".join(lines) + "\n").encode('ascii')
+
+
+def ply_binary(element_names):
+    data = [ply_header("binary_little_endian", element_names)]
+    data += [struct.pack("<3f", *co) for co in VERTS]
+    if "face" in element_names:
+        data += [struct.pack("<B%di" % len(f), len(f), *f) for f in FACES]
+    if "tristrips" in element_names:
+        data += [struct.pack("<i%di" % len(t), len(t), *t) for t in TRISTRIPS]
+    return b"".join(data)
+
+
+class ImportPLYTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def import_mesh(self, filename, data):
+        """Import the data and return the vertices and faces of the mesh, which is then removed."""
+        filepath = os.path.join(self.tmpdir.name, filename)
+        with open(filepath, 'wb') as f:
+            f.write(data)
+        mesh = import_ply.load_ply_mesh(filepath, "test")
+        result = (
+            [tuple(v.co) for v in mesh.vertices],
+            sorted(tuple(p.vertices) for p in mesh.polygons),
+        )
+        bpy.data.meshes.remove(mesh)
+        return result
+
+    def assertSameImport(self, element_names):
+        binary = self.import_mesh("binary.ply", ply_binary(element_names))
+        ascii = self.import_mesh("ascii.ply", ply_ascii(element_names))
+        self.assertEqual(binary, ascii)
+        self.assertEqual(binary[0], list(VERTS))
+        return binary[1]
+
+    def test_faces(self):
+        self.assertEqual(len(self.assertSameImport(("face",))), len(FACES))
+
+    def test_tristrips(self):
+        self.assertEqual(len(self.assertSameImport(("tristrips",))), 2)
+
+    def test_faces_and_tristrips(self):
+        self.assertEqual(len(self.assertSameImport(("face", "tristrips"))), len(FACES) + 2)
+
+
+if __name__ == '__main__':
+    import sys
+    # Blender's own arguments are not for unittest.
+    unittest.main(argv=[sys.argv[0]] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []),
+                  verbosity=2, exit=False)
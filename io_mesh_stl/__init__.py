@@ -108,6 +108,14 @@ class ImportSTL(Operator, ImportHelper):
         description="Use (import) facet normals (note that this will still give flat shading)",
         default=False,
     )
+    merge_distance: FloatProperty(
+        name="Merge Distance",
+        description="Also merge vertices closer than this distance, in file units "
+                    "(0 only merges vertices with the same coordinates)",
+        min=0.0, soft_max=1.0,
+        default=0.0,
+        precision=6,
+    )
 
     def execute(self, context):
         import os
@@ -140,7 +148,7 @@ class ImportSTL(Operator, ImportHelper):
 
         for path in paths:
             objName = bpy.path.display_name_from_filepath(path)
-            tris, tri_nors, pts = stl_utils.read_stl(path)
+            tris, tri_nors, pts = stl_utils.read_stl_array(path, self.merge_distance)
             tri_nors = tri_nors if self.use_facet_normal else None
             blender_utils.create_and_link_mesh(objName, tris, tri_nors, pts, global_matrix)
 
@@ -200,6 +208,7 @@ class STL_PT_import_geometry(bpy.types.Panel):
         operator = sfile.active_operator
 
         layout.prop(operator, "use_facet_normal")
+        layout.prop(operator, "merge_distance")
 
 
 @orientation_helper(axis_forward='Y', axis_up='Z')
@@ -250,7 +259,7 @@ class ExportSTL(Operator, ExportHelper):
 
     def execute(self, context):
         import os
-        import itertools
+        import numpy as np
         from mathutils import Matrix
         from . import stl_utils
         from . import blender_utils
@@ -286,16 +295,17 @@ class ExportSTL(Operator, ExportHelper):
         ).to_4x4() @ Matrix.Scale(global_scale, 4)
 
         if self.batch_mode == 'OFF':
-            faces = itertools.chain.from_iterable(
-                    blender_utils.faces_from_mesh(ob, global_matrix, self.use_mesh_modifiers)
-                    for ob in data_seq)
+            faces = np.concatenate([
+                blender_utils.faces_array_from_mesh(ob, global_matrix, self.use_mesh_modifiers)
+                for ob in data_seq
+            ] or [np.empty((0, 3, 3), dtype=np.float32)])
 
             stl_utils.write_stl(faces=faces, **keywords)
         elif self.batch_mode == 'OBJECT':
             prefix = os.path.splitext(self.filepath)[0]
             keywords_temp = keywords.copy()
             for ob in data_seq:
-                faces = blender_utils.faces_from_mesh(ob, global_matrix, self.use_mesh_modifiers)
+                faces = blender_utils.faces_array_from_mesh(ob, global_matrix, self.use_mesh_modifiers)
                 keywords_temp["filepath"] = prefix + bpy.path.clean_name(ob.name) + ".stl"
                 stl_utils.write_stl(faces=faces, **keywords_temp)
 
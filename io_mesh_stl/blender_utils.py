@@ -22,35 +22,45 @@
 def create_and_link_mesh(name, faces, face_nors, points, global_matrix):
     """
     Create a blender mesh and object called name from a list of
-    *points* and *faces* and link it in the current scene.
+    *points* and *faces* (triangles) and link it in the current scene.
+    They can also be NumPy arrays (see stl_utils.read_stl_array()).
     """
 
-    import array
-    from itertools import chain
+    import numpy as np
     import bpy
 
-    mesh = bpy.data.meshes.new(name)
-    mesh.from_pydata(points, [], faces)
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+    faces = np.asarray(faces, dtype=np.int32).reshape(-1, 3)
 
-    if face_nors:
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(points))
+    mesh.vertices.foreach_set("co", points.ravel())
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, faces.size, 3, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.full(len(faces), 3, dtype=np.int32))
+    mesh.update(calc_edges=True)
+
+    if face_nors is not None and len(face_nors):
         # Note: we store 'temp' normals in loops, since validate() may alter final mesh,
         #       we can only set custom lnors *after* calling it.
         mesh.create_normals_split()
-        lnors = tuple(chain(*chain(*zip(face_nors, face_nors, face_nors))))
-        mesh.loops.foreach_set("normal", lnors)
+        lnors = np.repeat(np.asarray(face_nors, dtype=np.float32).reshape(-1, 3), 3, axis=0)
+        mesh.loops.foreach_set("normal", lnors.ravel())
 
     mesh.transform(global_matrix)
 
     # update mesh to allow proper display
     mesh.validate(clean_customdata=False)  # *Very* important to not remove lnors here!
 
-    if face_nors:
-        clnors = array.array('f', [0.0] * (len(mesh.loops) * 3))
+    if face_nors is not None and len(face_nors):
+        clnors = np.empty(len(mesh.loops) * 3, dtype=np.float32)
         mesh.loops.foreach_get("normal", clnors)
 
-        mesh.polygons.foreach_set("use_smooth", [True] * len(mesh.polygons))
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
 
-        mesh.normals_split_custom_set(tuple(zip(*(iter(clnors),) * 3)))
+        mesh.normals_split_custom_set(clnors.reshape(-1, 3).tolist())
         mesh.use_auto_smooth = True
         mesh.show_edge_sharp = True
         mesh.free_normals_split()
@@ -111,3 +121,50 @@ def faces_from_mesh(ob, global_matrix, use_mesh_modifiers=False):
         yield [vertices[index].co.copy() for index in tri.vertices]
 
     mesh_owner.to_mesh_clear()
+
+
+def faces_array_from_mesh(ob, global_matrix, use_mesh_modifiers=False):
+    """
+    Same as faces_from_mesh(), but return all the faces at once as a NumPy
+    array of shape (number of faces, 3 vertices, 3 coordinates).
+    """
+
+    import numpy as np
+    import bpy
+
+    no_faces = np.empty((0, 3, 3), dtype=np.float32)
+
+    # get the editmode data
+    if ob.mode == "EDIT":
+        ob.update_from_editmode()
+
+    # get the modifiers
+    if use_mesh_modifiers:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        mesh_owner = ob.evaluated_get(depsgraph)
+    else:
+        mesh_owner = ob
+
+    # Object.to_mesh() is not guaranteed to return a mesh.
+    try:
+        mesh = mesh_owner.to_mesh()
+    except RuntimeError:
+        return no_faces
+
+    if mesh is None:
+        return no_faces
+
+    mat = global_matrix @ ob.matrix_world
+    mesh.transform(mat)
+    if mat.is_negative:
+        mesh.flip_normals()
+    mesh.calc_loop_triangles()
+
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tris)
+
+    mesh_owner.to_mesh_clear()
+
+    return co.reshape(-1, 3)[tris].reshape(-1, 3, 3)
@@ -70,6 +70,16 @@ BINARY_HEADER = 80
 BINARY_STRIDE = 12 * 4 + 2
 
 
+def _binary_dtype():
+    """NumPy dtype of a binary STL facet."""
+    import numpy as np
+    return np.dtype([
+        ('normal', '<f4', (3,)),
+        ('points', '<f4', (3, 3)),
+        ('attribute', '<u2'),
+    ])
+
+
 def _header_version():
     import bpy
     return "Exported from Blender-" + bpy.app.version_string
@@ -103,9 +113,11 @@ def _is_ascii_file(data):
     return (file_size != BINARY_HEADER + 4 + BINARY_STRIDE * size)
 
 
-def _binary_read(data):
-    # Skip header...
-
+def _binary_size(data):
+    """
+    Return the number of facets of a binary file, leaving data at the start
+    of the facets block.
+    """
     import os
     import struct
 
@@ -123,6 +135,14 @@ def _binary_read(data):
         size = file_size // BINARY_STRIDE
         print("WARNING! Reported size (facet number) is 0, inferring %d facets from file size." % size)
 
+    return size
+
+
+def _binary_read(data):
+    import struct
+
+    size = _binary_size(data)
+
     # We read 4096 elements at once, avoids too much calls to read()!
     CHUNK_LEN = 4096
     chunks = [CHUNK_LEN] * (size // CHUNK_LEN)
@@ -166,6 +186,73 @@ def _ascii_read(data):
             yield curr_nor, [tuple(map(float, l_item.split()[1:])) for l_item in (l, data.readline(), data.readline())]
 
 
+def _binary_read_array(data):
+    """
+    Read all facets at once, return an array of their normals and an array
+    of their 3 points.
+    """
+    import numpy as np
+
+    size = _binary_size(data)
+    facets = np.fromfile(data, dtype=_binary_dtype(), count=size)
+    return facets['normal'], facets['points']
+
+
+def _ascii_read_array(data):
+    import numpy as np
+
+    nors = []
+    pts = []
+    for nor, pt in _ascii_read(data):
+        nors.append(nor)
+        pts.append(pt)
+    return np.array(nors, dtype=np.float32).reshape(-1, 3), np.array(pts, dtype=np.float32).reshape(-1, 3, 3)
+
+
+def _faces_normal(faces):
+    """Normals of an array of triangles, same as mathutils.geometry.normal()."""
+    import numpy as np
+
+    faces = faces.astype(np.float64)
+    nors = np.cross(faces[:, 0] - faces[:, 1], faces[:, 1] - faces[:, 2])
+    lengths = np.linalg.norm(nors, axis=1)
+    np.divide(nors, lengths[:, None], out=nors, where=lengths[:, None] != 0.0)
+    return nors.astype(np.float32)
+
+
+def _binary_write_array(filepath, faces):
+    import struct
+    import numpy as np
+
+    facets = np.zeros(len(faces), dtype=_binary_dtype())
+    facets['normal'] = _faces_normal(faces)
+    facets['points'] = faces
+
+    with open(filepath, 'wb') as data:
+        data.write(struct.pack('<80sI', _header_version().encode('ascii'), len(facets)))
+        facets.tofile(data)
+
+
+def _ascii_write_array(filepath, faces):
+    import numpy as np
+
+    # Facets formatted at once.
+    CHUNK_LEN = 4096
+    fmt = 'facet normal %f %f %f\nouter loop\n' + 'vertex %f %f %f\n' * 3 + 'endloop\nendfacet\n'
+
+    values = np.hstack((_faces_normal(faces), faces.reshape(-1, 9)))
+    with open(filepath, 'w') as data:
+        fw = data.write
+        header = _header_version()
+        fw('solid %s\n' % header)
+
+        for i in range(0, len(values), CHUNK_LEN):
+            chunk = values[i:i + CHUNK_LEN]
+            fw((fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+        fw('endsolid %s\n' % header)
+
+
 def _binary_write(filepath, faces):
     import struct
     import itertools
@@ -223,12 +310,54 @@ def write_stl(filepath="", faces=(), ascii=False):
        output filepath
 
     faces
-       iterable of tuple of 3 vertex, vertex is tuple of 3 coordinates as float
+       iterable of tuple of 3 vertex, vertex is tuple of 3 coordinates as float,
+       or a NumPy array of shape (number of faces, 3, 3) (much faster)
 
     ascii
        save the file in ascii format (very huge)
     """
-    (_ascii_write if ascii else _binary_write)(filepath, faces)
+    import numpy as np
+
+    if isinstance(faces, np.ndarray):
+        (_ascii_write_array if ascii else _binary_write_array)(filepath, faces)
+    else:
+        (_ascii_write if ascii else _binary_write)(filepath, faces)
+
+
+def weld_points(points, merge_distance=0.0):
+    """
+    Merge equal points of an array of points (or points closer than
+    merge_distance, by snapping them to a grid of that size).
+
+    - returns a tuple(unique points, index of each point in them).
+
+      Unique points keep the coordinates and order of their first occurrence,
+      as read_stl() does.
+    """
+    import numpy as np
+
+    if not len(points):
+        return points.reshape(0, 3), np.empty(0, dtype=np.int64)
+
+    if merge_distance > 0.0:
+        keys = np.floor(points.astype(np.float64) / merge_distance + 0.5).astype(np.int64)
+    else:
+        keys = points
+
+    # Sorting rows with np.unique(axis=0) is slow, combine 1D unique ids of
+    # each coordinate instead.
+    ids = None
+    for column in keys.T:
+        _, column_ids = np.unique(column, return_inverse=True)
+        if ids is None:
+            ids = column_ids
+        else:
+            _, ids = np.unique(ids * (column_ids.max() + 1) + column_ids, return_inverse=True)
+    _, first_index, inverse = np.unique(ids, return_index=True, return_inverse=True)
+    order = np.argsort(first_index)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return points[first_index[order]], rank[inverse.ravel()]
 
 
 def read_stl(filepath):
@@ -281,15 +410,68 @@ def read_stl(filepath):
     return tris, tri_nors, pts.list
 
 
+def read_stl_array(filepath, merge_distance=0.0):
+    """
+    Same as read_stl(), but much faster, returning NumPy arrays:
+    triangles as an array of shape (number of triangles, 3), normals and
+    points as arrays of shape (number, 3).
+
+    merge_distance
+       points closer than this are also merged, see weld_points().
+    """
+    import time
+    start_time = time.process_time()
+
+    with open(filepath, 'rb') as data:
+        # check for ascii or binary
+        if _is_ascii_file(data):
+            tri_nors, tri_pts = _ascii_read_array(data)
+        else:
+            tri_nors, tri_pts = _binary_read_array(data)
+
+    pts, tris = weld_points(tri_pts.reshape(-1, 3), merge_distance)
+
+    print('Import finished in %.4f sec.' % (time.process_time() - start_time))
+
+    return tris.reshape(-1, 3), tri_nors, pts
+
+
+def benchmark(filepath, repeat=3):
+    """
+    Compare read_stl() and read_stl_array() on a file, printing the best
+    timings (does not need Blender).
+    """
+    import time
+
+    timings = {}
+    for func in (read_stl, read_stl_array):
+        best = float('inf')
+        for i in range(repeat):
+            start_time = time.perf_counter()
+            result = func(filepath)
+            best = min(best, time.perf_counter() - start_time)
+        timings[func.__name__] = best
+        print('%s: %.4f sec, %d triangles, %d points' % (func.__name__, best, len(result[0]), len(result[2])))
+    print('Speedup: x%.1f' % (timings['read_stl'] / timings['read_stl_array']))
+
+
 if __name__ == '__main__':
     import sys
+
+    if '--benchmark' in sys.argv:
+        # python stl_utils.py --benchmark file1.stl file2.stl ...
+        for filepath in sys.argv[sys.argv.index('--benchmark') + 1:]:
+            benchmark(filepath)
+        sys.exit()
+
     import bpy
+    from mathutils import Matrix
     from io_mesh_stl import blender_utils
 
     filepaths = sys.argv[sys.argv.index('--') + 1:]
 
     for filepath in filepaths:
         objName = bpy.path.display_name(filepath)
-        tris, pts = read_stl(filepath)
+        tris, tri_nors, pts = read_stl_array(filepath)
 
-        blender_utils.create_and_link_mesh(objName, tris, pts)
+        blender_utils.create_and_link_mesh(objName, tris, None, pts, Matrix())
@@ -47,6 +47,7 @@ from bpy.props import (
         StringProperty,
         BoolProperty,
         FloatProperty,
+        IntProperty,
         EnumProperty,
         CollectionProperty,
         )
@@ -136,6 +137,15 @@ class ImportFBX(bpy.types.Operator, ImportHelper):
             description="Offset to apply to animation during import, in frames",
             default=1.0,
             )
+    anim_simplify: FloatProperty(
+            name="Simplify",
+            description="Remove keyframes which can be linearly interpolated from their neighbors "
+                        "within this tolerance (0.0 to keep all keyframes)",
+            min=0.0, max=1.0,
+            soft_min=0.0, soft_max=0.1,
+            default=0.0,
+            precision=4,
+            )
 
     use_subsurf: BoolProperty(
             name="Subdivision Data",
@@ -343,6 +353,7 @@ class FBX_PT_import_animation(bpy.types.Panel):
         layout.enabled = operator.use_anim
 
         layout.prop(operator, "anim_offset")
+        layout.prop(operator, "anim_simplify")
 
 
 class FBX_PT_import_armature(bpy.types.Panel):
@@ -615,6 +626,37 @@ class ExportFBX(bpy.types.Operator, ExportHelper):
             description="Create a dir for each exported file",
             default=True,
             )
+    compression_level: IntProperty(
+            name="Compression Level",
+            description="Zlib compression level of geometry and animation arrays "
+                        "(higher gives smaller files but is slower to export)",
+            min=1, max=9,
+            default=1,
+            )
+    compression_threads: IntProperty(
+            name="Compression Threads",
+            description="Number of threads used to compress large arrays (0 for one per CPU, 1 to disable threading)",
+            min=0, max=64,
+            default=0,
+            )
+    use_stream_write: BoolProperty(
+            name="Stream Write",
+            description="Write objects to the file as soon as they are generated, "
+                        "instead of keeping the whole file in memory until the end (reduces memory usage "
+                        "on big scenes)",
+            default=False,
+            )
+    use_export_cache: BoolProperty(
+            name="Use Export Cache",
+            description="Reuse geometry encoded by previous exports when the mesh data and export settings "
+                        "did not change (speeds up repeated exports of mostly unchanged scenes)",
+            default=False,
+            )
+    export_cache_dir: StringProperty(
+            name="Export Cache Directory",
+            description="Directory where encoded geometry is cached (per-user Blender data directory if empty)",
+            subtype='DIR_PATH',
+            )
     use_metadata: BoolProperty(
             name="Use Metadata",
             default=True,
@@ -680,6 +722,13 @@ class FBX_PT_export_main(bpy.types.Panel):
         row.prop(operator, "batch_mode")
         sub = row.row(align=True)
         sub.prop(operator, "use_batch_own_dir", text="", icon='NEWFOLDER')
+        layout.prop(operator, "compression_level")
+        layout.prop(operator, "compression_threads")
+        layout.prop(operator, "use_stream_write")
+        layout.prop(operator, "use_export_cache")
+        sub = layout.row()
+        sub.enabled = operator.use_export_cache
+        sub.prop(operator, "export_cache_dir")
 
 
 class FBX_PT_export_include(bpy.types.Panel):
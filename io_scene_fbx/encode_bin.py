@@ -45,6 +45,60 @@ _FOOT_ID = b'\xfa\xbc\xab\x09\xd0\xc8\xd4\x66\xb1\x76\xfb\x83\x1c\xf7\x26\x7e'
 # Awful exceptions: those "classes" of elements seem to need block sentinel even when having no children and some props.
 _ELEMS_ID_ALWAYS_BLOCK_SENTINEL = {b"AnimationStack", b"AnimationLayer"}
 
+# Array compression settings, see init_compression().
+_COMPRESSION_LEVEL = 1
+_COMPRESSION_THREADS = 1
+# Arrays smaller than this (in bytes, uncompressed) are always compressed immediately,
+# not worth the overhead of a thread pool task.
+_COMPRESSION_DEFERRED_MIN_SIZE = 64 * 1024
+
+
+def init_compression(level=1, threads=1):
+    """
+    Set the zlib level used for arrays, and the number of threads compressing them.
+
+    With more than one thread, large arrays are kept uncompressed in the element tree
+    and all compressed at once in a thread pool when writing the file (zlib releases the GIL).
+    Zero threads means one per CPU. Output is the same whatever the number of threads.
+    """
+    global _COMPRESSION_LEVEL, _COMPRESSION_THREADS
+
+    if threads == 0:
+        import os
+        threads = os.cpu_count() or 1
+
+    _COMPRESSION_LEVEL = level
+    _COMPRESSION_THREADS = threads
+
+
+def compression_executor():
+    """
+    Thread pool compressing deferred arrays, which can be shared by all writes of an export.
+    None with a single compression thread, since no array is deferred then.
+    """
+    if _COMPRESSION_THREADS > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        return ThreadPoolExecutor(max_workers=_COMPRESSION_THREADS)
+    return None
+
+
+class _FBXDeferredArray:
+    """
+    Uncompressed array data, replaced by its packed compressed version by _compress_deferred_arrays().
+    """
+    __slots__ = (
+        "length",
+        "data",
+        )
+
+    def __init__(self, length, data):
+        self.length = length
+        self.data = data
+
+    def pack(self, level):
+        data = zlib.compress(self.data, level)
+        return pack('<3I', self.length, 1, len(data)) + data
+
 
 class FBXElem:
     __slots__ = (
@@ -144,10 +198,15 @@ class FBXElem:
         # mimic behavior of fbxconverter (also common sense)
         # we could make this configurable.
         encoding = 0 if len(data) <= 128 else 1
+        if encoding == 1 and _COMPRESSION_THREADS > 1 and len(data) >= _COMPRESSION_DEFERRED_MIN_SIZE:
+            self.props_type.append(prop_type)
+            self.props.append(_FBXDeferredArray(length, data))
+            return
+
         if encoding == 0:
             pass
         elif encoding == 1:
-            data = zlib.compress(data, 1)
+            data = zlib.compress(data, _COMPRESSION_LEVEL)
 
         comp_len = len(data)
 
@@ -285,15 +344,70 @@ def _write_timedate_hack(elem_root):
         print("Missing fields!")
 
 
-def write(fn, elem_root, version):
+def _compress_deferred_arrays(elem_root, executor=None):
+    """
+    Compress all deferred arrays of the element tree, in parallel.
+    A given executor is reused, otherwise a temporary one is created.
+    """
+    deferred = []
+    todo = [elem_root]
+    while todo:
+        elem = todo.pop()
+        for i, data in enumerate(elem.props):
+            if data.__class__ is _FBXDeferredArray:
+                deferred.append((elem.props, i, data))
+        todo.extend(elem.elems)
+
+    if not deferred:
+        return
+
+    level = _COMPRESSION_LEVEL
+    if executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=_COMPRESSION_THREADS) as executor:
+            _compress_deferred_arrays(elem_root, executor)
+        return
+
+    packed = executor.map(lambda item: item[2].pack(level), deferred)
+    for (props, i, _data), data in zip(deferred, packed):
+        props[i] = data
+
+
+def _write_header(write, version):
+    write(_HEAD_MAGIC)
+    write(pack('<I', version))
+
+
+def _write_footer(write, tell, version):
+    write(_FOOT_ID)
+    write(b'\x00' * 4)
+
+    # padding for alignment (values between 1 & 16 observed)
+    # if already aligned to 16, add a full 16 bytes padding.
+    ofs = tell()
+    pad = ((ofs + 15) & ~15) - ofs
+    if pad == 0:
+        pad = 16
+
+    write(b'\0' * pad)
+
+    write(pack('<I', version))
+
+    # unknown magic (always the same)
+    write(b'\0' * 120)
+    write(b'\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b')
+
+
+def write(fn, elem_root, version, executor=None):
     assert(elem_root.id == b'')
 
+    _compress_deferred_arrays(elem_root, executor)
+
     with open(fn, 'wb') as f:
         write = f.write
         tell = f.tell
 
-        write(_HEAD_MAGIC)
-        write(pack('<I', version))
+        _write_header(write, version)
 
         # hack since we don't decode time.
         # ideally we would _not_ modify this data.
@@ -302,20 +416,184 @@ def write(fn, elem_root, version):
         elem_root._calc_offsets_children(tell(), False)
         elem_root._write_children(write, tell, False)
 
-        write(_FOOT_ID)
-        write(b'\x00' * 4)
+        _write_footer(write, tell, version)
+
+
+class FBXStreamWriter:
+    """
+    Write an FBX file progressively, instead of building the whole element tree first (see write()).
 
-        # padding for alignment (values between 1 & 16 observed)
-        # if already aligned to 16, add a full 16 bytes padding.
-        ofs = tell()
-        pad = ((ofs + 15) & ~15) - ofs
-        if pad == 0:
-            pad = 16
+    Top-level elements are written (and removed from the root) with write_elems(),
+    while the children of a single 'scope' element (typically Objects) can be written as soon as they are complete,
+    between scope_begin() and scope_end(), the end offset of the scope being back-patched once known.
+    The resulting file is identical to the one write() would produce from the same tree.
 
-        write(b'\0' * pad)
+    Used as a context manager, the partial file is removed if an error happens before it is closed.
+    Deferred arrays of all written elements are compressed by the same thread pool: the given executor,
+    or one created on first use and shut down on close.
+    """
+    __slots__ = (
+        "_fn",
+        "_file",
+        "_executor",
+        "_owns_executor",
+        "_version",
+        "_is_timedate_done",
+        "_scope",
+        "_scope_offset",
+        "_scope_has_children",
+        )
 
-        write(pack('<I', version))
+    def __init__(self, fn, version, executor=None):
+        self._fn = fn
+        self._file = open(fn, 'wb')
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._version = version
+        self._is_timedate_done = False
+        self._scope = None
+        self._scope_offset = -1
+        self._scope_has_children = False
+
+        _write_header(self._file.write, version)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _shutdown_executor(self):
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _write_elem(self, elem, is_last):
+        write = self._file.write
+        tell = self._file.tell
+
+        if self._owns_executor and self._executor is None:
+            self._executor = compression_executor()
+        _compress_deferred_arrays(elem, self._executor)
+        elem._calc_offsets(tell(), is_last)
+        elem._write(write, tell, is_last)
+
+    def write_elems(self, elem_root, is_final=False):
+        """
+        Write all (complete) children of the root element, and remove them from it.
+        With is_final, the last one is written as the last element of the file.
+        """
+        assert(elem_root.id == b'')
+        assert(self._scope is None)
 
-        # unknown magic (always the same)
-        write(b'\0' * 120)
-        write(b'\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b')
+        if not self._is_timedate_done and elem_root.elems:
+            _write_timedate_hack(elem_root)
+            self._is_timedate_done = True
+
+        elem_last = elem_root.elems[-1] if (is_final and elem_root.elems) else None
+        for elem in elem_root.elems:
+            assert(elem.id != b'')
+            self._write_elem(elem, (elem is elem_last))
+        elem_root.elems.clear()
+
+    def scope_begin(self, id):
+        """
+        Start a new top-level element, returned so that the caller can add its properties and children.
+        Its properties are written on the first call to scope_flush() or scope_end().
+        """
+        assert(self._scope is None)
+        self._scope = FBXElem(id)
+        self._scope_offset = -1
+        self._scope_has_children = False
+        return self._scope
+
+    def _scope_write_head(self):
+        elem = self._scope
+        write = self._file.write
+
+        self._scope_offset = self._file.tell()
+
+        props_length = 0
+        for data in elem.props:
+            props_length += 1 + len(data)
+
+        # End offset is not known yet, back-patched by scope_end().
+        write(pack('<3I', 0, len(elem.props), props_length))
+
+        write(bytes((len(elem.id),)))
+        write(elem.id)
+
+        for i, data in enumerate(elem.props):
+            write(bytes((elem.props_type[i],)))
+            write(data)
+
+    def scope_flush(self):
+        """
+        Write all children of the current scope element, but the last one, and remove them from it.
+        The last child is kept since it might still be edited, and needs to know whether it is the last one.
+        """
+        elem = self._scope
+        assert(elem is not None)
+
+        if self._scope_offset == -1:
+            self._scope_write_head()
+
+        if len(elem.elems) > 1:
+            for sub_elem in elem.elems[:-1]:
+                self._write_elem(sub_elem, False)
+            del elem.elems[:-1]
+            self._scope_has_children = True
+
+    def scope_end(self):
+        """
+        Write remaining children of the current scope element and close it.
+        """
+        elem = self._scope
+        assert(elem is not None)
+        write = self._file.write
+        tell = self._file.tell
+
+        self.scope_flush()
+        if elem.elems:
+            self._write_elem(elem.elems[0], True)
+            elem.elems.clear()
+            self._scope_has_children = True
+
+        # Same logic as FBXElem._write_children(), the scope element itself is never the last one.
+        if self._scope_has_children or not elem.props or elem.id in _ELEMS_ID_ALWAYS_BLOCK_SENTINEL:
+            write(_BLOCK_SENTINEL_DATA)
+
+        end_offset = tell()
+        self._file.seek(self._scope_offset)
+        write(pack('<I', end_offset))
+        self._file.seek(end_offset)
+
+        self._scope = None
+
+    def close(self):
+        assert(self._scope is None)
+        write = self._file.write
+
+        # Closing sentinel of the root element, see FBXElem._write_children().
+        write(_BLOCK_SENTINEL_DATA)
+
+        _write_footer(write, self._file.tell, self._version)
+        self._file.close()
+        self._shutdown_executor()
+
+    def abort(self):
+        """
+        Stop writing after an error, closing and removing the incomplete file.
+        """
+        self._shutdown_executor()
+        if self._file.closed:
+            return
+        self._file.close()
+        import os
+        try:
+            os.remove(self._fn)
+        except OSError:
+            pass
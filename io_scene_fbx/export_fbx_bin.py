@@ -95,6 +95,7 @@ from .fbx_utils import (
     ObjectWrapper, fbx_name_class,
     # Top level.
     FBXExportSettingsMedia, FBXExportSettings, FBXExportData,
+    FBXExportCache,
 )
 
 # Units convertors!
@@ -755,6 +756,24 @@ def fbx_data_bindpose_element(root, me_obj, me, scene_data, arm_obj=None, mat_wo
     return mat_world_obj, mat_world_bones
 
 
+def fbx_data_mesh_shape_weights(me_obj, me, shape, shape_verts_idx):
+    """
+    Weights (in percents) of the shape key's vertices, from its vertex group if defined.
+    """
+    # Use vgroups as weights, if defined.
+    if not (shape.vertex_group and shape.vertex_group in me_obj.bdata.vertex_groups):
+        return array.array(data_types.ARRAY_FLOAT64, (100.0,)) * len(shape_verts_idx)
+
+    shape_verts_weights = array.array(data_types.ARRAY_FLOAT64, (0.0,)) * len(shape_verts_idx)
+    vg_idx = me_obj.bdata.vertex_groups[shape.vertex_group].index
+    vertices = me.vertices
+    for sk_idx, v_idx in enumerate(shape_verts_idx):
+        for vg in vertices[v_idx].groups:
+            if vg.group == vg_idx:
+                shape_verts_weights[sk_idx] = vg.weight * 100.0
+    return shape_verts_weights
+
+
 def fbx_data_mesh_shapes_elements(root, me_obj, me, scene_data, fbx_me_tmpl, fbx_me_props):
     """
     Write shape keys related data.
@@ -770,16 +789,7 @@ def fbx_data_mesh_shapes_elements(root, me_obj, me, scene_data, fbx_me_tmpl, fbx
     channels = []
 
     for shape, (channel_key, geom_key, shape_verts_co, shape_verts_idx) in shapes.items():
-        # Use vgroups as weights, if defined.
-        if shape.vertex_group and shape.vertex_group in me_obj.bdata.vertex_groups:
-            shape_verts_weights = [0.0] * (len(shape_verts_co) // 3)
-            vg_idx = me_obj.bdata.vertex_groups[shape.vertex_group].index
-            for sk_idx, v_idx in enumerate(shape_verts_idx):
-                for vg in me.vertices[v_idx].groups:
-                    if vg.group == vg_idx:
-                        shape_verts_weights[sk_idx] = vg.weight * 100.0
-        else:
-            shape_verts_weights = [100.0] * (len(shape_verts_co) // 3)
+        shape_verts_weights = fbx_data_mesh_shape_weights(me_obj, me, shape, shape_verts_idx)
         channels.append((channel_key, shape, shape_verts_weights))
 
         geom = elem_data_single_int64(root, b"Geometry", get_fbx_uuid_from_key(geom_key))
@@ -823,6 +833,73 @@ def fbx_data_mesh_shapes_elements(root, me_obj, me, scene_data, fbx_me_tmpl, fbx
                                 animatable=True)
 
 
+def fbx_data_mesh_cache_key(me_obj, me, scene_data):
+    """
+    Hash of everything used by fbx_data_mesh_elements() to generate the Geometry (and shape keys) elements of a mesh.
+    """
+    import hashlib
+
+    def _idprops_to_py(idprops):
+        return [(k, v.to_dict() if hasattr(v, "to_dict") else v.to_list() if hasattr(v, "to_list") else v)
+                for k, v in idprops.items()]
+
+    def _hash_foreach(seq, attr, nbr_items_per_elem, typecode):
+        t_data = array.array(typecode, (0,)) * (len(seq) * nbr_items_per_elem)
+        seq.foreach_get(attr, t_data)
+        h.update(t_data.tobytes())
+
+    h = hashlib.sha1()
+    settings = scene_data.settings
+    me_key = scene_data.data_meshes[me_obj][0]
+    do_bake_space_transform = me_obj.use_bake_space_transform(scene_data)
+
+    h.update(repr((
+        FBX_VERSION, encode_bin._COMPRESSION_LEVEL, me_key, me_obj.fbx_uuid, me.name,
+        settings.mesh_smooth_type, settings.use_subsurf, settings.use_mesh_edges, settings.use_tspace,
+        settings.use_custom_props, do_bake_space_transform,
+        tuple(map(tuple, settings.global_matrix)) if do_bake_space_transform else None,
+        _idprops_to_py(me) if settings.use_custom_props else None,
+        [(mod.show_render, mod.show_viewport, mod.subdivision_type, mod.boundary_smooth,
+          mod.levels, mod.render_levels, mod.use_creases)
+         for mod in me_obj.bdata.modifiers if mod.type == 'SUBSURF'] if settings.use_subsurf else None,
+        [(mat_slot.material.name if mat_slot.material else None) for mat_slot in me_obj.material_slots],
+        sorted((ma.name, idx) for ma, idx in scene_data.mesh_material_indices.get(me, {}).items()),
+        [uvlayer.name for uvlayer in me.uv_layers],
+        [collayer.name for collayer in me.vertex_colors],
+    )).encode())
+
+    _hash_foreach(me.vertices, "co", 3, data_types.ARRAY_FLOAT64)
+    _hash_foreach(me.edges, "vertices", 2, data_types.ARRAY_INT32)
+    _hash_foreach(me.edges, "use_edge_sharp", 1, data_types.ARRAY_INT32)
+    _hash_foreach(me.edges, "crease", 1, data_types.ARRAY_FLOAT64)
+    _hash_foreach(me.loops, "vertex_index", 1, data_types.ARRAY_INT32)
+    _hash_foreach(me.polygons, "loop_start", 1, data_types.ARRAY_INT32)
+    _hash_foreach(me.polygons, "loop_total", 1, data_types.ARRAY_INT32)
+    _hash_foreach(me.polygons, "use_smooth", 1, data_types.ARRAY_INT32)
+    _hash_foreach(me.polygons, "material_index", 1, data_types.ARRAY_INT32)
+    for uvlayer in me.uv_layers:
+        _hash_foreach(uvlayer.data, "uv", 2, data_types.ARRAY_FLOAT64)
+    for collayer in me.vertex_colors:
+        _hash_foreach(collayer.data, "color", 4, data_types.ARRAY_FLOAT64)
+    # (Custom) split normals.
+    me.calc_normals_split()
+    _hash_foreach(me.loops, "normal", 3, data_types.ARRAY_FLOAT64)
+    me.free_normals_split()
+
+    # Shape keys, and the bind pose written with them.
+    if me in scene_data.data_deformers_shape:
+        _me_key, shape_key, shapes = scene_data.data_deformers_shape[me]
+        mat_world_obj = me_obj.fbx_object_matrix(scene_data, global_space=True)
+        h.update(repr((shape_key, tuple(map(tuple, mat_world_obj)))).encode())
+        for shape, (channel_key, geom_key, shape_verts_co, shape_verts_idx) in shapes.items():
+            h.update(repr((channel_key, geom_key, shape.name, shape.value, shape.vertex_group)).encode())
+            h.update(array.array(data_types.ARRAY_FLOAT64, shape_verts_co).tobytes())
+            h.update(array.array(data_types.ARRAY_INT32, shape_verts_idx).tobytes())
+            h.update(fbx_data_mesh_shape_weights(me_obj, me, shape, shape_verts_idx).tobytes())
+
+    return h.hexdigest()
+
+
 def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
     """
     Write the Mesh (Geometry) data block.
@@ -838,6 +915,17 @@ def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
     if me_key in done_meshes:
         return
 
+    # Reuse elements encoded by a previous export, if nothing changed since then.
+    export_cache = scene_data.settings.export_cache
+    if export_cache is not None:
+        cache_key = fbx_data_mesh_cache_key(me_obj, me, scene_data)
+        elems = export_cache.get(cache_key)
+        if elems is not None:
+            root.elems.extend(elems)
+            done_meshes.add(me_key)
+            return
+        root_elems_start = len(root.elems)
+
     # No gscale/gmat here, all data are supposed to be in object space.
     smooth_type = scene_data.settings.mesh_smooth_type
     write_normals = True  # smooth_type in {'OFF'}
@@ -1280,6 +1368,9 @@ def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
     elem_props_template_finalize(tmpl, props)
     done_meshes.add(me_key)
 
+    if export_cache is not None:
+        export_cache.put(cache_key, root.elems[root_elems_start:])
+
 
 def fbx_data_material_elements(root, ma, scene_data):
     """
@@ -2866,28 +2957,38 @@ def fbx_definitions_elements(root, scene_data):
     fbx_templates_generate(definitions, scene_data.templates)
 
 
-def fbx_objects_elements(root, scene_data):
+def fbx_objects_elements(root, scene_data, stream=None):
     """
     Data (objects, geometry, material, textures, armatures, etc.).
+
+    When an encode_bin.FBXStreamWriter is given, each object is written to the file as soon as it is generated.
     """
     perfmon = PerfMon()
     perfmon.level_up()
-    objects = elem_empty(root, b"Objects")
+    if stream is None:
+        objects = elem_empty(root, b"Objects")
+        flush = lambda: None
+    else:
+        objects = stream.scope_begin(b"Objects")
+        flush = stream.scope_flush
 
     perfmon.step("FBX export fetch empties (%d)..." % len(scene_data.data_empties))
 
     for empty in scene_data.data_empties:
         fbx_data_empty_elements(objects, empty, scene_data)
+        flush()
 
     perfmon.step("FBX export fetch lamps (%d)..." % len(scene_data.data_lights))
 
     for lamp in scene_data.data_lights:
         fbx_data_light_elements(objects, lamp, scene_data)
+        flush()
 
     perfmon.step("FBX export fetch cameras (%d)..." % len(scene_data.data_cameras))
 
     for cam in scene_data.data_cameras:
         fbx_data_camera_elements(objects, cam, scene_data)
+        flush()
 
     perfmon.step("FBX export fetch meshes (%d)..."
                  % len({me_key for me_key, _me, _free in scene_data.data_meshes.values()}))
@@ -2895,6 +2996,7 @@ def fbx_objects_elements(root, scene_data):
     done_meshes = set()
     for me_obj in scene_data.data_meshes:
         fbx_data_mesh_elements(objects, me_obj, scene_data, done_meshes)
+        flush()
     del done_meshes
 
     perfmon.step("FBX export fetch objects (%d)..." % len(scene_data.objects))
@@ -2903,10 +3005,12 @@ def fbx_objects_elements(root, scene_data):
         if ob_obj.is_dupli:
             continue
         fbx_data_object_elements(objects, ob_obj, scene_data)
+        flush()
         for dp_obj in ob_obj.dupli_list_gen(scene_data.depsgraph):
             if dp_obj not in scene_data.objects:
                 continue
             fbx_data_object_elements(objects, dp_obj, scene_data)
+            flush()
 
     perfmon.step("FBX export fetch remaining...")
 
@@ -2914,24 +3018,32 @@ def fbx_objects_elements(root, scene_data):
         if not (ob_obj.is_object and ob_obj.type == 'ARMATURE'):
             continue
         fbx_data_armature_elements(objects, ob_obj, scene_data)
+        flush()
 
     if scene_data.data_leaf_bones:
         fbx_data_leaf_bone_elements(objects, scene_data)
+        flush()
 
     for ma in scene_data.data_materials:
         fbx_data_material_elements(objects, ma, scene_data)
+        flush()
 
     for blender_tex_key in scene_data.data_textures:
         fbx_data_texture_file_elements(objects, blender_tex_key, scene_data)
+        flush()
 
     for vid in scene_data.data_videos:
         fbx_data_video_elements(objects, vid, scene_data)
+        flush()
 
     perfmon.step("FBX export fetch animations...")
     start_time = time.process_time()
 
     fbx_data_animation_elements(objects, scene_data)
 
+    if stream is not None:
+        stream.scope_end()
+
     perfmon.level_down()
 
 
@@ -3004,6 +3116,11 @@ def save_single(operator, scene, depsgraph, filepath="",
                 use_custom_props=False,
                 bake_space_transform=False,
                 armature_nodetype='NULL',
+                compression_level=1,
+                compression_threads=0,
+                use_stream_write=False,
+                use_export_cache=False,
+                export_cache_dir="",
                 **kwargs
                 ):
 
@@ -3062,6 +3179,12 @@ def save_single(operator, scene, depsgraph, filepath="",
         set(),  # embedded_set
     )
 
+    export_cache = None
+    if use_export_cache:
+        if not export_cache_dir:
+            export_cache_dir = bpy.utils.user_resource('DATAFILES', path="fbx_export_cache", create=True)
+        export_cache = FBXExportCache(bpy.path.abspath(export_cache_dir))
+
     settings = FBXExportSettings(
         operator.report, (axis_up, axis_forward), global_matrix, global_scale, apply_unit_scale, unit_scale,
         bake_space_transform, global_matrix_inv, global_matrix_inv_transposed,
@@ -3071,7 +3194,7 @@ def save_single(operator, scene, depsgraph, filepath="",
         add_leaf_bones, preserve_original_bone_orientation, bone_correction_matrix, bone_correction_matrix_inv,
         bake_anim, bake_anim_use_all_bones, bake_anim_use_nla_strips, bake_anim_use_all_actions,
         bake_anim_step, bake_anim_simplify_factor, bake_anim_force_startend_keying,
-        False, media_settings, use_custom_props,
+        False, media_settings, use_custom_props, export_cache,
     )
 
     import bpy_extras.io_utils
@@ -3079,35 +3202,63 @@ def save_single(operator, scene, depsgraph, filepath="",
     print('\nFBX export starting... %r' % filepath)
     start_time = time.process_time()
 
+    encode_bin.init_compression(compression_level, compression_threads)
+
     # Generate some data about exported scene...
     scene_data = fbx_data_from_scene(scene, depsgraph, settings)
 
     root = elem_empty(None, b"")  # Root element has no id, as it is not saved per se!
 
-    # Mostly FBXHeaderExtension and GlobalSettings.
-    fbx_header_elements(root, scene_data)
+    # A single thread pool compresses the arrays of all written and cached elements.
+    executor = encode_bin.compression_executor()
+    if export_cache is not None:
+        export_cache.executor = executor
 
-    # Documents and References are pretty much void currently.
-    fbx_documents_elements(root, scene_data)
-    fbx_references_elements(root, scene_data)
+    # With stream writing, elements are written (and freed) as soon as they are generated,
+    # instead of keeping the whole encoded file in memory until the end.
+    stream = encode_bin.FBXStreamWriter(filepath, FBX_VERSION, executor) if use_stream_write else None
+    try:
+        # Mostly FBXHeaderExtension and GlobalSettings.
+        fbx_header_elements(root, scene_data)
 
-    # Templates definitions.
-    fbx_definitions_elements(root, scene_data)
+        # Documents and References are pretty much void currently.
+        fbx_documents_elements(root, scene_data)
+        fbx_references_elements(root, scene_data)
 
-    # Actual data.
-    fbx_objects_elements(root, scene_data)
+        # Templates definitions.
+        fbx_definitions_elements(root, scene_data)
 
-    # How data are inter-connected.
-    fbx_connections_elements(root, scene_data)
+        if stream is not None:
+            stream.write_elems(root)
 
-    # Animation.
-    fbx_takes_elements(root, scene_data)
+        # Actual data.
+        fbx_objects_elements(root, scene_data, stream)
+
+        # How data are inter-connected.
+        fbx_connections_elements(root, scene_data)
 
-    # Cleanup!
-    fbx_scene_data_cleanup(scene_data)
+        # Animation.
+        fbx_takes_elements(root, scene_data)
 
-    # And we are down, we can write the whole thing!
-    encode_bin.write(filepath, root, FBX_VERSION)
+        # Cleanup!
+        fbx_scene_data_cleanup(scene_data)
+
+        # And we are down, we can write the whole thing!
+        if stream is None:
+            encode_bin.write(filepath, root, FBX_VERSION, executor)
+        else:
+            stream.write_elems(root, is_final=True)
+            stream.close()
+    except BaseException:
+        # Don't leave a truncated file behind.
+        if stream is not None:
+            stream.abort()
+        raise
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if export_cache is not None:
+            export_cache.executor = None
 
     # Clear cached ObjectWrappers!
     ObjectWrapper.cache_clear()
@@ -3116,6 +3267,10 @@ def save_single(operator, scene, depsgraph, filepath="",
     if not media_settings.embed_textures:
         bpy_extras.io_utils.path_reference_copy(media_settings.copy_set)
 
+    if export_cache is not None:
+        export_cache.prune()
+        print(export_cache.stats_string())
+
     print('export finished in %.4f sec.' % (time.process_time() - start_time))
     return {'FINISHED'}
 
@@ -71,6 +71,7 @@ ensured to be unique.
 
 from struct import unpack
 import array
+import mmap
 import zlib
 
 # at the end of each nested block, there is a NUL record to indicate
@@ -123,6 +124,106 @@ def unpack_array(read, array_type, array_stride, array_byteswap):
     return data_array
 
 
+class FBXLazyFile:
+    """
+    Memory map of a file parsed lazily, array properties are decoded from it until it's closed.
+    Use as a context manager around the parsing and the use of its elements.
+    """
+    __slots__ = ("mapping",)
+
+    def __init__(self):
+        self.mapping = None
+
+    def open(self, f):
+        self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.mapping
+
+    def close(self):
+        if self.mapping is not None:
+            self.mapping.close()
+            self.mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class FBXLazyArray:
+    """
+    Location of an array property inside a memory-mapped FBX file,
+    the data is only decompressed when decode() is called.
+    """
+    __slots__ = (
+        "lazy_file", "offset", "length", "encoding", "comp_len",
+        "array_type", "array_stride", "array_byteswap",
+        )
+
+    def __init__(self, lazy_file, offset, length, encoding, comp_len, array_type, array_stride, array_byteswap):
+        self.lazy_file = lazy_file
+        self.offset = offset
+        self.length = length
+        self.encoding = encoding
+        self.comp_len = comp_len
+        self.array_type = array_type
+        self.array_stride = array_stride
+        self.array_byteswap = array_byteswap
+
+    def decode(self):
+        mapping = self.lazy_file.mapping
+        if mapping is None:
+            raise ValueError("FBX file closed before decoding its arrays")
+        data = mapping[self.offset:self.offset + self.comp_len]
+
+        if self.encoding == 0:
+            pass
+        elif self.encoding == 1:
+            data = zlib.decompress(data)
+
+        assert(self.length * self.array_stride == len(data))
+
+        data_array = array.array(self.array_type, data)
+        if self.array_byteswap and _IS_BIG_ENDIAN:
+            data_array.byteswap()
+        return data_array
+
+
+class FBXLazyProps(list):
+    """
+    Property list of an element parsed with a ``lazy_file``.
+
+    Indexing decodes array properties and keeps the result (so import code only pays once per array it uses),
+    iterating decodes them without keeping the result (so a full walk of the tree, as done by fbx2json,
+    never holds more than one decoded array at a time).
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+        value = list.__getitem__(self, key)
+        if value.__class__ is FBXLazyArray:
+            value = value.decode()
+            list.__setitem__(self, key, value)
+        return value
+
+    def __iter__(self):
+        for value in list.__iter__(self):
+            yield value.decode() if value.__class__ is FBXLazyArray else value
+
+
+def unpack_array_lazy(lazy_file, read, tell, array_type, array_stride, array_byteswap):
+    length = read_uint(read)
+    encoding = read_uint(read)
+    comp_len = read_uint(read)
+
+    offset = tell()
+    lazy_file.mapping.seek(comp_len, 1)
+
+    return FBXLazyArray(lazy_file, offset, length, encoding, comp_len, array_type, array_stride, array_byteswap)
+
+
 read_data_dict = {
     b'Y'[0]: lambda read: unpack(b'<h', read(2))[0],  # 16 bit int
     b'C'[0]: lambda read: unpack(b'?', read(1))[0],   # 1 bit bool (yes/no)
@@ -140,6 +241,16 @@ read_data_dict = {
     b'c'[0]: lambda read: unpack_array(read, 'B', 1, False),  # array (ubyte)
     }
 
+# Only used with a ``lazy_file``, the remaining types are always read immediately.
+read_array_lazy_dict = {
+    b'f'[0]: ('f', 4, False),  # array (float)
+    b'i'[0]: ('i', 4, True),   # array (int)
+    b'd'[0]: ('d', 8, False),  # array (double)
+    b'l'[0]: ('q', 8, True),   # array (long)
+    b'b'[0]: ('b', 1, False),  # array (bool)
+    b'c'[0]: ('B', 1, False),  # array (ubyte)
+    }
+
 
 # FBX 7500 (aka FBX2016) introduces incompatible changes at binary level:
 #   * The NULL block marking end of nested stuff switches from 13 bytes long to 25 bytes long.
@@ -159,7 +270,7 @@ def init_version(fbx_version):
     _BLOCK_SENTINEL_DATA = (b'\0' * _BLOCK_SENTINEL_LENGTH)
 
 
-def read_elem(read, tell, use_namedtuple):
+def read_elem(read, tell, use_namedtuple, lazy_file=None):
     # [0] the offset at which this block ends
     # [1] the number of properties in the scope
     # [2] the length of the property list
@@ -175,14 +286,25 @@ def read_elem(read, tell, use_namedtuple):
     elem_props_data = [None] * prop_count    # elem properties (if any)
     elem_subtree = []                        # elem children (if any)
 
-    for i in range(prop_count):
-        data_type = read(1)[0]
-        elem_props_data[i] = read_data_dict[data_type](read)
-        elem_props_type[i] = data_type
+    if lazy_file is None:
+        for i in range(prop_count):
+            data_type = read(1)[0]
+            elem_props_data[i] = read_data_dict[data_type](read)
+            elem_props_type[i] = data_type
+    else:
+        elem_props_data = FBXLazyProps(elem_props_data)
+        for i in range(prop_count):
+            data_type = read(1)[0]
+            array_info = read_array_lazy_dict.get(data_type)
+            if array_info is None:
+                list.__setitem__(elem_props_data, i, read_data_dict[data_type](read))
+            else:
+                list.__setitem__(elem_props_data, i, unpack_array_lazy(lazy_file, read, tell, *array_info))
+            elem_props_type[i] = data_type
 
     if tell() < end_offset:
         while tell() < (end_offset - _BLOCK_SENTINEL_LENGTH):
-            elem_subtree.append(read_elem(read, tell, use_namedtuple))
+            elem_subtree.append(read_elem(read, tell, use_namedtuple, lazy_file))
 
         if read(_BLOCK_SENTINEL_LENGTH) != _BLOCK_SENTINEL_DATA:
             raise IOError("failed to read nested block sentinel, "
@@ -209,12 +331,24 @@ def parse_version(fn):
         return read_uint(read)
 
 
-def parse(fn, use_namedtuple=True):
+def parse(fn, use_namedtuple=True, lazy_file=None):
+    """
+    Parse a binary FBX file, returning the root element and the file version.
+
+    With a ``lazy_file`` (FBXLazyFile) the file is memory-mapped and array properties are only
+    decompressed when first accessed (see FBXLazyProps),
+    which is only possible until the ``lazy_file`` is closed.
+    """
     root_elems = []
 
     with open(fn, 'rb') as f:
-        read = f.read
-        tell = f.tell
+        if lazy_file is not None:
+            mapping = lazy_file.open(f)
+            read = mapping.read
+            tell = mapping.tell
+        else:
+            read = f.read
+            tell = f.tell
 
         if read(len(_HEAD_MAGIC)) != _HEAD_MAGIC:
             raise IOError("Invalid header")
@@ -223,7 +357,7 @@ def parse(fn, use_namedtuple=True):
         init_version(fbx_version)
 
         while True:
-            elem = read_elem(read, tell, use_namedtuple)
+            elem = read_elem(read, tell, use_namedtuple, lazy_file)
             if elem is None:
                 break
             root_elems.append(elem)
@@ -316,17 +450,18 @@ def fbx2json(fn):
 
     fn_json = "%s.json" % os.path.splitext(fn)[0]
     print("Writing: %r " % fn_json, end="")
-    fbx_root_elem, fbx_version = parse(fn, use_namedtuple=True)
-    print("(Version %d) ..." % fbx_version)
-
-    with open(fn_json, 'w', encoding="ascii", errors='xmlcharrefreplace') as f:
-        fw = f.write
-        fw('[\n')
-        ident_sub = "    "
-        for fbx_elem_sub in fbx_root_elem.elems:
-            fbx2json_recurse(f.write, fbx_elem_sub, ident_sub,
-                             fbx_elem_sub is fbx_root_elem.elems[-1])
-        fw(']\n')
+    with FBXLazyFile() as lazy_file:
+        fbx_root_elem, fbx_version = parse(fn, use_namedtuple=True, lazy_file=lazy_file)
+        print("(Version %d) ..." % fbx_version)
+
+        with open(fn_json, 'w', encoding="ascii", errors='xmlcharrefreplace') as f:
+            fw = f.write
+            fw('[\n')
+            ident_sub = "    "
+            for fbx_elem_sub in fbx_root_elem.elems:
+                fbx2json_recurse(f.write, fbx_elem_sub, ident_sub,
+                                 fbx_elem_sub is fbx_root_elem.elems[-1])
+            fw(']\n')
 
 
 # ----------------------------------------------------------------------------
@@ -1236,6 +1236,170 @@ def fbx_name_class(name, cls):
     return FBX_NAME_CLASS_SEP.join((name, cls))
 
 
+# ##### Export cache. #####
+
+class FBXExportCache:
+    """
+    On-disk cache of encoded FBX elements, stored under a content hash of everything used to generate them
+    (the data-block's evaluated data and the relevant export settings), so that re-exporting unchanged data
+    can reuse the previously encoded element subtrees.
+
+    Only the Geometry elements of meshes and their shape keys (BlendShape deformers) are cached, skin deformers
+    and animation curves are always generated, since they depend on other objects.
+
+    Entries only contain raw data: a JSON description of the element tree (ids, property types and sizes)
+    followed by the already encoded property bytes, reading them back never executes anything.
+    Least recently used entries are removed by prune() once the cache is bigger than max_size (in bytes).
+    Arrays of stored elements are compressed by executor, the thread pool of the export, if set.
+    """
+    __slots__ = (
+        "cache_dir",
+        "max_size",
+        "executor",
+        "hits",
+        "misses",
+        "bytes_read",
+        "bytes_written",
+        )
+
+    MAGIC = b"FBXEXPORTCACHE\x00\x01"
+    EXT = ".fbxcache"
+
+    def __init__(self, cache_dir, max_size=1024 * 1024 * 1024, executor=None):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.executor = executor
+        self.hits = 0
+        self.misses = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def _path(self, key):
+        import os
+        return os.path.join(self.cache_dir, key[:2], key + self.EXT)
+
+    @classmethod
+    def _encode(cls, elems):
+        import json
+        from struct import pack
+
+        blobs = []
+
+        def _elem_desc(elem):
+            blobs.extend(elem.props)
+            return (elem.id.decode('latin-1'), bytes(elem.props_type).decode('latin-1'),
+                    [len(data) for data in elem.props], [_elem_desc(sub_elem) for sub_elem in elem.elems])
+
+        desc = json.dumps([_elem_desc(elem) for elem in elems]).encode()
+        return b"".join((cls.MAGIC, pack('<I', len(desc)), desc, *blobs))
+
+    @classmethod
+    def _decode(cls, data):
+        import json
+        from struct import unpack_from
+
+        if not data.startswith(cls.MAGIC):
+            raise ValueError("Not an FBX export cache entry")
+        offset = len(cls.MAGIC)
+        desc_len = unpack_from('<I', data, offset)[0]
+        offset += 4
+        desc = json.loads(data[offset:offset + desc_len])
+        offset += desc_len
+
+        def _elem_from_desc(elem_desc):
+            nonlocal offset
+            elem_id, props_type, props_len, sub_elems_desc = elem_desc
+            elem = encode_bin.FBXElem(elem_id.encode('latin-1'))
+            elem.props_type = bytearray(props_type.encode('latin-1'))
+            for prop_len in props_len:
+                elem.props.append(data[offset:offset + prop_len])
+                offset += prop_len
+            elem.elems = [_elem_from_desc(sub_elem_desc) for sub_elem_desc in sub_elems_desc]
+            return elem
+
+        elems = [_elem_from_desc(elem_desc) for elem_desc in desc]
+        if offset != len(data):
+            raise ValueError("Truncated FBX export cache entry")
+        return elems
+
+    def get(self, key):
+        """
+        Return the list of cached elements for given key, or None.
+        """
+        import os
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            elems = self._decode(data)
+            # Mark the entry as recently used, for prune().
+            os.utime(path)
+        except Exception:
+            # Missing or unreadable (e.g. written by another version of this add-on) entry.
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.bytes_read += len(data)
+        return elems
+
+    def put(self, key, elems):
+        import os
+
+        # Compress arrays now, so that it does not have to be done again when reusing those elements.
+        for elem in elems:
+            encode_bin._compress_deferred_arrays(elem, self.executor)
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = self._encode(elems)
+            # Write to a temp file first, so that an interrupted export never leaves a broken entry behind.
+            path_tmp = "%s.%d.tmp" % (path, os.getpid())
+            with open(path_tmp, 'wb') as f:
+                f.write(data)
+            os.replace(path_tmp, path)
+        except OSError as e:
+            print("FBX export cache: failed to write %r (%s)" % (path, e))
+            return
+        self.bytes_written += len(data)
+
+    def prune(self):
+        """
+        Remove least recently used entries until the cache is not bigger than max_size.
+        """
+        import os
+
+        entries = []
+        size = 0
+        for dirpath, _dirnames, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                if not filename.endswith(self.EXT):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                size += st.st_size
+
+        entries.sort()
+        for _mtime, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+
+    def stats_string(self):
+        total = self.hits + self.misses
+        return ("FBX export cache: %d/%d hits (%.1f%%), %.2f MiB reused, %.2f MiB written to %r"
+                "" % (self.hits, total, (100.0 * self.hits / total) if total else 0.0,
+                      self.bytes_read / 1048576.0, self.bytes_written / 1048576.0, self.cache_dir))
+
+
 # ##### Top-level FBX data container. #####
 
 # Helper sub-container gathering all exporter settings related to media (texture files).
@@ -1254,7 +1418,7 @@ FBXExportSettings = namedtuple("FBXExportSettings", (
     "bone_correction_matrix", "bone_correction_matrix_inv",
     "bake_anim", "bake_anim_use_all_bones", "bake_anim_use_nla_strips", "bake_anim_use_all_actions",
     "bake_anim_step", "bake_anim_simplify_factor", "bake_anim_force_startend_keying",
-    "use_metadata", "media_settings", "use_custom_props",
+    "use_metadata", "media_settings", "use_custom_props", "export_cache",
 ))
 
 # Helper container gathering some data we need multiple times:
@@ -1278,7 +1442,7 @@ FBXImportSettings = namedtuple("FBXImportSettings", (
     "bake_space_transform", "global_matrix_inv", "global_matrix_inv_transposed",
     "use_custom_normals", "use_image_search",
     "use_alpha_decals", "decal_offset",
-    "use_anim", "anim_offset",
+    "use_anim", "anim_offset", "anim_simplify",
     "use_subsurf",
     "use_custom_props", "use_custom_props_enum_as_string",
     "nodal_material_wrap_map", "image_cache",
@@ -35,6 +35,8 @@ if "bpy" in locals():
 import bpy
 from mathutils import Matrix, Euler, Vector
 
+import numpy as np
+
 # -----
 # Utils
 from . import parse_fbx, fbx_utils
@@ -523,10 +525,12 @@ def blen_read_object_transform_preprocess(fbx_props, fbx_obj, rot_alt_mat, use_p
 
 # ---------
 # Animation
-def blen_read_animations_curves_iter(fbx_curves, blen_start_offset, fbx_start_offset, fps):
+def blen_read_animations_curves_merge(fbx_curves, blen_start_offset, fbx_start_offset, fps, right=None):
     """
-    Get raw FBX AnimCurve list, and yield values for all curves at each singular curves' keyframes,
-    together with (blender) timing, in frames.
+    Get raw FBX AnimCurve list, and return the (blender) timing, in frames, of all curves' keyframes merged together,
+    and the values of each curve at all those frames, as a list of (values, fbx_curve) pairs (numpy arrays).
+    Curves keep their first value before their first keyframe, and get the 'right' value after their last one
+    (defaults to their last value).
     blen_start_offset is expected in frames, while fbx_start_offset is expected in FBX ktime.
     """
     # As a first step, assume linear interpolation between key frames, we'll (try to!) handle more
@@ -534,44 +538,153 @@ def blen_read_animations_curves_iter(fbx_curves, blen_start_offset, fbx_start_of
     from .fbx_utils import FBX_KTIME
     timefac = fps / FBX_KTIME
 
-    curves = tuple([0,
-                    elem_prop_first(elem_find_first(c[2], b'KeyTime')),
-                    elem_prop_first(elem_find_first(c[2], b'KeyValueFloat')),
-                    c]
-                   for c in fbx_curves)
-
-    allkeys = sorted({item for sublist in curves for item in sublist[1]})
-    for curr_fbxktime in allkeys:
-        curr_values = []
-        for item in curves:
-            idx, times, values, fbx_curve = item
-
-            if times[idx] < curr_fbxktime:
-                if idx >= 0:
-                    idx += 1
-                    if idx >= len(times):
-                        # We have reached our last element for this curve, stay on it from now on...
-                        idx = -1
-                    item[0] = idx
-
-            if times[idx] >= curr_fbxktime:
-                if idx == 0:
-                    curr_values.append((values[idx], fbx_curve))
-                else:
-                    # Interpolate between this key and the previous one.
-                    ifac = (curr_fbxktime - times[idx - 1]) / (times[idx] - times[idx - 1])
-                    curr_values.append(((values[idx] - values[idx - 1]) * ifac + values[idx - 1], fbx_curve))
-        curr_blenkframe = (curr_fbxktime - fbx_start_offset) * timefac + blen_start_offset
-        yield (curr_blenkframe, curr_values)
+    curves = []
+    for c in fbx_curves:
+        times = np.asarray(elem_prop_first(elem_find_first(c[2], b'KeyTime'), default=()), dtype=np.int64)
+        values = np.asarray(elem_prop_first(elem_find_first(c[2], b'KeyValueFloat'), default=()), dtype=np.float64)
+        if len(times):
+            curves.append((times, values, c))
+
+    if not curves:
+        return np.empty(0, dtype=np.float64), []
+
+    allkeys = np.unique(np.concatenate([times for times, _values, _c in curves]))
+    curves_values = [(np.interp(allkeys, times, values, right=right), fbx_curve)
+                     for times, values, fbx_curve in curves]
+
+    frames = (allkeys - fbx_start_offset) * timefac + blen_start_offset
+    return frames, curves_values
+
+
+def blen_read_object_transform_do_batch(transform_data, locs, rots, scas):
+    """
+    Same as blen_read_object_transform_do() (first returned matrix only), for (n, 3) arrays of
+    loc, rot (in degrees) and sca values, all other transform data being constant. Returns a (n, 4, 4) array.
+    """
+    to_rot = lambda rot, rot_ord: Euler(convert_deg_to_rad_iter(rot), rot_ord).to_matrix().to_4x4()
+    rot_piv = Matrix.Translation(transform_data.rot_piv)
+    sca_piv = Matrix.Translation(transform_data.sca_piv)
+
+    geom_mat = (Matrix.Translation(transform_data.geom_loc) @
+                to_rot(transform_data.geom_rot, transform_data.rot_ord) @
+                Matrix.Diagonal(transform_data.geom_sca).to_4x4())
+
+    # Constant parts of the transform chain, around the animated rotation and scale.
+    pre_rot_mat = np.array(Matrix.Translation(transform_data.rot_ofs) @
+                           rot_piv @
+                           to_rot(transform_data.pre_rot, transform_data.rot_ord))
+    pst_rot_mat = np.array(transform_data.rot_alt_mat @
+                           to_rot(transform_data.pst_rot, transform_data.rot_ord) @
+                           rot_piv.inverted_safe() @
+                           Matrix.Translation(transform_data.sca_ofs) @
+                           sca_piv)
+    pst_sca_mat = np.array(sca_piv.inverted_safe() @ geom_mat)
+
+    nbr_frames = len(locs)
+    lcl_translation = np.tile(np.identity(4), (nbr_frames, 1, 1))
+    lcl_translation[:, :3, 3] = locs
+
+    lcl_rot = np.tile(np.identity(4), (nbr_frames, 1, 1))
+    lcl_rot[:, :3, :3] = np_euler_to_matrix(np.radians(rots), transform_data.rot_ord)
+
+    lcl_scale = np.tile(np.identity(4), (nbr_frames, 1, 1))
+    lcl_scale[:, 0, 0], lcl_scale[:, 1, 1], lcl_scale[:, 2, 2] = scas.T
+
+    return lcl_translation @ pre_rot_mat @ lcl_rot @ pst_rot_mat @ lcl_scale @ pst_sca_mat
+
+
+def np_euler_to_matrix(eulers, rot_ord):
+    """Same as mathutils' Euler.to_matrix(), for a (n, 3) array of euler angles (in radians)."""
+    cos = np.cos(eulers)
+    sin = np.sin(eulers)
+    mat = np.tile(np.identity(3), (len(eulers), 1, 1))
+    for axis in rot_ord:
+        i = "XYZ".index(axis)
+        j, k = (i + 1) % 3, (i + 2) % 3
+        axis_mat = np.tile(np.identity(3), (len(eulers), 1, 1))
+        axis_mat[:, j, j] = axis_mat[:, k, k] = cos[:, i]
+        axis_mat[:, j, k] = -sin[:, i]
+        axis_mat[:, k, j] = sin[:, i]
+        mat = axis_mat @ mat
+    return mat
+
+
+def np_matrix_decompose(mats):
+    """Same as mathutils' Matrix.decompose(), for a (n, 4, 4) array of matrices, quaternions being (w, x, y, z)."""
+    locs = mats[:, :3, 3]
+    rots = mats[:, :3, :3]
+    scas = np.linalg.norm(rots, axis=1)
+    rots = rots / np.where(scas == 0.0, 1.0, scas)[:, None, :]
+    neg = np.linalg.det(rots) < 0.0
+    rots[neg] *= -1.0
+    scas[neg] *= -1.0
+
+    m = rots
+    quats = np.empty((len(m), 4))
+    trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+    # Pick the numerically best formula for each matrix.
+    case = np.where(trace > 0.0, 0, 1 + np.argmax(np.diagonal(m, axis1=1, axis2=2), axis=1))
+    for c, (i, j, k) in enumerate(((None, None, None), (0, 1, 2), (1, 2, 0), (2, 0, 1))):
+        sel = case == c
+        if not sel.any():
+            continue
+        ms = m[sel]
+        if c == 0:
+            t = np.sqrt(trace[sel] + 1.0) * 2.0
+            quats[sel, 0] = 0.25 * t
+            quats[sel, 1] = (ms[:, 2, 1] - ms[:, 1, 2]) / t
+            quats[sel, 2] = (ms[:, 0, 2] - ms[:, 2, 0]) / t
+            quats[sel, 3] = (ms[:, 1, 0] - ms[:, 0, 1]) / t
+        else:
+            t = np.sqrt(np.maximum(1.0 + ms[:, i, i] - ms[:, j, j] - ms[:, k, k], 0.0)) * 2.0
+            t = np.where(t == 0.0, 1.0, t)
+            quats[sel, 0] = (ms[:, k, j] - ms[:, j, k]) / t
+            quats[sel, 1 + i] = 0.25 * t
+            quats[sel, 1 + j] = (ms[:, j, i] + ms[:, i, j]) / t
+            quats[sel, 1 + k] = (ms[:, k, i] + ms[:, i, k]) / t
+    quats[quats[:, 0] < 0.0] *= -1.0
+    quats /= np.linalg.norm(quats, axis=1)[:, None]
 
+    return locs, quats, rots, scas
 
-def blen_read_animations_action_item(action, item, cnodes, fps, anim_offset):
+
+def blen_read_animations_simplify(frames, values, tolerance):
+    """
+    Return a mask of the keyframes to keep, dropping those which can be linearly interpolated from their neighbors
+    (within given tolerance). First and last keys are always kept.
+    """
+    keep = np.ones(len(frames), dtype=bool)
+    if tolerance <= 0.0 or len(frames) < 3:
+        return keep
+
+    while True:
+        idx = np.flatnonzero(keep)
+        if len(idx) < 3:
+            break
+        f, v = frames[idx], values[idx]
+        fac = (f[1:-1] - f[:-2]) / (f[2:] - f[:-2])
+        candidates = np.abs(v[:-2] + (v[2:] - v[:-2]) * fac - v[1:-1]) <= tolerance
+        if not candidates.any():
+            break
+        # Never drop two consecutive keys in a same pass, so that each dropped key is checked against
+        # its actual remaining neighbors.
+        runs = np.cumsum(np.concatenate(((0,), np.diff(candidates.astype(np.int8)) != 0)))
+        run_starts = np.flatnonzero(np.concatenate(((True,), runs[1:] != runs[:-1])))
+        pos_in_run = np.arange(len(candidates)) - run_starts[runs]
+        drop = candidates & (pos_in_run % 2 == 0)
+        keep[idx[1:-1][drop]] = False
+
+    return keep
+
+
+def blen_read_animations_action_item(action, item, cnodes, fps, anim_offset, anim_simplify=0.0):
     """
     'Bake' loc/rot/scale into the action,
     taking any pre_ and post_ matrix into account to transform from fbx into blender space.
+    All frames are evaluated at once (as numpy arrays), and keyframes of each F-Curve are created in a single batch.
+    anim_simplify is the tolerance under which redundant keyframes are removed (0.0 to keep all of them).
     """
     from bpy.types import Object, PoseBone, ShapeKey, Material, Camera
-    from itertools import chain
 
     fbx_curves = []
     for curves, fbxprop in cnodes.values():
@@ -584,14 +697,6 @@ def blen_read_animations_action_item(action, item, cnodes, fps, anim_offset):
 
     blen_curves = []
     props = []
-    keyframes = {}
-
-    # Add each keyframe to the keyframe dict
-    def store_keyframe(fc, frame, value):
-        fc_key = (fc.data_path, fc.array_index)
-        if not keyframes.get(fc_key):
-            keyframes[fc_key] = []
-        keyframes[fc_key].extend((frame, value))
 
     if isinstance(item, Material):
         grpname = item.name
@@ -625,113 +730,118 @@ def blen_read_animations_action_item(action, item, cnodes, fps, anim_offset):
     blen_curves = [action.fcurves.new(prop, index=channel, action_group=grpname)
                    for prop, nbr_channels, grpname in props for channel in range(nbr_channels)]
 
+    # Values for each of blen_curves, at all frames.
     if isinstance(item, Material):
-        for frame, values in blen_read_animations_curves_iter(fbx_curves, anim_offset, 0, fps):
-            value = [0,0,0]
-            for v, (fbxprop, channel, _fbx_acdata) in values:
-                assert(fbxprop == b'DiffuseColor')
-                assert(channel in {0, 1, 2})
-                value[channel] = v
-
-            for fc, v in zip(blen_curves, value):
-                store_keyframe(fc, frame, v)
+        # Channels without (or past the end of their) curve are keyed to zero.
+        frames, values = blen_read_animations_curves_merge(fbx_curves, anim_offset, 0, fps, right=np.nan)
+        blen_values = [np.zeros(len(frames)) for fc in blen_curves]
+        for v, (fbxprop, channel, _fbx_acdata) in values:
+            assert(fbxprop == b'DiffuseColor')
+            assert(channel in {0, 1, 2})
+            blen_values[channel] = np.nan_to_num(v, nan=0.0)
 
     elif isinstance(item, ShapeKey):
-        for frame, values in blen_read_animations_curves_iter(fbx_curves, anim_offset, 0, fps):
-            value = 0.0
-            for v, (fbxprop, channel, _fbx_acdata) in values:
-                assert(fbxprop == b'DeformPercent')
-                assert(channel == 0)
-                value = v / 100.0
-
-            for fc, v in zip(blen_curves, (value,)):
-                store_keyframe(fc, frame, v)
+        frames, values = blen_read_animations_curves_merge(fbx_curves, anim_offset, 0, fps, right=np.nan)
+        blen_values = [np.zeros(len(frames))]
+        for v, (fbxprop, channel, _fbx_acdata) in values:
+            assert(fbxprop == b'DeformPercent')
+            assert(channel == 0)
+            blen_values[0] = np.nan_to_num(v / 100.0, nan=0.0)
 
     elif isinstance(item, Camera):
-        for frame, values in blen_read_animations_curves_iter(fbx_curves, anim_offset, 0, fps):
-            value = 0.0
-            for v, (fbxprop, channel, _fbx_acdata) in values:
-                assert(fbxprop == b'FocalLength')
-                assert(channel == 0)
-                value = v
-
-            for fc, v in zip(blen_curves, (value,)):
-                store_keyframe(fc, frame, v)
+        frames, values = blen_read_animations_curves_merge(fbx_curves, anim_offset, 0, fps, right=np.nan)
+        blen_values = [np.zeros(len(frames))]
+        for v, (fbxprop, channel, _fbx_acdata) in values:
+            assert(fbxprop == b'FocalLength')
+            assert(channel == 0)
+            blen_values[0] = np.nan_to_num(v, nan=0.0)
 
     else:  # Object or PoseBone:
-        if item.is_bone:
-            bl_obj = item.bl_obj.pose.bones[item.bl_bone]
-        else:
-            bl_obj = item.bl_obj
-
         transform_data = item.fbx_transform_data
-        rot_eul_prev = bl_obj.rotation_euler.copy()
-        rot_quat_prev = bl_obj.rotation_quaternion.copy()
 
         # Pre-compute inverted local rest matrix of the bone, if relevant.
         restmat_inv = item.get_bind_matrix().inverted_safe() if item.is_bone else None
 
-        for frame, values in blen_read_animations_curves_iter(fbx_curves, anim_offset, 0, fps):
-            for v, (fbxprop, channel, _fbx_acdata) in values:
-                if fbxprop == b'Lcl Translation':
-                    transform_data.loc[channel] = v
-                elif fbxprop == b'Lcl Rotation':
-                    transform_data.rot[channel] = v
-                elif fbxprop == b'Lcl Scaling':
-                    transform_data.sca[channel] = v
-            mat, _, _ = blen_read_object_transform_do(transform_data)
-
-            # compensate for changes in the local matrix during processing
-            if item.anim_compensation_matrix:
-                mat = mat @ item.anim_compensation_matrix
-
-            # apply pre- and post matrix
-            # post-matrix will contain any correction for lights, camera and bone orientation
-            # pre-matrix will contain any correction for a parent's correction matrix or the global matrix
-            if item.pre_matrix:
-                mat = item.pre_matrix @ mat
-            if item.post_matrix:
-                mat = mat @ item.post_matrix
-
-            # And now, remove that rest pose matrix from current mat (also in parent space).
-            if restmat_inv:
-                mat = restmat_inv @ mat
-
-            # Now we have a virtual matrix of transform from AnimCurves, we can insert keyframes!
-            loc, rot, sca = mat.decompose()
-            if rot_mode == 'QUATERNION':
-                if rot_quat_prev.dot(rot) < 0.0:
-                    rot = -rot
-                rot_quat_prev = rot
-            elif rot_mode == 'AXIS_ANGLE':
-                vec, ang = rot.to_axis_angle()
-                rot = ang, vec.x, vec.y, vec.z
-            else:  # Euler
-                rot = rot.to_euler(rot_mode, rot_eul_prev)
-                rot_eul_prev = rot
-
-            # Add each keyframe and its value to the keyframe dict
-            for fc, value in zip(blen_curves, chain(loc, rot, sca)):
-                store_keyframe(fc, frame, value)
+        frames, values = blen_read_animations_curves_merge(fbx_curves, anim_offset, 0, fps)
+        nbr_frames = len(frames)
+
+        # Non-animated channels keep their static value.
+        locs = np.tile(np.array(transform_data.loc, dtype=np.float64), (nbr_frames, 1))
+        rots = np.tile(np.array(transform_data.rot, dtype=np.float64), (nbr_frames, 1))
+        scas = np.tile(np.array(transform_data.sca, dtype=np.float64), (nbr_frames, 1))
+        for v, (fbxprop, channel, _fbx_acdata) in values:
+            if fbxprop == b'Lcl Translation':
+                locs[:, channel] = v
+            elif fbxprop == b'Lcl Rotation':
+                rots[:, channel] = v
+            elif fbxprop == b'Lcl Scaling':
+                scas[:, channel] = v
+
+        # Keep transform data in the same state as if all frames had been evaluated one after the other.
+        if nbr_frames:
+            transform_data.loc[:] = locs[-1].tolist()
+            transform_data.rot[:] = rots[-1].tolist()
+            transform_data.sca[:] = scas[-1].tolist()
+
+        mats = blen_read_object_transform_do_batch(transform_data, locs, rots, scas)
+
+        # compensate for changes in the local matrix during processing
+        if item.anim_compensation_matrix:
+            mats = mats @ np.array(item.anim_compensation_matrix)
+
+        # apply pre- and post matrix
+        # post-matrix will contain any correction for lights, camera and bone orientation
+        # pre-matrix will contain any correction for a parent's correction matrix or the global matrix
+        if item.pre_matrix:
+            mats = np.array(item.pre_matrix) @ mats
+        if item.post_matrix:
+            mats = mats @ np.array(item.post_matrix)
+
+        # And now, remove that rest pose matrix from current mat (also in parent space).
+        if restmat_inv:
+            mats = np.array(restmat_inv) @ mats
+
+        # Now we have virtual matrices of transform from AnimCurves, we can compute keyframes values!
+        locs, quats, rotmats, scas = np_matrix_decompose(mats)
+        if rot_mode == 'QUATERNION':
+            # Keep quaternions continuous (starting from current rotation), flipping them when needed.
+            quats_prev = np.concatenate((np.array(bl_obj.rotation_quaternion)[None, :], quats[:-1]))[:nbr_frames]
+            flips = np.cumsum(np.einsum('ij,ij->i', quats, quats_prev) < 0.0) % 2 == 1
+            quats[flips] *= -1.0
+            rots = quats
+        elif rot_mode == 'AXIS_ANGLE':
+            half_angles = np.arccos(np.clip(quats[:, 0], -1.0, 1.0))
+            sins = np.sin(half_angles)
+            axes = quats[:, 1:] / np.where(np.abs(sins) < 1e-7, 1.0, sins)[:, None]
+            axes[~axes.any(axis=1), 1] = 1.0
+            rots = np.column_stack((half_angles * 2.0, axes))
+        else:  # Euler
+            # Compatible eulers depend on the previous frame's one, so this has to remain sequential.
+            rot_eul_prev = bl_obj.rotation_euler.copy()
+            rots = np.empty((nbr_frames, 3))
+            for i, rotmat in enumerate(rotmats):
+                rot_eul_prev = Matrix(rotmat.tolist()).to_euler(rot_mode, rot_eul_prev)
+                rots[i] = rot_eul_prev
+
+        blen_values = list(np.column_stack((locs, rots, scas)).T)
 
     # Add all keyframe points to the fcurves at once and modify them after
-    for fc_key, key_values in keyframes.items():
-        data_path, index = fc_key
+    linear_enum_value = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items['LINEAR'].value
+    for fc, values in zip(blen_curves, blen_values):
+        keep = blen_read_animations_simplify(frames, values, anim_simplify)
+        key_values = np.column_stack((frames[keep], values[keep])).astype(np.float32).ravel()
 
-        # Add all keyframe points at once
-        fcurve = action.fcurves.find(data_path=data_path, index=index)
         num_keys = len(key_values) // 2
-        fcurve.keyframe_points.add(num_keys)
-        fcurve.keyframe_points.foreach_set('co', key_values)
-        linear_enum_value = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items['LINEAR'].value
-        fcurve.keyframe_points.foreach_set('interpolation', (linear_enum_value,) * num_keys)
+        fc.keyframe_points.add(num_keys)
+        fc.keyframe_points.foreach_set('co', key_values)
+        fc.keyframe_points.foreach_set('interpolation', np.full(num_keys, linear_enum_value, dtype=np.int32))
 
     # Since we inserted our keyframes in 'ultra-fast' mode, we have to update the fcurves now.
     for fc in blen_curves:
         fc.update()
 
 
-def blen_read_animations(fbx_tmpl_astack, fbx_tmpl_alayer, stacks, scene, anim_offset):
+def blen_read_animations(fbx_tmpl_astack, fbx_tmpl_alayer, stacks, scene, anim_offset, anim_simplify=0.0):
     """
     Recreate an action per stack/layer/object combinations.
     Only the first found action is linked to objects, more complex setups are not handled,
@@ -773,7 +883,7 @@ def blen_read_animations(fbx_tmpl_astack, fbx_tmpl_alayer, stacks, scene, anim_o
                 if not id_data.animation_data.action:
                     id_data.animation_data.action = action
                 # And actually populate the action!
-                blen_read_animations_action_item(action, item, cnodes, scene.render.fps, anim_offset)
+                blen_read_animations_action_item(action, item, cnodes, scene.render.fps, anim_offset, anim_simplify)
 
 
 # ----
@@ -787,81 +897,86 @@ def blen_read_geom_layerinfo(fbx_layer):
         )
 
 
-def blen_read_geom_array_setattr(generator, blen_data, blen_attr, fbx_data, stride, item_size, descr, xform):
-    """Generic fbx_layer to blen_data setter, generator is expected to yield tuples (ble_idx, fbx_idx)."""
-    max_idx = len(blen_data) - 1
-    print_error = True
-
-    def check_skip(blen_idx, fbx_idx):
-        nonlocal print_error
-        if fbx_idx < 0:  # Negative values mean 'skip'.
-            return True
-        if blen_idx > max_idx:
-            if print_error:
-                print("ERROR: too much data in this layer, compared to elements in mesh, skipping!")
-                print_error = False
-            return True
-        return False
+def blen_read_geom_array_setattr(indices, blen_data, blen_attr, fbx_data, stride, item_size, descr, xform):
+    """
+    Generic fbx_layer to blen_data setter, indices is expected to be a pair of (blen_idx, fbx_idx) numpy arrays.
 
-    if xform is not None:
-        if isinstance(blen_data, list):
-            if item_size == 1:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    blen_data[blen_idx] = xform(fbx_data[fbx_idx])
-            else:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    blen_data[blen_idx] = xform(fbx_data[fbx_idx:fbx_idx + item_size])
-        else:
-            if item_size == 1:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    setattr(blen_data[blen_idx], blen_attr, xform(fbx_data[fbx_idx]))
-            else:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    setattr(blen_data[blen_idx], blen_attr, xform(fbx_data[fbx_idx:fbx_idx + item_size]))
+    All data is gathered with numpy fancy indexing and written with a single foreach_set() call,
+    xform (if any) is called once with the whole array of items (of shape (n,) or (n, item_size)).
+    blen_data may also be a numpy array, which is then directly filled.
+    """
+    blen_idx, fbx_idx = indices
+    blen_len = len(blen_data)
+    fbx_data = np.asarray(fbx_data)
+
+    # Negative values mean 'skip'.
+    mask = (fbx_idx >= 0) & (fbx_idx + item_size <= len(fbx_data))
+    mask_too_much = blen_idx >= blen_len
+    if mask_too_much.any():
+        print("ERROR: too much data in this layer, compared to elements in mesh, skipping!")
+        mask &= ~mask_too_much
+    if not mask.all():
+        blen_idx = blen_idx[mask]
+        fbx_idx = fbx_idx[mask]
+
+    if item_size == 1:
+        items = fbx_data[fbx_idx]
     else:
-        if isinstance(blen_data, list):
-            if item_size == 1:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    blen_data[blen_idx] = fbx_data[fbx_idx]
-            else:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    blen_data[blen_idx] = fbx_data[fbx_idx:fbx_idx + item_size]
-        else:
-            if item_size == 1:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    setattr(blen_data[blen_idx], blen_attr, fbx_data[fbx_idx])
-            else:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    setattr(blen_data[blen_idx], blen_attr, fbx_data[fbx_idx:fbx_idx + item_size])
+        items = fbx_data[fbx_idx[:, None] + np.arange(item_size)]
+    if xform is not None:
+        items = xform(items)
+
+    if isinstance(blen_data, np.ndarray):
+        blen_data[blen_idx] = items
+        return
+
+    dtype = {'b': np.bool_, 'i': np.int32, 'u': np.int32}.get(items.dtype.kind, np.float32)
+    blen_values = np.empty(blen_len * item_size, dtype=dtype)
+    if len(blen_idx) != blen_len:
+        # Keep existing values of the items not covered by this layer.
+        blen_data.foreach_get(blen_attr, blen_values)
+    blen_values.reshape(blen_len, item_size)[blen_idx] = items.reshape(-1, item_size)
+    blen_data.foreach_set(blen_attr, blen_values)
 
-    for blen_idx, fbx_idx in generator:
-        if check_skip(blen_idx, fbx_idx):
-            continue
-        _process(blen_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx)
 
+def blen_read_geom_polygons_loops(mesh):
+    """Return the indices of the loops used by polygons, and the index of the polygon of each of those loops."""
+    nbr_polys = len(mesh.polygons)
+    poly_loop_starts = np.empty(nbr_polys, dtype=np.int32)
+    poly_loop_totals = np.empty(nbr_polys, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", poly_loop_starts)
+    mesh.polygons.foreach_get("loop_total", poly_loop_totals)
 
-# generic generators.
+    poly_idx = np.repeat(np.arange(nbr_polys), poly_loop_totals)
+    poly_offsets = np.cumsum(poly_loop_totals) - poly_loop_totals
+    loop_idx = np.arange(len(poly_idx)) - np.repeat(poly_offsets - poly_loop_starts, poly_loop_totals)
+    return loop_idx, poly_idx
+
+
+# generic index generators, all return a pair of (blen_idx, fbx_idx) numpy arrays.
 def blen_read_geom_array_gen_allsame(data_len):
-    return zip(*(range(data_len), (0,) * data_len))
+    return np.arange(data_len), np.zeros(data_len, dtype=np.int64)
 
 
 def blen_read_geom_array_gen_direct(fbx_data, stride):
-    fbx_data_len = len(fbx_data)
-    return zip(*(range(fbx_data_len // stride), range(0, fbx_data_len, stride)))
+    blen_idx = np.arange(len(fbx_data) // stride)
+    return blen_idx, blen_idx * stride
 
 
 def blen_read_geom_array_gen_indextodirect(fbx_layer_index, stride):
-    return ((bi, fi * stride) for bi, fi in enumerate(fbx_layer_index))
+    fbx_idx = np.asarray(fbx_layer_index, dtype=np.int64)
+    return np.arange(len(fbx_idx)), fbx_idx * stride
 
 
 def blen_read_geom_array_gen_direct_looptovert(mesh, fbx_data, stride):
     fbx_data_len = len(fbx_data) // stride
-    loops = mesh.loops
-    for p in mesh.polygons:
-        for lidx in p.loop_indices:
-            vidx = loops[lidx].vertex_index
-            if vidx < fbx_data_len:
-                yield lidx, vidx * stride
+    loops_vidx = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loops_vidx)
+
+    loop_idx, _poly_idx = blen_read_geom_polygons_loops(mesh)
+    vidx = loops_vidx[loop_idx]
+    mask = vidx < fbx_data_len
+    return loop_idx[mask], vidx[mask].astype(np.int64) * stride
 
 
 # generic error printers.
@@ -1133,7 +1248,7 @@ def blen_read_geom_layer_smooth(fbx_obj, mesh):
             fbx_layer_data, None,
             fbx_layer_mapping, fbx_layer_ref,
             1, 1, layer_id,
-            xform=lambda s: not s,
+            xform=np.logical_not,
             )
         # We only set sharp edges here, not face smoothing itself...
         mesh.use_auto_smooth = True
@@ -1152,8 +1267,6 @@ def blen_read_geom_layer_smooth(fbx_obj, mesh):
         return False
 
 def blen_read_geom_layer_edge_crease(fbx_obj, mesh):
-    from math import sqrt
-
     fbx_layer = elem_find_first(fbx_obj, b'LayerElementEdgeCrease')
 
     if fbx_layer is None:
@@ -1190,7 +1303,7 @@ def blen_read_geom_layer_edge_crease(fbx_obj, mesh):
             1, 1, layer_id,
             # Blender squares those values before sending them to OpenSubdiv, when other softwares don't,
             # so we need to compensate that to get similar results through FBX...
-            xform=sqrt,
+            xform=np.sqrt,
             )
     else:
         print("warning layer %r mapping type unsupported: %r" % (fbx_layer.id, fbx_layer_mapping))
@@ -1220,17 +1333,20 @@ def blen_read_geom_layer_normal(fbx_obj, mesh, xform=None):
              (mesh.polygons, "Polygons", True, blen_read_geom_array_mapped_polygon),
              (mesh.vertices, "Vertices", True, blen_read_geom_array_mapped_vert))
     for blen_data, blen_data_type, is_fake, func in tries:
-        bdata = [None] * len(blen_data) if is_fake else blen_data
+        bdata = np.zeros((len(blen_data), 3), dtype=np.float32) if is_fake else blen_data
         if func(mesh, bdata, "normal",
                 fbx_layer_data, fbx_layer_index, fbx_layer_mapping, fbx_layer_ref, 3, 3, layer_id, xform, True):
             if blen_data_type == "Polygons":
-                for pidx, p in enumerate(mesh.polygons):
-                    for lidx in range(p.loop_start, p.loop_start + p.loop_total):
-                        mesh.loops[lidx].normal[:] = bdata[pidx]
+                lnors = np.empty((len(mesh.loops), 3), dtype=np.float32)
+                mesh.loops.foreach_get("normal", lnors.ravel())
+                loop_idx, poly_idx = blen_read_geom_polygons_loops(mesh)
+                lnors[loop_idx] = bdata[poly_idx]
+                mesh.loops.foreach_set("normal", lnors.ravel())
             elif blen_data_type == "Vertices":
                 # We have to copy vnors to lnors! Far from elegant, but simple.
-                for l in mesh.loops:
-                    l.normal[:] = bdata[l.vertex_index]
+                loops_vidx = np.empty(len(mesh.loops), dtype=np.int32)
+                mesh.loops.foreach_get("vertex_index", loops_vidx)
+                mesh.loops.foreach_set("normal", bdata[loops_vidx].ravel())
             return True
 
     blen_read_geom_array_error_mapping("normal", fbx_layer_mapping)
@@ -1239,7 +1355,6 @@ def blen_read_geom_layer_normal(fbx_obj, mesh, xform=None):
 
 
 def blen_read_geom(fbx_tmpl, fbx_obj, settings):
-    from itertools import chain
     import array
 
     # Vertices are in object space, but we are post-multiplying all transforms with the inverse of the
@@ -1260,10 +1375,9 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
     fbx_edges = elem_prop_first(elem_find_first(fbx_obj, b'Edges'))
 
     if geom_mat_co is not None:
-        def _vcos_transformed_gen(raw_cos, m=None):
-            # Note: we could most likely get much better performances with numpy, but will leave this as TODO for now.
-            return chain(*(m @ Vector(v) for v in zip(*(iter(raw_cos),) * 3)))
-        fbx_verts = array.array(fbx_verts.typecode, _vcos_transformed_gen(fbx_verts, geom_mat_co))
+        m = np.array(geom_mat_co, dtype=np.float64)
+        vcos = np.asarray(fbx_verts).reshape(-1, 3) @ m[:3, :3].T + m[:3, 3]
+        fbx_verts = array.array(fbx_verts.typecode, vcos.ravel().tobytes())
 
     if fbx_verts is None:
         fbx_verts = ()
@@ -1275,18 +1389,17 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
     mesh.vertices.foreach_set("co", fbx_verts)
 
     if fbx_polys:
+        # Last index of each polygon is negative (XOR'ed with -1).
+        fbx_polys_np = np.asarray(fbx_polys)
+        poly_ends = np.flatnonzero(fbx_polys_np < 0).astype(np.int32)
+
         mesh.loops.add(len(fbx_polys))
-        poly_loop_starts = []
-        poly_loop_totals = []
-        poly_loop_prev = 0
-        for i, l in enumerate(mesh.loops):
-            index = fbx_polys[i]
-            if index < 0:
-                poly_loop_starts.append(poly_loop_prev)
-                poly_loop_totals.append((i - poly_loop_prev) + 1)
-                poly_loop_prev = i + 1
-                index ^= -1
-            l.vertex_index = index
+        mesh.loops.foreach_set("vertex_index",
+                               np.where(fbx_polys_np < 0, np.invert(fbx_polys_np), fbx_polys_np).astype(np.int32))
+
+        poly_loop_starts = np.zeros(len(poly_ends), dtype=np.int32)
+        poly_loop_starts[1:] = poly_ends[:-1] + 1
+        poly_loop_totals = poly_ends - poly_loop_starts + 1
 
         mesh.polygons.add(len(poly_loop_starts))
         mesh.polygons.foreach_set("loop_start", poly_loop_starts)
@@ -1340,8 +1453,10 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
         if geom_mat_no is None:
             ok_normals = blen_read_geom_layer_normal(fbx_obj, mesh)
         else:
+            geom_mat_no_np = np.array(geom_mat_no.to_3x3(), dtype=np.float64)
+
             def nortrans(v):
-                return geom_mat_no @ Vector(v)
+                return v @ geom_mat_no_np.T
             ok_normals = blen_read_geom_layer_normal(fbx_obj, mesh, nortrans)
 
     mesh.validate(clean_customdata=False)  # *Very* important to not remove lnors here!
@@ -2355,27 +2470,36 @@ class FbxImportHelperNode:
             return None
 
 
-def load(operator, context, filepath="",
-         use_manual_orientation=False,
-         axis_forward='-Z',
-         axis_up='Y',
-         global_scale=1.0,
-         bake_space_transform=False,
-         use_custom_normals=True,
-         use_image_search=False,
-         use_alpha_decals=False,
-         decal_offset=0.0,
-         use_anim=True,
-         anim_offset=1.0,
-         use_subsurf=False,
-         use_custom_props=True,
-         use_custom_props_enum_as_string=True,
-         ignore_leaf_bones=False,
-         force_connect_children=False,
-         automatic_bone_orientation=False,
-         primary_bone_axis='Y',
-         secondary_bone_axis='X',
-         use_prepost_rot=True):
+def load(operator, context, filepath="", **kwargs):
+    from . import parse_fbx
+
+    # Arrays are decoded from the memory-mapped file when the import uses them, it's closed once the import is done.
+    with parse_fbx.FBXLazyFile() as lazy_file:
+        return load_lazy(operator, context, lazy_file, filepath=filepath, **kwargs)
+
+
+def load_lazy(operator, context, lazy_file, filepath="",
+              use_manual_orientation=False,
+              axis_forward='-Z',
+              axis_up='Y',
+              global_scale=1.0,
+              bake_space_transform=False,
+              use_custom_normals=True,
+              use_image_search=False,
+              use_alpha_decals=False,
+              decal_offset=0.0,
+              use_anim=True,
+              anim_offset=1.0,
+              anim_simplify=0.0,
+              use_subsurf=False,
+              use_custom_props=True,
+              use_custom_props_enum_as_string=True,
+              ignore_leaf_bones=False,
+              force_connect_children=False,
+              automatic_bone_orientation=False,
+              primary_bone_axis='Y',
+              secondary_bone_axis='X',
+              use_prepost_rot=True):
 
     global fbx_elem_nil
     fbx_elem_nil = FBXElem('', (), (), ())
@@ -2415,7 +2539,7 @@ def load(operator, context, filepath="",
     # End ascii detection.
 
     try:
-        elem_root, version = parse_fbx.parse(filepath)
+        elem_root, version = parse_fbx.parse(filepath, lazy_file=lazy_file)
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -2509,7 +2633,7 @@ def load(operator, context, filepath="",
         bake_space_transform, global_matrix_inv, global_matrix_inv_transposed,
         use_custom_normals, use_image_search,
         use_alpha_decals, decal_offset,
-        use_anim, anim_offset,
+        use_anim, anim_offset, anim_simplify,
         use_subsurf,
         use_custom_props, use_custom_props_enum_as_string,
         nodal_material_wrap_map, image_cache,
@@ -3056,7 +3180,8 @@ def load(operator, context, filepath="",
                     curvenodes[acn_uuid][ac_uuid] = (fbx_acitem, channel)
 
             # And now that we have sorted all this, apply animations!
-            blen_read_animations(fbx_tmpl_astack, fbx_tmpl_alayer, stacks, scene, settings.anim_offset)
+            blen_read_animations(fbx_tmpl_astack, fbx_tmpl_alayer, stacks, scene,
+                                 settings.anim_offset, settings.anim_simplify)
 
         _(); del _
 
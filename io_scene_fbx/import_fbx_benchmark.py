@@ -0,0 +1,169 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+# Compares the former per-item reading of FBX geometry with the NumPy one, on a generated file.
+# Needs Blender, the optional argument is the number of subdivisions of the generated grid:
+#     blender -b --factory-startup --python io_scene_fbx/import_fbx_benchmark.py -- 500
+
+import array
+import os
+import tempfile
+import time
+from itertools import chain
+
+import bpy
+import numpy as np
+from mathutils import Matrix, Vector
+
+# XXX Not really nice, but that hack is needed to allow execution of that script
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    from io_scene_fbx import parse_fbx
+    from io_scene_fbx.import_fbx import (
+        blen_read_geom_array_gen_direct,
+        blen_read_geom_array_gen_indextodirect,
+        blen_read_geom_array_setattr,
+        elem_find_first,
+        elem_find_first_string_as_bytes,
+        elem_find_iter,
+        elem_prop_first,
+    )
+else:
+    from . import parse_fbx
+    from .import_fbx import (
+        blen_read_geom_array_gen_direct,
+        blen_read_geom_array_gen_indextodirect,
+        blen_read_geom_array_setattr,
+        elem_find_first,
+        elem_find_first_string_as_bytes,
+        elem_find_iter,
+        elem_prop_first,
+    )
+
+
+def write_test_file(filepath, subdivisions):
+    """Export a grid mesh with normals, UVs, colors, a material and smoothing to filepath."""
+    bpy.ops.mesh.primitive_grid_add(x_subdivisions=subdivisions, y_subdivisions=subdivisions)
+    obj = bpy.context.object
+    mesh = obj.data
+    mesh.vertex_colors.new()
+    mesh.materials.append(bpy.data.materials.new("benchmark"))
+    bpy.ops.export_scene.fbx(filepath=filepath, use_selection=True, mesh_smooth_type='FACE')
+    bpy.data.objects.remove(obj)
+    bpy.data.meshes.remove(mesh)
+
+
+def benchmark(filepath, repeat=3):
+    """
+    Compare the former per-item reading of geometry data with the numpy one, on all meshes of a file,
+    printing the best timings.
+    """
+    def best_time(func, *args):
+        best = float('inf')
+        for i in range(repeat):
+            start_time = time.perf_counter()
+            func(*args)
+            best = min(best, time.perf_counter() - start_time)
+        return best
+
+    # Former implementations, item by item.
+    def layer_before(fbx_data, fbx_index, stride, item_size):
+        if fbx_index is None:
+            fbx_data_len = len(fbx_data)
+            indices = zip(range(fbx_data_len // stride), range(0, fbx_data_len, stride))
+        else:
+            indices = ((bi, fi * stride) for bi, fi in enumerate(fbx_index))
+        blen_data = [None] * (len(fbx_data) // stride if fbx_index is None else len(fbx_index))
+        for blen_idx, fbx_idx in indices:
+            if fbx_idx < 0:
+                continue
+            if item_size == 1:
+                blen_data[blen_idx] = fbx_data[fbx_idx]
+            else:
+                blen_data[blen_idx] = fbx_data[fbx_idx:fbx_idx + item_size]
+
+    def layer_after(fbx_data, fbx_index, stride, item_size):
+        if fbx_index is None:
+            indices = blen_read_geom_array_gen_direct(fbx_data, stride)
+        else:
+            indices = blen_read_geom_array_gen_indextodirect(fbx_index, stride)
+        blen_data = np.zeros((len(indices[0]), item_size) if item_size > 1 else len(indices[0]))
+        blen_read_geom_array_setattr(indices, blen_data, None, fbx_data, stride, item_size, None, None)
+
+    def verts_before(fbx_verts, m):
+        return array.array(fbx_verts.typecode, chain(*(m @ Vector(v) for v in zip(*(iter(fbx_verts),) * 3))))
+
+    def verts_after(fbx_verts, m):
+        m = np.array(m, dtype=np.float64)
+        vcos = np.asarray(fbx_verts).reshape(-1, 3) @ m[:3, :3].T + m[:3, 3]
+        return array.array(fbx_verts.typecode, vcos.ravel().tobytes())
+
+    layers = (
+        (b'LayerElementNormal', b'Normals', b'NormalsIndex', 3),
+        (b'LayerElementUV', b'UV', b'UVIndex', 2),
+        (b'LayerElementColor', b'Colors', b'ColorIndex', 4),
+        (b'LayerElementMaterial', b'Materials', None, 1),
+        (b'LayerElementSmoothing', b'Smoothing', None, 1),
+    )
+    timings = {}
+
+    def add_timings(name, before, after, *args):
+        t_before, t_after = timings.get(name, (0.0, 0.0))
+        timings[name] = (t_before + best_time(before, *args), t_after + best_time(after, *args))
+
+    elem_root, _version = parse_fbx.parse(filepath)
+    fbx_objects = elem_find_first(elem_root, b'Objects')
+    m = Matrix.Rotation(0.5, 4, 'X')
+    for fbx_obj in fbx_objects.elems:
+        if fbx_obj.id != b'Geometry':
+            continue
+        fbx_verts = elem_prop_first(elem_find_first(fbx_obj, b'Vertices'))
+        if fbx_verts is None:
+            continue
+        add_timings("Vertices", verts_before, verts_after, fbx_verts, m)
+
+        for layer_id, data_id, index_id, item_size in layers:
+            for fbx_layer in elem_find_iter(fbx_obj, layer_id):
+                fbx_layer_ref = elem_find_first_string_as_bytes(fbx_layer, b'ReferenceInformationType')
+                fbx_layer_data = elem_prop_first(elem_find_first(fbx_layer, data_id))
+                fbx_layer_index = elem_prop_first(elem_find_first(fbx_layer, index_id)) if index_id else None
+                if fbx_layer_data is None or fbx_layer_ref not in {b'Direct', b'IndexToDirect'}:
+                    continue
+                if fbx_layer_ref == b'Direct':
+                    fbx_layer_index = None
+                add_timings(layer_id.decode(), layer_before, layer_after,
+                            fbx_layer_data, fbx_layer_index, item_size, item_size)
+
+    for name, (t_before, t_after) in timings.items():
+        print('%s: before %.4f sec, after %.4f sec, x%.1f' % (name, t_before, t_after, t_before / max(t_after, 1e-9)))
+
+
+def main():
+    import sys
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    subdivisions = int(argv[0]) if argv else 500
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = os.path.join(tmpdir, "benchmark.fbx")
+        write_test_file(filepath, subdivisions)
+        benchmark(filepath)
+
+
+if __name__ == '__main__':
+    main()
@@ -167,6 +167,15 @@ class ExportGLTF2_Base:
         default='AUTO'
     )
 
+    export_image_encode_threads: IntProperty(
+        name='Image Encoding Threads',
+        description='Number of threads used to compress images which have to be assembled out of several '
+                    'textures (0 = one per CPU core, 1 = no threading)',
+        default=0,
+        min=0,
+        max=64
+    )
+
     export_texture_dir: StringProperty(
         name='Textures',
         description='Folder to place texture files in. Relative to the .gltf file',
@@ -195,6 +204,20 @@ class ExportGLTF2_Base:
         default=True
     )
 
+    export_deduplicate_buffers: BoolProperty(
+        name='Deduplicate Buffers',
+        description='Store identical binary data (vertex attributes, indices, animation samplers...) only once',
+        default=False
+    )
+
+    export_gather_cache_size: IntProperty(
+        name='Gather Cache Size',
+        description='Maximum number of results kept per cached export step, least recently used ones being '
+                    'discarded (0 = unlimited). Lower values reduce memory usage on large scenes',
+        default=0,
+        min=0
+    )
+
     export_draco_mesh_compression_enable: BoolProperty(
         name='Draco mesh compression',
         description='Compress mesh using Draco',
@@ -531,12 +554,15 @@ class ExportGLTF2_Base:
 
         export_settings['gltf_format'] = self.export_format
         export_settings['gltf_image_format'] = self.export_image_format
+        export_settings['gltf_image_encode_threads'] = self.export_image_encode_threads
         export_settings['gltf_copyright'] = self.export_copyright
         export_settings['gltf_texcoords'] = self.export_texcoords
         export_settings['gltf_normals'] = self.export_normals
         export_settings['gltf_tangents'] = self.export_tangents and self.export_normals
         export_settings['gltf_loose_edges'] = self.use_mesh_edges
         export_settings['gltf_loose_points'] = self.use_mesh_vertices
+        export_settings['gltf_deduplicate_buffers'] = self.export_deduplicate_buffers
+        export_settings['gltf_gather_cache_size'] = self.export_gather_cache_size
 
         if self.is_draco_available:
             export_settings['gltf_draco_mesh_compression'] = self.export_draco_mesh_compression_enable
@@ -669,6 +695,8 @@ class GLTF_PT_export_main(bpy.types.Panel):
                 layout.prop(operator, 'export_texture_dir', icon='FILE_FOLDER')
 
         layout.prop(operator, 'export_copyright')
+        layout.prop(operator, 'export_deduplicate_buffers')
+        layout.prop(operator, 'export_gather_cache_size')
         layout.prop(operator, 'will_save_settings')
 
 
@@ -769,6 +797,7 @@ class GLTF_PT_export_geometry(bpy.types.Panel):
         col = layout.column()
         col.active = operator.export_materials == "EXPORT"
         col.prop(operator, 'export_image_format')
+        col.prop(operator, 'export_image_encode_threads')
 
 
 class GLTF_PT_export_geometry_compression(bpy.types.Panel):
@@ -1087,6 +1116,7 @@ class ImportGLTF2(Operator, ImportHelper):
         from .io.imp.gltf2_io_gltf import glTFImporter, ImportError
         from .blender.imp.gltf2_blender_gltf import BlenderGlTF
 
+        gltf_importer = None
         try:
             gltf_importer = glTFImporter(filename, import_settings)
             gltf_importer.read()
@@ -1107,6 +1137,10 @@ class ImportGLTF2(Operator, ImportHelper):
             self.report({'ERROR'}, e.args[0])
             return {'CANCELLED'}
 
+        finally:
+            if gltf_importer is not None:
+                gltf_importer.close()
+
     def set_debug_log(self):
         import logging
         if bpy.app.debug_value == 0:
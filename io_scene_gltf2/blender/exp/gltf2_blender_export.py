@@ -11,7 +11,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import bpy
 import sys
@@ -20,6 +22,7 @@ import traceback
 from io_scene_gltf2.blender.com import gltf2_blender_json
 from io_scene_gltf2.blender.exp import gltf2_blender_export_keys
 from io_scene_gltf2.blender.exp import gltf2_blender_gather
+from io_scene_gltf2.blender.exp import gltf2_blender_gather_cache
 from io_scene_gltf2.blender.exp.gltf2_blender_gltf2_exporter import GlTF2Exporter
 from io_scene_gltf2.io.com.gltf2_io_debug import print_console, print_newline
 from io_scene_gltf2.io.exp import gltf2_io_export
@@ -43,7 +46,11 @@ def save(context, export_settings):
     for callback in pre_export_callbacks:
         callback(export_settings)
 
-    json, buffer = __export(export_settings)
+    try:
+        json, buffer = __export(export_settings)
+    finally:
+        gltf2_blender_gather_cache.print_cache_stats()
+        gltf2_blender_gather_cache.clear_caches()
 
     post_export_callbacks = export_settings["post_export_callbacks"]
     for callback in post_export_callbacks:
@@ -59,10 +66,21 @@ def save(context, export_settings):
 
 
 def __export(export_settings):
-    exporter = GlTF2Exporter(export_settings)
-    __gather_gltf(exporter, export_settings)
-    buffer = __create_buffer(exporter, export_settings)
-    exporter.finalize_images()
+    # Images are compressed in worker threads while the rest of the scene is gathered,
+    # and waited for in order when their data is written.
+    threads = export_settings[gltf2_blender_export_keys.IMAGE_ENCODE_THREADS] or os.cpu_count() or 1
+    executor = ThreadPoolExecutor(max_workers=threads) if threads > 1 else None
+    export_settings[gltf2_blender_export_keys.IMAGE_ENCODE_EXECUTOR] = executor
+
+    try:
+        exporter = GlTF2Exporter(export_settings)
+        __gather_gltf(exporter, export_settings)
+        buffer = __create_buffer(exporter, export_settings)
+        exporter.finalize_images()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        export_settings[gltf2_blender_export_keys.IMAGE_ENCODE_EXECUTOR] = None
 
     export_user_extensions('gather_gltf_hook', export_settings, exporter.glTF)
     exporter.traverse_extensions()
@@ -56,6 +56,10 @@ ANIMATIONS = 'gltf_animations'
 EMBED_IMAGES = 'gltf_embed_images'
 BINARY = 'gltf_binary'
 EMBED_BUFFERS = 'gltf_embed_buffers'
+DEDUPLICATE_BUFFERS = 'gltf_deduplicate_buffers'
+GATHER_CACHE_SIZE = 'gltf_gather_cache_size'
+IMAGE_ENCODE_THREADS = 'gltf_image_encode_threads'
+IMAGE_ENCODE_EXECUTOR = 'gltf_image_encode_executor'
 USE_NO_COLOR = 'gltf_use_no_color'
 
 METALLIC_ROUGHNESS_IMAGE = "metallic_roughness_image"
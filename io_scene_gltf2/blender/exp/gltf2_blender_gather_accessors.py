@@ -13,13 +13,13 @@
 # limitations under the License.
 
 
-from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import unique
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.io.com import gltf2_io_constants
 from io_scene_gltf2.io.exp import gltf2_io_binary_data
 
 
-@cached
+@unique
 def gather_accessor(buffer_view: gltf2_io_binary_data.BinaryData,
                     component_type: gltf2_io_constants.ComponentType,
                     count,
@@ -13,18 +13,67 @@
 # limitations under the License.
 
 import functools
+import time
+from collections import OrderedDict
 import bpy
 from io_scene_gltf2.blender.exp import gltf2_blender_get
+from io_scene_gltf2.blender.exp import gltf2_blender_export_keys
+from io_scene_gltf2.io.com.gltf2_io_debug import print_console
 
+# All caches created by the cached/unique decorators, so they can be dumped and released after export.
+__caches = []
 
-def cached(func):
+
+class GatherCache:
     """
-    Decorate the cache gather functions results.
+    Results of one gather function for the current export.
 
-    The gather function is only executed if its result isn't in the cache yet
-    :param func: the function to be decorated. It will have a static __cache member afterwards
-    :return:
+    Entries are kept in least recently used order; when 'evict' is set and the export settings define a
+    size limit, the least recently used entries are dropped beyond that limit.
     """
+
+    def __init__(self, func, evict):
+        self.name = func.__module__.rsplit('.', 1)[-1] + '.' + func.__qualname__
+        self.evict = evict
+        self.entries = OrderedDict()
+        self.settings_key = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.time = 0.0
+
+    def clear(self):
+        self.entries = OrderedDict()
+        self.settings_key = None
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.time = 0.0
+
+
+def __settings_key(export_settings):
+    if not isinstance(export_settings, dict):
+        # Some helpers are cached against another last argument than the export settings (see get_bone_tree).
+        return export_settings
+    # export_settings is not modified during an export, and each export gets a new dict (with its own timestamp).
+    return id(export_settings), export_settings.get('timestamp')
+
+
+def __identity_key(value):
+    """Key datablocks by their session pointer (and name, in case a temporary datablock gets the same address)."""
+    if isinstance(value, bpy.types.ID):
+        return type(value), value.original.as_pointer(), value.name
+    if isinstance(value, bpy.types.PoseBone):
+        return type(value), value.id_data.original.as_pointer(), value.name
+    return value
+
+
+def __make_cached(func, evict):
+    cache = GatherCache(func, evict)
+    __caches.append(cache)
+
     @functools.wraps(func)
     def wrapper_cached(*args, **kwargs):
         assert len(args) >= 2 and 0 <= len(kwargs) <= 1, "Wrong signature for cached function"
@@ -39,34 +88,85 @@ def cached(func):
             export_settings = args[-1]
             cache_key_args = args[:-1]
 
-        __by_name = [bpy.types.Object, bpy.types.Scene, bpy.types.Material, bpy.types.Action, bpy.types.Mesh, bpy.types.PoseBone]
-
         # we make a tuple from the function arguments so that they can be used as a key to the cache
-        cache_key = ()
-        for i in cache_key_args:
-            if type(i) in __by_name:
-                cache_key += (i.name,)
-            else:
-                cache_key += (i,)
-        for i in cache_key_kwargs.values():
-            if type(i) in __by_name:
-                cache_key += (i.name,)
-            else:
-                cache_key += (i,)
+        cache_key = tuple(__identity_key(i) for i in cache_key_args)
+        cache_key += tuple(__identity_key(i) for i in cache_key_kwargs.values())
 
         # invalidate cache if export settings have changed
-        if not hasattr(func, "__export_settings") or export_settings != func.__export_settings:
-            func.__cache = {}
-            func.__export_settings = export_settings
+        settings_key = __settings_key(export_settings)
+        if settings_key != cache.settings_key:
+            cache.clear()
+            cache.settings_key = settings_key
+
         # use or fill cache
-        if cache_key in func.__cache:
-            return func.__cache[cache_key]
-        else:
-            result = func(*args)
-            func.__cache[cache_key] = result
-            return result
+        entries = cache.entries
+        if cache_key in entries:
+            cache.hits += 1
+            entries.move_to_end(cache_key)
+            return entries[cache_key]
+
+        cache.misses += 1
+        start_time = time.perf_counter()
+        result = func(*args, **kwargs)
+        cache.time += time.perf_counter() - start_time
+        entries[cache_key] = result
+
+        max_size = 0
+        if cache.evict and isinstance(export_settings, dict):
+            max_size = export_settings.get(gltf2_blender_export_keys.GATHER_CACHE_SIZE, 0)
+        if max_size > 0:
+            while len(entries) > max_size:
+                entries.popitem(last=False)
+                cache.evictions += 1
+        return result
+
+    wrapper_cached.cache = cache
     return wrapper_cached
 
+
+def cached(func):
+    """
+    Decorate the cache gather functions results.
+
+    The gather function is only executed if its result isn't in the cache yet.
+    Results may be evicted when the export settings limit the cache size, and gathered again later as new objects,
+    so this must only be used for plain data which is never compared or referenced by identity (e.g. not for
+    primitives, skins or animation channels); see unique().
+    :param func: the function to be decorated. It will have a 'cache' member afterwards
+    :return:
+    """
+    return __make_cached(func, evict=True)
+
+
+def unique(func):
+    """
+    Decorate gather functions whose result must be the same object for the same arguments.
+
+    Same as cached(), but results are never evicted, e.g. so that a glTF node or mesh is only exported once.
+    :param func: the function to be decorated. It will have a 'cache' member afterwards
+    :return:
+    """
+    return __make_cached(func, evict=False)
+
+
+call_or_fetch = cached
+
+
+def print_cache_stats():
+    """Print hit/miss/time counters of all gather caches used since the last clear_caches()."""
+    caches = sorted((c for c in __caches if c.hits or c.misses), key=lambda c: c.time, reverse=True)
+    for cache in caches:
+        print_console('PROFILE', '{}: {} hits, {} misses, {} evictions, {} entries, {:.3f}s'.format(
+            cache.name, cache.hits, cache.misses, cache.evictions, len(cache.entries), cache.time))
+
+
+def clear_caches():
+    """Release all gather caches results, and reset their counters."""
+    for cache in __caches:
+        cache.clear()
+        cache.reset_stats()
+
+
 def bonecache(func):
 
     def reset_cache_bonecache():
@@ -96,10 +196,6 @@ def bonecache(func):
             return func.__bonecache[args[7]][pose_bone_if_armature.name]
     return wrapper_bonecache
 
-# TODO: replace "cached" with "unique" in all cases where the caching is functional and not only for performance reasons
-call_or_fetch = cached
-unique = cached
-
 def skdriverdiscovercache(func):
 
     def reset_cache_skdriverdiscovercache():
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import unique
 from ..com.gltf2_blender_extras import generate_extras
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
@@ -21,7 +21,7 @@ import bpy
 import math
 
 
-@cached
+@unique
 def gather_camera(blender_camera, export_settings):
     if not __filter_camera(blender_camera, export_settings):
         return None
@@ -23,11 +23,11 @@ from io_scene_gltf2.io.exp import gltf2_io_binary_data
 from io_scene_gltf2.io.exp import gltf2_io_image_data
 from io_scene_gltf2.io.com import gltf2_io_debug
 from io_scene_gltf2.blender.exp.gltf2_blender_image import Channel, ExportImage, FillImage
-from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached, unique
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
 
 
-@cached
+@unique
 def gather_image(
         blender_shader_sockets: typing.Tuple[bpy.types.NodeSocket],
         export_settings):
@@ -85,7 +85,7 @@ def __gather_original_uri(original_uri, export_settings):
     return _path_to_uri(rel_path)
 
 
-@cached
+@unique
 def __make_image(buffer_view, extensions, extras, mime_type, name, uri, export_settings):
     return gltf2_io.Image(
         buffer_view=buffer_view,
@@ -103,10 +103,11 @@ def __filter_image(sockets, export_settings):
     return True
 
 
-@cached
+@unique
 def __gather_buffer_view(image_data, mime_type, name, export_settings):
     if export_settings[gltf2_blender_export_keys.FORMAT] != 'GLTF_SEPARATE':
-        return gltf2_io_binary_data.BinaryData(data=image_data.encode(mime_type))
+        executor = export_settings.get(gltf2_blender_export_keys.IMAGE_ENCODE_EXECUTOR)
+        return gltf2_io_binary_data.DeferredBinaryData(image_data.encode_async(mime_type, executor))
     return None
 
 
@@ -169,12 +170,13 @@ def __gather_name(export_image, export_settings):
         return export_image.original.name
 
 
-@cached
+@unique
 def __gather_uri(image_data, mime_type, name, export_settings):
     if export_settings[gltf2_blender_export_keys.FORMAT] == 'GLTF_SEPARATE':
         # as usual we just store the data in place instead of already resolving the references
-        return gltf2_io_image_data.ImageData(
-            data=image_data.encode(mime_type=mime_type),
+        executor = export_settings.get(gltf2_blender_export_keys.IMAGE_ENCODE_EXECUTOR)
+        return gltf2_io_image_data.DeferredImageData(
+            image_data.encode_async(mime_type, executor),
             mime_type=mime_type,
             name=name
         )
@@ -15,13 +15,13 @@
 import mathutils
 
 from . import gltf2_blender_export_keys
-from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import unique
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_skins
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
 from ..com.gltf2_blender_extras import generate_extras
 
-@cached
+@unique
 def gather_joint(blender_object, blender_bone, export_settings):
     """
     Generate a glTF2 node from a blender bone, as joints in glTF2 are simply nodes.
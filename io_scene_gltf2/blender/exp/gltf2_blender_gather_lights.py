@@ -16,7 +16,7 @@ import bpy
 import math
 from typing import Optional, List, Dict, Any
 
-from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import unique
 from ..com.gltf2_blender_extras import generate_extras
 
 from io_scene_gltf2.io.com import gltf2_io_lights_punctual
@@ -26,7 +26,7 @@ from io_scene_gltf2.blender.exp import gltf2_blender_gather_light_spots
 from io_scene_gltf2.blender.exp import gltf2_blender_search_node_tree
 
 
-@cached
+@unique
 def gather_lights_punctual(blender_lamp, export_settings) -> Optional[Dict[str, Any]]:
     if not __filter_lights_punctual(blender_lamp, export_settings):
         return None
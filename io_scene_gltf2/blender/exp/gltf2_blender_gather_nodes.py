@@ -18,7 +18,7 @@ from mathutils import Matrix, Quaternion, Vector
 
 from . import gltf2_blender_export_keys
 from io_scene_gltf2.blender.com import gltf2_blender_math
-from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import unique
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_skins
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_cameras
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_mesh
@@ -47,7 +47,7 @@ def gather_node(blender_object, library, blender_scene, dupli_object_parent, exp
     gather_node.__cache[(blender_object.name, library)] = node
     return node
 
-@cached
+@unique
 def __gather_node(blender_object, library, blender_scene, dupli_object_parent, export_settings):
     children, only_bone_children = __gather_children(blender_object, blender_scene, export_settings)
 
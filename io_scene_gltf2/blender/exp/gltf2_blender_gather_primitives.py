@@ -18,7 +18,7 @@ import numpy as np
 
 from .gltf2_blender_export_keys import NORMALS, MORPH_NORMAL, TANGENTS, MORPH_TANGENT, MORPH
 
-from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import unique
 from io_scene_gltf2.blender.exp import gltf2_blender_extract
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_accessors
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_primitive_attributes
@@ -30,7 +30,7 @@ from io_scene_gltf2.io.com import gltf2_io_constants
 from io_scene_gltf2.io.com.gltf2_io_debug import print_console
 
 
-@cached
+@unique
 def gather_primitives(
         blender_mesh: bpy.types.Mesh,
         library: Optional[str],
@@ -80,7 +80,7 @@ def gather_primitives(
 
     return primitives
 
-@cached
+@unique
 def __gather_cache_primitives(
         blender_mesh: bpy.types.Mesh,
         library: Optional[str],
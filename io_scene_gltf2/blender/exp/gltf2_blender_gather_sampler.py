@@ -14,7 +14,7 @@
 
 import bpy
 from io_scene_gltf2.io.com import gltf2_io
-from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import unique
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
 from io_scene_gltf2.io.com.gltf2_io_constants import TextureFilter, TextureWrap
 from io_scene_gltf2.blender.exp.gltf2_blender_get import (
@@ -24,7 +24,7 @@ from io_scene_gltf2.blender.exp.gltf2_blender_get import (
 )
 
 
-@cached
+@unique
 def gather_sampler(blender_shader_node: bpy.types.Node, export_settings):
     wrap_s, wrap_t = __gather_wrap(blender_shader_node, export_settings)
 
@@ -52,9 +52,9 @@ def gather_sampler(blender_shader_node: bpy.types.Node, export_settings):
     return sampler
 
 
-@cached
+@unique
 def __sampler_by_value(mag_filter, min_filter, wrap_s, wrap_t, export_settings):
-    # @cached function to dedupe samplers with the same settings.
+    # @unique function to dedupe samplers with the same settings.
     return gltf2_io.Sampler(
         extensions=None,
         extras=None,
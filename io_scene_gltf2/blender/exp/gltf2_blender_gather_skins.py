@@ -14,7 +14,7 @@
 
 import mathutils
 from . import gltf2_blender_export_keys
-from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import unique
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.io.exp import gltf2_io_binary_data
 from io_scene_gltf2.io.com import gltf2_io_constants
@@ -23,7 +23,7 @@ from io_scene_gltf2.blender.exp import gltf2_blender_gather_joints
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
 
 
-@cached
+@unique
 def gather_skin(blender_object, export_settings):
     """
     Gather armatures, bones etc into a glTF2 skin object.
@@ -162,7 +162,7 @@ def __gather_skeleton(blender_object, export_settings):
     # In the future support the result of https://github.com/KhronosGroup/glTF/pull/1195
     return None  # gltf2_blender_gather_nodes.gather_node(blender_object, blender_scene, export_settings)
 
-@cached
+@unique
 def get_bone_tree(blender_dummy, blender_object):
 
     bones = []
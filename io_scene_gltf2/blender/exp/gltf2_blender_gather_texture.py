@@ -14,7 +14,7 @@
 
 import typing
 import bpy
-from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import unique
 
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_sampler
@@ -24,7 +24,7 @@ from io_scene_gltf2.io.com import gltf2_io_debug
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
 
 
-@cached
+@unique
 def gather_texture(
         blender_shader_sockets: typing.Tuple[bpy.types.NodeSocket],
         export_settings):
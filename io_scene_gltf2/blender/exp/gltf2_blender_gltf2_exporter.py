@@ -24,6 +24,7 @@ from io_scene_gltf2.io.exp import gltf2_io_buffer
 from io_scene_gltf2.io.exp import gltf2_io_image_data
 from io_scene_gltf2.blender.exp import gltf2_blender_export_keys
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
+from io_scene_gltf2.io.com.gltf2_io_debug import print_console
 
 
 class GlTF2Exporter:
@@ -70,7 +71,10 @@ class GlTF2Exporter:
             textures=[]
         )
 
-        self.__buffer = gltf2_io_buffer.Buffer()
+        if export_settings[gltf2_blender_export_keys.DEDUPLICATE_BUFFERS]:
+            self.__buffer = gltf2_io_buffer.DeduplicatedBuffer()
+        else:
+            self.__buffer = gltf2_io_buffer.Buffer()
         self.__images = {}
 
         # mapping of all glTFChildOfRootProperty types to their corresponding root level arrays
@@ -139,6 +143,10 @@ class GlTF2Exporter:
             )
             self.__gltf.buffers.append(buffer)
 
+        if isinstance(self.__buffer, gltf2_io_buffer.DeduplicatedBuffer):
+            print_console('INFO', 'Buffer deduplication saved {} bytes ({} bytes written)'.format(
+                self.__buffer.bytes_saved, self.__buffer.byte_length))
+
         self.__finalized = True
 
         if is_glb:
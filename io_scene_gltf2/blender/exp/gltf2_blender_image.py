@@ -15,9 +15,12 @@
 import bpy
 import os
 from typing import Optional, Tuple
+from concurrent.futures import Future
 import numpy as np
 import tempfile
 import enum
+import struct
+import zlib
 
 
 class Channel(enum.IntEnum):
@@ -127,10 +130,30 @@ class ExportImage:
         # Unhappy path = we need to create the image self.fills describes.
         return self.__encode_unhappy()
 
+    def encode_async(self, mime_type: Optional[str], executor) -> Future:
+        """Same as encode(), but returns a Future.
+
+        When an image has to be assembled out of channels and saved as PNG, its pixels are gathered here (Blender
+        data can only be accessed from the main thread), and compressed by the given executor.
+        Other images are encoded right away.
+        """
+        if executor is None or self.__on_happy_path() or mime_type not in {None, "image/png"}:
+            future = Future()
+            future.set_result(self.encode(mime_type))
+            return future
+
+        self.file_format = "PNG"
+        pixels, dim = self.__assemble_pixels()
+        return executor.submit(_encode_png, pixels, dim, Channel.A in self.fills)
+
     def __encode_happy(self) -> bytes:
         return self.__encode_from_image(self.blender_image())
 
     def __encode_unhappy(self) -> bytes:
+        pixels, dim = self.__assemble_pixels()
+        return self.__encode_from_numpy_array(pixels, dim)
+
+    def __assemble_pixels(self) -> Tuple[np.ndarray, Tuple[int, int]]:
         # We need to assemble the image out of channels.
         # Do it with numpy and image.pixels.
 
@@ -144,7 +167,7 @@ class ExportImage:
         if not images:
             # No ImageFills; use a 1x1 white pixel
             pixels = np.array([1.0, 1.0, 1.0, 1.0], np.float32)
-            return self.__encode_from_numpy_array(pixels, (1, 1))
+            return pixels, (1, 1)
 
         width = max(image.size[0] for image in images)
         height = max(image.size[1] for image in images)
@@ -170,7 +193,7 @@ class ExportImage:
 
         tmp_buf = None  # GC this
 
-        return self.__encode_from_numpy_array(out_buf, (width, height))
+        return out_buf, (width, height)
 
     def __encode_from_numpy_array(self, pixels: np.ndarray, dim: Tuple[int, int]) -> bytes:
         with TmpImageGuard() as guard:
@@ -227,6 +250,34 @@ def _encode_temp_image(tmp_image: bpy.types.Image, file_format: str) -> bytes:
             return f.read()
 
 
+def _encode_png(pixels: np.ndarray, dim: Tuple[int, int], alpha: bool) -> bytes:
+    """Encode RGBA float pixels (in Blender order, i.e. bottom row first) as an 8 bits RGB(A) PNG.
+
+    Only uses numpy and zlib, which both release the GIL, so this can run in a worker thread.
+    Pixels are converted to bytes the same way Blender does it for byte images.
+    """
+    width, height = dim
+    channels = 4 if alpha else 3
+    pixels = pixels.reshape(height, width, 4)[::-1, :, :channels]
+    rows = (np.clip(pixels, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+    # Use the 'Up' filter on every row, it compresses pictures much better than no filter at all.
+    filtered = np.empty((height, width * channels + 1), np.uint8)
+    filtered[:, 0] = 2
+    filtered[0, 1:] = rows[0].reshape(-1)
+    filtered[1:, 1:] = (rows[1:] - rows[:-1]).reshape(height - 1, -1)
+
+    def chunk(tag, data):
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+    return b''.join((
+        b'\x89PNG\r\n\x1a\n',
+        chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6 if alpha else 2, 0, 0, 0)),
+        chunk(b'IDAT', zlib.compress(filtered.tobytes(), 6)),
+        chunk(b'IEND', b''),
+    ))
+
+
 class TmpImageGuard:
     """Guard to automatically clean up temp images (use it with `with`)."""
     def __init__(self):
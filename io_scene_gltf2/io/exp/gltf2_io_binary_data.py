@@ -39,3 +39,14 @@ class BinaryData:
     @property
     def byte_length(self):
         return len(self.data)
+
+
+class DeferredBinaryData(BinaryData):
+    """Binary data computed in the background (a concurrent.futures.Future), waited for when first accessed."""
+
+    def __init__(self, future):
+        self.__future = future
+
+    @property
+    def data(self):
+        return self.__future.result()
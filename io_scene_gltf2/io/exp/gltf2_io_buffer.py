@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import base64
+import hashlib
 
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.io.exp import gltf2_io_binary_data
@@ -60,3 +61,32 @@ class Buffer:
 
     def clear(self):
         self.__data = b""
+
+
+class DeduplicatedBuffer(Buffer):
+    """
+    Buffer storing identical binary data only once.
+
+    Incoming binary data is hashed, and the BufferView of previously added identical data is returned instead
+    of appending it again (e.g. meshes instanced through separate objects, repeated indices or animation samplers).
+    """
+
+    def __init__(self, buffer_index=0):
+        super().__init__(buffer_index)
+        self.__buffer_views = {}
+        self.bytes_saved = 0
+
+    def add_and_get_view(self, binary_data: gltf2_io_binary_data.BinaryData) -> gltf2_io.BufferView:
+        """Add binary data to the buffer, unless already present. Return a glTF BufferView."""
+        key = (binary_data.byte_length, hashlib.sha256(binary_data.data).digest())
+        buffer_view = self.__buffer_views.get(key)
+        if buffer_view is None:
+            buffer_view = super().add_and_get_view(binary_data)
+            self.__buffer_views[key] = buffer_view
+        else:
+            self.bytes_saved += binary_data.byte_length
+        return buffer_view
+
+    def clear(self):
+        super().clear()
+        self.__buffer_views = {}
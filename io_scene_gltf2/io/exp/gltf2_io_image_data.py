@@ -25,10 +25,10 @@ class ImageData:
         self._name = name
 
     def __eq__(self, other):
-        return self._data == other.data
+        return self.data == other.data
 
     def __hash__(self):
-        return hash(self._data)
+        return hash(self.data)
 
     def adjusted_name(self):
         regex_dot = re.compile("\.")
@@ -53,3 +53,21 @@ class ImageData:
     @property
     def byte_length(self):
         return len(self._data)
+
+
+class DeferredImageData(ImageData):
+    """Image encoded in the background (a concurrent.futures.Future), waited for when first accessed."""
+
+    def __init__(self, future, mime_type: str, name: str):
+        super().__init__(None, mime_type, name)
+        self.__future = future
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = self.__future.result()
+        return self._data
+
+    @property
+    def byte_length(self):
+        return len(self.data)
@@ -16,6 +16,7 @@ from ..com.gltf2_io import gltf_from_dict
 from ..com.gltf2_io_debug import Log
 import logging
 import json
+import mmap
 import struct
 import base64
 from os.path import dirname, join, isfile
@@ -36,6 +37,7 @@ class glTFImporter():
         self.import_settings = import_settings
         self.glb_buffer = None
         self.buffers = {}
+        self.file_maps = []
         self.accessor_cache = {}
         self.decode_accessor_cache = {}
 
@@ -139,8 +141,7 @@ class glTFImporter():
         if not isfile(self.filename):
             raise ImportError("Please select a file")
 
-        with open(self.filename, 'rb') as f:
-            content = memoryview(f.read())
+        content = self.map_file(self.filename)
 
         if content[:4] == b'glTF':
             gltf, self.glb_buffer = self.load_glb(content)
@@ -184,8 +185,38 @@ class glTFImporter():
 
         path = join(dirname(self.filename), unquote(uri))
         try:
-            with open(path, 'rb') as f_:
-                return memoryview(f_.read())
+            return self.map_file(path)
         except Exception:
             self.log.error("Couldn't read file: " + path)
             return None
+
+    def map_file(self, path):
+        """
+        Memory-map a file, read-only.
+
+        Buffer views and accessors are then decoded directly from the mapped file (np.frombuffer
+        does not copy), so only the pages actually touched have to be loaded in RAM.
+        """
+        with open(path, 'rb') as f:
+            try:
+                file_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # Empty files can't be mapped, nor can some special files; just read them.
+                return memoryview(f.read())
+        self.file_maps.append(file_map)
+        return memoryview(file_map)
+
+    def close(self):
+        """Release buffers and mapped files."""
+        self.glb_buffer = None
+        self.buffers = {}
+        self.accessor_cache = {}
+        self.decode_accessor_cache = {}
+        for file_map in self.file_maps:
+            try:
+                file_map.close()
+            except BufferError:
+                # Some data still references the map (e.g. a numpy array kept by the caller),
+                # it will be unmapped once that data is garbage collected.
+                pass
+        self.file_maps = []
@@ -111,6 +111,12 @@ class ImportOBJ(bpy.types.Operator, ImportHelper):
         ),
     )
 
+    use_fast_parse: BoolProperty(
+        name="Fast Parsing",
+        description="Parse plain polygonal files using several processes (others are still parsed the usual way)",
+        default=True,
+    )
+
     global_clamp_size: FloatProperty(
         name="Clamp Size",
         description="Clamp bounds under this value (zero to disable)",
@@ -178,6 +184,7 @@ class OBJ_PT_import_include(bpy.types.Panel):
         layout.prop(operator, 'use_image_search')
         layout.prop(operator, 'use_smooth_groups')
         layout.prop(operator, 'use_edges')
+        layout.prop(operator, 'use_fast_parse')
 
 
 class OBJ_PT_import_transform(bpy.types.Panel):
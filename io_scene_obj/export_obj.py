@@ -20,6 +20,8 @@
 
 import os
 
+import numpy as np
+
 import bpy
 from mathutils import Matrix, Vector, Color
 from bpy_extras import io_utils, node_shader_utils
@@ -157,6 +159,68 @@ def write_mtl(scene, filepath, path_mode, copy_set, mtl_dict):
                 fw('illum 2\n')  # light normally
 
 
+def quantize(values):
+    """Integer keys of the values rounded to 4 decimals, exactly like round(value, 4) does."""
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * 10000.0
+    keys = np.rint(scaled)
+    # The product is not exact, and rint() rounds halfway cases to even: values close to halfway
+    # are rounded by round() instead, which rounds their exact decimal value.
+    near_half = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) <= 1e-9 * np.maximum(np.abs(scaled), 1.0)
+    if np.any(near_half):
+        keys[near_half] = [round(round(v, 4) * 10000.0) for v in values[near_half].tolist()]
+    return keys.astype(np.int64)
+
+
+def unquantize(keys, values):
+    """The values rounded to 4 decimals from their quantize() keys, same as round(value, 4) (sign of zero included)."""
+    return np.copysign(keys / 10000.0, values)
+
+
+def unique_first_seen(keys):
+    """
+    Deduplicate the rows of keys.
+    Returns the indices of the first occurrence of each unique row, in order of appearance,
+    and for each row the index of its unique value in those.
+    """
+    if not len(keys):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    _, first_index, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first_index)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return first_index[order], rank[inverse.ravel()]
+
+
+# Amount of lines formatted at once by write_lines() and write_faces().
+WRITE_BLOCK_SIZE = 65536
+
+
+def write_lines(fw, line_fmt, values):
+    """Write each row of the 2D array values formatted with line_fmt, by big blocks of lines."""
+    for i in range(0, len(values), WRITE_BLOCK_SIZE):
+        block = values[i:i + WRITE_BLOCK_SIZE]
+        fw((line_fmt * len(block)) % tuple(block.ravel().tolist()))
+
+
+def write_faces(fw, loop_fmt, faces_size, loops_values):
+    """Write 'f' lines, faces_size giving the amount of rows of loops_values each face uses."""
+    faces_fmt = {}
+    loop_offset = 0
+    for i in range(0, len(faces_size), WRITE_BLOCK_SIZE):
+        block_sizes = faces_size[i:i + WRITE_BLOCK_SIZE].tolist()
+        fmt = []
+        for size in block_sizes:
+            face_fmt = faces_fmt.get(size)
+            if face_fmt is None:
+                face_fmt = faces_fmt[size] = 'f' + loop_fmt * size + '\n'
+            fmt.append(face_fmt)
+        nbr_loops = sum(block_sizes)
+        block = loops_values[loop_offset:loop_offset + nbr_loops]
+        fw(''.join(fmt) % tuple(block.ravel().tolist()))
+        loop_offset += nbr_loops
+
+
 def test_nurbs_compat(ob):
     if ob.type != 'CURVE':
         return False
@@ -263,12 +327,6 @@ def write_file(filepath, objects, depsgraph, scene,
     if EXPORT_GLOBAL_MATRIX is None:
         EXPORT_GLOBAL_MATRIX = Matrix()
 
-    def veckey3d(v):
-        return round(v.x, 4), round(v.y, 4), round(v.z, 4)
-
-    def veckey2d(v):
-        return round(v[0], 4), round(v[1], 4)
-
     def findVertexGroupName(face, vWeightMap):
         """
         Searches the vertexDict to see what groups is assigned to a given face.
@@ -306,8 +364,6 @@ def write_file(filepath, objects, depsgraph, scene,
             # Initialize totals, these are updated each object
             totverts = totuvco = totno = 1
 
-            face_vert_index = 1
-
             # A Dict of Materials
             # (material.name, image.name):matname_imagename # matname_imagename has gaps removed.
             mtl_dict = {}
@@ -367,33 +423,28 @@ def write_file(filepath, objects, depsgraph, scene,
 
                         if EXPORT_UV:
                             faceuv = len(me.uv_layers) > 0
-                            if faceuv:
-                                uv_layer = me.uv_layers.active.data[:]
                         else:
                             faceuv = False
 
-                        me_verts = me.vertices[:]
-
-                        # Make our own list so it can be sorted to reduce context switching
-                        face_index_pairs = [(face, index) for index, face in enumerate(me.polygons)]
+                        nbr_verts = len(me.vertices)
+                        nbr_faces = len(me.polygons)
+                        nbr_loops = len(me.loops)
 
                         if EXPORT_EDGES:
                             edges = me.edges
                         else:
                             edges = []
 
-                        if not (len(face_index_pairs) + len(edges) + len(me.vertices)):  # Make sure there is something to write
+                        if not (nbr_faces + len(edges) + nbr_verts):  # Make sure there is something to write
                             # clean up
                             ob_for_convert.to_mesh_clear()
                             continue  # dont bother with this mesh.
 
-                        if EXPORT_NORMALS and face_index_pairs:
+                        if EXPORT_NORMALS and nbr_faces:
                             me.calc_normals_split()
                             # No need to call me.free_normals_split later, as this mesh is deleted anyway!
 
-                        loops = me.loops
-
-                        if (EXPORT_SMOOTH_GROUPS or EXPORT_SMOOTH_GROUPS_BITFLAGS) and face_index_pairs:
+                        if (EXPORT_SMOOTH_GROUPS or EXPORT_SMOOTH_GROUPS_BITFLAGS) and nbr_faces:
                             smooth_groups, smooth_groups_tot = me.calc_smooth_groups(use_bitflags=EXPORT_SMOOTH_GROUPS_BITFLAGS)
                             if smooth_groups_tot <= 1:
                                 smooth_groups, smooth_groups_tot = (), 0
@@ -408,28 +459,48 @@ def write_file(filepath, objects, depsgraph, scene,
                             materials = [None]
                             material_names = [name_compat(None)]
 
+                        faces_loop_start = np.empty(nbr_faces, dtype=np.int32)
+                        me.polygons.foreach_get("loop_start", faces_loop_start)
+                        faces_loop_total = np.empty(nbr_faces, dtype=np.int32)
+                        me.polygons.foreach_get("loop_total", faces_loop_total)
+                        faces_material_index = np.empty(nbr_faces, dtype=np.int16)
+                        me.polygons.foreach_get("material_index", faces_material_index)
+                        faces_use_smooth = np.empty(nbr_faces, dtype=bool)
+                        me.polygons.foreach_get("use_smooth", faces_use_smooth)
+                        loops_vertex_index = np.empty(nbr_loops, dtype=np.int32)
+                        me.loops.foreach_get("vertex_index", loops_vertex_index)
+                        loops_vertex_index = loops_vertex_index.astype(np.int64)
+                        if smooth_groups_tot:
+                            smooth_groups = np.array(smooth_groups, dtype=np.int64)
+
                         # Sort by Material, then images
                         # so we dont over context switch in the obj file.
+                        # Note: np.lexsort is stable, like the list.sort() it replaces, the last key is the primary one.
                         if EXPORT_KEEP_VERT_ORDER:
-                            pass
+                            faces_order = np.arange(nbr_faces)
                         else:
                             if len(materials) > 1:
-                                if smooth_groups:
-                                    sort_func = lambda a: (a[0].material_index,
-                                                           smooth_groups[a[1]] if a[0].use_smooth else False)
+                                if smooth_groups_tot:
+                                    sort_keys = (np.where(faces_use_smooth, smooth_groups, 0), faces_material_index)
                                 else:
-                                    sort_func = lambda a: (a[0].material_index,
-                                                           a[0].use_smooth)
+                                    sort_keys = (faces_use_smooth, faces_material_index)
                             else:
                                 # no materials
-                                if smooth_groups:
-                                    sort_func = lambda a: smooth_groups[a[1] if a[0].use_smooth else False]
+                                if smooth_groups_tot:
+                                    # Non-smooth faces are sorted with the smooth group of the first face.
+                                    sort_keys = (np.where(faces_use_smooth, smooth_groups, smooth_groups[0]),)
                                 else:
-                                    sort_func = lambda a: a[0].use_smooth
+                                    sort_keys = (faces_use_smooth,)
 
-                            face_index_pairs.sort(key=sort_func)
+                            faces_order = np.lexsort(sort_keys)
 
-                            del sort_func
+                            del sort_keys
+
+                        # Loop indices and sizes of the faces, in writing order.
+                        faces_size = faces_loop_total[faces_order].astype(np.int64)
+                        faces_loop_offset = np.concatenate(((0,), np.cumsum(faces_size)))
+                        loops_order = (np.arange(faces_loop_offset[-1], dtype=np.int64) +
+                                       np.repeat(faces_loop_start[faces_order] - faces_loop_offset[:-1], faces_size))
 
                         # Set the default mat to no material and no image.
                         contextMat = 0, 0  # Can never be this, so we will label a new material the first chance we get.
@@ -451,92 +522,104 @@ def write_file(filepath, objects, depsgraph, scene,
                         subprogress2.step()
 
                         # Vert
-                        for v in me_verts:
-                            fw('v %.6f %.6f %.6f\n' % v.co[:])
+                        verts_co = np.empty(nbr_verts * 3, dtype=np.float32)
+                        me.vertices.foreach_get("co", verts_co)
+                        write_lines(fw, 'v %.6f %.6f %.6f\n', verts_co.reshape(-1, 3))
+                        del verts_co
 
                         subprogress2.step()
 
                         # UV
                         if faceuv:
-                            # in case removing some of these dont get defined.
-                            uv = f_index = uv_index = uv_key = uv_val = uv_ls = None
-
-                            uv_face_mapping = [None] * len(face_index_pairs)
-
-                            uv_dict = {}
-                            uv_get = uv_dict.get
-                            for f, f_index in face_index_pairs:
-                                uv_ls = uv_face_mapping[f_index] = []
-                                for uv_index, l_index in enumerate(f.loop_indices):
-                                    uv = uv_layer[l_index].uv
-                                    # include the vertex index in the key so we don't share UV's between vertices,
-                                    # allowed by the OBJ spec but can cause issues for other importers, see: T47010.
-
-                                    # this works too, shared UV's for all verts
-                                    #~ uv_key = veckey2d(uv)
-                                    uv_key = loops[l_index].vertex_index, veckey2d(uv)
-
-                                    uv_val = uv_get(uv_key)
-                                    if uv_val is None:
-                                        uv_val = uv_dict[uv_key] = uv_unique_count
-                                        fw('vt %.6f %.6f\n' % uv[:])
-                                        uv_unique_count += 1
-                                    uv_ls.append(uv_val)
-
-                            del uv_dict, uv, f_index, uv_index, uv_ls, uv_get, uv_key, uv_val
-                            # Only need uv_unique_count and uv_face_mapping
+                            uvs = np.empty(nbr_loops * 2, dtype=np.float32)
+                            me.uv_layers.active.data.foreach_get("uv", uvs)
+                            uvs = uvs.reshape(-1, 2)[loops_order]
+                            # include the vertex index in the key so we don't share UV's between vertices,
+                            # allowed by the OBJ spec but can cause issues for other importers, see: T47010.
+                            uv_keys = np.column_stack((loops_vertex_index[loops_order], quantize(uvs)))
+                            unique_uvs, loops_uv_index = unique_first_seen(uv_keys)
+                            write_lines(fw, 'vt %.6f %.6f\n', uvs[unique_uvs])
+                            uv_unique_count = len(unique_uvs)
+
+                            del uvs, uv_keys, unique_uvs
+                            # Only need uv_unique_count and loops_uv_index
 
                         subprogress2.step()
 
                         # NORMAL, Smooth/Non smoothed.
                         if EXPORT_NORMALS:
-                            no_key = no_val = None
-                            normals_to_idx = {}
-                            no_get = normals_to_idx.get
-                            loops_to_normals = [0] * len(loops)
-                            for f, f_index in face_index_pairs:
-                                for l_idx in f.loop_indices:
-                                    no_key = veckey3d(loops[l_idx].normal)
-                                    no_val = no_get(no_key)
-                                    if no_val is None:
-                                        no_val = normals_to_idx[no_key] = no_unique_count
-                                        fw('vn %.4f %.4f %.4f\n' % no_key)
-                                        no_unique_count += 1
-                                    loops_to_normals[l_idx] = no_val
-                            del normals_to_idx, no_get, no_key, no_val
-                        else:
-                            loops_to_normals = []
+                            normals = np.empty(nbr_loops * 3, dtype=np.float32)
+                            me.loops.foreach_get("normal", normals)
+                            normals = normals.reshape(-1, 3)[loops_order]
+                            normals_keys = quantize(normals)
+                            unique_normals, loops_normal_index = unique_first_seen(normals_keys)
+                            write_lines(fw, 'vn %.4f %.4f %.4f\n',
+                                        unquantize(normals_keys[unique_normals], normals[unique_normals]))
+                            no_unique_count = len(unique_normals)
+                            del normals, normals_keys, unique_normals
 
                         subprogress2.step()
 
                         # XXX
+                        faces_vgroup = None
                         if EXPORT_POLYGROUPS:
                             # Retrieve the list of vertex groups
                             vertGroupNames = ob.vertex_groups.keys()
                             if vertGroupNames:
                                 currentVGroup = ''
                                 # Create a dictionary keyed by face id and listing, for each vertex, the vertex groups it belongs to
-                                vgroupsMap = [[] for _i in range(len(me_verts))]
-                                for v_idx, v_ls in enumerate(vgroupsMap):
-                                    v_ls[:] = [(vertGroupNames[g.group], g.weight) for g in me_verts[v_idx].groups]
+                                vgroupsMap = [[(vertGroupNames[g.group], g.weight) for g in v.groups]
+                                              for v in me.vertices]
+                                faces_vgroup = [findVertexGroupName(me.polygons[f_index], vgroupsMap)
+                                                for f_index in faces_order.tolist()]
+
+                        faces_material = np.minimum(faces_material_index[faces_order], len(materials) - 1)
+                        faces_smooth = faces_use_smooth[faces_order].astype(np.int64)
+                        if smooth_groups_tot:
+                            faces_smooth[faces_smooth != 0] = smooth_groups[faces_order][faces_smooth != 0]
+
+                        # Faces are written by blocks of faces sharing the same context (material, smoothing...).
+                        if nbr_faces:
+                            # Slots using the same material are the same context.
+                            material_keys = np.array([material_names.index(name) for name in material_names])
+                            context_change = np.empty(nbr_faces, dtype=bool)
+                            context_change[0] = True
+                            faces_material_key = material_keys[faces_material]
+                            context_change[1:] = ((faces_material_key[1:] != faces_material_key[:-1]) |
+                                                  (faces_smooth[1:] != faces_smooth[:-1]))
+                            if faces_vgroup is not None:
+                                context_change[1:] |= [vg_a != vg_b for vg_a, vg_b in zip(faces_vgroup[1:],
+                                                                                          faces_vgroup[:-1])]
+                            blocks_start = np.flatnonzero(context_change)
+                            blocks_end = np.append(blocks_start[1:], nbr_faces)
+                        else:
+                            blocks_start = blocks_end = np.empty(0, dtype=np.int64)
 
-                        for f, f_index in face_index_pairs:
-                            f_smooth = f.use_smooth
-                            if f_smooth and smooth_groups:
-                                f_smooth = smooth_groups[f_index]
-                            f_mat = min(f.material_index, len(materials) - 1)
+                        loops_values = [totverts + loops_vertex_index[loops_order]]
+                        if faceuv:
+                            loops_values.append(totuvco + loops_uv_index)
+                        if EXPORT_NORMALS:
+                            loops_values.append(totno + loops_normal_index)
+                        loops_values = np.column_stack(loops_values)
+                        if faceuv:
+                            loop_fmt = " %d/%d/%d" if EXPORT_NORMALS else " %d/%d"  # vert, uv, normal
+                        else:  # No UV's
+                            loop_fmt = " %d//%d" if EXPORT_NORMALS else " %d"
+
+                        for block_start, block_end in zip(blocks_start.tolist(), blocks_end.tolist()):
+                            f_mat = int(faces_material[block_start])
+                            f_smooth = int(faces_smooth[block_start])
 
                             # MAKE KEY
                             key = material_names[f_mat], None  # No image, use None instead.
 
                             # Write the vertex group
-                            if EXPORT_POLYGROUPS:
-                                if vertGroupNames:
-                                    # find what vertext group the face belongs to
-                                    vgroup_of_face = findVertexGroupName(f, vgroupsMap)
-                                    if vgroup_of_face != currentVGroup:
-                                        currentVGroup = vgroup_of_face
-                                        fw('g %s\n' % vgroup_of_face)
+                            if faces_vgroup is not None:
+                                # find what vertext group the face belongs to
+                                vgroup_of_face = faces_vgroup[block_start]
+                                if vgroup_of_face != currentVGroup:
+                                    currentVGroup = vgroup_of_face
+                                    fw('g %s\n' % vgroup_of_face)
 
                             # CHECK FOR CONTEXT SWITCH
                             if key == contextMat:
@@ -585,8 +668,7 @@ def write_file(filepath, objects, depsgraph, scene,
                             contextMat = key
                             if f_smooth != contextSmooth:
                                 if f_smooth:  # on now off
-                                    if smooth_groups:
-                                        f_smooth = smooth_groups[f_index]
+                                    if smooth_groups_tot:
                                         fw('s %d\n' % f_smooth)
                                     else:
                                         fw('s 1\n')
@@ -594,45 +676,22 @@ def write_file(filepath, objects, depsgraph, scene,
                                     fw('s off\n')
                                 contextSmooth = f_smooth
 
-                            f_v = [(vi, me_verts[v_idx], l_idx)
-                                   for vi, (v_idx, l_idx) in enumerate(zip(f.vertices, f.loop_indices))]
-
-                            fw('f')
-                            if faceuv:
-                                if EXPORT_NORMALS:
-                                    for vi, v, li in f_v:
-                                        fw(" %d/%d/%d" % (totverts + v.index,
-                                                          totuvco + uv_face_mapping[f_index][vi],
-                                                          totno + loops_to_normals[li],
-                                                          ))  # vert, uv, normal
-                                else:  # No Normals
-                                    for vi, v, li in f_v:
-                                        fw(" %d/%d" % (totverts + v.index,
-                                                       totuvco + uv_face_mapping[f_index][vi],
-                                                       ))  # vert, uv
-
-                                face_vert_index += len(f_v)
-
-                            else:  # No UV's
-                                if EXPORT_NORMALS:
-                                    for vi, v, li in f_v:
-                                        fw(" %d//%d" % (totverts + v.index, totno + loops_to_normals[li]))
-                                else:  # No Normals
-                                    for vi, v, li in f_v:
-                                        fw(" %d" % (totverts + v.index))
-
-                            fw('\n')
+                            write_faces(fw, loop_fmt, faces_size[block_start:block_end],
+                                        loops_values[faces_loop_offset[block_start]:faces_loop_offset[block_end]])
 
                         subprogress2.step()
 
                         # Write edges.
-                        if EXPORT_EDGES:
-                            for ed in edges:
-                                if ed.is_loose:
-                                    fw('l %d %d\n' % (totverts + ed.vertices[0], totverts + ed.vertices[1]))
+                        if EXPORT_EDGES and len(edges):
+                            edges_is_loose = np.empty(len(edges), dtype=bool)
+                            edges.foreach_get("is_loose", edges_is_loose)
+                            edges_verts = np.empty(len(edges) * 2, dtype=np.int32)
+                            edges.foreach_get("vertices", edges_verts)
+                            write_lines(fw, 'l %d %d\n',
+                                        totverts + edges_verts.reshape(-1, 2)[edges_is_loose].astype(np.int64))
 
                         # Make the indices global rather then per mesh
-                        totverts += len(me_verts)
+                        totverts += nbr_verts
                         totuvco += uv_unique_count
                         totno += no_unique_count
 
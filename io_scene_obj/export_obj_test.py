@@ -0,0 +1,76 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+# Checks the UV and normal deduplication keys of the OBJ exporter against round(), needs Blender:
+#     blender -b --factory-startup --python io_scene_obj/export_obj_test.py
+
+import random
+import unittest
+
+import numpy as np
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    from io_scene_obj.export_obj import quantize, unquantize
+else:
+    from .export_obj import quantize, unquantize
+
+
+# Halfway cases at 4 decimals, where rounding the exact value and the scaled one can differ.
+TIE_VALUES = [0.12345, 0.00005, -0.00005, 1.00005, 0.99995, 12.34565, -3.14155, 2.5e-5, -0.00001, 0.0, -0.0]
+
+
+def legacy_key(value):
+    """Key used by the former veckey2d()/veckey3d() dicts."""
+    return round(value, 4)
+
+
+class QuantizeTest(unittest.TestCase):
+    def assertSameAsRound(self, values):
+        values = np.asarray(values, dtype=np.float32).astype(np.float64)
+        keys = quantize(values)
+        expected = [legacy_key(v) for v in values.tolist()]
+        self.assertEqual((keys / 10000.0).tolist(), expected)
+        self.assertEqual(['%.4f' % v for v in unquantize(keys, values).tolist()], ['%.4f' % v for v in expected])
+
+    def test_ties(self):
+        self.assertSameAsRound(TIE_VALUES)
+        self.assertSameAsRound([k / 20000.0 for k in range(-40000, 40000)])
+
+    def test_random(self):
+        rng = random.Random(0)
+        self.assertSameAsRound([rng.randint(-200000, 200000) / 100000.0 + 0.00005 for i in range(100000)])
+        self.assertSameAsRound([rng.uniform(-1.0, 1.0) for i in range(100000)])
+
+    def test_classes(self):
+        # Values rounded to the same key by round() are in the same class, and only those.
+        values = np.asarray(TIE_VALUES + [0.1234, 0.1235, 0.0001, -0.0001], dtype=np.float64)
+        keys = quantize(values)
+        for v1, k1 in zip(values.tolist(), keys.tolist()):
+            for v2, k2 in zip(values.tolist(), keys.tolist()):
+                self.assertEqual(k1 == k2, legacy_key(v1) == legacy_key(v2))
+
+
+if __name__ == '__main__':
+    import sys
+    # Blender's own arguments are not for unittest.
+    unittest.main(argv=[sys.argv[0]] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []),
+                  verbosity=2, exit=False)
@@ -33,14 +33,18 @@ http://wiki.blender.org/index.php/Scripts/Manual/Import/wavefront_obj
 
 import array
 import os
+import sys
 import time
 import bpy
 import mathutils
+import numpy as np
 
 from bpy_extras.io_utils import unpack_list
 from bpy_extras.image_utils import load_image
 from bpy_extras.wm_utils.progress_report import ProgressReport
 
+from . import import_obj_parse
+
 
 def line_value(line_split):
     """
@@ -559,6 +563,142 @@ def split_mesh(verts_loc, faces, unique_materials, filepath, SPLIT_OB_OR_GROUP):
             in face_split_dict.items()]
 
 
+def split_mesh_arrays(verts_loc, face_sizes, loops_loc, face_keys, keys, face_materials, unique_materials,
+                      filepath, SPLIT_OB_OR_GROUP):
+    """
+    Same as split_mesh(), for the arrays of the fast parser (face_keys and face_materials being indices in keys
+    and unique_materials). Returns a list of
+    (verts_loc, faces_index, loops_index, loops_loc, face_materials, unique_materials, dataname, use_vnor, use_vtex)
+    with faces_index and loops_index the selection of faces and loops used by each object.
+    """
+    filename = os.path.splitext((os.path.basename(filepath)))[0]
+    loops_face = np.repeat(np.arange(len(face_sizes)), face_sizes)
+
+    if not SPLIT_OB_OR_GROUP or not len(face_sizes):
+        # Like in split_mesh(), every face has (maybe undefined) normal and uv indices.
+        use_verts_nor = use_verts_tex = bool(len(face_sizes))
+        # use the filename for the object name since we aren't chopping up the mesh.
+        return [(verts_loc, slice(None), slice(None), loops_loc, face_materials, unique_materials, filename,
+                 use_verts_nor, use_verts_tex)]
+
+    def key_to_name(key):
+        # if the key is a tuple, join it to make a string
+        if not key:
+            return filename  # assume its a string. make sure this is true if the splitting code is changed
+        elif isinstance(key, bytes):
+            return key.decode('utf-8', 'replace')
+        else:
+            return "_".join(k.decode('utf-8', 'replace') for k in key)
+
+    def first_use_remap(indices):
+        # Unique values of indices sorted by first use, and indices remapped to them.
+        values, first_index, inverse = np.unique(indices, return_index=True, return_inverse=True)
+        order = np.argsort(first_index, kind='stable')
+        remap = np.empty_like(order)
+        remap[order] = np.arange(len(order))
+        return values[order], remap[inverse.reshape(-1)]
+
+    unique_materials_names = list(unique_materials.keys())
+    ret = []
+    # Objects are created in order of their first face.
+    for key_idx in first_use_remap(face_keys)[0]:
+        faces_index = np.flatnonzero(face_keys == key_idx)
+        loops_index = np.flatnonzero(face_keys[loops_face] == key_idx)
+
+        verts_index, loops_loc_split = first_use_remap(loops_loc[loops_index])
+        materials_index, face_materials_split = first_use_remap(face_materials[faces_index])
+        unique_materials_split = {unique_materials_names[i]: unique_materials[unique_materials_names[i]]
+                                  for i in materials_index}
+
+        use_verts_nor = use_verts_tex = bool(len(faces_index))
+        ret.append((verts_loc[verts_index], faces_index, loops_index, loops_loc_split, face_materials_split,
+                    unique_materials_split, key_to_name(keys[key_idx]), use_verts_nor, use_verts_tex))
+    return ret
+
+
+def create_mesh_arrays(new_objects,
+                       verts_loc,
+                       verts_nor,
+                       verts_tex,
+                       face_sizes,
+                       loops_loc,
+                       loops_nor,
+                       loops_tex,
+                       face_materials,
+                       face_smooth_groups,
+                       unique_materials,
+                       unique_smooth_groups,
+                       dataname,
+                       ):
+    """
+    Same as create_mesh(), for the arrays of the fast parser (face_smooth_groups being -1 for faces not smooth).
+    Those only contain valid polygons, no edges.
+    """
+    me = bpy.data.meshes.new(dataname)
+
+    for material in unique_materials.values():
+        me.materials.append(material)
+
+    loops_start = np.cumsum(face_sizes) - face_sizes
+
+    me.vertices.add(len(verts_loc))
+    me.loops.add(len(loops_loc))
+    me.polygons.add(len(face_sizes))
+
+    me.vertices.foreach_set("co", verts_loc.astype(np.float32).ravel())
+    me.loops.foreach_set("vertex_index", loops_loc.astype(np.int32))
+    me.polygons.foreach_set("loop_start", loops_start.astype(np.int32))
+    me.polygons.foreach_set("loop_total", face_sizes.astype(np.int32))
+    me.polygons.foreach_set("material_index", face_materials.astype(np.int32))
+    me.polygons.foreach_set("use_smooth", face_smooth_groups >= 0)
+
+    if len(verts_nor) and len(loops_loc):
+        # Note: we store 'temp' normals in loops, since validate() may alter final mesh,
+        #       we can only set custom lnors *after* calling it.
+        me.create_normals_split()
+        me.loops.foreach_set("normal", verts_nor[loops_nor].astype(np.float32).ravel())
+
+    if len(verts_tex) and len(face_sizes):
+        me.uv_layers.new(do_init=False)
+        me.uv_layers[0].data.foreach_set("uv", verts_tex[loops_tex].astype(np.float32).ravel())
+
+    # Edges on the boundary of a smooth group are sharp.
+    sharp_edges = None
+    if unique_smooth_groups and len(loops_loc):
+        loops_next = np.arange(1, len(loops_loc) + 1)
+        loops_next[loops_start + face_sizes - 1] = loops_start
+        loops_group = np.repeat(face_smooth_groups, face_sizes)
+        in_group = loops_group >= 0
+        edges_keys = np.stack((loops_group, np.minimum(loops_loc, loops_loc[loops_next]),
+                               np.maximum(loops_loc, loops_loc[loops_next])), axis=1)[in_group]
+        edges_keys, users = np.unique(edges_keys, axis=0, return_counts=True)
+        sharp_edges = edges_keys[users == 1, 1] * len(verts_loc) + edges_keys[users == 1, 2]
+
+    me.validate(clean_customdata=False)  # *Very* important to not remove lnors here!
+    me.update(calc_edges=False, calc_edges_loose=False)
+
+    # XXX If validate changes the geometry, this is likely to be broken...
+    if sharp_edges is not None and len(sharp_edges):
+        edges_verts = np.empty(len(me.edges) * 2, np.int32)
+        me.edges.foreach_get("vertices", edges_verts)
+        edges_verts = edges_verts.reshape(-1, 2).astype(np.int64)
+        edges_keys = edges_verts.min(axis=1) * len(verts_loc) + edges_verts.max(axis=1)
+        me.edges.foreach_set("use_edge_sharp", np.isin(edges_keys, sharp_edges))
+
+    if len(verts_nor):
+        clnors = np.empty(len(me.loops) * 3, np.float32)
+        me.loops.foreach_get("normal", clnors)
+
+        if not unique_smooth_groups:
+            me.polygons.foreach_set("use_smooth", [True] * len(me.polygons))
+
+        me.normals_split_custom_set(tuple(zip(*(iter(clnors),) * 3)))
+        me.use_auto_smooth = True
+
+    ob = bpy.data.objects.new(me.name, me)
+    new_objects.append(ob)
+
+
 def create_mesh(new_objects,
                 use_edges,
                 verts_loc,
@@ -902,36 +1042,168 @@ def any_number_as_int(svalue):
     return int(float(svalue))
 
 
-def load(context,
-         filepath,
-         *,
-         global_clamp_size=0.0,
-         use_smooth_groups=True,
-         use_edges=True,
-         use_split_objects=True,
-         use_split_groups=False,
-         use_image_search=True,
-         use_groups_as_vgroups=False,
-         relpath=None,
-         global_matrix=None
-         ):
+def unique_name(existing_names, name_orig):
+    i = 0
+    if name_orig is None:
+        name_orig = b"ObjObject"
+    name = name_orig
+    while name in existing_names:
+        name = b"%s.%03d" % (name_orig, i)
+        i += 1
+    existing_names.add(name)
+    return name
+
+
+def load_fast(progress,
+              filepath,
+              float_func,
+              *,
+              use_smooth_groups,
+              use_edges,
+              use_split_objects,
+              use_split_groups,
+              use_image_search,
+              relpath,
+              ):
     """
-    Called by the user interface or another script.
-    load_obj(path) - should give acceptable results.
-    This function passes the file and sends the data off
-        to be split into objects and then converted into mesh objects
+    Import the file with the fast (NumPy, multi-process) parser, returning the new objects.
+    That parser only handles plain polygonal files, None is returned for others, see load_legacy().
     """
-    def unique_name(existing_names, name_orig):
-        i = 0
-        if name_orig is None:
-            name_orig = b"ObjObject"
-        name = name_orig
-        while name in existing_names:
-            name = b"%s.%03d" % (name_orig, i)
-            i += 1
-        existing_names.add(name)
-        return name
+    if bpy.app.version >= (2, 91, 0):
+        python_executable = sys.executable
+    else:
+        python_executable = bpy.app.binary_path_python
+    fast_data = import_obj_parse.parse(filepath, comma_decimal=float_func is not float, use_edges=use_edges,
+                                       python_executable=python_executable)
+    if fast_data is None:
+        return None
 
+    (verts_loc, verts_nor, verts_tex, face_sizes, loops_loc, loops_nor, loops_tex,
+     context_records) = fast_data
+
+    # Context variables
+    context_material = None
+    context_smooth_group = None
+    context_object_key = None
+    context_object_obpart = None
+
+    objects_names = set()
+
+    material_libs = set()  # filenames to material libs this OBJ uses
+    use_default_material = False
+    unique_materials = {}
+    unique_smooth_groups = {}
+
+    # Replay the records affecting faces, to get each face's object key, material and smooth group.
+    object_keys = {}
+    material_indices = {}
+    smooth_group_indices = {}
+    face_contexts = []  # (first face, object key index, material index, smooth group index)
+    for face_idx, line in context_records:
+        line_split = line.split()
+        line_start = line_split[0]
+        if line_start == b's':
+            if use_smooth_groups:
+                context_smooth_group = line_value(line_split)
+                if context_smooth_group == b'off':
+                    context_smooth_group = None
+                elif context_smooth_group:  # is not None
+                    unique_smooth_groups[context_smooth_group] = None
+
+        elif line_start == b'o':
+            if use_split_objects:
+                context_object_key = unique_name(objects_names, line_value(line_split))
+                context_object_obpart = context_object_key
+
+        elif line_start == b'g':
+            if use_split_groups:
+                grppart = line_value(line_split)
+                context_object_key = (context_object_obpart, grppart) if context_object_obpart else grppart
+
+        elif line_start == b'usemtl':
+            context_material = line_value(line_split)
+            unique_materials[context_material] = None
+
+        elif line_start == b'mtllib':
+            material_libs |= {os.fsdecode(f) for f in filenames_group_by_ext(line.lstrip()[7:].strip(), b'.mtl')}
+
+        face_contexts.append((
+            face_idx,
+            object_keys.setdefault(context_object_key, len(object_keys)),
+            material_indices.setdefault(context_material, len(material_indices)),
+            smooth_group_indices.setdefault(context_smooth_group, len(smooth_group_indices))
+            if context_smooth_group else -1,
+        ))
+
+    nbr_faces = len(face_sizes)
+    if not face_contexts or face_contexts[0][0] != 0:
+        face_contexts.insert(0, (0, object_keys.setdefault(None, len(object_keys)),
+                                 material_indices.setdefault(None, len(material_indices)), -1))
+    face_contexts = np.array(face_contexts, np.int64)
+    contexts_len = np.diff(np.append(face_contexts[:, 0], nbr_faces))
+    face_keys, face_materials, face_smooth_groups = (
+        np.repeat(face_contexts[:, i], contexts_len) for i in (1, 2, 3))
+
+    if material_indices.get(None, -1) in face_materials:
+        use_default_material = True
+    # Material indices follow the order of unique_materials, None being added last.
+    materials_order = list(unique_materials.keys()) + ([None] if use_default_material else [])
+    materials_remap = np.array([materials_order.index(name) if name in materials_order else -1
+                                for name in material_indices.keys()], np.int64)
+    face_materials = materials_remap[face_materials]
+
+    progress.step("Done, loading materials and images...")
+
+    if use_default_material:
+        unique_materials[None] = None
+    create_materials(filepath, relpath, material_libs, unique_materials,
+                     use_image_search, float_func)
+
+    progress.step("Done, building geometries (verts:%i faces:%i materials: %i smoothgroups:%i) ..." %
+                  (len(verts_loc), len(face_sizes), len(unique_materials), len(unique_smooth_groups)))
+
+    new_objects = []  # put new objects here
+
+    # Split the mesh by objects/materials, may
+    SPLIT_OB_OR_GROUP = bool(use_split_objects or use_split_groups)
+
+    for data in split_mesh_arrays(verts_loc, face_sizes, loops_loc, face_keys, list(object_keys.keys()),
+                                  face_materials, unique_materials, filepath, SPLIT_OB_OR_GROUP):
+        (verts_loc_split, faces_index, loops_index, loops_loc_split, face_materials_split,
+         unique_materials_split, dataname, use_vnor, use_vtex) = data
+        create_mesh_arrays(new_objects,
+                           verts_loc_split,
+                           verts_nor if use_vnor else verts_nor[:0],
+                           verts_tex if use_vtex else verts_tex[:0],
+                           face_sizes[faces_index],
+                           loops_loc_split,
+                           loops_nor[loops_index],
+                           loops_tex[loops_index],
+                           face_materials_split,
+                           face_smooth_groups[faces_index],
+                           unique_materials_split,
+                           unique_smooth_groups,
+                           dataname,
+                           )
+
+    return new_objects
+
+
+def load_legacy(progress,
+                filepath,
+                float_func,
+                *,
+                use_smooth_groups,
+                use_edges,
+                use_split_objects,
+                use_split_groups,
+                use_image_search,
+                use_groups_as_vgroups,
+                relpath,
+                ):
+    """
+    Import the file with the regular parser, which handles all supported OBJ content, returning the new objects.
+    """
     def handle_vec(line_start, context_multi_line, line_split, tag, data, vec, vec_len):
         ret_context_multi_line = tag if strip_slash(line_split) else b''
         if line_start == tag:
@@ -956,331 +1228,376 @@ def load(context,
             [],  # If non-empty, that face is a Blender-invalid ngon (holes...), need a mutable object for that...
         )
 
-    with ProgressReport(context.window_manager) as progress:
-        progress.enter_substeps(1, "Importing OBJ %r..." % filepath)
-
-        if global_matrix is None:
-            global_matrix = mathutils.Matrix()
+    verts_loc = []
+    verts_nor = []
+    verts_tex = []
+    faces = []  # tuples of the faces
+    material_libs = set()  # filenames to material libs this OBJ uses
+    vertex_groups = {}  # when use_groups_as_vgroups is true
 
-        if use_split_objects or use_split_groups:
-            use_groups_as_vgroups = False
-
-        verts_loc = []
-        verts_nor = []
-        verts_tex = []
-        faces = []  # tuples of the faces
-        material_libs = set()  # filenames to material libs this OBJ uses
-        vertex_groups = {}  # when use_groups_as_vgroups is true
+    # Context variables
+    context_material = None
+    context_smooth_group = None
+    context_object_key = None
+    context_object_obpart = None
+    context_vgroup = None
+
+    objects_names = set()
+
+    # Nurbs
+    context_nurbs = {}
+    nurbs = []
+    context_parm = b''  # used by nurbs too but could be used elsewhere
+
+    # Until we can use sets
+    use_default_material = False
+    unique_materials = {}
+    unique_smooth_groups = {}
+    # unique_obects= {} - no use for this variable since the objects are stored in the face.
+
+    # when there are faces that end with \
+    # it means they are multiline-
+    # since we use xreadline we cant skip to the next line
+    # so we need to know whether
+    context_multi_line = b''
+
+    # Per-face handling data.
+    face_vert_loc_indices = None
+    face_vert_nor_indices = None
+    face_vert_tex_indices = None
+    verts_loc_len = verts_nor_len = verts_tex_len = 0
+    face_items_usage = set()
+    face_invalid_blenpoly = None
+    prev_vidx = None
+    face = None
+    vec = []
+
+    quick_vert_failures = 0
+    skip_quick_vert = False
+
+    with open(filepath, 'rb') as f:
+        for line in f:
+            line_split = line.split()
+
+            if not line_split:
+                continue
+
+            line_start = line_split[0]  # we compare with this a _lot_
+
+            if len(line_split) == 1 and not context_multi_line and line_start != b'end':
+                print("WARNING, skipping malformatted line: %s" % line.decode('UTF-8', 'replace').rstrip())
+                continue
+
+            # Handling vertex data are pretty similar, factorize that.
+            # Also, most OBJ files store all those on a single line, so try fast parsing for that first,
+            # and only fallback to full multi-line parsing when needed, this gives significant speed-up
+            # (~40% on affected code).
+            if line_start == b'v':
+                vdata, vdata_len, do_quick_vert = verts_loc, 3, not skip_quick_vert
+            elif line_start == b'vn':
+                vdata, vdata_len, do_quick_vert = verts_nor, 3, not skip_quick_vert
+            elif line_start == b'vt':
+                vdata, vdata_len, do_quick_vert = verts_tex, 2, not skip_quick_vert
+            elif context_multi_line == b'v':
+                vdata, vdata_len, do_quick_vert = verts_loc, 3, False
+            elif context_multi_line == b'vn':
+                vdata, vdata_len, do_quick_vert = verts_nor, 3, False
+            elif context_multi_line == b'vt':
+                vdata, vdata_len, do_quick_vert = verts_tex, 2, False
+            else:
+                vdata_len = 0
+
+            if vdata_len:
+                if do_quick_vert:
+                    try:
+                        vdata.append(list(map(float_func, line_split[1:vdata_len + 1])))
+                    except:
+                        do_quick_vert = False
+                        # In case we get too many failures on quick parsing, force fallback to full multi-line one.
+                        # Exception handling can become costly...
+                        quick_vert_failures += 1
+                        if quick_vert_failures > 10000:
+                            skip_quick_vert = True
+                if not do_quick_vert:
+                    context_multi_line = handle_vec(line_start, context_multi_line, line_split,
+                                                    context_multi_line or line_start,
+                                                    vdata, vec, vdata_len)
+
+            elif line_start == b'f' or context_multi_line == b'f':
+                if not context_multi_line:
+                    line_split = line_split[1:]
+                    # Instantiate a face
+                    face = create_face(context_material, context_smooth_group, context_object_key)
+                    (face_vert_loc_indices, face_vert_nor_indices, face_vert_tex_indices,
+                     _1, _2, _3, face_invalid_blenpoly) = face
+                    faces.append(face)
+                    face_items_usage.clear()
+                    verts_loc_len = len(verts_loc)
+                    verts_nor_len = len(verts_nor)
+                    verts_tex_len = len(verts_tex)
+                    if context_material is None:
+                        use_default_material = True
+                # Else, use face_vert_loc_indices and face_vert_tex_indices previously defined and used the obj_face
+
+                context_multi_line = b'f' if strip_slash(line_split) else b''
+
+                for v in line_split:
+                    obj_vert = v.split(b'/')
+                    idx = int(obj_vert[0])  # Note that we assume here we cannot get OBJ invalid 0 index...
+                    vert_loc_index = (idx + verts_loc_len) if (idx < 1) else idx - 1
+                    # Add the vertex to the current group
+                    # *warning*, this wont work for files that have groups defined around verts
+                    if use_groups_as_vgroups and context_vgroup:
+                        vertex_groups[context_vgroup].append(vert_loc_index)
+                    # This a first round to quick-detect ngons that *may* use a same edge more than once.
+                    # Potential candidate will be re-checked once we have done parsing the whole face.
+                    if not face_invalid_blenpoly:
+                        # If we use more than once a same vertex, invalid ngon is suspected.
+                        if vert_loc_index in face_items_usage:
+                            face_invalid_blenpoly.append(True)
+                        else:
+                            face_items_usage.add(vert_loc_index)
+                    face_vert_loc_indices.append(vert_loc_index)
+
+                    # formatting for faces with normals and textures is
+                    # loc_index/tex_index/nor_index
+                    if len(obj_vert) > 1 and obj_vert[1] and obj_vert[1] != b'0':
+                        idx = int(obj_vert[1])
+                        face_vert_tex_indices.append((idx + verts_tex_len) if (idx < 1) else idx - 1)
+                    else:
+                        face_vert_tex_indices.append(0)
 
-        # Get the string to float conversion func for this file- is 'float' for almost all files.
-        float_func = get_float_func(filepath)
+                    if len(obj_vert) > 2 and obj_vert[2] and obj_vert[2] != b'0':
+                        idx = int(obj_vert[2])
+                        face_vert_nor_indices.append((idx + verts_nor_len) if (idx < 1) else idx - 1)
+                    else:
+                        face_vert_nor_indices.append(0)
 
-        # Context variables
-        context_material = None
-        context_smooth_group = None
-        context_object_key = None
-        context_object_obpart = None
-        context_vgroup = None
-
-        objects_names = set()
-
-        # Nurbs
-        context_nurbs = {}
-        nurbs = []
-        context_parm = b''  # used by nurbs too but could be used elsewhere
-
-        # Until we can use sets
-        use_default_material = False
-        unique_materials = {}
-        unique_smooth_groups = {}
-        # unique_obects= {} - no use for this variable since the objects are stored in the face.
-
-        # when there are faces that end with \
-        # it means they are multiline-
-        # since we use xreadline we cant skip to the next line
-        # so we need to know whether
-        context_multi_line = b''
-
-        # Per-face handling data.
-        face_vert_loc_indices = None
-        face_vert_nor_indices = None
-        face_vert_tex_indices = None
-        verts_loc_len = verts_nor_len = verts_tex_len = 0
-        face_items_usage = set()
-        face_invalid_blenpoly = None
-        prev_vidx = None
-        face = None
-        vec = []
-
-        quick_vert_failures = 0
-        skip_quick_vert = False
+                if not context_multi_line:
+                    # Means we have finished a face, we have to do final check if ngon is suspected to be blender-invalid...
+                    if face_invalid_blenpoly:
+                        face_invalid_blenpoly.clear()
+                        face_items_usage.clear()
+                        prev_vidx = face_vert_loc_indices[-1]
+                        for vidx in face_vert_loc_indices:
+                            edge_key = (prev_vidx, vidx) if (prev_vidx < vidx) else (vidx, prev_vidx)
+                            if edge_key in face_items_usage:
+                                face_invalid_blenpoly.append(True)
+                                break
+                            face_items_usage.add(edge_key)
+                            prev_vidx = vidx
+
+            elif use_edges and (line_start == b'l' or context_multi_line == b'l'):
+                # very similar to the face load function above with some parts removed
+                if not context_multi_line:
+                    line_split = line_split[1:]
+                    # Instantiate a face
+                    face = create_face(context_material, context_smooth_group, context_object_key)
+                    face_vert_loc_indices = face[0]
+                    # XXX A bit hackish, we use special 'value' of face_vert_nor_indices (a single True item) to tag this
+                    #     as a polyline, and not a regular face...
+                    face[1][:] = [True]
+                    faces.append(face)
+                    if context_material is None:
+                        use_default_material = True
+                # Else, use face_vert_loc_indices previously defined and used the obj_face
+
+                context_multi_line = b'l' if strip_slash(line_split) else b''
+
+                for v in line_split:
+                    obj_vert = v.split(b'/')
+                    idx = int(obj_vert[0]) - 1
+                    face_vert_loc_indices.append((idx + len(verts_loc) + 1) if (idx < 0) else idx)
+
+            elif line_start == b's':
+                if use_smooth_groups:
+                    context_smooth_group = line_value(line_split)
+                    if context_smooth_group == b'off':
+                        context_smooth_group = None
+                    elif context_smooth_group:  # is not None
+                        unique_smooth_groups[context_smooth_group] = None
+
+            elif line_start == b'o':
+                if use_split_objects:
+                    context_object_key = unique_name(objects_names, line_value(line_split))
+                    context_object_obpart = context_object_key
+                    # unique_objects[context_object_key]= None
+
+            elif line_start == b'g':
+                if use_split_groups:
+                    grppart = line_value(line_split)
+                    context_object_key = (context_object_obpart, grppart) if context_object_obpart else grppart
+                    # print 'context_object_key', context_object_key
+                    # unique_objects[context_object_key]= None
+                elif use_groups_as_vgroups:
+                    context_vgroup = line_value(line.split())
+                    if context_vgroup and context_vgroup != b'(null)':
+                        vertex_groups.setdefault(context_vgroup, [])
+                    else:
+                        context_vgroup = None  # dont assign a vgroup
+
+            elif line_start == b'usemtl':
+                context_material = line_value(line.split())
+                unique_materials[context_material] = None
+            elif line_start == b'mtllib':  # usemap or usemat
+                # can have multiple mtllib filenames per line, mtllib can appear more than once,
+                # so make sure only occurrence of material exists
+                material_libs |= {os.fsdecode(f) for f in filenames_group_by_ext(line.lstrip()[7:].strip(), b'.mtl')
+                }
+
+                # Nurbs support
+            elif line_start == b'cstype':
+                context_nurbs[b'cstype'] = line_value(line.split())  # 'rat bspline' / 'bspline'
+            elif line_start == b'curv' or context_multi_line == b'curv':
+                curv_idx = context_nurbs[b'curv_idx'] = context_nurbs.get(b'curv_idx', [])  # in case were multiline
+
+                if not context_multi_line:
+                    context_nurbs[b'curv_range'] = float_func(line_split[1]), float_func(line_split[2])
+                    line_split[0:3] = []  # remove first 3 items
+
+                if strip_slash(line_split):
+                    context_multi_line = b'curv'
+                else:
+                    context_multi_line = b''
 
-        progress.enter_substeps(3, "Parsing OBJ file...")
-        with open(filepath, 'rb') as f:
-            for line in f:
-                line_split = line.split()
+                for i in line_split:
+                    vert_loc_index = int(i) - 1
 
-                if not line_split:
-                    continue
+                    if vert_loc_index < 0:
+                        vert_loc_index = len(verts_loc) + vert_loc_index + 1
 
-                line_start = line_split[0]  # we compare with this a _lot_
+                    curv_idx.append(vert_loc_index)
 
-                if len(line_split) == 1 and not context_multi_line and line_start != b'end':
-                    print("WARNING, skipping malformatted line: %s" % line.decode('UTF-8', 'replace').rstrip())
-                    continue
+            elif line_start == b'parm' or context_multi_line == b'parm':
+                if context_multi_line:
+                    context_multi_line = b''
+                else:
+                    context_parm = line_split[1]
+                    line_split[0:2] = []  # remove first 2
 
-                # Handling vertex data are pretty similar, factorize that.
-                # Also, most OBJ files store all those on a single line, so try fast parsing for that first,
-                # and only fallback to full multi-line parsing when needed, this gives significant speed-up
-                # (~40% on affected code).
-                if line_start == b'v':
-                    vdata, vdata_len, do_quick_vert = verts_loc, 3, not skip_quick_vert
-                elif line_start == b'vn':
-                    vdata, vdata_len, do_quick_vert = verts_nor, 3, not skip_quick_vert
-                elif line_start == b'vt':
-                    vdata, vdata_len, do_quick_vert = verts_tex, 2, not skip_quick_vert
-                elif context_multi_line == b'v':
-                    vdata, vdata_len, do_quick_vert = verts_loc, 3, False
-                elif context_multi_line == b'vn':
-                    vdata, vdata_len, do_quick_vert = verts_nor, 3, False
-                elif context_multi_line == b'vt':
-                    vdata, vdata_len, do_quick_vert = verts_tex, 2, False
+                if strip_slash(line_split):
+                    context_multi_line = b'parm'
                 else:
-                    vdata_len = 0
-
-                if vdata_len:
-                    if do_quick_vert:
-                        try:
-                            vdata.append(list(map(float_func, line_split[1:vdata_len + 1])))
-                        except:
-                            do_quick_vert = False
-                            # In case we get too many failures on quick parsing, force fallback to full multi-line one.
-                            # Exception handling can become costly...
-                            quick_vert_failures += 1
-                            if quick_vert_failures > 10000:
-                                skip_quick_vert = True
-                    if not do_quick_vert:
-                        context_multi_line = handle_vec(line_start, context_multi_line, line_split,
-                                                        context_multi_line or line_start,
-                                                        vdata, vec, vdata_len)
-
-                elif line_start == b'f' or context_multi_line == b'f':
-                    if not context_multi_line:
-                        line_split = line_split[1:]
-                        # Instantiate a face
-                        face = create_face(context_material, context_smooth_group, context_object_key)
-                        (face_vert_loc_indices, face_vert_nor_indices, face_vert_tex_indices,
-                         _1, _2, _3, face_invalid_blenpoly) = face
-                        faces.append(face)
-                        face_items_usage.clear()
-                        verts_loc_len = len(verts_loc)
-                        verts_nor_len = len(verts_nor)
-                        verts_tex_len = len(verts_tex)
-                        if context_material is None:
-                            use_default_material = True
-                    # Else, use face_vert_loc_indices and face_vert_tex_indices previously defined and used the obj_face
-
-                    context_multi_line = b'f' if strip_slash(line_split) else b''
-
-                    for v in line_split:
-                        obj_vert = v.split(b'/')
-                        idx = int(obj_vert[0])  # Note that we assume here we cannot get OBJ invalid 0 index...
-                        vert_loc_index = (idx + verts_loc_len) if (idx < 1) else idx - 1
-                        # Add the vertex to the current group
-                        # *warning*, this wont work for files that have groups defined around verts
-                        if use_groups_as_vgroups and context_vgroup:
-                            vertex_groups[context_vgroup].append(vert_loc_index)
-                        # This a first round to quick-detect ngons that *may* use a same edge more than once.
-                        # Potential candidate will be re-checked once we have done parsing the whole face.
-                        if not face_invalid_blenpoly:
-                            # If we use more than once a same vertex, invalid ngon is suspected.
-                            if vert_loc_index in face_items_usage:
-                                face_invalid_blenpoly.append(True)
-                            else:
-                                face_items_usage.add(vert_loc_index)
-                        face_vert_loc_indices.append(vert_loc_index)
-
-                        # formatting for faces with normals and textures is
-                        # loc_index/tex_index/nor_index
-                        if len(obj_vert) > 1 and obj_vert[1] and obj_vert[1] != b'0':
-                            idx = int(obj_vert[1])
-                            face_vert_tex_indices.append((idx + verts_tex_len) if (idx < 1) else idx - 1)
-                        else:
-                            face_vert_tex_indices.append(0)
+                    context_multi_line = b''
+
+                if context_parm.lower() == b'u':
+                    context_nurbs.setdefault(b'parm_u', []).extend([float_func(f) for f in line_split])
+                elif context_parm.lower() == b'v':  # surfaces not supported yet
+                    context_nurbs.setdefault(b'parm_v', []).extend([float_func(f) for f in line_split])
+                # else: # may want to support other parm's ?
+
+            elif line_start == b'deg':
+                context_nurbs[b'deg'] = [int(i) for i in line.split()[1:]]
+            elif line_start == b'end':
+                # Add the nurbs curve
+                if context_object_key:
+                    context_nurbs[b'name'] = context_object_key
+                nurbs.append(context_nurbs)
+                context_nurbs = {}
+                context_parm = b''
+
+            ''' # How to use usemap? deprecated?
+            elif line_start == b'usema': # usemap or usemat
+                context_image= line_value(line_split)
+            '''
+
+    progress.step("Done, loading materials and images...")
+
+    if use_default_material:
+        unique_materials[None] = None
+    create_materials(filepath, relpath, material_libs, unique_materials,
+                     use_image_search, float_func)
+
+    progress.step("Done, building geometries (verts:%i faces:%i materials: %i smoothgroups:%i) ..." %
+                  (len(verts_loc), len(faces), len(unique_materials), len(unique_smooth_groups)))
+
+    new_objects = []  # put new objects here
+
+    # Split the mesh by objects/materials, may
+    SPLIT_OB_OR_GROUP = bool(use_split_objects or use_split_groups)
+
+    for data in split_mesh(verts_loc, faces, unique_materials, filepath, SPLIT_OB_OR_GROUP):
+        verts_loc_split, faces_split, unique_materials_split, dataname, use_vnor, use_vtex = data
+        # Create meshes from the data, warning 'vertex_groups' wont support splitting
+        #~ print(dataname, use_vnor, use_vtex)
+        create_mesh(new_objects,
+                    use_edges,
+                    verts_loc_split,
+                    verts_nor if use_vnor else [],
+                    verts_tex if use_vtex else [],
+                    faces_split,
+                    unique_materials_split,
+                    unique_smooth_groups,
+                    vertex_groups,
+                    dataname,
+                    )
+
+    # nurbs support
+    for context_nurbs in nurbs:
+        create_nurbs(context_nurbs, verts_loc, new_objects)
+
+    return new_objects
 
-                        if len(obj_vert) > 2 and obj_vert[2] and obj_vert[2] != b'0':
-                            idx = int(obj_vert[2])
-                            face_vert_nor_indices.append((idx + verts_nor_len) if (idx < 1) else idx - 1)
-                        else:
-                            face_vert_nor_indices.append(0)
-
-                    if not context_multi_line:
-                        # Means we have finished a face, we have to do final check if ngon is suspected to be blender-invalid...
-                        if face_invalid_blenpoly:
-                            face_invalid_blenpoly.clear()
-                            face_items_usage.clear()
-                            prev_vidx = face_vert_loc_indices[-1]
-                            for vidx in face_vert_loc_indices:
-                                edge_key = (prev_vidx, vidx) if (prev_vidx < vidx) else (vidx, prev_vidx)
-                                if edge_key in face_items_usage:
-                                    face_invalid_blenpoly.append(True)
-                                    break
-                                face_items_usage.add(edge_key)
-                                prev_vidx = vidx
 
-                elif use_edges and (line_start == b'l' or context_multi_line == b'l'):
-                    # very similar to the face load function above with some parts removed
-                    if not context_multi_line:
-                        line_split = line_split[1:]
-                        # Instantiate a face
-                        face = create_face(context_material, context_smooth_group, context_object_key)
-                        face_vert_loc_indices = face[0]
-                        # XXX A bit hackish, we use special 'value' of face_vert_nor_indices (a single True item) to tag this
-                        #     as a polyline, and not a regular face...
-                        face[1][:] = [True]
-                        faces.append(face)
-                        if context_material is None:
-                            use_default_material = True
-                    # Else, use face_vert_loc_indices previously defined and used the obj_face
-
-                    context_multi_line = b'l' if strip_slash(line_split) else b''
-
-                    for v in line_split:
-                        obj_vert = v.split(b'/')
-                        idx = int(obj_vert[0]) - 1
-                        face_vert_loc_indices.append((idx + len(verts_loc) + 1) if (idx < 0) else idx)
-
-                elif line_start == b's':
-                    if use_smooth_groups:
-                        context_smooth_group = line_value(line_split)
-                        if context_smooth_group == b'off':
-                            context_smooth_group = None
-                        elif context_smooth_group:  # is not None
-                            unique_smooth_groups[context_smooth_group] = None
-
-                elif line_start == b'o':
-                    if use_split_objects:
-                        context_object_key = unique_name(objects_names, line_value(line_split))
-                        context_object_obpart = context_object_key
-                        # unique_objects[context_object_key]= None
-
-                elif line_start == b'g':
-                    if use_split_groups:
-                        grppart = line_value(line_split)
-                        context_object_key = (context_object_obpart, grppart) if context_object_obpart else grppart
-                        # print 'context_object_key', context_object_key
-                        # unique_objects[context_object_key]= None
-                    elif use_groups_as_vgroups:
-                        context_vgroup = line_value(line.split())
-                        if context_vgroup and context_vgroup != b'(null)':
-                            vertex_groups.setdefault(context_vgroup, [])
-                        else:
-                            context_vgroup = None  # dont assign a vgroup
-
-                elif line_start == b'usemtl':
-                    context_material = line_value(line.split())
-                    unique_materials[context_material] = None
-                elif line_start == b'mtllib':  # usemap or usemat
-                    # can have multiple mtllib filenames per line, mtllib can appear more than once,
-                    # so make sure only occurrence of material exists
-                    material_libs |= {os.fsdecode(f) for f in filenames_group_by_ext(line.lstrip()[7:].strip(), b'.mtl')
-                    }
-
-                    # Nurbs support
-                elif line_start == b'cstype':
-                    context_nurbs[b'cstype'] = line_value(line.split())  # 'rat bspline' / 'bspline'
-                elif line_start == b'curv' or context_multi_line == b'curv':
-                    curv_idx = context_nurbs[b'curv_idx'] = context_nurbs.get(b'curv_idx', [])  # in case were multiline
-
-                    if not context_multi_line:
-                        context_nurbs[b'curv_range'] = float_func(line_split[1]), float_func(line_split[2])
-                        line_split[0:3] = []  # remove first 3 items
-
-                    if strip_slash(line_split):
-                        context_multi_line = b'curv'
-                    else:
-                        context_multi_line = b''
+def load(context,
+         filepath,
+         *,
+         global_clamp_size=0.0,
+         use_smooth_groups=True,
+         use_edges=True,
+         use_split_objects=True,
+         use_split_groups=False,
+         use_image_search=True,
+         use_groups_as_vgroups=False,
+         use_fast_parse=True,
+         relpath=None,
+         global_matrix=None
+         ):
+    """
+    Called by the user interface or another script.
+    load_obj(path) - should give acceptable results.
+    This function passes the file and sends the data off
+        to be split into objects and then converted into mesh objects
+    """
+    with ProgressReport(context.window_manager) as progress:
+        progress.enter_substeps(1, "Importing OBJ %r..." % filepath)
 
-                    for i in line_split:
-                        vert_loc_index = int(i) - 1
+        if global_matrix is None:
+            global_matrix = mathutils.Matrix()
 
-                        if vert_loc_index < 0:
-                            vert_loc_index = len(verts_loc) + vert_loc_index + 1
+        if use_split_objects or use_split_groups:
+            use_groups_as_vgroups = False
 
-                        curv_idx.append(vert_loc_index)
+        # Get the string to float conversion func for this file- is 'float' for almost all files.
+        float_func = get_float_func(filepath)
 
-                elif line_start == b'parm' or context_multi_line == b'parm':
-                    if context_multi_line:
-                        context_multi_line = b''
-                    else:
-                        context_parm = line_split[1]
-                        line_split[0:2] = []  # remove first 2
+        progress.enter_substeps(3, "Parsing OBJ file...")
 
-                    if strip_slash(line_split):
-                        context_multi_line = b'parm'
-                    else:
-                        context_multi_line = b''
-
-                    if context_parm.lower() == b'u':
-                        context_nurbs.setdefault(b'parm_u', []).extend([float_func(f) for f in line_split])
-                    elif context_parm.lower() == b'v':  # surfaces not supported yet
-                        context_nurbs.setdefault(b'parm_v', []).extend([float_func(f) for f in line_split])
-                    # else: # may want to support other parm's ?
-
-                elif line_start == b'deg':
-                    context_nurbs[b'deg'] = [int(i) for i in line.split()[1:]]
-                elif line_start == b'end':
-                    # Add the nurbs curve
-                    if context_object_key:
-                        context_nurbs[b'name'] = context_object_key
-                    nurbs.append(context_nurbs)
-                    context_nurbs = {}
-                    context_parm = b''
-
-                ''' # How to use usemap? deprecated?
-                elif line_start == b'usema': # usemap or usemat
-                    context_image= line_value(line_split)
-                '''
-
-        progress.step("Done, loading materials and images...")
-
-        if use_default_material:
-            unique_materials[None] = None
-        create_materials(filepath, relpath, material_libs, unique_materials,
-                         use_image_search, float_func)
-
-        progress.step("Done, building geometries (verts:%i faces:%i materials: %i smoothgroups:%i) ..." %
-                      (len(verts_loc), len(faces), len(unique_materials), len(unique_smooth_groups)))
+        new_objects = None
+        if use_fast_parse and not use_groups_as_vgroups:
+            new_objects = load_fast(progress, filepath, float_func,
+                                    use_smooth_groups=use_smooth_groups,
+                                    use_edges=use_edges,
+                                    use_split_objects=use_split_objects,
+                                    use_split_groups=use_split_groups,
+                                    use_image_search=use_image_search,
+                                    relpath=relpath,
+                                    )
+        if new_objects is None:
+            new_objects = load_legacy(progress, filepath, float_func,
+                                      use_smooth_groups=use_smooth_groups,
+                                      use_edges=use_edges,
+                                      use_split_objects=use_split_objects,
+                                      use_split_groups=use_split_groups,
+                                      use_image_search=use_image_search,
+                                      use_groups_as_vgroups=use_groups_as_vgroups,
+                                      relpath=relpath,
+                                      )
 
         # deselect all
         if bpy.ops.object.select_all.poll():
             bpy.ops.object.select_all(action='DESELECT')
 
-        new_objects = []  # put new objects here
-
-        # Split the mesh by objects/materials, may
-        SPLIT_OB_OR_GROUP = bool(use_split_objects or use_split_groups)
-
-        for data in split_mesh(verts_loc, faces, unique_materials, filepath, SPLIT_OB_OR_GROUP):
-            verts_loc_split, faces_split, unique_materials_split, dataname, use_vnor, use_vtex = data
-            # Create meshes from the data, warning 'vertex_groups' wont support splitting
-            #~ print(dataname, use_vnor, use_vtex)
-            create_mesh(new_objects,
-                        use_edges,
-                        verts_loc_split,
-                        verts_nor if use_vnor else [],
-                        verts_tex if use_vtex else [],
-                        faces_split,
-                        unique_materials_split,
-                        unique_smooth_groups,
-                        vertex_groups,
-                        dataname,
-                        )
-
-        # nurbs support
-        for context_nurbs in nurbs:
-            create_nurbs(context_nurbs, verts_loc, new_objects)
-
         view_layer = context.view_layer
         collection = view_layer.active_layer_collection.collection
 
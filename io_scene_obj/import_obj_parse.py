@@ -0,0 +1,289 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+Fast OBJ geometry parser.
+
+The file is split into line-aligned chunks, parsed in parallel (in worker processes for big files) into NumPy arrays.
+Only plain polygonal files are handled here: anything else (NURBS, multi-line records, polylines...) makes parse()
+return None, so that import_obj falls back to its regular parser.
+
+This module must not import bpy, worker processes cannot.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+
+# Records that are only handled by the regular parser.
+EXOTIC_RECORDS = {b'cstype', b'curv', b'curv2', b'surf', b'parm', b'trim', b'hole', b'scrv', b'sp', b'end',
+                  b'deg', b'bmat', b'step', b'con'}
+# Records affecting the context of following faces (object, material...), handed over to import_obj as is.
+CONTEXT_RECORDS = {b'o', b'g', b's', b'usemtl', b'mtllib'}
+
+# Files smaller than this are parsed in this process, starting worker processes would cost more than it saves.
+PROCESS_POOL_MIN_SIZE = 32 * 1024 * 1024
+CHUNK_MIN_SIZE = 4 * 1024 * 1024
+
+
+class ExoticOBJError(Exception):
+    """Raised when some content has to be handled by the regular parser."""
+    pass
+
+
+def _to_float(tokens, comma_decimal):
+    values = np.array(tokens, dtype=np.bytes_)
+    if comma_decimal:
+        values = np.char.replace(values, b',', b'.')
+    try:
+        return values.astype(np.float64)
+    except ValueError:
+        raise ExoticOBJError()
+
+
+def _to_int(tokens):
+    try:
+        return np.array(tokens, dtype=np.bytes_).astype(np.int64)
+    except ValueError:
+        raise ExoticOBJError()
+
+
+def _parse_face_tokens(face_tok):
+    """Return (loc, tex, nor) raw index arrays of 'v/vt/vn' face items, 0 meaning undefined tex or nor."""
+    nbr_items = len(face_tok)
+    joined = b' '.join(face_tok)
+    if b'/' not in joined:
+        loc = _to_int(face_tok)
+        return loc, np.zeros(nbr_items, np.int64), np.zeros(nbr_items, np.int64)
+
+    # Usual case, all items use the same 'v/vt/vn' or 'v//vn' layout.
+    joined = joined.replace(b'//', b'/0/')
+    if joined.count(b'/') == 2 * nbr_items:
+        values = joined.replace(b'/', b' ').split()
+        if len(values) == 3 * nbr_items:
+            values = _to_int(values).reshape(nbr_items, 3)
+            return values[:, 0], values[:, 1], values[:, 2]
+
+    loc = []
+    tex = []
+    nor = []
+    for item in face_tok:
+        obj_vert = item.split(b'/')
+        loc.append(obj_vert[0])
+        tex.append(obj_vert[1] if len(obj_vert) > 1 and obj_vert[1] else b'0')
+        nor.append(obj_vert[2] if len(obj_vert) > 2 and obj_vert[2] else b'0')
+    return _to_int(loc), _to_int(tex), _to_int(nor)
+
+
+def parse_chunk(filepath, start, end, comma_decimal, use_edges):
+    """
+    Parse bytes [start, end[ of the file, which must be line-aligned.
+    Returns None if some content needs the regular parser, else a dict of NumPy arrays, face indices being the raw
+    values from the file (1-based, or negative relative ones).
+    """
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    v_tok = []
+    vn_tok = []
+    vt_tok = []
+    face_tok = []
+    face_sizes = []
+    # Amount of v/vt/vn defined in this chunk before each face, to resolve relative indices.
+    face_verts_before = []
+    context_records = []
+
+    try:
+        for line in data.splitlines():
+            line_split = line.split()
+            if not line_split or line_split[0].startswith(b'#'):
+                continue
+            if line_split[-1][-1] == 92:  # '\' char, multi-line record.
+                return None
+            if len(line_split) == 1:
+                # Skipped as malformatted by the regular parser too.
+                continue
+
+            line_start = line_split[0]
+            if line_start == b'v':
+                if len(line_split) < 4:
+                    return None
+                v_tok += line_split[1:4]
+            elif line_start == b'vn':
+                if len(line_split) < 4:
+                    return None
+                vn_tok += line_split[1:4]
+            elif line_start == b'vt':
+                vt_tok += line_split[1:3]
+                if len(line_split) == 2:
+                    # Some files do not explicitly write the 'v' value when it's 0.0, see T68249...
+                    vt_tok.append(b'0')
+            elif line_start == b'f':
+                if len(line_split) < 4:
+                    # Faces with 2 verts are edges.
+                    return None
+                face_tok += line_split[1:]
+                face_sizes.append(len(line_split) - 1)
+                face_verts_before.append((len(v_tok) // 3, len(vt_tok) // 2, len(vn_tok) // 3))
+            elif line_start in CONTEXT_RECORDS:
+                context_records.append((len(face_sizes), line))
+            elif line_start in EXOTIC_RECORDS or (use_edges and line_start == b'l'):
+                return None
+
+        loc, tex, nor = _parse_face_tokens(face_tok) if face_tok else (np.zeros(0, np.int64),) * 3
+        return {
+            "verts_loc": _to_float(v_tok, comma_decimal).reshape(-1, 3),
+            "verts_nor": _to_float(vn_tok, comma_decimal).reshape(-1, 3),
+            "verts_tex": _to_float(vt_tok, comma_decimal).reshape(-1, 2),
+            "face_sizes": np.array(face_sizes, np.int64),
+            "face_verts_before": np.array(face_verts_before, np.int64).reshape(-1, 3),
+            "loops_loc": loc,
+            "loops_tex": tex,
+            "loops_nor": nor,
+            "context_records": context_records,
+        }
+    except ExoticOBJError:
+        return None
+
+
+def _chunk_bounds(filepath, nbr_chunks):
+    size = os.path.getsize(filepath)
+    bounds = [0]
+    with open(filepath, 'rb') as f:
+        for i in range(1, nbr_chunks):
+            f.seek(size * i // nbr_chunks)
+            f.readline()  # Move to the beginning of next line.
+            bound = f.tell()
+            if bound > bounds[-1] and bound < size:
+                bounds.append(bound)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _parse_chunks_in_processes(filepath, chunks, comma_decimal, use_edges, workers, python_executable):
+    import importlib
+    import multiprocessing
+    from multiprocessing import spawn
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Spawned processes do not have Blender's modules, and cannot import this add-on package (it imports bpy).
+    # So they get this module as a top-level one, from the add-on directory temporarily added to the path.
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    module_name = __name__.rpartition('.')[2]
+    executable = spawn.get_executable()
+    sys.path.insert(0, module_dir)
+    try:
+        worker_module = importlib.import_module(module_name)
+        if python_executable:
+            spawn.set_executable(python_executable)
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            return list(executor.map(worker_module.parse_chunk, *zip(*(
+                (filepath, start, end, comma_decimal, use_edges) for start, end in chunks))))
+    finally:
+        spawn.set_executable(executable)
+        sys.path.remove(module_dir)
+        if module_name != __name__:
+            sys.modules.pop(module_name, None)
+
+
+def _resolve_indices(raw, base):
+    """OBJ indices are 1-based, or relative to the amount of items defined before (when < 1)."""
+    return np.where(raw < 1, raw + base, raw - 1)
+
+
+def parse(filepath, comma_decimal=False, use_edges=True, workers=0, python_executable=None):
+    """
+    Parse the whole file.
+    Returns None when it needs the regular parser, else a tuple:
+    (verts_loc, verts_nor, verts_tex, face_sizes, loops_loc, loops_nor, loops_tex, context_records)
+    with 0-based indices ('undefined' tex and nor ones being 0), and context_records a list of
+    (face_index, line) of the records affecting the faces defined after them.
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    size = os.path.getsize(filepath)
+    use_processes = workers > 1 and size >= PROCESS_POOL_MIN_SIZE
+    nbr_chunks = max(1, min(workers * 4 if use_processes else 1, size // CHUNK_MIN_SIZE))
+    chunks = _chunk_bounds(filepath, nbr_chunks)
+
+    results = None
+    if use_processes and len(chunks) > 1:
+        try:
+            results = _parse_chunks_in_processes(filepath, chunks, comma_decimal, use_edges, workers,
+                                                 python_executable)
+        except Exception:
+            import traceback
+            traceback.print_exc()
+            print("OBJ: could not parse in worker processes, parsing in a single one instead")
+    if results is None:
+        results = []
+        for start, end in chunks:
+            results.append(parse_chunk(filepath, start, end, comma_decimal, use_edges))
+            if results[-1] is None:
+                break
+    if any(res is None for res in results):
+        return None
+
+    # Merge chunks, resolving face indices now that we know how many items were defined before each chunk.
+    context_records = []
+    loops_loc = []
+    loops_tex = []
+    loops_nor = []
+    nbr_faces = nbr_loc = nbr_tex = nbr_nor = 0
+    for res in results:
+        face_sizes = res["face_sizes"]
+        bases = np.repeat(res["face_verts_before"], face_sizes, axis=0) + (nbr_loc, nbr_tex, nbr_nor)
+        loops_loc.append(_resolve_indices(res["loops_loc"], bases[:, 0]))
+        loops_tex.append(np.where(res["loops_tex"] == 0, 0, _resolve_indices(res["loops_tex"], bases[:, 1])))
+        loops_nor.append(np.where(res["loops_nor"] == 0, 0, _resolve_indices(res["loops_nor"], bases[:, 2])))
+        context_records += [(face_idx + nbr_faces, line) for face_idx, line in res["context_records"]]
+        nbr_faces += len(face_sizes)
+        nbr_loc += len(res["verts_loc"])
+        nbr_tex += len(res["verts_tex"])
+        nbr_nor += len(res["verts_nor"])
+
+    verts_loc = np.concatenate([res["verts_loc"] for res in results])
+    verts_nor = np.concatenate([res["verts_nor"] for res in results])
+    verts_tex = np.concatenate([res["verts_tex"] for res in results])
+    face_sizes = np.concatenate([res["face_sizes"] for res in results])
+    loops_loc = np.concatenate(loops_loc)
+    loops_tex = np.concatenate(loops_tex)
+    loops_nor = np.concatenate(loops_nor)
+
+    # Out of range indices are reported by the regular parser.
+    if len(loops_loc) and (loops_loc.min() < 0 or loops_loc.max() >= len(verts_loc)):
+        return None
+    if len(verts_nor) and len(loops_nor) and (loops_nor.min() < 0 or loops_nor.max() >= len(verts_nor)):
+        return None
+    if len(verts_tex) and len(loops_tex) and (loops_tex.min() < 0 or loops_tex.max() >= len(verts_tex)):
+        return None
+
+    # Faces using a same vertex more than once may be invalid Blender polygons, those need to be tessellated
+    # by the regular parser.
+    if len(loops_loc):
+        loops_face = np.repeat(np.arange(len(face_sizes)), face_sizes)
+        order = np.lexsort((loops_loc, loops_face))
+        if np.any((loops_face[order][1:] == loops_face[order][:-1]) & (loops_loc[order][1:] == loops_loc[order][:-1])):
+            return None
+
+    return verts_loc, verts_nor, verts_tex, face_sizes, loops_loc, loops_nor, loops_tex, context_records
@@ -0,0 +1,177 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+# Compares the meshes imported by the fast and the regular OBJ parsers, needs Blender:
+#     blender -b --factory-startup --python io_scene_obj/import_obj_test.py
+
+import os
+import tempfile
+import unittest
+
+import bpy
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == '__main__':
+    from io_scene_obj import import_obj
+else:
+    from . import import_obj
+
+
+OBJ_SINGLE = b"""mtllib single lib.mtl
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+v 0.5 0.5 1
+vt 0 0
+vt 1 0
+vt 1 1
+vt 0 1
+vn 0 0 1
+vn 0 0 -1
+usemtl red
+s 1
+f 1/1/1 2/2/1 3/3/1 4/4/1
+f 1/1/2 2/2/2 5/3/2
+usemtl blue
+s off
+f 2/2/1 3/3/1 5/4/1
+f 3/3/2 4/4/2 5/1/2
+"""
+
+OBJ_SPLIT = b"""mtllib split.mtl
+o First
+v 0 0 0
+v 1 0 0
+v 1 1 0
+vn 0 0 1
+vt 0.5 0.5
+g grpA
+usemtl red
+f 1/1/1 2/1/1 3/1/1
+o Second
+v 0 0 1
+v 1 0 1
+v 1 1 1
+v 0 1 1
+g grpB
+s 2
+f -4 -3 -2 -1
+usemtl green
+f 4 5 6
+g grpC
+f 5 6 7
+o First
+f 1//1 3//1 7//1
+"""
+
+MTL = b"""newmtl red
+Kd 1 0 0
+newmtl green
+Kd 0 1 0
+newmtl blue
+Kd 0 0 1
+"""
+
+
+def strip_name_suffix(name):
+    base, sep, suffix = name.rpartition('.')
+    return base if sep and suffix.isdigit() else name
+
+
+class ImportOBJFastParseTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        for filename, data in (("single.obj", OBJ_SINGLE), ("split.obj", OBJ_SPLIT),
+                               ("single lib.mtl", MTL), ("split.mtl", MTL)):
+            with open(os.path.join(cls.tmpdir.name, filename), 'wb') as f:
+                f.write(data)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def import_meshes(self, filename, **kwargs):
+        """Import the file and return a description of the new meshes, which are then removed."""
+        objects_before = set(bpy.data.objects)
+        meshes_before = set(bpy.data.meshes)
+        materials_before = set(bpy.data.materials)
+
+        import_obj.load(bpy.context, os.path.join(self.tmpdir.name, filename), **kwargs)
+
+        result = []
+        for ob in sorted(set(bpy.data.objects) - objects_before, key=lambda ob: ob.name):
+            me = ob.data
+            me.calc_normals_split()
+            result.append((
+                strip_name_suffix(ob.name),
+                [tuple(round(c, 5) for c in v.co) for v in me.vertices],
+                [tuple(p.vertices) for p in me.polygons],
+                [strip_name_suffix(ma.name) if ma else None
+                 for ma in (me.materials[p.material_index] if me.materials else None for p in me.polygons)],
+                [p.use_smooth for p in me.polygons],
+                sorted(tuple(e.vertices) for e in me.edges if e.use_edge_sharp),
+                [[tuple(round(c, 5) for c in uv.uv) for uv in uv_layer.data] for uv_layer in me.uv_layers],
+                [tuple(round(c, 5) for c in l.normal) for l in me.loops],
+            ))
+
+        for ob in set(bpy.data.objects) - objects_before:
+            bpy.data.objects.remove(ob)
+        for me in set(bpy.data.meshes) - meshes_before:
+            bpy.data.meshes.remove(me)
+        for ma in set(bpy.data.materials) - materials_before:
+            bpy.data.materials.remove(ma)
+        return result
+
+    def assertSameImport(self, filename, **kwargs):
+        fast = self.import_meshes(filename, use_fast_parse=True, **kwargs)
+        regular = self.import_meshes(filename, use_fast_parse=False, **kwargs)
+        self.assertTrue(fast)
+        self.assertEqual(fast, regular)
+        return fast
+
+    def test_single(self):
+        meshes = self.assertSameImport("single.obj")
+        self.assertEqual([m[0] for m in meshes], ["single"])
+        self.assertEqual(meshes[0][3], ["red", "red", "blue", "blue"])
+
+    def test_single_no_smooth_groups(self):
+        self.assertSameImport("single.obj", use_smooth_groups=False)
+
+    def test_split_objects(self):
+        meshes = self.assertSameImport("split.obj", use_split_objects=True)
+        self.assertEqual(sorted(m[0] for m in meshes), ["First", "First", "Second"])
+
+    def test_split_groups(self):
+        meshes = self.assertSameImport("split.obj", use_split_objects=True, use_split_groups=True)
+        self.assertEqual(sorted(m[0] for m in meshes), ["First", "First_grpA", "Second_grpB", "Second_grpC"])
+
+    def test_not_split(self):
+        meshes = self.assertSameImport("split.obj", use_split_objects=False, use_split_groups=False)
+        self.assertEqual([m[0] for m in meshes], ["split"])
+
+
+if __name__ == '__main__':
+    import sys
+    # Blender's own arguments are not for unittest.
+    unittest.main(argv=[sys.argv[0]] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []),
+                  verbosity=2, exit=False)
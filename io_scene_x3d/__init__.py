@@ -63,6 +63,13 @@ class ImportX3D(bpy.types.Operator, ImportHelper):
     filename_ext = ".x3d"
     filter_glob: StringProperty(default="*.x3d;*.wrl", options={'HIDDEN'})
 
+    use_shared_geometry: BoolProperty(
+            name="Shared Geometry",
+            description="Shapes reusing a geometry node (DEF/USE) share "
+                        "a single mesh, as linked duplicates",
+            default=True,
+            )
+
     def execute(self, context):
         from . import import_x3d
 
@@ -268,6 +275,30 @@ class X3D_PT_import_transform(bpy.types.Panel):
         layout.prop(operator, "axis_up")
 
 
+class X3D_PT_import_geometry(bpy.types.Panel):
+    bl_space_type = 'FILE_BROWSER'
+    bl_region_type = 'TOOL_PROPS'
+    bl_label = "Geometry"
+    bl_parent_id = "FILE_PT_operator"
+
+    @classmethod
+    def poll(cls, context):
+        sfile = context.space_data
+        operator = sfile.active_operator
+
+        return operator.bl_idname == "IMPORT_SCENE_OT_x3d"
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False  # No animation.
+
+        sfile = context.space_data
+        operator = sfile.active_operator
+
+        layout.prop(operator, "use_shared_geometry")
+
+
 def menu_func_import(self, context):
     self.layout.operator(ImportX3D.bl_idname,
                          text="X3D Extensible 3D (.x3d/.wrl)")
@@ -285,6 +316,7 @@ classes = (
     X3D_PT_export_geometry,
     ImportX3D,
     X3D_PT_import_transform,
+    X3D_PT_import_geometry,
 )
 
 
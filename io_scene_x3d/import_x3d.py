@@ -1340,28 +1340,25 @@ class x3dNode(vrmlNode):
         # print(self.x3dNode.tagName)
         self.lineno = self.x3dNode.parse_position[0]
 
-        define = self.x3dNode.getAttributeNode('DEF')
-        if define:
-            self.getDefDict()[define.value] = self
+        define = self.x3dNode.attributes.get('DEF')
+        if define is not None:
+            self.getDefDict()[define] = self
         else:
-            use = self.x3dNode.getAttributeNode('USE')
-            if use:
+            use = self.x3dNode.attributes.get('USE')
+            if use is not None:
                 try:
-                    self.reference = self.getDefDict()[use.value]
+                    self.reference = self.getDefDict()[use]
                     self.node_type = NODE_REFERENCE
                 except:
-                    print('\tWarning: reference', use.value, 'not found')
+                    print('\tWarning: reference', use, 'not found')
                     self.parent.children.remove(self)
 
                 return
 
         for x3dChildNode in self.x3dNode.childNodes:
-            if x3dChildNode.nodeType in {x3dChildNode.TEXT_NODE, x3dChildNode.COMMENT_NODE, x3dChildNode.CDATA_SECTION_NODE}:
-                continue
-
             node_type = NODE_NORMAL
             # print(x3dChildNode, dir(x3dChildNode))
-            if x3dChildNode.getAttributeNode('USE'):
+            if 'USE' in x3dChildNode.attributes:
                 node_type = NODE_REFERENCE
 
             child = x3dNode(self, node_type, x3dChildNode)
@@ -1374,12 +1371,12 @@ class x3dNode(vrmlNode):
 
     # Used to retain object identifiers from X3D to Blender
     def getDefName(self):
-        node_id = self.x3dNode.getAttributeNode('DEF')
-        if node_id:
-            return node_id.value
-        node_id = self.x3dNode.getAttributeNode('USE')
-        if node_id:
-            return "USE_" + node_id.value
+        node_id = self.x3dNode.attributes.get('DEF')
+        if node_id is not None:
+            return node_id
+        node_id = self.x3dNode.attributes.get('USE')
+        if node_id is not None:
+            return "USE_" + node_id
         return None
 
     # Other funcs operate from vrml, but this means we can wrap XML fields, still use nice utility funcs
@@ -1388,9 +1385,8 @@ class x3dNode(vrmlNode):
         # ancestry and AS_CHILD are ignored, only used for VRML now
 
         self_real = self.getRealNode()  # in case we're an instance
-        field_xml = self.x3dNode.getAttributeNode(field)
-        if field_xml:
-            value = field_xml.value
+        value = self.x3dNode.attributes.get(field)
+        if value is not None:
 
             # We may want to edit. for x3d specific stuff
             # Sucks a bit to return the field name in the list but vrml excepts this :/
@@ -1401,25 +1397,44 @@ class x3dNode(vrmlNode):
             return None
 
     def canHaveReferences(self):
-        return self.x3dNode.getAttributeNode('DEF')
+        return 'DEF' in self.x3dNode.attributes
 
     def desc(self):
         return self.getRealNode().x3dNode.toxml()
 
 
+class x3dElement(object):
+    """
+    Light XML element, only keeping what x3dNode needs:
+    no text, comments or parent links.
+    """
+    __slots__ = ('tagName',
+                 'attributes',
+                 'childNodes',
+                 'parse_position')
+
+    def __init__(self, tagName, attributes, parse_position):
+        self.tagName = tagName
+        self.attributes = attributes
+        self.childNodes = []
+        self.parse_position = parse_position
+
+    def toxml(self):
+        from xml.sax.saxutils import quoteattr
+
+        attributes = "".join(" %s=%s" % (name, quoteattr(value)) for name, value in self.attributes.items())
+        if not self.childNodes:
+            return "<%s%s/>" % (self.tagName, attributes)
+        children = "".join(child.toxml() for child in self.childNodes)
+        return "<%s%s>%s</%s>" % (self.tagName, attributes, children, self.tagName)
+
+
 def x3d_parse(path):
     """
     Sets up the root node and returns it so load_web3d() can deal with the blender side of things.
     Return root (x3dNode, '') or (None, 'Error String')
     """
-    import xml.dom.minidom
-    import xml.sax
-    from xml.sax import handler
-
-    '''
-    try:    doc = xml.dom.minidom.parse(path)
-    except: return None, 'Could not parse this X3D file, XML error'
-    '''
+    import xml.parsers.expat
 
     # Could add a try/except here, but a console error is more useful.
     data = gzipOpen(path)
@@ -1427,33 +1442,35 @@ def x3d_parse(path):
     if data is None:
         return None, 'Failed to open file: ' + path
 
-    # Enable line number reporting in the parser - kinda brittle
-    def set_content_handler(dom_handler):
-        def startElementNS(name, tagName, attrs):
-            orig_start_cb(name, tagName, attrs)
-            cur_elem = dom_handler.elementStack[-1]
-            cur_elem.parse_position = (parser._parser.CurrentLineNumber, parser._parser.CurrentColumnNumber)
-
-        orig_start_cb = dom_handler.startElementNS
-        dom_handler.startElementNS = startElementNS
-        orig_set_content_handler(dom_handler)
-
-    parser = xml.sax.make_parser()
-    orig_set_content_handler = parser.setContentHandler
-    parser.setFeature(handler.feature_external_ges, False)
-    parser.setFeature(handler.feature_external_pes, False)
-    parser.setContentHandler = set_content_handler
-
-    doc = xml.dom.minidom.parseString(data, parser)
-
-    try:
-        x3dnode = doc.getElementsByTagName('X3D')[0]
-    except:
+    # The file is streamed through expat, building x3dElement's instead of a full DOM:
+    # CAD exports can have millions of elements.
+    # External entities are not loaded, expat doesn't without an ExternalEntityRefHandler.
+    parser = xml.parsers.expat.ParserCreate()
+    stack = []
+    x3d_elements = []
+
+    def start_element(name, attributes):
+        elem = x3dElement(name, attributes, (parser.CurrentLineNumber, parser.CurrentColumnNumber))
+        if stack:
+            stack[-1].childNodes.append(elem)
+        if name == 'X3D':
+            x3d_elements.append(elem)
+        stack.append(elem)
+
+    def end_element(name):
+        stack.pop()
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.Parse(data, True)
+    del data
+
+    if not x3d_elements:
         return None, 'Not a valid x3d document, cannot import'
 
     bpy.ops.object.select_all(action='DESELECT')
 
-    root = x3dNode(None, NODE_NORMAL, x3dnode)
+    root = x3dNode(None, NODE_NORMAL, x3d_elements[0])
     root.setRoot(path)  # so images and Inline's we load have a relative path
     root.parse()
 
@@ -1483,7 +1500,7 @@ import bpy
 from bpy_extras import image_utils
 from mathutils import Vector, Matrix, Quaternion
 
-GLOBALS = {'CIRCLE_DETAIL': 16}
+GLOBALS = {'CIRCLE_DETAIL': 16, 'SHARE_GEOMETRY': True}
 
 
 def translateRotation(rot):
@@ -3067,6 +3084,40 @@ def importShape_ProcessObject(
         bpyob["source_line_no"] = geom.lineno
 
 
+def importShape_ProcessInstance(
+        bpycollection, vrmlname, bpydata, geom, geom_spec, node,
+        bpymat, has_alpha, ancestry,
+        global_matrix):
+    """
+    Link a new object to the already imported data of a USE'd geometry node.
+    When this shape doesn't have the material of the data, it's set on the object.
+    """
+
+    vrmlname += "_" + geom_spec
+
+    data_mat = bpydata.materials[0] if bpydata.materials else None
+    if bpymat != data_mat:
+        if not bpydata.materials:
+            bpydata.materials.append(None)
+
+    bpyob = node.blendObject = bpy.data.objects.new(vrmlname, bpydata)
+
+    if bpymat != data_mat:
+        bpyob.material_slots[0].link = 'OBJECT'
+        bpyob.material_slots[0].material = bpymat
+
+    if type(bpydata) == bpy.types.Mesh and bpydata.uv_layers:
+        if has_alpha and bpymat:  # set the faces alpha flag?
+            bpymat.blend_method = 'BLEND'
+
+    bpyob.matrix_world = getFinalMatrix(node, None, ancestry, global_matrix)
+    bpycollection.objects.link(bpyob)
+    bpyob.select_set(True)
+
+    if DEBUG:
+        bpyob["source_line_no"] = geom.lineno
+
+
 def importText(geom, ancestry):
     fmt = geom.getChildBySpec('FontStyle')
     size = fmt.getFieldAsFloat("size", 1, ancestry) if fmt else 1.
@@ -3149,6 +3200,17 @@ def importShape(bpycollection, node, ancestry, global_matrix):
     bpydata = None
     geom_spec = geom.getSpec()
 
+    # USE-based caching: shapes using the same geometry node share its data,
+    # unless their texture transform changes it.
+    if GLOBALS['SHARE_GEOMETRY'] and geom.reference and texmtx is None:
+        bpydata = geom.getRealNode().parsed
+        if bpydata is not None:
+            importShape_ProcessInstance(
+                    bpycollection, vrmlname, bpydata, geom, geom_spec,
+                    node, bpymat, tex_has_alpha,
+                    ancestry, global_matrix)
+            return
+
     # ccw is handled by every geometry importer separately; some
     # geometries are easier to flip than others
     geom_fn = geometry_importers.get(geom_spec)
@@ -3161,6 +3223,9 @@ def importShape(bpycollection, node, ancestry, global_matrix):
                 bpycollection, vrmlname, bpydata, geom, geom_spec,
                 node, bpymat, tex_has_alpha, texmtx,
                 ancestry, global_matrix)
+
+        if GLOBALS['SHARE_GEOMETRY'] and texmtx is None and geom.canHaveReferences():
+            geom.parsed = bpydata
     else:
         print('\tImportX3D warning: unsupported type "%s"' % geom_spec)
 
@@ -3493,12 +3558,14 @@ def load_web3d(
         *,
         PREF_FLAT=False,
         PREF_CIRCLE_DIV=16,
+        PREF_SHARE_GEOMETRY=True,
         global_matrix=None,
         HELPER_FUNC=None
         ):
 
     # Used when adding blender primitives
     GLOBALS['CIRCLE_DETAIL'] = PREF_CIRCLE_DIV
+    GLOBALS['SHARE_GEOMETRY'] = PREF_SHARE_GEOMETRY
 
     bpyscene = bpycontext.scene
     bpycollection = bpycontext.collection
@@ -3631,6 +3698,7 @@ def load_with_profiler(
 def load(context,
          filepath,
          *,
+         use_shared_geometry=True,
          global_matrix=None
          ):
 
@@ -3638,6 +3706,7 @@ def load(context,
     load_web3d(context, filepath,
                PREF_FLAT=True,
                PREF_CIRCLE_DIV=16,
+               PREF_SHARE_GEOMETRY=use_shared_geometry,
                global_matrix=global_matrix,
                )
 
@@ -72,6 +72,12 @@ class ImportMDD(bpy.types.Operator, ImportHelper):
             min=1, max=1000,
             default=1,
             )
+    use_mesh_cache: BoolProperty(
+            name="Mesh Cache",
+            description="Stream the frames from the file with a Mesh Cache modifier, "
+                        "instead of adding a shape key per frame (the file must be kept)",
+            default=False,
+            )
 
     @classmethod
     def poll(cls, context):
@@ -88,7 +94,7 @@ class ImportMDD(bpy.types.Operator, ImportHelper):
         keywords = self.as_keywords(ignore=("filter_glob",))
 
         from . import import_mdd
-        return import_mdd.load(context, **keywords)
+        return import_mdd.load(self, context, **keywords)
 
 
 class ExportMDD(bpy.types.Operator, ExportHelper):
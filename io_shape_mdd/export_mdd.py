@@ -31,6 +31,7 @@ Be sure not to use modifiers that change the number or order of verts in the mes
 
 import bpy
 import mathutils
+import numpy as np
 from struct import pack
 
 
@@ -43,6 +44,15 @@ def zero_file(filepath):
     file.close()
 
 
+def write_vertices(file, mesh):
+    """
+    Write the vertex coordinates of the mesh, big endian.
+    """
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co.astype('>f4').tofile(file)
+
+
 def check_vertcount(mesh, vertcount):
     """
     check and make sure the vertcount is consistent throughout the frame range
@@ -93,12 +103,12 @@ def save(context, filepath="", frame_start=1, frame_end=300, fps=25.0, use_rest_
     f.write(pack(">2i", numframes, numverts))
 
     # Write the frame times (should we use the time IPO??)
-    f.write(pack(">%df" % (numframes), *[frame / fps for frame in range(numframes)]))  # seconds
+    (np.arange(numframes) / fps).astype('>f4').tofile(f)  # seconds
 
     if use_rest_frame:
         check_vertcount(me, numverts)
         me.transform(mat_flip @ obj.matrix_world)
-        f.write(pack(">%df" % (numverts * 3), *[axis for v in me.vertices for axis in v.co]))
+        write_vertices(f, me)
 
     obj_eval.to_mesh_clear()
 
@@ -111,7 +121,7 @@ def save(context, filepath="", frame_start=1, frame_end=300, fps=25.0, use_rest_
         me.transform(mat_flip @ obj.matrix_world)
 
         # Write the vertex data
-        f.write(pack(">%df" % (numverts * 3), *[axis for v in me.vertices for axis in v.co]))
+        write_vertices(f, me)
 
         obj_eval.to_mesh_clear()
 
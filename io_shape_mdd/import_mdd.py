@@ -32,16 +32,13 @@
 # Bill Niewuendorp
 
 import bpy
-from struct import unpack
+import numpy as np
 
-def set_linear_interpolation(obj, shapekey):
-    anim_data = obj.data.shape_keys.animation_data
-    data_path = "key_blocks[\"" + shapekey.name + "\"].value"
 
-    for fcu in anim_data.action.fcurves:
-        if fcu.data_path == data_path:
-            for keyframe in fcu.keyframe_points:
-                keyframe.interpolation = 'LINEAR'
+def set_linear_interpolation(fcurve):
+    # Enum properties can't be set with foreach_set().
+    for keyframe in fcurve.keyframe_points:
+        keyframe.interpolation = 'LINEAR'
 
 
 def obj_update_frame(file, scene, obj, start, fr, step):
@@ -49,38 +46,52 @@ def obj_update_frame(file, scene, obj, start, fr, step):
     # Insert new shape key
     new_shapekey = obj.shape_key_add()
     new_shapekey.name = ("frame_%.4d" % fr)
-    new_shapekey_index = len(obj.data.shape_keys.key_blocks) - 1
-
-    obj.active_shape_key_index = new_shapekey_index
-    obj.show_only_shape_key = True
 
     verts = new_shapekey.data
-
-    for v in verts:  # 12 is the size of 3 floats
-        v.co[:] = unpack('>3f', file.read(12))
-
-    # me.update()
-    obj.show_only_shape_key = False
+    co = np.fromfile(file, dtype='>f4', count=len(verts) * 3)
+    verts.foreach_set("co", co.astype(np.float32))
 
     # insert keyframes
-    new_shapekey = obj.data.shape_keys.key_blocks[new_shapekey_index]
     frame = start + fr*step
-
-    new_shapekey.value = 0.0
-    new_shapekey.keyframe_insert("value", frame=frame - step)
-
-    new_shapekey.value = 1.0
-    new_shapekey.keyframe_insert("value", frame=frame)
-
-    new_shapekey.value = 0.0
-    new_shapekey.keyframe_insert("value", frame=frame + step)
-
-    set_linear_interpolation(obj, new_shapekey)
-
-    obj.data.update()
-
-
-def load(context, filepath, frame_start=0, frame_step=1):
+    keys = ((frame - step, 0.0), (frame, 1.0), (frame + step, 0.0))
+
+    action = obj.data.shape_keys.animation_data.action
+    data_path = new_shapekey.path_from_id("value")
+    fcurve = action.fcurves.find(data_path)
+    if fcurve is None:
+        fcurve = action.fcurves.new(data_path)
+        fcurve.keyframe_points.add(len(keys))
+        fcurve.keyframe_points.foreach_set("co", [value for key in keys for value in key])
+    else:
+        for key_frame, key_value in keys:
+            fcurve.keyframe_points.insert(key_frame, key_value)
+
+    set_linear_interpolation(fcurve)
+    fcurve.update()
+
+
+def add_mesh_cache(obj, filepath, start, step):
+    """
+    Stream the frames from the file with a Mesh Cache modifier,
+    MDD frame 0 being shown at the start frame.
+    """
+    mod = obj.modifiers.new(name=bpy.path.display_name_from_filepath(filepath), type='MESH_CACHE')
+    mod.cache_format = 'MDD'
+    if bpy.data.is_saved:
+        try:  # can't always find the relative path (between drive letters on windows)
+            filepath = bpy.path.relpath(filepath)
+        except ValueError:
+            pass
+    mod.filepath = filepath
+    mod.time_mode = 'FRAME'
+    mod.interpolation = 'LINEAR'
+    # The MDD frame is: (frame_scale * scene frame) - frame_start.
+    mod.frame_scale = 1.0 / step
+    mod.frame_start = start / step
+    return mod
+
+
+def load(operator, context, filepath, frame_start=0, frame_step=1, use_mesh_cache=False):
 
     scene = context.scene
     obj = context.object
@@ -91,19 +102,43 @@ def load(context, filepath, frame_start=0, frame_step=1):
         bpy.ops.object.mode_set(mode='OBJECT')
 
     file = open(filepath, 'rb')
-    frames, points = unpack(">2i", file.read(8))
-    time = unpack((">%df" % frames), file.read(frames * 4))
+    frames, points = np.fromfile(file, dtype='>i4', count=2).tolist()
+    time = np.fromfile(file, dtype='>f4', count=frames)
 
     print('\tpoints:%d frames:%d' % (points, frames))
     print('\tstart frame:%d step:%d' % (frame_start, frame_step))
 
+    if points != len(obj.data.vertices):
+        file.close()
+        operator.report({'ERROR'}, "Number of points (%d) differs from the number of verts (%d), cannot import" %
+                        (points, len(obj.data.vertices)))
+        return {'CANCELLED'}
+
+    if use_mesh_cache:
+        file.close()
+        add_mesh_cache(obj, filepath, frame_start, frame_step)
+        return {'FINISHED'}
+
     # If target object doesn't have Basis shape key, create it.
     if not obj.data.shape_keys:
         basis = obj.shape_key_add()
         basis.name = "Basis"
         obj.data.update()
 
+    shape_keys = obj.data.shape_keys
+    if shape_keys.animation_data is None:
+        shape_keys.animation_data_create()
+    if shape_keys.animation_data.action is None:
+        action = bpy.data.actions.new(name=shape_keys.name + "Action")
+        action.id_root = 'KEY'
+        shape_keys.animation_data.action = action
+
     for i in range(frames):
         obj_update_frame(file, scene, obj, frame_start, i, frame_step)
 
+    file.close()
+
+    obj.active_shape_key_index = len(shape_keys.key_blocks) - 1
+    obj.data.update()
+
     return {'FINISHED'}